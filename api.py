@@ -1,24 +1,50 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 import os
+from typing import Annotated
 
-from fastapi import FastAPI
+import anyio
+from fastapi import FastAPI, Query, Request, Response
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import RedirectResponse
-from pydantic import BaseModel, SecretStr
+from fastapi.responses import JSONResponse, RedirectResponse
+from pydantic import BaseModel, Field, SecretStr
 from starlette.status import HTTP_303_SEE_OTHER
 import uvicorn
 
+from src.app_errors.app_errors import (
+    IncorrectPasswordError,
+    InvalidInputError,
+    InvalidPassWordError,
+    InvalidTokenError,
+    PasswordPoolSaturatedError,
+    UserAlreadyExistsError,
+    UserNotFoundError,
+    UserSessionExpiredError,
+)
 from src.client.film_client import FilmClient
 from src.client.user_client import UserClient
 from src.dao.dao import DAO
+from src.service.request_context import request_scope
+from src.utils.env import getenv
+from src.utils.etag import etag_matches
 from start import start
 
 
 ROOT_PATH = os.getenv("ROOT_PATH", "/proxy/8000")  # "" en local si besoin
 start()
 
-app = FastAPI(root_path=ROOT_PATH, title="MovieReco API")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Les services étant sans état partagé, on peut élargir le pool de threads
+    # qui exécute les routes synchrones (40 par défaut).
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = int(getenv("THREADPOOL_SIZE", limiter.total_tokens))
+    yield
+
+
+app = FastAPI(root_path=ROOT_PATH, title="MovieReco API", lifespan=lifespan)
 
 dao = DAO()
 user_client = UserClient()
@@ -49,6 +75,72 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
+# ============================================================
+# Authentification par jeton (Authorization: Bearer <token>)
+# ============================================================
+AUTH_ERRORS = (
+    IncorrectPasswordError,
+    InvalidTokenError,
+    UserNotFoundError,
+    UserSessionExpiredError,
+)
+
+
+def bearer_token(request: Request) -> str | None:
+    auth = request.headers.get("Authorization", "")
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
+
+
+@app.middleware("http")
+async def token_auth(request: Request, call_next):
+    """
+    Valide le jeton bearer s'il est présent (HMAC + session en mémoire, sans
+    accès à la base) et place l'utilisateur dans le contexte de la requête.
+    """
+    token = bearer_token(request)
+    if token:
+        try:
+            user_client.authenticate(token)
+        except AUTH_ERRORS as e:
+            return JSONResponse(status_code=401, content={"error": str(e)})
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    """
+    Ouvre un contexte propre à chaque requête (utilisateur, session, caches).
+    Déclaré après token_auth, il l'englobe.
+    """
+    with request_scope():
+        return await call_next(request)
+
+
+@app.exception_handler(IncorrectPasswordError)
+@app.exception_handler(InvalidTokenError)
+@app.exception_handler(UserNotFoundError)
+@app.exception_handler(UserSessionExpiredError)
+async def auth_error_handler(_request: Request, exc: Exception):
+    return JSONResponse(status_code=401, content={"error": str(exc)})
+
+
+@app.exception_handler(InvalidInputError)
+@app.exception_handler(InvalidPassWordError)
+@app.exception_handler(UserAlreadyExistsError)
+async def input_error_handler(_request: Request, exc: Exception):
+    return JSONResponse(status_code=400, content={"error": str(exc)})
+
+
+@app.exception_handler(PasswordPoolSaturatedError)
+async def saturated_handler(_request: Request, exc: PasswordPoolSaturatedError):
+    """File des calculs bcrypt pleine : on refuse vite plutôt que d'empiler."""
+    return JSONResponse(
+        status_code=503, content={"error": str(exc)}, headers={"Retry-After": "1"}
+    )
+
 # ============================================================
 # Models
 # ============================================================
@@ -61,6 +153,13 @@ class SignupResponse(BaseModel):
     pseudo: str
 
 
+class LoginResponse(BaseModel):
+    status: str = "ok"
+    token: str
+    token_type: str = "bearer"
+    expires_at: int
+
+
 class FavoriteAddResponse(BaseModel):
     status: str = "ok"
     titre: str
@@ -69,6 +168,25 @@ class FavoriteAddResponse(BaseModel):
     annee: int | None = None
 
 
+class FavoriteBatchRequest(BaseModel):
+    titres: list[str] = Field(min_length=1, max_length=500)
+
+
+class FavoriteBatchItem(BaseModel):
+    titre: str
+    status: str
+    film: str | None = None
+    realisateur: str | None = None
+    annee: int | None = None
+    error: str | None = None
+
+
+class FavoriteBatchResponse(BaseModel):
+    status: str
+    ajoutes: int = 0
+    resultats: list[FavoriteBatchItem] = []
+
+
 @app.get("/", include_in_schema=False)
 async def redirect_to_docs():
     return RedirectResponse(url="/docs", status_code=HTTP_303_SEE_OTHER)
@@ -79,7 +197,7 @@ async def redirect_to_docs():
 @app.post(
     "/users/signup",
     response_model=SignupResponse,
-    responses={400: {"model": ErrorResponse}},
+    responses={400: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
 )
 def signup(
     pseudo: str,
@@ -89,35 +207,227 @@ def signup(
     return user_client.signup(pseudo, email, password.get_secret_value())
 
 
+@app.post(
+    "/users/login",
+    response_model=LoginResponse,
+    responses={401: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+def login(
+    pseudo: str,
+    password: SecretStr,
+):
+    return user_client.login_token(pseudo, password.get_secret_value())
+
+
+@app.post("/users/logout", responses={401: {"model": ErrorResponse}})
+def logout(request: Request):
+    token = bearer_token(request)
+    if not token:
+        return JSONResponse(status_code=401, content={"error": "Jeton manquant."})
+    return user_client.logout_token(token)
+
+
 # ============================================================
 # TMDB (PUBLIC) - recherche live
 # ============================================================
 
+def not_modified(request: Request, etag: str | None, cache_control: str):
+    """
+    Réponse 304 si le client a déjà la version courante (If-None-Match),
+    sans construire le contenu. Sinon None.
+    """
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(
+            status_code=304, headers={"ETag": etag, "Cache-Control": cache_control}
+        )
+    return None
+
+
 @app.get("/tmdb/movie")
 def tmdb_movie_details(
     titre: str,
+    request: Request,
+    response: Response,
 ):
-    return film_client.get_film_tmdb(titre)
+    film, etag = film_client.film_tmdb(titre)
+    cache_control = f"public, max-age={film_client.tmdb_service.movies_ttl}"
+    cached = not_modified(request, etag, cache_control)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return film
 
 # ============================================================
-# FAVORIS (AUTH REQUIRED via pseudo + password)
+# CATALOGUE LOCAL (PUBLIC)
+# ============================================================
+@app.get("/films/similar")
+def similar_films(
+    titre: str, n: int = Query(10, ge=1, le=100), approx: bool = False
+):
+    return film_client.similar_films(titre, n, approx)
+
+
+@app.get("/films/trending")
+def trending_films(n: int = Query(10, ge=1, le=100)):
+    """Films les plus ajoutés en favori récemment (sans authentification)."""
+    return film_client.trending(n)
+
+
+@app.get("/films/search")
+def search_films(
+    genre: Annotated[list[str] | None, Query()] = None,
+    realisateur: str | None = None,
+    annee_min: int | None = None,
+    annee_max: int | None = None,
+    acteur: Annotated[list[str] | None, Query(description="« Prénom Nom »")] = None,
+    page: int = Query(1, ge=1),
+    taille: int = Query(20, ge=1, le=100),
+):
+    """
+    Films du catalogue local ayant tous les genres, le réalisateur et tous
+    les acteurs demandés (paramètres répétables), sortis entre `annee_min`
+    et `annee_max`, par pages de `taille`, avec le nombre de films trouvés
+    par genre, décennie et réalisateur.
+    """
+    return film_client.search_films(
+        genre, realisateur, acteur, annee_min, annee_max, page, taille
+    )
+
+
+@app.get("/films/autocomplete")
+def autocomplete_films(q: str, n: int = Query(10, ge=1, le=20)):
+    """Titres du catalogue local commençant par `q`, les plus mis en favori d'abord."""
+    return film_client.autocomplete(q, n)
+
+
+@app.get("/actors/co-stars")
+def actor_co_stars(prenom: str, nom: str, n: int = Query(20, ge=1, le=200)):
+    return film_client.co_stars(prenom, nom, n)
+
+
+@app.get("/actors/separation")
+def actor_separation(prenom1: str, nom1: str, prenom2: str, nom2: str):
+    return film_client.separation(prenom1, nom1, prenom2, nom2)
+
+
+# ============================================================
+# FAVORIS (AUTH REQUIRED via jeton bearer, ou pseudo + password)
 # Favori = film choisi dans TMDB (movie_id)
 # ============================================================
+def secret(password: SecretStr | None) -> str | None:
+    return password.get_secret_value() if password else None
+
+
 @app.post(
     "/favorites/add_tmdb",
     response_model=FavoriteAddResponse,
     responses={401: {"model": ErrorResponse}},
 )
 def add_favorite_tmdb(
-    pseudo: str,
-    password: SecretStr,
     titre: str,
+    pseudo: str | None = None,
+    password: SecretStr | None = None,
 ):
-    return user_client.add_favorite(pseudo, password.get_secret_value(), titre)
+    return user_client.add_favorite(pseudo, secret(password), titre)
+
+@app.post(
+    "/favorites/add_tmdb/batch",
+    response_model=FavoriteBatchResponse,
+    responses={401: {"model": ErrorResponse}},
+)
+def add_favorites_tmdb_batch(
+    body: FavoriteBatchRequest,
+    pseudo: str | None = None,
+    password: SecretStr | None = None,
+):
+    return user_client.add_favorites_batch(pseudo, secret(password), body.titres)
+
 
 @app.get("/favorites", responses={401: {"model": ErrorResponse}})
-def get_favorites(pseudo: str, password: SecretStr):
-    return user_client.get_favorites(pseudo, password.get_secret_value())
+def get_favorites(
+    request: Request,
+    response: Response,
+    pseudo: str | None = None,
+    password: SecretStr | None = None,
+):
+    # Authentifie une seule fois : la suite lit l'utilisateur dans le contexte
+    etag = user_client.favorites_etag(pseudo, secret(password))
+    cache_control = "private, no-cache"
+    cached = not_modified(request, etag, cache_control)
+    if cached:
+        return cached
+    if etag:
+        response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Vary"] = "Authorization"
+    return user_client.get_favorites(None, None)
+
+
+@app.delete("/favorites", responses={401: {"model": ErrorResponse}})
+def remove_favorite(
+    titre: str,
+    pseudo: str | None = None,
+    password: SecretStr | None = None,
+):
+    return user_client.remove_favorite(pseudo, secret(password), titre)
+
+
+@app.get("/favorites/sync", responses={401: {"model": ErrorResponse}})
+def sync_favorites(
+    since: int | None = None,
+    pseudo: str | None = None,
+    password: SecretStr | None = None,
+):
+    """
+    Favoris ajoutés ou retirés depuis le jeton `since` (renvoyé par l'appel
+    précédent). Sans jeton : liste complète (full = true).
+    """
+    return user_client.sync_favorites(pseudo, secret(password), since)
+
+
+# ============================================================
+# RECOMMANDATIONS (AUTH REQUIRED)
+# ============================================================
+@app.get("/recommendations", responses={401: {"model": ErrorResponse}})
+def get_recommendations(
+    n: int = Query(10, ge=1, le=100),
+    pseudo: str | None = None,
+    password: SecretStr | None = None,
+):
+    return user_client.get_recommendations(pseudo, secret(password), n)
+
+
+@app.get("/recommendations/similar-users", responses={401: {"model": ErrorResponse}})
+def similar_users(
+    n: int = Query(10, ge=1, le=100),
+    pseudo: str | None = None,
+    password: SecretStr | None = None,
+):
+    """Utilisateurs dont les favoris ressemblent le plus aux vôtres."""
+    return user_client.similar_users(pseudo, secret(password), n)
+
+
+@app.get("/recommendations/neighbours", responses={401: {"model": ErrorResponse}})
+def neighbour_films(
+    n: int = Query(10, ge=1, le=100),
+    pseudo: str | None = None,
+    password: SecretStr | None = None,
+):
+    """Films aimés par les utilisateurs aux goûts proches, pas encore en favori."""
+    return user_client.neighbour_films(pseudo, secret(password), n)
+
+
+# ============================================================
+# METRIQUES
+# ============================================================
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    service = user_client.user_service
+    return {
+        "password_pool": service.password_pool.metrics(),
+        "favorites_cache": service.favorites_cache.metrics(),
+    }
 
 
 if __name__ == "__main__":
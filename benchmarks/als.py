@@ -0,0 +1,56 @@
+"""
+Durée d'apprentissage de la factorisation implicite (ImplicitALS) et débit du
+calcul des recommandations, sur des favoris synthétiques (popularité de Zipf).
+
+    uv run python -m benchmarks.als --interactions 1000000 --workers 4
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from benchmarks.item_similarity_updates import synthetic_favorites
+from src.engine.als import ImplicitALS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interactions", type=int, default=1_000_000)
+    parser.add_argument("--films", type=int, default=50_000)
+    parser.add_argument("--per-user", type=int, default=20)
+    parser.add_argument("--factors", type=int, default=64)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--queries", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    users, films = synthetic_favorites(
+        args.interactions // args.per_user, args.films, args.per_user, rng
+    )
+
+    start = time.perf_counter()
+    model = ImplicitALS(
+        factors=args.factors, iterations=args.iterations, workers=args.workers
+    ).fit(users, films)
+    total = time.perf_counter() - start
+    for i, seconds in enumerate(model.iteration_times, start=1):
+        print(f"itération {i} : {seconds:.2f}s")
+    size = (model.user_factors.nbytes + model.item_factors.nbytes) / 1e6
+    print(
+        f"apprentissage : {users.size} favoris, {model.user_ids.size} utilisateurs, "
+        f"{model.film_ids.size} films en {total:.1f}s ({args.workers} processus), "
+        f"facteurs {size:.1f} Mo"
+    )
+
+    queries = model.user_ids[: args.queries]
+    start = time.perf_counter()
+    model.recommend(queries, 10)
+    elapsed = time.perf_counter() - start
+    print(f"recommandations : {queries.size / elapsed:.0f} utilisateurs/s")
+
+
+if __name__ == "__main__":
+    main()
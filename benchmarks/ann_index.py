@@ -0,0 +1,84 @@
+"""
+Rappel et débit (requêtes/s) de l'index approché LSHIndex comparés à une
+recherche exhaustive, sur des vecteurs synthétiques groupés en amas.
+
+    uv run python -m benchmarks.ann_index --films 200000 --dim 64
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from src.engine.ann_index import LSHIndex
+
+
+def synthetic_vectors(n_films, dim, n_clusters, rng):
+    centers = rng.standard_normal((n_clusters, dim))
+    labels = rng.integers(0, n_clusters, n_films)
+    return (centers[labels] + 0.5 * rng.standard_normal((n_films, dim))).astype(
+        np.float32
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--films", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--clusters", type=int, default=2_000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--tables", type=int, default=8)
+    parser.add_argument("--bits", type=int, default=12)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = synthetic_vectors(args.films, args.dim, args.clusters, rng)
+
+    start = time.perf_counter()
+    index = LSHIndex(args.dim, args.tables, args.bits).build(
+        np.arange(args.films), vectors
+    )
+    print(f"construction : {args.films} vecteurs en {time.perf_counter() - start:.2f}s")
+
+    queries = rng.integers(0, args.films, args.queries).tolist()
+    start = time.perf_counter()
+    truth = [
+        {f for f, _ in index.exact(index.vector(q), args.k, exclude=(q,))}
+        for q in queries
+    ]
+    print(f"exhaustif : {args.queries / (time.perf_counter() - start):.0f} req/s")
+
+    for n_probes in (0, 1, 2, 4, 8):
+        start = time.perf_counter()
+        results = [index.similar(q, args.k, n_probes) for q in queries]
+        qps = args.queries / (time.perf_counter() - start)
+        found = sum(
+            len({f for f, _ in res} & expected)
+            for res, expected in zip(results, truth, strict=True)
+        )
+        recall = found / (args.k * args.queries)
+        print(f"n_probes={n_probes} : rappel@{args.k} {recall:.3f}, {qps:.0f} req/s")
+
+    with tempfile.TemporaryDirectory() as path:
+        index.save(path)
+        start = time.perf_counter()
+        loaded = LSHIndex.load(path)
+        load_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for q in queries:
+            loaded.similar(q, args.k, 2)
+        qps = args.queries / (time.perf_counter() - start)
+        print(
+            f"chargement mmap : {load_time * 1e3:.1f} ms, n_probes=2 : {qps:.0f} req/s"
+        )
+
+    start = time.perf_counter()
+    for i in range(1_000):
+        index.insert(args.films + i, vectors[i])
+    print(f"insertion : {(time.perf_counter() - start):.3f} ms par vecteur")
+
+
+if __name__ == "__main__":
+    main()
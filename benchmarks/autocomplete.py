@@ -0,0 +1,73 @@
+"""
+Latence et mémoire de l'autocomplétion des titres (TitlePrefixIndex) sur des
+titres synthétiques (mots de fréquence de type Zipf, popularité Pareto).
+
+    uv run python -m benchmarks.autocomplete --titles 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.engine.title_index import TitlePrefixIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--titles", type=int, default=1_000_000)
+    parser.add_argument("--words", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    vocabulary = [
+        "".join(rng.choice(letters, rng.integers(2, 10))) for _ in range(args.words)
+    ]
+    ranks = np.arange(1, args.words + 1)
+    zipf = (1 / ranks) / (1 / ranks).sum()
+    lengths = rng.integers(1, 6, args.titles)
+    words = rng.choice(args.words, lengths.sum(), p=zipf)
+    bounds = np.cumsum(lengths) - lengths
+    titles = [
+        " ".join(vocabulary[w] for w in words[b : b + n]).title()
+        for b, n in zip(bounds.tolist(), lengths.tolist(), strict=True)
+    ]
+    popularity = np.floor(rng.pareto(1.2, args.titles))
+
+    start = time.perf_counter()
+    index = TitlePrefixIndex().fit(np.arange(args.titles), titles, popularity)
+    print(
+        f"construction : {args.titles} titres en "
+        f"{time.perf_counter() - start:.1f}s, {index.nbytes / 1e6:.0f} Mo"
+    )
+
+    samples = rng.choice(args.titles, args.queries)
+    for length in (1, 2, 3, 5, 8):
+        prefixes = [titles[i][:length] for i in samples.tolist()]
+        for label in ("premier appel", "appels suivants"):
+            timings = np.empty(args.queries)
+            for i, prefix in enumerate(prefixes):
+                begin = time.perf_counter()
+                index.complete(prefix, 10)
+                timings[i] = time.perf_counter() - begin
+            p50, p99 = np.percentile(timings * 1e6, [50, 99])
+            print(
+                f"préfixe de {length} car., {label:<15} : "
+                f"médiane {p50:7.1f} µs, p99 {p99:8.1f} µs"
+            )
+    print(f"mémoire avec les classements gardés : {index.nbytes / 1e6:.0f} Mo")
+
+    start = time.perf_counter()
+    for i in range(999):
+        index.add(args.titles + i, f"Nouveau Film {i}")
+    added = (time.perf_counter() - start) / 999 * 1e6
+    start = time.perf_counter()
+    index.add(args.titles + 999, "Nouveau Film 999")
+    merge = time.perf_counter() - start
+    print(f"ajout : {added:.1f} µs, fusion de 1000 ajouts : {merge:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
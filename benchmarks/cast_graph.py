@@ -0,0 +1,59 @@
+"""
+Latence des requêtes du graphe acteurs – films (CastGraph) sur un casting
+synthétique (popularité des acteurs de type Pareto).
+
+    uv run python -m benchmarks.cast_graph --roles 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.engine.cast_graph import CastGraph
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--roles", type=int, default=1_000_000)
+    parser.add_argument("--films", type=int, default=100_000)
+    parser.add_argument("--actors", type=int, default=300_000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    films = rng.integers(0, args.films, args.roles)
+    popularity = rng.pareto(1.5, args.actors) + 1
+    actors = rng.choice(args.actors, args.roles, p=popularity / popularity.sum())
+
+    start = time.perf_counter()
+    graph = CastGraph().fit(films, actors)
+    size = (graph.indptr.nbytes + graph.indices.nbytes) / 1e6
+    print(
+        f"construction : {graph.indices.size // 2} arêtes en "
+        f"{time.perf_counter() - start:.2f}s, {size:.1f} Mo"
+    )
+
+    pairs = rng.choice(graph.actor_ids, (args.queries, 2))
+    timings, lengths = np.empty(args.queries), []
+    for i, (source, target) in enumerate(pairs.tolist()):
+        start = time.perf_counter()
+        path = graph.shortest_path(source, target)
+        timings[i] = time.perf_counter() - start
+        if path:
+            lengths.append(len(path) // 2)
+    p50, p99 = np.percentile(timings * 1e3, [50, 99])
+    print(
+        f"séparation : médiane {p50:.2f} ms, p99 {p99:.2f} ms, "
+        f"{np.mean(lengths):.1f} degrés en moyenne"
+    )
+
+    start = time.perf_counter()
+    for source in pairs[:, 0].tolist():
+        graph.co_stars(source, 20)
+    per_query = (time.perf_counter() - start) / args.queries * 1e3
+    print(f"partenaires : {per_query:.3f} ms par requête")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Latence de la recherche à filtres et facettes (CatalogIndex) sur un
+catalogue synthétique (popularité des réalisateurs et acteurs de type Pareto).
+
+    uv run python -m benchmarks.catalog_search --films 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.engine.catalog_index import CatalogIndex
+
+
+GENRES = [
+    "Action",
+    "Animation",
+    "Aventure",
+    "Comédie",
+    "Crime",
+    "Documentaire",
+    "Drame",
+    "Familial",
+    "Fantastique",
+    "Guerre",
+    "Histoire",
+    "Horreur",
+    "Musique",
+    "Mystère",
+    "Romance",
+    "Science-Fiction",
+    "Téléfilm",
+    "Thriller",
+    "Western",
+]
+
+
+def _pareto_choice(rng, n, size):
+    popularity = rng.pareto(1.5, n) + 1
+    return rng.choice(n, size, p=popularity / popularity.sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--films", type=int, default=1_000_000)
+    parser.add_argument("--directors", type=int, default=100_000)
+    parser.add_argument("--actors", type=int, default=300_000)
+    parser.add_argument("--roles", type=int, default=3_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    films = np.arange(1, args.films + 1)
+    directors = [
+        f"Réalisateur {d}" for d in _pareto_choice(rng, args.directors, args.films)
+    ]
+    counts = rng.integers(1, 4, args.films)
+    genre_codes = rng.integers(0, len(GENRES), counts.sum())
+    bounds = np.cumsum(counts) - counts
+    genres = [
+        ", ".join(GENRES[g] for g in genre_codes[b : b + c])
+        for b, c in zip(bounds.tolist(), counts.tolist(), strict=True)
+    ]
+    years = rng.integers(1920, 2026, args.films).tolist()
+    casting_films = rng.integers(1, args.films + 1, args.roles)
+    casting_actors = _pareto_choice(rng, args.actors, args.roles)
+
+    start = time.perf_counter()
+    index = CatalogIndex().fit(
+        films, directors, genres, casting_films, casting_actors, years=years
+    )
+    arrays = [index.film_ids, index.years, index.directors, index.genre_bits]
+    arrays += [a for lists in index._lists.values() for a in lists]
+    size = sum(a.nbytes for a in arrays) / 1e6
+    print(
+        f"construction : {args.films} films en {time.perf_counter() - start:.1f}s, {size:.0f} Mo"
+    )
+
+    queries = {
+        "sans filtre": lambda: {},
+        "un genre": lambda: {"genres": [rng.choice(GENRES)]},
+        "deux genres + années": lambda: {
+            "genres": list(rng.choice(GENRES, 2, replace=False)),
+            "years": (1990, 2009),
+        },
+        "réalisateur": lambda: {"director": rng.choice(directors)},
+        "acteur + genre": lambda: {
+            "actors": [int(rng.choice(casting_actors))],
+            "genres": [rng.choice(GENRES)],
+        },
+    }
+    for name, query in queries.items():
+        timings = np.empty(args.queries)
+        for i in range(args.queries):
+            params = query()
+            begin = time.perf_counter()
+            rows = index.select(**params)
+            index.film_ids[rows[:20]]
+            index.facets(rows)
+            timings[i] = time.perf_counter() - begin
+        p50, p99 = np.percentile(timings * 1e3, [50, 99])
+        print(
+            f"{name:<22} : médiane {p50:6.2f} ms, p99 {p99:6.2f} ms ({rows.size} films)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Coût d'une mise à jour incrémentale du modèle item-item (ItemSimilarity.add /
+remove) comparé à une reconstruction complète, sur des favoris synthétiques
+à popularité de type Zipf.
+
+    uv run python -m benchmarks.item_similarity_updates --films 50000 --users 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.engine.item_similarity import ItemSimilarity
+
+
+def synthetic_favorites(n_users, n_films, per_user, rng):
+    users = np.repeat(np.arange(n_users), per_user)
+    films = (rng.zipf(1.3, users.size) - 1) % n_films
+    return users, films
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--films", type=int, default=50_000)
+    parser.add_argument("--per-user", type=int, default=20)
+    parser.add_argument("--events", type=int, default=2_000)
+    parser.add_argument("--k", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    users, films = synthetic_favorites(args.users, args.films, args.per_user, rng)
+
+    start = time.perf_counter()
+    model = ItemSimilarity(k=args.k).fit(users, films)
+    fit_time = time.perf_counter() - start
+    print(f"fit : {users.size} favoris, {model.film_ids.size} films en {fit_time:.2f}s")
+
+    event_users = rng.integers(0, args.users, args.events)
+    event_films = (rng.zipf(1.3, args.events) - 1) % args.films
+    timings = np.empty(args.events)
+    for i, (user, film) in enumerate(zip(event_users, event_films, strict=True)):
+        start = time.perf_counter()
+        if i % 4 == 3:
+            model.remove(int(user), int(film))
+        else:
+            model.add(int(user), int(film))
+        timings[i] = time.perf_counter() - start
+
+    p50, p99 = np.percentile(timings * 1e3, [50, 99])
+    print(
+        f"mise à jour : médiane {p50:.2f} ms, p99 {p99:.2f} ms, "
+        f"max {timings.max() * 1e3:.2f} ms ({args.events} événements)"
+    )
+
+    start = time.perf_counter()
+    model.compact()
+    print(f"compaction : {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
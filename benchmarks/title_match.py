@@ -0,0 +1,89 @@
+"""
+Latence et mémoire de la recherche approchée des titres (TrigramIndex) sur
+des titres synthétiques (mots de fréquence de type Zipf), interrogés avec
+des fautes de frappe.
+
+    uv run python -m benchmarks.title_match --titles 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.engine.trigram_index import TrigramIndex
+
+
+def _typo(rng, titre: str, edits: int) -> str:
+    """Le titre avec `edits` caractères remplacés, supprimés ou insérés."""
+    chars = list(titre)
+    for _ in range(edits):
+        pos = int(rng.integers(len(chars)))
+        kind = rng.integers(3)
+        if kind == 0:
+            chars[pos] = chr(int(rng.integers(97, 123)))
+        elif kind == 1 and len(chars) > 1:
+            del chars[pos]
+        else:
+            chars.insert(pos, chr(int(rng.integers(97, 123))))
+    return "".join(chars)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--titles", type=int, default=1_000_000)
+    parser.add_argument("--words", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    vocabulary = [
+        "".join(rng.choice(letters, rng.integers(2, 10))) for _ in range(args.words)
+    ]
+    ranks = np.arange(1, args.words + 1)
+    zipf = (1 / ranks) / (1 / ranks).sum()
+    lengths = rng.integers(1, 6, args.titles)
+    words = rng.choice(args.words, lengths.sum(), p=zipf)
+    bounds = np.cumsum(lengths) - lengths
+    titles = [
+        " ".join(vocabulary[w] for w in words[b : b + n]).title()
+        for b, n in zip(bounds.tolist(), lengths.tolist(), strict=True)
+    ]
+
+    start = time.perf_counter()
+    index = TrigramIndex().fit(np.arange(args.titles), titles)
+    print(
+        f"construction : {args.titles} titres en "
+        f"{time.perf_counter() - start:.1f}s, {index.nbytes / 1e6:.0f} Mo"
+    )
+
+    samples = rng.choice(args.titles, args.queries).tolist()
+    for edits in (0, 1, 2, 4):
+        queries = [_typo(rng, titles[i], edits) for i in samples]
+        timings = np.empty(args.queries)
+        found = 0
+        for i, (query, expected) in enumerate(zip(queries, samples, strict=True)):
+            begin = time.perf_counter()
+            match = index.match(query)
+            timings[i] = time.perf_counter() - begin
+            # titres en double : un autre film du même titre compte aussi
+            found += match is not None and titles[match[0]] == titles[expected]
+        p50, p99 = np.percentile(timings * 1e3, [50, 99])
+        print(
+            f"{edits} faute(s) : trouvés {found / args.queries:6.1%}, "
+            f"médiane {p50:5.2f} ms, p99 {p99:6.2f} ms"
+        )
+
+    start = time.perf_counter()
+    for i in range(999):
+        index.add(args.titles + i, f"Nouveau Film {i}")
+    added = (time.perf_counter() - start) / 999 * 1e6
+    start = time.perf_counter()
+    index.add(args.titles + 999, "Nouveau Film 999")
+    merge = time.perf_counter() - start
+    print(f"ajout : {added:.1f} µs, fusion de 1000 ajouts : {merge:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
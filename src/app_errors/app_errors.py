@@ -46,6 +46,18 @@ class UserSessionExpiredError(Exception):
     pass
 
 
+class InvalidTokenError(Exception):
+    """Levée lorsqu'un jeton de session est mal formé, falsifié ou expiré."""
+
+    pass
+
+
+class PasswordPoolSaturatedError(Exception):
+    """Levée lorsque la file des calculs de mot de passe est pleine."""
+
+    pass
+
+
 class SomeThingWentWrongError(Exception):
     """Levée pour signaler une erreur générique inattendue."""
 
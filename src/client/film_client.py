@@ -1,16 +1,189 @@
+import logging
+
+from src.business_object.actor import Actor
+from src.service.autocomplete_service import AutocompleteService
+from src.service.cast_graph_service import CastGraphService
+from src.service.catalog_service import CatalogService
 from src.service.film_service import FilmService
+from src.service.popularity_service import PopularityService
+from src.service.recommendation_service import RecommendationService
+from src.service.title_match_service import TitleMatchService
 from src.service.tmdb_service import TmdbService
+from src.utils.etag import content_etag
 
 
 class FilmClient:
     def __init__(self):
         self.film_service = FilmService()
         self.tmdb_service = TmdbService()
+        self.recommendation_service = RecommendationService.shared()
+        self.cast_graph_service = CastGraphService.shared()
+        self.popularity_service = PopularityService.shared()
+        self.catalog_service = CatalogService.shared()
+        self.autocomplete_service = AutocompleteService.shared()
+        self.title_match_service = TitleMatchService.shared()
 
-    def get_film_tmdb(self, titre):
-        film = self.tmdb_service.get_movie_filtered(titre)
+    def _film_local(self, titre):
+        """Film du catalogue local correspondant au titre (même mal orthographié)."""
+        try:
+            return self.title_match_service.find(titre)
+        except Exception as e:
+            logging.error(f"Erreur lors de la recherche locale du titre : {e}")
+            return None
+
+    def film_tmdb(self, titre):
+        """
+        Film correspondant au titre, pris en base si possible, sinon sur TMDB,
+        et son ETag (celui du film local, ou de l'entrée du cache TMDB) : une
+        seule recherche pour les deux.
+        """
+        film, source = self._film_local(titre), "local"
+        if film is not None:
+            etag = content_etag(
+                [film.titre, film.realisateur, film.annee, film.genre, film.casting]
+            )
+        else:
+            film, etag = self.tmdb_service.get_movie_cached(titre)
+            source = "tmdb"
 
         return {
             "titre" : film.titre,
             "realisateur" : film.realisateur,
-        }
+            "source" : source,
+        }, etag
+
+    def get_film_tmdb(self, titre):
+        """Film correspondant au titre, pris en base si possible, sinon sur TMDB."""
+        return self.film_tmdb(titre)[0]
+
+    def similar_films(self, titre, n=10, approx=False):
+        try:
+            similaires = self.recommendation_service.similar_films(titre, n, approx)
+            if similaires is None:
+                return {"status" : "error", "error" : f"Film '{titre}' inconnu"}
+            return {
+                "status" : "ok",
+                "titre" : titre,
+                "films" : [
+                    {
+                        "titre" : film.titre,
+                        "realisateur" : film.realisateur,
+                        "score" : round(score, 4)
+                    }
+                    for film, score in similaires
+                ]
+            }
+        except Exception as e:
+            logging.error(f"Erreur lors de la recherche de films similaires : {e}")
+            return {"status" : "error"}
+
+    def trending(self, n=10):
+        try:
+            return {
+                "status" : "ok",
+                "films" : [
+                    {
+                        "titre" : film.titre,
+                        "realisateur" : film.realisateur,
+                        "score" : round(score, 4)
+                    }
+                    for film, score in self.popularity_service.trending(n)
+                ]
+            }
+        except Exception as e:
+            logging.error(f"Erreur lors de la lecture des films tendance : {e}")
+            return {"status" : "error"}
+
+    def search_films(
+        self, genres=None, realisateur=None, acteurs=None, annee_min=None,
+        annee_max=None, page=1, taille=20
+    ):
+        # acteurs : « Prénom Nom », le prénom étant le premier mot
+        noms = [a.strip().partition(" ") for a in acteurs or []]
+        acteurs = [Actor(nom, prenom) for prenom, _, nom in noms]
+        try:
+            total, films, facettes = self.catalog_service.search_films(
+                genres, realisateur, acteurs, (annee_min, annee_max),
+                limit=taille, offset=(page - 1) * taille
+            )
+            return {
+                "status" : "ok",
+                "total" : total,
+                "page" : page,
+                "films" : [
+                    {
+                        "titre" : film.titre,
+                        "realisateur" : film.realisateur,
+                        "annee" : film.annee,
+                        "genre" : film.genre
+                    }
+                    for film in films
+                ],
+                "facettes" : {
+                    "genres" : [
+                        {"genre" : genre, "films" : n}
+                        for genre, n in facettes.get("genre", [])
+                    ],
+                    "decennies" : [
+                        {"decennie" : decennie, "films" : n}
+                        for decennie, n in facettes.get("decade", [])
+                    ],
+                    "realisateurs" : [
+                        {"realisateur" : realisateur, "films" : n}
+                        for realisateur, n in facettes.get("director", [])
+                    ]
+                }
+            }
+        except Exception as e:
+            logging.error(f"Erreur lors de la recherche dans le catalogue : {e}")
+            return {"status" : "error"}
+
+    def autocomplete(self, q, n=10):
+        try:
+            return {
+                "status" : "ok",
+                "titres" : [
+                    {"titre" : titre, "favoris" : count}
+                    for titre, count in self.autocomplete_service.complete(q, n)
+                ]
+            }
+        except Exception as e:
+            logging.error(f"Erreur lors de l'autocomplétion : {e}")
+            return {"status" : "error"}
+
+    def co_stars(self, prenom, nom, n=20):
+        actor = Actor(nom, prenom)
+        try:
+            partenaires = self.cast_graph_service.co_stars(actor, n)
+            if partenaires is None:
+                return {"status" : "error", "error" : f"Acteur '{actor.description()}' inconnu"}
+            return {
+                "status" : "ok",
+                "acteur" : actor.description(),
+                "partenaires" : [
+                    {"acteur" : partenaire.description(), "films" : count}
+                    for partenaire, count in partenaires
+                ]
+            }
+        except Exception as e:
+            logging.error(f"Erreur lors de la recherche des partenaires : {e}")
+            return {"status" : "error"}
+
+    def separation(self, prenom1, nom1, prenom2, nom2):
+        actor, other = Actor(nom1, prenom1), Actor(nom2, prenom2)
+        try:
+            chemin = self.cast_graph_service.separation(actor, other)
+            if chemin is None:
+                return {"status" : "error", "error" : "Acteur inconnu"}
+            return {
+                "status" : "ok",
+                "degres" : len(chemin) // 2 if chemin else None,
+                "chemin" : [
+                    {"acteur" : step.description()} if isinstance(step, Actor)
+                    else {"film" : step.titre if step else None}
+                    for step in chemin
+                ]
+            }
+        except Exception as e:
+            logging.error(f"Erreur lors du calcul de la séparation : {e}")
+            return {"status" : "error"}
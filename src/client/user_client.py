@@ -1,8 +1,11 @@
 import logging
 
+from src.app_errors.app_errors import InvalidInputError
 from src.business_object.user import User
+from src.service.recommendation_service import RecommendationService
 from src.service.tmdb_service import TmdbService
 from src.service.user_service import UserService
+from src.utils.etag import content_etag
 from src.utils.log_decorator import log
 
 
@@ -10,6 +13,7 @@ class UserClient:
     def __init__(self):
         self.user_service = UserService()
         self.tmdb_service = TmdbService()
+        self.recommendation_service = RecommendationService.shared()
 
     def signup(self, pseudo, email, password):
         try:
@@ -22,16 +26,60 @@ class UserClient:
     def login(self, pseudo, password):
         return self.user_service.login(pseudo, password)
 
+    def login_token(self, pseudo, password):
+        token = self.user_service.login_token(pseudo, password)
+        session = self.user_service.current_session
+        return {
+            "status": "ok",
+            "token": token,
+            "token_type": "bearer",
+            "expires_at": int(session.expires_at),
+        }
+
+    def authenticate(self, token):
+        return self.user_service.authenticate(token)
+
+    def logout_token(self, token):
+        if self.user_service.revoke_token(token):
+            return {"status": "ok"}
+        return {"status": "error"}
+
+    def current_user(self, pseudo=None, password=None):
+        """
+        Utilisateur de la requête : connexion par pseudo + mot de passe s'ils
+        sont fournis, sinon l'utilisateur déjà authentifié par jeton.
+        Lève InvalidInputError si un seul des deux est fourni.
+        """
+        if pseudo is None and password is None:
+            return self.user_service.current_user
+        if pseudo is None or password is None:
+            raise InvalidInputError("Le pseudo et le mot de passe vont ensemble.")
+        return self.login(pseudo, password)
+
+    def favorites_etag(self, pseudo=None, password=None):
+        """
+        ETag des favoris de l'utilisateur de la requête, tiré de leur dernier
+        changement en base (FAVORIS_LOG) : le même sur tous les workers, sans
+        lire la liste. None si non authentifié.
+        """
+        user = self.current_user(pseudo, password)
+        if not user:
+            return None
+        change = self.user_service.favorites_change(user.pseudo)
+        if change is None:
+            return None
+        return content_etag(["favorites", user.pseudo, change])
+
     @log
     def add_favorite(self, pseudo, password, titre):
         try:
-            user = self.login(pseudo, password)
+            user = self.current_user(pseudo, password)
             if not user:
                 logging.error("Pseudo ou mot de passe incorrect")
                 return {"status" : "error"}
 
             film = self.tmdb_service.get_movie_filtered(titre)
-            self.user_service.add_favorite(pseudo, film)
+            self.user_service.add_favorite(user.pseudo, film)
 
             return {
                 "status" : "ok",
@@ -42,14 +90,63 @@ class UserClient:
         except Exception as e:
             logging.error(f"Erreur lors de l'ajout de favori : {e}")
 
+    @log
+    def add_favorites_batch(self, pseudo, password, titres):
+        """
+        Ajoute une liste de titres aux favoris : une seule authentification,
+        recherche TMDB parallèle puis enregistrement en une transaction.
+        Retourne le statut de chaque titre.
+        """
+        try:
+            user = self.current_user(pseudo, password)
+            if not user:
+                logging.error("Pseudo ou mot de passe incorrect")
+                return {"status" : "error"}
+
+            resolved = self.tmdb_service.get_movies_filtered(titres)
+            films = [f for f in resolved.values() if not isinstance(f, Exception)]
+            saved = self.user_service.add_favorites_batch(user.pseudo, films)
+
+            resultats = []
+            for titre, film in resolved.items():
+                if isinstance(film, Exception):
+                    resultats.append(
+                        {"titre" : titre, "status" : "error", "error" : str(film)}
+                    )
+                elif not saved:
+                    resultats.append(
+                        {"titre" : titre, "status" : "error",
+                         "error" : "Enregistrement impossible"}
+                    )
+                else:
+                    resultats.append({
+                        "titre" : titre,
+                        "status" : "ok",
+                        "film" : film.titre,
+                        "realisateur" : film.realisateur,
+                        "annee" : film.annee
+                    })
+
+            return {
+                "status" : "ok" if saved else "error",
+                "ajoutes" : sum(r["status"] == "ok" for r in resultats),
+                "resultats" : resultats
+            }
+        except Exception as e:
+            logging.error(f"Erreur lors de l'ajout de favoris par lot : {e}")
+            return {"status" : "error"}
+
     def get_favorites(self, pseudo, password):
         try:
-            user = self.login(pseudo, password)
+            user = self.current_user(pseudo, password)
             if not user:
                 logging.error("Pseudo ou mot de passe incorrect")
                 return {"status" : "error"}
 
-            favorites = self.user_service.get_favorites(pseudo)
+            # même changement que l'ETag : une liste en cache plus ancienne est relue
+            favorites = self.user_service.get_favorites(
+                user.pseudo, self.user_service.favorites_change(user.pseudo)
+            )
 
             dico = {
                 "status" : "ok",
@@ -66,3 +163,111 @@ class UserClient:
 
         except Exception as e:
             logging.error(f"Erreur lors de la récupération des favoris : {e}")
+
+    @log
+    def remove_favorite(self, pseudo, password, titre):
+        try:
+            user = self.current_user(pseudo, password)
+            if not user:
+                logging.error("Pseudo ou mot de passe incorrect")
+                return {"status" : "error"}
+
+            if not self.user_service.remove_favorite(user.pseudo, titre):
+                return {"status" : "error", "titre" : titre}
+            return {"status" : "ok", "titre" : titre}
+        except Exception as e:
+            logging.error(f"Erreur lors de la suppression de favori : {e}")
+            return {"status" : "error"}
+
+    def sync_favorites(self, pseudo, password, since=None):
+        try:
+            user = self.current_user(pseudo, password)
+            if not user:
+                logging.error("Pseudo ou mot de passe incorrect")
+                return {"status" : "error"}
+
+            delta = self.user_service.sync_favorites(user.pseudo, since)
+            if delta is None:
+                return {"status" : "error"}
+
+            def films(liste):
+                return [
+                    {"titre" : film.titre, "realisateur" : film.realisateur}
+                    for film in liste
+                ]
+
+            return {
+                "status" : "ok",
+                "token" : delta["token"],
+                "full" : delta["full"],
+                "added" : films(delta["added"]),
+                "removed" : films(delta["removed"])
+            }
+        except Exception as e:
+            logging.error(f"Erreur lors de la synchronisation des favoris : {e}")
+            return {"status" : "error"}
+
+    def get_recommendations(self, pseudo, password, n=10):
+        try:
+            user = self.current_user(pseudo, password)
+            if not user:
+                logging.error("Pseudo ou mot de passe incorrect")
+                return {"status" : "error"}
+
+            recommandations = self.recommendation_service.precomputed(user.pseudo, n)
+            return {
+                "status" : "ok",
+                "films" : [
+                    {
+                        "titre" : film.titre,
+                        "realisateur" : film.realisateur,
+                        "score" : round(score, 4)
+                    }
+                    for film, score in recommandations
+                ]
+            }
+        except Exception as e:
+            logging.error(f"Erreur lors du calcul des recommandations : {e}")
+            return {"status" : "error"}
+
+    def similar_users(self, pseudo, password, n=10):
+        try:
+            user = self.current_user(pseudo, password)
+            if not user:
+                logging.error("Pseudo ou mot de passe incorrect")
+                return {"status" : "error"}
+
+            voisins = self.recommendation_service.similar_users(user.pseudo, n)
+            return {
+                "status" : "ok",
+                "utilisateurs" : [
+                    {"pseudo" : voisin, "score" : round(score, 4)}
+                    for voisin, score in voisins
+                ]
+            }
+        except Exception as e:
+            logging.error(f"Erreur lors de la recherche d'utilisateurs proches : {e}")
+            return {"status" : "error"}
+
+    def neighbour_films(self, pseudo, password, n=10):
+        try:
+            user = self.current_user(pseudo, password)
+            if not user:
+                logging.error("Pseudo ou mot de passe incorrect")
+                return {"status" : "error"}
+
+            recommandations = self.recommendation_service.neighbour_films(user.pseudo, n)
+            return {
+                "status" : "ok",
+                "films" : [
+                    {
+                        "titre" : film.titre,
+                        "realisateur" : film.realisateur,
+                        "score" : round(score, 4)
+                    }
+                    for film, score in recommandations
+                ]
+            }
+        except Exception as e:
+            logging.error(f"Erreur lors du calcul des films des voisins : {e}")
+            return {"status" : "error"}
@@ -149,3 +149,39 @@ class ActorDAO:
             return None
 
         return [Film(row[1], row[2], row[3], row[4]) for row in rows] if rows else None
+
+    @log
+    def find_id(self, actor: Actor) -> int | None:
+        """
+        Retourne l'id d'un acteur à partir de son nom et prénom, en une
+        requête (None s'il n'existe pas).
+        """
+        mark = self.dao.placeholder()
+        try:
+            with self.dao.transaction() as cursor:
+                cursor.execute(
+                    f"SELECT id_actor FROM ACTOR WHERE nom = {mark} AND prenom = {mark};",
+                    (actor.nom, actor.prenom),
+                )
+                row = cursor.fetchone()
+        except Exception as e:
+            logging.error(f"Erreur lors de la récupération de l'id : {e}")
+            return None
+        return row[0] if row else None
+
+    @log
+    def get_actors_by_id(self, ids: list[int]) -> dict[int, Actor]:
+        """Retourne les acteurs dont l'id_actor est dans `ids`, indexés par id."""
+        if not ids:
+            return {}
+        try:
+            rows = self.dao.select_query(
+                "ACTOR",
+                "id_actor, nom, prenom",
+                where=f"id_actor IN ({', '.join(str(int(i)) for i in ids)})",
+                multiple=True,
+            )
+        except Exception as e:
+            logging.error(f"Erreur lors de la récupération des acteurs : {e}")
+            return {}
+        return {row[0]: Actor(row[1], row[2]) for row in rows or []}
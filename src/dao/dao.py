@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 import os
 
 from dotenv import load_dotenv
@@ -12,7 +13,7 @@ class DAO:
         Crée la BD si elle n'est pas créée
         """
         self.init_db = InitDB()
-        self.ordre_suppr_tables = ["FAVORIS", "CASTING", "ACTOR", "FILM", "USERS"]
+        self.ordre_suppr_tables = ["RECOMMENDATIONS", "FAVORIS_LOG", "FAVORIS", "CASTING", "ACTOR", "FILM", "USERS"]
         # Ordre logique de suppression pour respecter les contraintes FK
 
         if self.postgres():
@@ -78,6 +79,45 @@ class DAO:
                 connection.commit()
 
 
+    def placeholder(self) -> str:
+        """Marqueur de paramètre du pilote courant : %s (psycopg2) ou ? (sqlite3)."""
+        return "%s" if self.postgres() else "?"
+
+    @contextmanager
+    def transaction(self):
+        """
+        Ouvre une transaction et fournit son curseur.
+        Validée à la sortie du bloc, annulée si une exception est levée.
+        Sous PostgreSQL, elle a sa propre connexion (DBConnection.dedicated) :
+        l'annulation ne touche pas le travail des autres threads.
+        """
+        if self.postgres():
+            with DBConnection().dedicated() as connection:
+                try:
+                    with connection.cursor() as cursor:
+                        yield cursor
+                    connection.commit()
+                except BaseException:
+                    connection.rollback()
+                    raise
+        else:
+            with LocalDBConnection().get_connection() as connection:
+                yield connection.cursor()
+
+    def insert_many(self, cursor, tablename, vars, rows, other=None):
+        """
+        Insère plusieurs lignes en une seule instruction préparée (executemany)
+        dans la transaction du curseur donné.
+        """
+        if not rows:
+            return
+        marks = ", ".join([self.placeholder()] * len(rows[0]))
+        query = f"INSERT INTO {tablename} ({vars}) VALUES ({marks})"
+        if other:
+            query += f" {other}"
+        query += ";"
+        cursor.executemany(query, rows)
+
     def update_query(self, tablename, var, value, where=None, other=None):
         query = f"UPDATE {tablename} SET {var} = {value}"
         if where:
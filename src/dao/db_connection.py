@@ -1,6 +1,7 @@
 from contextlib import contextmanager
 import os
 import sqlite3
+import threading
 
 from dotenv import load_dotenv
 import psycopg2
@@ -33,12 +34,22 @@ class LocalDBConnection(metaclass=Singleton):
 class DBConnection(metaclass=Singleton):
     """
     Classe de connexion à la base de données PostgreSQL
-    (Singleton : une seule connexion)
+    (Singleton : une connexion partagée pour les requêtes simples, et des
+    connexions réservées aux transactions)
     """
 
+    # connexions de transaction gardées ouvertes entre deux utilisations
+    MAX_IDLE = 8
+
     def __init__(self):
         load_dotenv(override=True)
-        self.__connection = psycopg2.connect(
+        self.__connection = self._connect()
+        self._idle = []
+        self._idle_lock = threading.Lock()
+
+    @staticmethod
+    def _connect():
+        return psycopg2.connect(
             host=os.environ["POSTGRES_HOST"],
             port=os.environ["POSTGRES_PORT"],
             database=os.environ["POSTGRES_DATABASE"],
@@ -49,3 +60,26 @@ class DBConnection(metaclass=Singleton):
     @property
     def connection(self):
         return self.__connection
+
+    @contextmanager
+    def dedicated(self):
+        """
+        Connexion réservée au bloc : une transaction n'est ni validée ni
+        annulée par les requêtes des autres threads. Le bloc doit la laisser
+        sans transaction ouverte (commit ou rollback) ; elle est ensuite
+        gardée pour une prochaine transaction.
+        """
+        with self._idle_lock:
+            connection = self._idle.pop() if self._idle else None
+        if connection is None or connection.closed:
+            connection = self._connect()
+        try:
+            yield connection
+        finally:
+            if not connection.closed:
+                with self._idle_lock:
+                    if len(self._idle) < self.MAX_IDLE:
+                        self._idle.append(connection)
+                        connection = None
+                if connection is not None:
+                    connection.close()
@@ -11,11 +11,39 @@ class FilmDAO:
     """
     Cette classe permet d'intéragir essentiellement avec la table film de la base de
     données. Dispose de méthodes pour ajouter et retourner des films selon des filtres.
+
+    Les objets inscrits avec subscribe() sont prévenus de chaque film ajouté
+    (film_added(id_film, film)) et de chaque casting ajouté
+    (casting_added(id_film, ids des acteurs)), s'ils ont la méthode
+    correspondante, pour tenir à jour les index en mémoire du processus.
     """
+    _listeners: list = []
+
     def __init__(self):
         self.dao = DAO()
         self.actor_dao = ActorDAO()
 
+    @classmethod
+    def subscribe(cls, listener):
+        """Inscrit un objet à prévenir des ajouts de films et de castings."""
+        if listener not in cls._listeners:
+            cls._listeners.append(listener)
+
+    @classmethod
+    def unsubscribe(cls, listener):
+        if listener in cls._listeners:
+            cls._listeners.remove(listener)
+
+    def _notify(self, event: str, *args):
+        for listener in FilmDAO._listeners:
+            callback = getattr(listener, event, None)
+            if callback is None:
+                continue
+            try:
+                callback(*args)
+            except Exception as e:
+                logging.error(f"Erreur lors de la notification {event} : {e}")
+
     @log
     def exists(self, film: Film) -> bool:
         """
@@ -82,11 +110,147 @@ class FilmDAO:
                 "titre, realisateur, annee, genre",
                 f"'{film.titre}', '{film.realisateur}', '{film.annee}', '{film.genre}'",
             )
+            if FilmDAO._listeners:
+                self._notify("film_added", self.get_id(film), film)
 
         except Exception as e:
             logging.error(f"Erreur lors de l'insertion du film : {e}")
             return False
 
+    @log
+    def upsert_film(self, film: Film) -> int | None:
+        """
+        Insère le film s'il n'existe pas encore et retourne son id.
+        Coût constant : une insertion avec garde de conflit puis une lecture
+        sur l'index unique (titre, realisateur).
+        """
+        try:
+            self.dao.insert_query(
+                "FILM",
+                "titre, realisateur, annee, genre",
+                f"'{film.titre}', '{film.realisateur}', '{film.annee}', '{film.genre}'",
+                other="ON CONFLICT (titre, realisateur) DO NOTHING",
+            )
+            res = self.dao.select_query(
+                "FILM",
+                "id_film",
+                where=f"titre = '{film.titre}' AND realisateur = '{film.realisateur}'",
+            )
+            if res:
+                self._notify("film_added", res[0], film)
+            return res[0] if res else None
+
+        except Exception as e:
+            logging.error(f"Erreur lors de l'insertion du film : {e}")
+            return None
+
+    @log
+    def upsert_films(self, films: list[Film], cursor) -> list[int | None]:
+        """
+        Version par lot de upsert_film(), dans la transaction du curseur donné :
+        une insertion groupée avec garde de conflit puis une lecture par film
+        sur l'index unique (titre, realisateur).
+
+        Retour
+        ------
+        list[int | None]
+            Les id des films, dans l'ordre de la liste reçue
+        """
+        rows = [(f.titre, str(f.realisateur), f.annee, f.genre) for f in films]
+        self.dao.insert_many(
+            cursor,
+            "FILM",
+            "titre, realisateur, annee, genre",
+            rows,
+            other="ON CONFLICT (titre, realisateur) DO NOTHING",
+        )
+
+        mark = self.dao.placeholder()
+        ids = []
+        for titre, realisateur, _, _ in rows:
+            cursor.execute(
+                f"SELECT id_film FROM FILM WHERE titre = {mark} AND realisateur = {mark};",
+                (titre, realisateur),
+            )
+            res = cursor.fetchone()
+            ids.append(res[0] if res else None)
+        for id_film, film in zip(ids, films, strict=True):
+            if id_film is not None:
+                self._notify("film_added", id_film, film)
+        return ids
+
+    @staticmethod
+    def _actor(member) -> Actor | None:
+        """Acteur d'un casting : Actor, ou nom TMDB « Prénom Nom » (prénom = premier mot)."""
+        if isinstance(member, Actor):
+            return member
+        prenom, _, nom = str(member or "").strip().partition(" ")
+        return Actor(nom, prenom) if prenom else None
+
+    @log
+    def upsert_casting(self, ids: list[int | None], films: list[Film], cursor):
+        """
+        Enregistre le casting des films donnés (acteurs et lignes CASTING
+        manquants), dans la transaction du curseur donné : une insertion
+        groupée des acteurs, une lecture par acteur et par film, une
+        insertion groupée des rôles.
+
+        Paramètres
+        ----------
+        ids : list[int | None]
+            id_film de chaque film (films sans id ignorés)
+        films : list[Film]
+            Films dont l'attribut casting (Actor ou « Prénom Nom ») est lu
+        """
+        castings = {}
+        for id_film, film in zip(ids, films, strict=True):
+            if id_film is None or not film.casting:
+                continue
+            actors = [self._actor(member) for member in film.casting]
+            castings.setdefault(id_film, {}).update(
+                {(a.nom, a.prenom): a for a in actors if a is not None}
+            )
+        names = list(dict.fromkeys(key for c in castings.values() for key in c))
+        if not names:
+            return
+        self.dao.insert_many(
+            cursor,
+            "ACTOR",
+            "nom, prenom",
+            names,
+            other="ON CONFLICT (nom, prenom) DO NOTHING",
+        )
+
+        mark = self.dao.placeholder()
+        actor_ids = {}
+        for nom, prenom in names:
+            cursor.execute(
+                f"SELECT id_actor FROM ACTOR WHERE nom = {mark} AND prenom = {mark};",
+                (nom, prenom),
+            )
+            res = cursor.fetchone()
+            if res:
+                actor_ids[(nom, prenom)] = res[0]
+
+        added = {}
+        for id_film, casting in castings.items():
+            cursor.execute(
+                f"SELECT id_actor FROM CASTING WHERE id_film = {mark};", (id_film,)
+            )
+            known = {row[0] for row in cursor.fetchall()}
+            new = [actor_ids[k] for k in casting if k in actor_ids]
+            added[id_film] = [i for i in dict.fromkeys(new) if i not in known]
+        self.dao.insert_many(
+            cursor,
+            "CASTING",
+            "id_film, id_actor",
+            [(id_film, i) for id_film, actors in added.items() for i in actors],
+            other="ON CONFLICT (id_film, id_actor) DO NOTHING",
+        )
+        for id_film, actors in added.items():
+            if actors:
+                self._notify("casting_added", id_film, actors)
+
     @log
     def add_casting(self, film: Film) -> bool:
         """
@@ -97,6 +261,7 @@ class FilmDAO:
 
             # Ajout des acteurs si non présents dans la BDD et récupération des id
             if film.casting:
+                added = []
                 for actor in film.casting:
                     # N'ajoute l'acteur que s'il n'est pas déjà dans la BDD
                     if not self.actor_dao.exists(actor):
@@ -104,17 +269,22 @@ class FilmDAO:
                     id_actor = self.actor_dao.get_id(actor)
 
                     # vérification que l'association n'existe pas déjà
-                    if self.dao.select_query(
-                        "CASTING",
-                        "1",
-                        where=f"id_film = '{id_film}' AND id_actor = '{id_actor}'",
-                    ) is None:
-
+                    if (
+                        self.dao.select_query(
+                            "CASTING",
+                            "1",
+                            where=f"id_film = '{id_film}' AND id_actor = '{id_actor}'",
+                        )
+                        is None
+                    ):
                         # Insertion dans la table d'association
                         self.dao.insert_query(
                             "CASTING", "id_film, id_actor", f"{id_film}, {id_actor}"
                         )
+                        added.append(id_actor)
 
+                if added:
+                    self._notify("casting_added", id_film, added)
                 return True
 
             else:
@@ -168,6 +338,56 @@ class FilmDAO:
                 )
         return films
 
+    @log
+    def get_films_by_id(self, ids: list[int] | None = None) -> dict[int, Film]:
+        """
+        Retourne tous les films de la base (ou ceux dont l'id_film est dans
+        `ids`) indexés par id_film, en une requête.
+        """
+        where = None
+        if ids is not None:
+            if not ids:
+                return {}
+            where = f"id_film IN ({', '.join(str(int(i)) for i in ids)})"
+        try:
+            rows = self.dao.select_query(
+                "FILM",
+                "id_film, titre, realisateur, annee, genre",
+                where=where,
+                multiple=True,
+            )
+        except Exception as e:
+            logging.error(f"Erreur lors de la lecture des films : {e}")
+            return {}
+        return {
+            row[0]: Film(titre=row[1], realisateur=row[2], annee=row[3], genre=row[4])
+            for row in rows or []
+        }
+
+    @log
+    def get_casting_pairs(self, ids: list[int] | None = None) -> list[tuple[int, int]]:
+        """
+        Retourne tous les couples (id_film, id_actor) de CASTING (ou ceux des
+        films dont l'id_film est dans `ids`), en une requête.
+        """
+        where = None
+        if ids is not None:
+            if not ids:
+                return []
+            where = f"id_film IN ({', '.join(str(int(i)) for i in ids)})"
+        try:
+            rows = self.dao.select_query(
+                "CASTING",
+                "id_film, id_actor",
+                where=where,
+                other="ORDER BY id_film",
+                multiple=True,
+            )
+        except Exception as e:
+            logging.error(f"Erreur lors de la lecture du casting : {e}")
+            return []
+        return [(row[0], row[1]) for row in rows or []]
+
     @log
     def get_casting(self, film: Film) -> list[Actor]:
         try:
@@ -0,0 +1,97 @@
+from collections.abc import Iterable
+import logging
+import time
+
+from src.business_object.film import Film
+from src.dao.dao import DAO
+from src.utils.log_decorator import log
+
+
+COLUMNS = "id_user, rang, id_film, score"
+
+
+class RecommendationDAO:
+    """
+    Classe d'accès aux données pour la table 'RECOMMENDATIONS' : les n
+    meilleures recommandations de chaque utilisateur, précalculées par
+    src/service/recommendation_batch.py.
+
+    La table est remplacée d'un bloc à chaque calcul : les lignes sont
+    écrites dans RECOMMENDATIONS_NEW, puis les deux tables sont échangées
+    dans une même transaction. Les lectures voient donc l'ancien ou le
+    nouveau calcul, jamais un mélange des deux.
+    """
+
+    def __init__(self):
+        self.dao = DAO()
+
+    @log
+    def get_for_user(self, pseudo: str, n: int = 10) -> list[tuple[Film, float]]:
+        """
+        Recommandations précalculées d'un utilisateur, de la meilleure à la
+        moins bonne, en une lecture sur la clé primaire (id_user, rang).
+        """
+        mark = self.dao.placeholder()
+        try:
+            with self.dao.transaction() as cursor:
+                cursor.execute(
+                    "SELECT f.titre, f.realisateur, f.annee, f.genre, r.score "
+                    "FROM RECOMMENDATIONS r "
+                    "JOIN USERS u ON u.id_user = r.id_user "
+                    "JOIN FILM f ON f.id_film = r.id_film "
+                    f"WHERE u.pseudo = {mark} ORDER BY r.rang LIMIT {mark};",
+                    (pseudo, n),
+                )
+                rows = cursor.fetchall()
+        except Exception as e:
+            logging.error(f"Erreur lors de la lecture des recommandations : {e}")
+            return []
+        return [
+            (Film(titre=row[0], realisateur=row[1], annee=row[2], genre=row[3]), row[4])
+            for row in rows
+        ]
+
+    @log
+    def replace_all(self, batches: Iterable[list[tuple]]) -> bool:
+        """
+        Remplace toutes les recommandations.
+
+        Paramètres
+        ----------
+        batches : Iterable[list[tuple]]
+            Lots de lignes (id_user, rang, id_film, score), chacun inséré en
+            une instruction préparée et validé séparément.
+
+        Retour
+        ------
+        bool
+            True si la nouvelle table est en service.
+        """
+        # nom de contrainte propre à chaque calcul : sous PostgreSQL, l'index
+        # de clé primaire garde son nom quand la table est renommée
+        generation = time.time_ns()
+        try:
+            with self.dao.transaction() as cursor:
+                cursor.execute("DROP TABLE IF EXISTS RECOMMENDATIONS_NEW;")
+                cursor.execute(
+                    "CREATE TABLE RECOMMENDATIONS_NEW ("
+                    "id_user INT NOT NULL, rang INT NOT NULL, "
+                    "id_film INT NOT NULL, score REAL NOT NULL, "
+                    f"CONSTRAINT pk_recommendations_{generation} "
+                    "PRIMARY KEY (id_user, rang));"
+                )
+            for rows in batches:
+                with self.dao.transaction() as cursor:
+                    self.dao.insert_many(cursor, "RECOMMENDATIONS_NEW", COLUMNS, rows)
+            with self.dao.transaction() as cursor:
+                if not self.dao.postgres():
+                    # sqlite3 n'ouvre pas de transaction avant un DROP / ALTER
+                    cursor.execute("BEGIN;")
+                cursor.execute("DROP TABLE IF EXISTS RECOMMENDATIONS;")
+                cursor.execute(
+                    "ALTER TABLE RECOMMENDATIONS_NEW RENAME TO RECOMMENDATIONS;"
+                )
+            return True
+        except Exception as e:
+            logging.error(f"Erreur lors de l'écriture des recommandations : {e}")
+            return False
@@ -7,6 +7,9 @@ CREATE TABLE IF NOT EXISTS USERS (
   UNIQUE(pseudo, mdp)
   );
 
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_pseudo ON USERS (pseudo);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON USERS (email);
+
 CREATE TABLE IF NOT EXISTS FILM (
   id_film SERIAL PRIMARY KEY,
   titre VARCHAR(255) NOT NULL,
@@ -38,3 +41,21 @@ CREATE TABLE IF NOT EXISTS CASTING (
   FOREIGN KEY (id_film) REFERENCES FILM(id_film) ON DELETE CASCADE,
   FOREIGN KEY (id_actor) REFERENCES ACTOR(id_actor) ON DELETE CASCADE
   );
+
+CREATE TABLE IF NOT EXISTS FAVORIS_LOG (
+  id_change SERIAL PRIMARY KEY,
+  id_user INT NOT NULL,
+  id_film INT NOT NULL,
+  op VARCHAR(8) NOT NULL,
+  changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+  );
+
+CREATE INDEX IF NOT EXISTS idx_favoris_log_user ON FAVORIS_LOG (id_user, id_change);
+
+CREATE TABLE IF NOT EXISTS RECOMMENDATIONS (
+  id_user INT NOT NULL,
+  rang INT NOT NULL,
+  id_film INT NOT NULL,
+  score REAL NOT NULL,
+  PRIMARY KEY (id_user, rang)
+  );
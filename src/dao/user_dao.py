@@ -1,5 +1,9 @@
 import logging
+import sqlite3
 
+import psycopg2
+
+from src.app_errors.app_errors import UserAlreadyExistsError
 from src.business_object.admin import Admin
 from src.business_object.client import Client
 from src.business_object.film import Film
@@ -35,6 +39,8 @@ class UserDao:
     def create(self, user: User, role: str = "client") -> bool:
         """
         Insère un nouvel utilisateur dans la table 'users'.
+        Les index uniques sur pseudo et email garantissent l'unicité : une
+        violation de contrainte lève UserAlreadyExistsError.
         """
         try:
             self.dao.insert_query(
@@ -42,10 +48,41 @@ class UserDao:
                 f"'{user.pseudo}', '{user.email}', '{user.psswd}', '{role}'"
             )
             return True
+        except (sqlite3.IntegrityError, psycopg2.IntegrityError) as e:
+            message = f"Le pseudo '{user.pseudo}' ou le mail '{user.email}' est déjà utilisé."
+            raise UserAlreadyExistsError(message) from e
         except Exception as e:
             logging.error(f"Erreur lors de l'insertion de l'utilisateur : {e}")
             return False
 
+    @log
+    def pseudo_exists(self, pseudo: str) -> bool:
+        """
+        Vérifie si un pseudo est déjà utilisé (lecture sur l'index unique).
+        """
+        try:
+            res = self.dao.select_query(
+                "USERS", "1", where=f"pseudo = '{pseudo}'", other="LIMIT 1"
+            )
+            return res is not None
+        except Exception as e:
+            logging.error(f"Erreur lors de la recherche du pseudo : {e}")
+            return False
+
+    @log
+    def email_exists(self, email: str) -> bool:
+        """
+        Vérifie si un email est déjà utilisé (lecture sur l'index unique).
+        """
+        try:
+            res = self.dao.select_query(
+                "USERS", "1", where=f"email = '{email.lower()}'", other="LIMIT 1"
+            )
+            return res is not None
+        except Exception as e:
+            logging.error(f"Erreur lors de la recherche de l'email : {e}")
+            return False
+
     @log
     def add_favorites(self, user: User) -> bool:
         """
@@ -62,17 +99,10 @@ class UserDao:
                         self.film_dao.add_film(film)
                     id_film = self.film_dao.get_id(film)
 
-                    # vérification que l'association n'existe pas déjà
-                    if self.dao.select_query(
-                        "FAVORIS",
-                        "1",
-                        where=f"id_user = '{id_user}' AND id_film = '{id_film}'",
-                    ) is None:
-
-                        # Insertion dans la table d'association
-                        self.dao.insert_query(
-                            "FAVORIS", "id_user, id_film", f"{id_user}, {id_film}"
-                        )
+                    # Insertion dans la table d'association (doublons ignorés)
+                    with self.dao.transaction() as cursor:
+                        self.film_dao.upsert_casting([id_film], [film], cursor)
+                        self._insert_favorites(cursor, id_user, [id_film])
 
                 return True
 
@@ -83,6 +113,210 @@ class UserDao:
             logging.error(f"Erreur lors de l'ajout des favoris' : {e}")
             return None
 
+    @log
+    def add_favorite(self, id_user: int, film: Film) -> bool:
+        """
+        Ajoute un seul favori : le film est inséré s'il n'existe pas, avec
+        son casting, puis une ligne FAVORIS est ajoutée (ignorée si déjà
+        présente). Le coût ne dépend pas du nombre de favoris de l'utilisateur.
+        """
+        try:
+            id_film = self.film_dao.upsert_film(film)
+            if id_film is None:
+                return False
+
+            with self.dao.transaction() as cursor:
+                self.film_dao.upsert_casting([id_film], [film], cursor)
+                self._insert_favorites(cursor, id_user, [id_film])
+            return True
+
+        except Exception as e:
+            logging.error(f"Erreur lors de l'ajout du favori : {e}")
+            return False
+
+    @log
+    def add_favorites_batch(self, id_user: int, films: list[Film]) -> bool:
+        """
+        Ajoute plusieurs favoris en une seule transaction : films, castings et
+        lignes FAVORIS sont insérés par lots (doublons ignorés). En cas
+        d'erreur, rien n'est enregistré.
+
+        Paramètres
+        ----------
+        id_user : int
+            Identifiant de l'utilisateur
+        films : list[Film]
+            Films à ajouter aux favoris
+
+        Retour
+        ------
+        bool
+            True si tous les favoris ont été enregistrés, False sinon
+        """
+        if not films:
+            return True
+        try:
+            with self.dao.transaction() as cursor:
+                ids = self.film_dao.upsert_films(films, cursor)
+                if None in ids:
+                    raise ValueError("Film non enregistré")
+
+                self.film_dao.upsert_casting(ids, films, cursor)
+                self._insert_favorites(cursor, id_user, ids)
+            return True
+
+        except Exception as e:
+            logging.error(f"Erreur lors de l'ajout des favoris par lot : {e}")
+            return False
+
+    def _lock_log(self, cursor):
+        """
+        Sérialise les écritures de FAVORIS_LOG jusqu'à la fin de la
+        transaction (PostgreSQL). Un id_change SERIAL est attribué avant la
+        validation : sans verrou, un id plus petit pourrait être validé après
+        qu'un client a lu un id plus grand, et la synchronisation par
+        `id_change > since` le manquerait pour toujours. Les lectures ne sont
+        pas bloquées ; SQLite sérialise déjà les écritures.
+        """
+        if self.dao.postgres():
+            cursor.execute("LOCK TABLE FAVORIS_LOG IN SHARE ROW EXCLUSIVE MODE;")
+
+    def _insert_favorites(self, cursor, id_user: int, ids: list[int]):
+        """
+        Insère des lignes FAVORIS (doublons ignorés) dans la transaction du
+        curseur et journalise dans FAVORIS_LOG celles qui sont réellement neuves.
+        """
+        ids = list(dict.fromkeys(ids))
+        self._lock_log(cursor)
+        mark = self.dao.placeholder()
+        cursor.executemany(
+            "INSERT INTO FAVORIS_LOG (id_user, id_film, op) "
+            f"SELECT {mark}, {mark}, 'add' WHERE NOT EXISTS "
+            f"(SELECT 1 FROM FAVORIS WHERE id_user = {mark} AND id_film = {mark});",
+            [(id_user, id_film, id_user, id_film) for id_film in ids],
+        )
+        self.dao.insert_many(
+            cursor,
+            "FAVORIS",
+            "id_user, id_film",
+            [(id_user, id_film) for id_film in ids],
+            other="ON CONFLICT (id_user, id_film) DO NOTHING",
+        )
+
+    @log
+    def remove_favorite(self, id_user: int, titre: str) -> bool:
+        """
+        Retire des favoris d'un utilisateur le(s) film(s) portant ce titre
+        et journalise la suppression dans FAVORIS_LOG.
+
+        Retour
+        ------
+        bool
+            True si au moins un favori a été retiré, False sinon
+        """
+        try:
+            mark = self.dao.placeholder()
+            with self.dao.transaction() as cursor:
+                self._lock_log(cursor)
+                cursor.execute(
+                    "INSERT INTO FAVORIS_LOG (id_user, id_film, op) "
+                    "SELECT fav.id_user, fav.id_film, 'remove' FROM FAVORIS fav "
+                    "JOIN FILM f ON f.id_film = fav.id_film "
+                    f"WHERE fav.id_user = {mark} AND f.titre = {mark};",
+                    (id_user, titre),
+                )
+                cursor.execute(
+                    f"DELETE FROM FAVORIS WHERE id_user = {mark} AND id_film IN "
+                    f"(SELECT id_film FROM FILM WHERE titre = {mark});",
+                    (id_user, titre),
+                )
+                return cursor.rowcount > 0
+
+        except Exception as e:
+            logging.error(f"Erreur lors de la suppression du favori : {e}")
+            return False
+
+    @log
+    def last_favorites_change(self, id_user: int | None = None) -> int:
+        """
+        Retourne le dernier identifiant de FAVORIS_LOG (de l'utilisateur
+        donné, ou de toute la table), 0 si le journal est vide.
+        """
+        where = f"id_user = {id_user}" if id_user is not None else None
+        res = self.dao.select_query("FAVORIS_LOG", "MAX(id_change)", where=where)
+        return res[0] if res and res[0] is not None else 0
+
+    @log
+    def get_favorites_changes(
+        self, id_user: int, since: int
+    ) -> list[tuple[int, str, Film]] | None:
+        """
+        Retourne les changements de favoris d'un utilisateur postérieurs au
+        jeton `since`, dans l'ordre : (id_change, "add" | "remove", film).
+        Le coût dépend du nombre de changements, pas du nombre de favoris
+        (index sur (id_user, id_change)).
+        """
+        try:
+            rows = self.dao.select_query(
+                "FAVORIS_LOG l",
+                "l.id_change, l.op, f.titre, f.realisateur, f.annee, f.genre",
+                "FILM f ON f.id_film = l.id_film",
+                f"l.id_user = {id_user} AND l.id_change > {int(since)}",
+                "ORDER BY l.id_change ASC",
+                multiple=True,
+            )
+        except Exception as e:
+            logging.error(f"Erreur lors de la lecture du journal des favoris : {e}")
+            return None
+
+        return [
+            (row[0], row[1], Film(row[2], row[3], row[4], row[5])) for row in rows or []
+        ]
+
+    @log
+    def get_favorites_log(
+        self, since: int, limit: int = 10000
+    ) -> list[tuple[int, int, int, str]] | None:
+        """
+        Retourne les changements de favoris de tous les utilisateurs
+        postérieurs au jeton `since`, dans l'ordre et au plus `limit` :
+        (id_change, id_user, id_film, "add" | "remove").
+        """
+        try:
+            rows = self.dao.select_query(
+                "FAVORIS_LOG",
+                "id_change, id_user, id_film, op",
+                where=f"id_change > {int(since)}",
+                other=f"ORDER BY id_change ASC LIMIT {int(limit)}",
+                multiple=True,
+            )
+        except Exception as e:
+            logging.error(f"Erreur lors de la lecture du journal des favoris : {e}")
+            return None
+        return [(row[0], row[1], row[2], row[3]) for row in rows or []]
+
+    @log
+    def get_favorites_daily_counts(
+        self, since: str, until: int
+    ) -> list[tuple[int, str, str, int]]:
+        """
+        Nombre de changements de favoris par film, opération et jour, depuis
+        la date `since` ('AAAA-MM-JJ HH:MM:SS') et jusqu'au jeton `until`
+        inclus : (id_film, "add" | "remove", jour, nombre).
+        """
+        try:
+            rows = self.dao.select_query(
+                "FAVORIS_LOG",
+                "id_film, op, DATE(changed_at), COUNT(*)",
+                where=f"changed_at >= '{since}' AND id_change <= {int(until)}",
+                other="GROUP BY id_film, op, DATE(changed_at)",
+                multiple=True,
+            )
+        except Exception as e:
+            logging.error(f"Erreur lors de la lecture du journal des favoris : {e}")
+            return []
+        return [(row[0], row[1], str(row[2]), row[3]) for row in rows or []]
+
     @log
     def login(self, pseudo: str):
         """
@@ -150,7 +384,9 @@ class UserDao:
 
         """
         try:
-            self.dao.update_query("USERS", "mdp", f"{new_psswd}", f"pseudo = {pseudo}")
+            self.dao.update_query(
+                "USERS", "mdp", f"'{new_psswd}'", f"pseudo = '{pseudo}'"
+            )
             return True
         except Exception as e:
             logging.error(f"Erreur lors du changement de mot de passe : {e}")
@@ -210,6 +446,82 @@ class UserDao:
 
         return [Film(row[1], row[2], row[3], row[4]) for row in rows] if rows else None
 
+    @log
+    def get_favorites_by_pseudo(self, pseudo: str) -> list[Film] | None:
+        """
+        Récupère les films favoris d'un utilisateur en une seule requête
+        (jointure USERS / FAVORIS / FILM), sans relire l'utilisateur.
+
+        Retour
+        ------
+        list[Film] | None
+            Les favoris triés par titre (liste vide s'il n'y en a pas),
+            None en cas d'erreur
+        """
+        try:
+            rows = self.dao.select_query(
+                "FILM f",
+                "f.id_film, f.titre, f.realisateur, f.annee, f.genre",
+                "FAVORIS fav ON fav.id_film = f.id_film "
+                "JOIN USERS u ON u.id_user = fav.id_user",
+                f"u.pseudo = '{pseudo}'",
+                "ORDER BY f.titre ASC",
+                multiple=True,
+            )
+        except Exception as e:
+            logging.error(f"Erreur lors de la récupération des films : {e}")
+            return None
+
+        return [Film(row[1], row[2], row[3], row[4]) for row in rows or []]
+
+    @log
+    def get_favorites_pairs(self) -> list[tuple[int, int]]:
+        """
+        Retourne tous les couples (id_user, id_film) de FAVORIS, pour
+        construire les modèles de recommandation.
+        """
+        try:
+            rows = self.dao.select_query("FAVORIS", "id_user, id_film", multiple=True)
+        except Exception as e:
+            logging.error(f"Erreur lors de la lecture des favoris : {e}")
+            return []
+        return [(row[0], row[1]) for row in rows or []]
+
+    @log
+    def get_favorites_counts(self) -> list[tuple[int, int]]:
+        """Nombre d'utilisateurs ayant chaque film en favori : (id_film, nombre)."""
+        try:
+            rows = self.dao.select_query(
+                "FAVORIS",
+                "id_film, COUNT(*)",
+                other="GROUP BY id_film",
+                multiple=True,
+            )
+        except Exception as e:
+            logging.error(f"Erreur lors de la lecture des favoris : {e}")
+            return []
+        return [(row[0], row[1]) for row in rows or []]
+
+    @log
+    def get_user_ids(self, ids: list[int] | None = None) -> dict[str, int]:
+        """
+        Retourne la table pseudo -> id_user de tous les utilisateurs, ou
+        seulement de ceux dont l'id_user est dans `ids`.
+        """
+        where = None
+        if ids is not None:
+            if not ids:
+                return {}
+            where = f"id_user IN ({', '.join(str(int(i)) for i in ids)})"
+        try:
+            rows = self.dao.select_query(
+                "USERS", "pseudo, id_user", where=where, multiple=True
+            )
+        except Exception as e:
+            logging.error(f"Erreur lors de la lecture des utilisateurs : {e}")
+            return {}
+        return {row[0]: row[1] for row in rows or []}
+
     @log
     def get_all_users(self) -> list[User]:
         """
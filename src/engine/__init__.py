@@ -0,0 +1,18 @@
+"""
+Moteurs de calcul en mémoire (NumPy / SciPy) : ils ne lisent pas la base
+eux-mêmes, les services leur fournissent des tableaux d'identifiants.
+"""
+
+from .als import ImplicitALS
+from .content_similarity import ContentSimilarity, film_features
+from .item_similarity import ItemSimilarity
+from .user_similarity import UserSimilarity
+
+
+__all__ = [
+    "ContentSimilarity",
+    "ImplicitALS",
+    "ItemSimilarity",
+    "UserSimilarity",
+    "film_features",
+]
@@ -0,0 +1,343 @@
+import json
+import mmap
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+
+# Tableaux partagés avec les processus de calcul pendant ImplicitALS.fit :
+# matrices creuses (héritées par fork) et facteurs en mémoire partagée,
+# écrits en place par chaque processus.
+_shared: dict = {}
+
+
+def _shared_array(shape: tuple[int, int], dtype=np.float32) -> np.ndarray:
+    """
+    Tableau en mémoire partagée anonyme : les écritures des processus créés
+    ensuite par fork sont visibles du processus parent.
+    """
+    count = shape[0] * shape[1]
+    buffer = mmap.mmap(-1, max(count * np.dtype(dtype).itemsize, 1))
+    return np.frombuffer(buffer, dtype=dtype, count=count).reshape(shape)
+
+
+def _row_blocks(indptr: np.ndarray, block_nnz: int) -> list[tuple[int, int]]:
+    """Découpe les lignes d'une matrice CSR en blocs d'environ block_nnz valeurs."""
+    n_rows = indptr.size - 1
+    bounds = np.searchsorted(indptr, np.arange(0, indptr[-1], block_nnz), "right") - 1
+    bounds = np.unique(np.concatenate([[0], bounds, [n_rows]]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist(), strict=True))
+
+
+def conjugate_gradient(
+    weights: sp.csr_matrix,
+    x: np.ndarray,
+    others: np.ndarray,
+    gram: np.ndarray,
+    steps: int,
+):
+    """
+    Quelques itérations de gradient conjugué pour un bloc de lignes, toutes
+    résolues ensemble (écrit dans x, en place).
+
+    Pour chaque ligne u, résout (YᵀY + λI + Yᵀ(Cᵤ - I)Y) xᵤ = YᵀCᵤ1, avec
+    Y = others, YᵀY + λI = gram et Cᵤ - I = diag(weights[u]).
+
+    Paramètres
+    ----------
+    weights : sp.csr_matrix
+        Confiance supplémentaire alpha * valeur des interactions du bloc.
+    x : np.ndarray
+        Facteurs courants du bloc (point de départ), (lignes, f).
+    others : np.ndarray
+        Facteurs de l'autre côté, (colonnes, f).
+    gram : np.ndarray
+        YᵀY + λI, (f, f).
+    steps : int
+        Nombre d'itérations.
+    """
+    rows = np.repeat(np.arange(weights.shape[0]), np.diff(weights.indptr))
+    gathered = others[weights.indices]
+
+    def apply(p):
+        dots = np.einsum("ij,ij->i", p[rows], gathered) * weights.data
+        spread = sp.csr_matrix(
+            (dots, weights.indices, weights.indptr), shape=weights.shape
+        )
+        return p @ gram + spread @ others
+
+    target = sp.csr_matrix(
+        (weights.data + 1, weights.indices, weights.indptr), shape=weights.shape
+    )
+    residual = target @ others - apply(x)
+    direction = residual.copy()
+    norms = np.einsum("ij,ij->i", residual, residual)
+    for _ in range(steps):
+        product = apply(direction)
+        curvature = np.einsum("ij,ij->i", direction, product)
+        step = np.divide(
+            norms, curvature, out=np.zeros_like(norms), where=curvature > 0
+        )
+        x += step[:, None] * direction
+        residual -= step[:, None] * product
+        new_norms = np.einsum("ij,ij->i", residual, residual)
+        beta = np.divide(
+            new_norms, norms, out=np.zeros_like(norms), where=norms > 1e-20
+        )
+        direction = residual + beta[:, None] * direction
+        norms = new_norms
+
+
+def _solve_block(side: str, start: int, stop: int, gram: np.ndarray):
+    """Met à jour les facteurs des lignes start..stop d'un côté ("users" / "items")."""
+    other = "items" if side == "users" else "users"
+    factors = _shared["factors"][side]
+    conjugate_gradient(
+        _shared["weights"][side][start:stop],
+        factors[start:stop],
+        _shared["factors"][other],
+        gram,
+        _shared["cg_steps"],
+    )
+
+
+class ImplicitALS:
+    """
+    Factorisation de la matrice utilisateurs × films des favoris (retours
+    implicites, Hu, Koren et Volinsky 2008) par moindres carrés alternés.
+
+    Chaque demi-itération fixe les facteurs d'un côté et résout les systèmes
+    linéaires de l'autre par quelques pas de gradient conjugué, vectorisés
+    sur des blocs de lignes. Les blocs sont répartis entre `workers`
+    processus qui écrivent les facteurs en mémoire partagée.
+
+    Les facteurs sont des tableaux float32 : (utilisateurs + films) x
+    factors x 4 octets, sauvegardés sur disque et rechargés par mmap.
+
+    Attributs
+    ---------
+    user_ids, film_ids : np.ndarray
+        Identifiants triés des lignes de user_factors / item_factors.
+    user_factors, item_factors : np.ndarray
+        Facteurs appris, float32.
+    iteration_times : list[float]
+        Durée de chaque itération du dernier apprentissage, en secondes.
+    """
+
+    _ARRAYS = (
+        "user_ids",
+        "film_ids",
+        "user_factors",
+        "item_factors",
+        "liked_indptr",
+        "liked_indices",
+    )
+
+    def __init__(
+        self,
+        factors: int = 64,
+        regularization: float = 0.05,
+        alpha: float = 20.0,
+        iterations: int = 10,
+        cg_steps: int = 3,
+        workers: int = 0,
+        block_nnz: int = 100_000,
+        seed: int = 0,
+    ):
+        self.factors = factors
+        self.regularization = regularization
+        self.alpha = alpha
+        self.iterations = iterations
+        self.cg_steps = cg_steps
+        self.workers = workers
+        self.block_nnz = block_nnz
+        self.seed = seed
+        self.user_ids = np.empty(0, dtype=np.int64)
+        self.film_ids = np.empty(0, dtype=np.int64)
+        self.user_factors = np.empty((0, factors), dtype=np.float32)
+        self.item_factors = np.empty((0, factors), dtype=np.float32)
+        self.liked_indptr = np.zeros(1, dtype=np.int64)
+        self.liked_indices = np.empty(0, dtype=np.int32)
+        self.iteration_times: list[float] = []
+
+    # -----------------------------
+    # Apprentissage
+    # -----------------------------
+    def fit(self, users, films, values=None) -> "ImplicitALS":
+        """
+        Apprend les facteurs à partir des couples (id_user, id_film).
+
+        Paramètres
+        ----------
+        users : array-like d'entiers
+            id_user de chaque interaction
+        films : array-like d'entiers
+            id_film de chaque interaction
+        values : array-like de réels, optionnel
+            Intensité de chaque interaction (1 par défaut).
+        """
+        users = np.asarray(users, dtype=np.int64)
+        films = np.asarray(films, dtype=np.int64)
+        values = (
+            np.ones(users.size, dtype=np.float32)
+            if values is None
+            else np.asarray(values, dtype=np.float32)
+        )
+        self.user_ids, user_rows = np.unique(users, return_inverse=True)
+        self.film_ids, film_rows = np.unique(films, return_inverse=True)
+        shape = (self.user_ids.size, self.film_ids.size)
+        user_items = sp.csr_matrix(
+            (self.alpha * values, (user_rows, film_rows)), shape=shape
+        )
+        user_items.sum_duplicates()
+        self.liked_indptr = user_items.indptr.astype(np.int64)
+        self.liked_indices = user_items.indices.astype(np.int32)
+
+        rng = np.random.default_rng(self.seed)
+        factors = {}
+        for side, size in (("users", shape[0]), ("items", shape[1])):
+            factors[side] = _shared_array((size, self.factors))
+            factors[side][:] = rng.normal(0, 0.01, (size, self.factors))
+        weights = {"users": user_items, "items": user_items.T.tocsr()}
+        blocks = {
+            side: _row_blocks(matrix.indptr, self.block_nnz)
+            for side, matrix in weights.items()
+        }
+        _shared.update(factors=factors, weights=weights, cg_steps=self.cg_steps)
+
+        pool = None
+        if self.workers > 0:
+            pool = multiprocessing.get_context("fork").Pool(self.workers)
+        try:
+            self.iteration_times = []
+            for _ in range(self.iterations):
+                start = time.perf_counter()
+                for side, other in (("users", "items"), ("items", "users")):
+                    fixed = factors[other]
+                    gram = fixed.T @ fixed
+                    gram[np.diag_indices_from(gram)] += self.regularization
+                    tasks = [(side, a, b, gram) for a, b in blocks[side]]
+                    if pool is None:
+                        for task in tasks:
+                            _solve_block(*task)
+                    else:
+                        pool.starmap(_solve_block, tasks)
+                self.iteration_times.append(time.perf_counter() - start)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            _shared.clear()
+
+        self.user_factors = np.array(factors["users"])
+        self.item_factors = np.array(factors["items"])
+        return self
+
+    # -----------------------------
+    # Sauvegarde
+    # -----------------------------
+    def save(self, path: str):
+        """Écrit le modèle dans le dossier `path`, un .npy par tableau."""
+        os.makedirs(path, exist_ok=True)
+        for name in self._ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        meta = {
+            "factors": self.factors,
+            "regularization": self.regularization,
+            "alpha": self.alpha,
+            "iterations": self.iterations,
+            "cg_steps": self.cg_steps,
+        }
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "ImplicitALS":
+        """
+        Recharge un modèle sauvegardé. Avec mmap=True, les facteurs restent
+        sur disque et ne sont lus qu'à la demande (pages partagées entre
+        processus).
+        """
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            model = cls(**json.load(f))
+        for name in cls._ARRAYS:
+            setattr(
+                model,
+                name,
+                np.load(
+                    os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None
+                ),
+            )
+        return model
+
+    # -----------------------------
+    # Requêtes
+    # -----------------------------
+    def _user_rows(self, user_ids) -> np.ndarray:
+        """Ligne de chaque id_user dans user_factors, -1 s'il est inconnu."""
+        user_ids = np.asarray(user_ids, dtype=np.int64)
+        if self.user_ids.size == 0:
+            return np.full(user_ids.size, -1)
+        pos = np.minimum(
+            np.searchsorted(self.user_ids, user_ids), self.user_ids.size - 1
+        )
+        return np.where(self.user_ids[pos] == user_ids, pos, -1)
+
+    def recommend(
+        self, user_ids, n: int = 10, batch_size: int = 256
+    ) -> list[list[tuple[int, float]]]:
+        """
+        Les n films de meilleur score xᵤ·yᵢ de chaque utilisateur, favoris
+        exclus, calculés par produits matriciels de batch_size utilisateurs
+        à la fois (batch_size x films x 4 octets de mémoire).
+
+        Retour
+        ------
+        list[list[tuple[int, float]]]
+            Pour chaque id_user, dans l'ordre : [(id_film, score)], vide si
+            l'utilisateur est inconnu.
+        """
+        rows = self._user_rows(user_ids)
+        results = [[] for _ in range(rows.size)]
+        positions = np.flatnonzero(rows >= 0)
+        k = min(n, self.film_ids.size)
+        if k == 0:
+            return results
+        for chunk in range(0, positions.size, batch_size):
+            batch = positions[chunk : chunk + batch_size]
+            users = rows[batch]
+            scores = (
+                np.asarray(self.user_factors[users]) @ np.asarray(self.item_factors).T
+            )
+            starts, ends = self.liked_indptr[users], self.liked_indptr[users + 1]
+            lengths = ends - starts
+            liked = self.liked_indices[
+                np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+                + np.arange(lengths.sum())
+            ]
+            scores[np.repeat(np.arange(users.size), lengths), liked] = -np.inf
+
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            for position, films, film_scores in zip(
+                batch.tolist(), top, top_scores, strict=True
+            ):
+                keep = np.isfinite(film_scores)
+                results[position] = list(
+                    zip(
+                        self.film_ids[films[keep]].tolist(),
+                        film_scores[keep].tolist(),
+                        strict=True,
+                    )
+                )
+        return results
+
+    def recommend_user(self, user_id: int, n: int = 10) -> list[tuple[int, float]]:
+        """Les n films de meilleur score d'un utilisateur, favoris exclus."""
+        return self.recommend([user_id], n)[0]
@@ -0,0 +1,331 @@
+import json
+import os
+
+import numpy as np
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Normalise (L2) des vecteurs ligne, en float32 ; les vecteurs nuls restent nuls."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class LSHIndex:
+    """
+    Index de plus proches voisins approché (cosinus) par hachage sensible à
+    la localité : chaque table hache un vecteur par le signe de son produit
+    avec `n_bits` hyperplans aléatoires. Deux vecteurs proches ont de fortes
+    chances de tomber dans le même seau d'au moins une table ; seuls les
+    vecteurs de ces seaux sont comparés exactement.
+
+    Chaque table est un tableau de codes trié (un seau = un intervalle,
+    trouvé par recherche dichotomique) : l'index se sauvegarde en fichiers
+    .npy et se recharge en mémoire projetée (np.load(mmap_mode="r")).
+
+    Le compromis rappel / latence se règle à la requête par `n_probes` :
+    en plus du seau du vecteur, on visite dans chaque table les seaux
+    obtenus en inversant un à un ses n_probes bits les moins sûrs (produit
+    avec l'hyperplan le plus proche de zéro).
+
+    Les vecteurs insérés après la construction sont gardés à part et
+    comparés par leurs codes jusqu'à la prochaine compaction.
+
+    Attributs
+    ---------
+    dim : int
+        Dimension des vecteurs.
+    n_tables : int
+        Nombre de tables de hachage (plus de tables : meilleur rappel, plus
+        de mémoire).
+    n_bits : int
+        Bits par code (plus de bits : seaux plus petits, requêtes plus
+        rapides, rappel plus faible).
+    compact_every : int
+        Nombre d'insertions en attente déclenchant une compaction.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        n_tables: int = 8,
+        n_bits: int = 12,
+        seed: int = 0,
+        compact_every: int = 10_000,
+    ):
+        if not 0 < n_bits <= 31:
+            raise ValueError("n_bits doit être compris entre 1 et 31")
+        self.dim = dim
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.compact_every = compact_every
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((n_tables * n_bits, dim)).astype(np.float32)
+        self._set_base(
+            np.empty(0, dtype=np.int64),
+            np.empty((0, dim), dtype=np.float32),
+            np.empty((n_tables, 0), dtype=np.int32),
+            np.empty((n_tables, 0), dtype=np.uint32),
+        )
+
+    def _set_base(self, ids, vectors, order, sorted_codes):
+        self.ids = ids  # triés
+        self.vectors = vectors
+        self.order = order  # (n_tables, n) : positions triées par code
+        self.sorted_codes = sorted_codes  # (n_tables, n)
+        self.alive = np.ones(ids.size, dtype=bool)
+        # id -> position dans les tableaux en attente
+        self._pending: dict[int, int] = {}
+        self._pending_ids: list[int] = []
+        self._pending_vectors = np.empty((0, self.dim), dtype=np.float32)
+        self._pending_codes = np.empty((0, self.n_tables), dtype=np.uint32)
+
+    # -----------------------------
+    # Hachage
+    # -----------------------------
+    def _project(self, vectors: np.ndarray) -> np.ndarray:
+        """Produits avec les hyperplans : (n, n_tables, n_bits)."""
+        return (vectors @ self.planes.T).reshape(-1, self.n_tables, self.n_bits)
+
+    def _codes(self, projections: np.ndarray) -> np.ndarray:
+        weights = (1 << np.arange(self.n_bits, dtype=np.uint32)).astype(np.uint32)
+        return ((projections > 0) @ weights).astype(np.uint32)
+
+    # -----------------------------
+    # Construction
+    # -----------------------------
+    def build(self, ids, vectors, batch_size: int = 65_536) -> "LSHIndex":
+        """
+        Construit l'index. Les vecteurs sont normalisés (cosinus) et hachés
+        par lots pour borner la mémoire.
+
+        Paramètres
+        ----------
+        ids : array-like d'entiers
+            Identifiant de chaque vecteur (id_film), sans doublon
+        vectors : array-like (n, dim)
+            Vecteurs à indexer
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        by_id = np.argsort(ids, kind="stable")
+        ids = ids[by_id]
+        vectors = normalize(np.asarray(vectors, dtype=np.float32)[by_id])
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Vecteurs de dimension {vectors.shape[1]} != {self.dim}")
+
+        codes = np.empty((self.n_tables, ids.size), dtype=np.uint32)
+        for start in range(0, ids.size, batch_size):
+            block = vectors[start : start + batch_size]
+            codes[:, start : start + len(block)] = self._codes(self._project(block)).T
+        order = np.argsort(codes, axis=1, kind="stable").astype(np.int32)
+        self._set_base(ids, vectors, order, np.take_along_axis(codes, order, axis=1))
+        return self
+
+    def insert(self, film_id: int, vector):
+        """Ajoute (ou remplace) un vecteur, sans reconstruire les tables."""
+        self.remove(film_id)
+        vector = normalize(vector)
+        if vector.shape[1] != self.dim:
+            raise ValueError(f"Vecteur de dimension {vector.shape[1]} != {self.dim}")
+        pos = len(self._pending_ids)
+        if pos >= self._pending_vectors.shape[0]:
+            capacity = max(2 * pos, 16)
+            vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+            codes = np.zeros((capacity, self.n_tables), dtype=np.uint32)
+            vectors[:pos], codes[:pos] = self._pending_vectors, self._pending_codes
+            self._pending_vectors, self._pending_codes = vectors, codes
+        self._pending_vectors[pos] = vector[0]
+        self._pending_codes[pos] = self._codes(self._project(vector))[0]
+        self._pending[film_id] = pos
+        self._pending_ids.append(film_id)
+        if len(self._pending) >= self.compact_every:
+            self.compact()
+
+    def _base_position(self, film_id: int) -> int | None:
+        pos = np.searchsorted(self.ids, film_id)
+        if pos < self.ids.size and self.ids[pos] == film_id and self.alive[pos]:
+            return int(pos)
+        return None
+
+    def remove(self, film_id: int):
+        """Retire un vecteur de l'index."""
+        if self._pending.pop(film_id, None) is not None:
+            return
+        pos = self._base_position(film_id)
+        if pos is not None:
+            if not self.alive.flags.writeable:
+                self.alive = self.alive.copy()
+            self.alive[pos] = False
+
+    def compact(self):
+        """Réintègre les vecteurs en attente dans les tables triées."""
+        ids, vectors = self._items()
+        self.build(ids, vectors)
+
+    def _items(self) -> tuple[np.ndarray, np.ndarray]:
+        """Tous les (ids, vecteurs) vivants, base puis attente."""
+        keep = np.flatnonzero(self.alive)
+        pending = np.fromiter(
+            self._pending.values(), dtype=np.intp, count=len(self._pending)
+        )
+        ids = np.concatenate(
+            [self.ids[keep], np.asarray(self._pending_ids, dtype=np.int64)[pending]]
+        )
+        vectors = np.concatenate([self.vectors[keep], self._pending_vectors[pending]])
+        return ids, vectors
+
+    # -----------------------------
+    # Sauvegarde
+    # -----------------------------
+    _ARRAYS = ("planes", "ids", "vectors", "order", "sorted_codes", "alive")
+
+    def save(self, path: str):
+        """Écrit l'index (compacté) dans le dossier `path`, un .npy par tableau."""
+        if self._pending:
+            self.compact()
+        os.makedirs(path, exist_ok=True)
+        for name in self._ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        meta = {
+            "dim": self.dim,
+            "n_tables": self.n_tables,
+            "n_bits": self.n_bits,
+            "compact_every": self.compact_every,
+        }
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "LSHIndex":
+        """
+        Recharge un index sauvegardé. Avec mmap=True, les tableaux restent
+        sur disque et ne sont lus qu'à la demande (pages partagées entre
+        processus) ; les insertions vont dans les tableaux en attente.
+        """
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(
+            meta["dim"],
+            meta["n_tables"],
+            meta["n_bits"],
+            compact_every=meta["compact_every"],
+        )
+        arrays = {
+            name: np.load(
+                os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None
+            )
+            for name in cls._ARRAYS
+        }
+        index.planes = np.asarray(arrays.pop("planes"))
+        alive = arrays.pop("alive")
+        index._set_base(**arrays)
+        index.alive = alive
+        return index
+
+    # -----------------------------
+    # Requêtes
+    # -----------------------------
+    def __len__(self) -> int:
+        return int(self.alive.sum()) + len(self._pending)
+
+    def vector(self, film_id: int) -> np.ndarray | None:
+        """Vecteur (normalisé) d'un id, None s'il est inconnu."""
+        if film_id in self._pending:
+            return self._pending_vectors[self._pending[film_id]]
+        pos = self._base_position(film_id)
+        return None if pos is None else np.asarray(self.vectors[pos])
+
+    def _probe_codes(self, projections: np.ndarray, n_probes: int) -> np.ndarray:
+        """Codes visités par table : (n_tables, 1 + n_probes)."""
+        codes = self._codes(projections[None])[0]
+        n_probes = min(n_probes, self.n_bits)
+        flips = np.argsort(np.abs(projections), axis=1)[:, :n_probes]
+        probes = codes[:, None] ^ (np.uint32(1) << flips.astype(np.uint32))
+        return np.concatenate([codes[:, None], probes], axis=1)
+
+    def _candidates(self, probe_codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Positions (base, attente) des vecteurs des seaux visités."""
+        base = []
+        for table in range(self.n_tables):
+            codes = self.sorted_codes[table]
+            lo = np.searchsorted(codes, probe_codes[table], side="left")
+            hi = np.searchsorted(codes, probe_codes[table], side="right")
+            base += [
+                self.order[table][a:b] for a, b in zip(lo, hi, strict=True) if b > a
+            ]
+        base = np.unique(np.concatenate(base)) if base else np.empty(0, np.int32)
+        base = base[self.alive[base]]
+
+        pending = np.empty(0, dtype=np.intp)
+        if self._pending:
+            positions = np.fromiter(
+                self._pending.values(), dtype=np.intp, count=len(self._pending)
+            )
+            codes = self._pending_codes[positions]
+            hit = np.zeros(positions.size, dtype=bool)
+            for table in range(self.n_tables):
+                hit |= np.isin(codes[:, table], probe_codes[table])
+            pending = positions[hit]
+        return base, pending
+
+    def query(
+        self, vector, k: int = 10, n_probes: int = 2, exclude=()
+    ) -> list[tuple[int, float]]:
+        """
+        Les k vecteurs les plus proches (cosinus) parmi les seaux visités :
+        [(id, score)], par score décroissant.
+
+        Paramètres
+        ----------
+        n_probes : int
+            Seaux voisins visités par table en plus du seau du vecteur
+            (0 à n_bits) : plus de seaux, meilleur rappel, requête plus lente.
+        exclude : iterable d'id
+            Ids à ne pas retourner.
+        """
+        query = normalize(vector)[0]
+        base, pending = self._candidates(
+            self._probe_codes(self._project(query[None])[0], n_probes)
+        )
+        ids = np.concatenate(
+            [self.ids[base], np.asarray(self._pending_ids, dtype=np.int64)[pending]]
+        )
+        scores = np.concatenate(
+            [self.vectors[base] @ query, self._pending_vectors[pending] @ query]
+        )
+        return self._top(ids, scores, k, exclude)
+
+    def exact(self, vector, k: int = 10, exclude=()) -> list[tuple[int, float]]:
+        """Recherche exhaustive (référence pour mesurer le rappel)."""
+        query = normalize(vector)[0]
+        base = np.flatnonzero(self.alive)
+        pending = np.fromiter(
+            self._pending.values(), dtype=np.intp, count=len(self._pending)
+        )
+        ids = np.concatenate(
+            [self.ids[base], np.asarray(self._pending_ids, dtype=np.int64)[pending]]
+        )
+        scores = self.vectors @ query
+        scores = np.concatenate([scores[base], self._pending_vectors[pending] @ query])
+        return self._top(ids, scores, k, exclude)
+
+    def similar(
+        self, film_id: int, k: int = 10, n_probes: int = 2
+    ) -> list[tuple[int, float]]:
+        """Les k films les plus proches d'un film indexé ([] s'il est inconnu)."""
+        vector = self.vector(film_id)
+        if vector is None:
+            return []
+        return self.query(vector, k, n_probes, exclude=(film_id,))
+
+    @staticmethod
+    def _top(ids, scores, k, exclude) -> list[tuple[int, float]]:
+        keep = ~np.isin(ids, np.fromiter(exclude, dtype=np.int64))
+        ids, scores = ids[keep], scores[keep]
+        k = min(k, ids.size)
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return list(zip(ids[best].tolist(), scores[best].tolist(), strict=True))
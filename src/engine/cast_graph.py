@@ -0,0 +1,293 @@
+import numpy as np
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, nodes: np.ndarray):
+    """
+    Voisins d'un ensemble de nœuds d'un graphe CSR, en une opération.
+
+    Retour
+    ------
+    tuple[np.ndarray, np.ndarray]
+        (voisins, nœud d'origine de chaque voisin)
+    """
+    starts, ends = indptr[nodes], indptr[nodes + 1]
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=indices.dtype), np.empty(0, dtype=nodes.dtype)
+    # positions starts[i] .. ends[i] - 1 de chaque nœud, concaténées
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return indices[offsets + np.arange(total)], np.repeat(nodes, lengths)
+
+
+class CastGraph:
+    """
+    Graphe biparti acteurs – films construit à partir de CASTING.
+
+    Acteurs et films sont numérotés dans un même espace de nœuds (acteurs
+    d'abord, puis films) et le graphe est stocké en CSR : `indptr` et
+    `indices` sont deux tableaux d'entiers, 8 octets par couple (film,
+    acteur) et 4 octets par nœud, sans objet Python par nœud.
+
+    Deux acteurs sont à un degré de séparation s'ils ont joué dans un même
+    film ; les chemins les plus courts sont trouvés par un parcours en
+    largeur bidirectionnel, niveau par niveau, vectorisé avec NumPy.
+
+    Les rôles ajoutés après la construction (add) ne reconstruisent pas le
+    CSR : ils sont gardés à part (nœuds numérotés après ceux du CSR, listes
+    d'adjacence) et lus avec lui, jusqu'au prochain fit.
+
+    Attributs
+    ---------
+    actor_ids : np.ndarray
+        id_actor des acteurs, triés (nœuds 0 .. n_actors - 1).
+    film_ids : np.ndarray
+        id_film des films, triés (nœuds n_actors .. nombre de nœuds du CSR - 1).
+    pending_roles : int
+        Nombre de couples (film, acteur) ajoutés depuis la construction.
+    """
+
+    def __init__(self):
+        self.actor_ids = np.empty(0, dtype=np.int64)
+        self.film_ids = np.empty(0, dtype=np.int64)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.empty(0, dtype=np.int32)
+        self._reset_pending()
+
+    def _reset_pending(self):
+        self._n_base = self.indptr.size - 1
+        # nœuds inconnus du CSR : (type, id) -> nœud, et l'inverse
+        self._extra_index: dict[tuple[str, int], int] = {}
+        self._extra_nodes: list[tuple[str, int]] = []
+        # arcs ajoutés (dans les deux sens), et les nœuds qui en ont
+        self._extra_edges: dict[int, list[int]] = {}
+        self._extra_keys = np.empty(0, dtype=np.int64)
+        self.pending_roles = 0
+
+    @property
+    def n_actors(self) -> int:
+        return self.actor_ids.size
+
+    @property
+    def n_nodes(self) -> int:
+        return self._n_base + len(self._extra_nodes)
+
+    def fit(self, films, actors) -> "CastGraph":
+        """
+        Construit le graphe à partir des couples (id_film, id_actor).
+
+        Paramètres
+        ----------
+        films : array-like d'entiers
+            id_film de chaque ligne de CASTING
+        actors : array-like d'entiers
+            id_actor de chaque ligne de CASTING
+        """
+        films = np.asarray(films, dtype=np.int64)
+        actors = np.asarray(actors, dtype=np.int64)
+        self.actor_ids, actor_node = np.unique(actors, return_inverse=True)
+        self.film_ids, film_node = np.unique(films, return_inverse=True)
+        n_nodes = self.actor_ids.size + self.film_ids.size
+        film_node = film_node + self.actor_ids.size
+
+        # couples distincts, puis deux arcs par couple (acteur <-> film)
+        pairs = np.unique(actor_node * n_nodes + film_node)
+        actor_node, film_node = pairs // n_nodes, pairs % n_nodes
+        sources = np.concatenate([actor_node, film_node])
+        targets = np.concatenate([film_node, actor_node])
+        order = np.lexsort((targets, sources))
+        self.indices = targets[order].astype(np.int32)
+        self.indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n_nodes), out=self.indptr[1:])
+        self._reset_pending()
+        return self
+
+    def add(self, film_id: int, actor_ids) -> int:
+        """
+        Ajoute les rôles d'un film, sans reconstruire le CSR. Retourne le
+        nombre de couples ajoutés (ceux déjà présents sont ignorés).
+        """
+        film = self._node("film", film_id, create=True)
+        added = 0
+        for actor_id in actor_ids:
+            actor = self._node("actor", int(actor_id), create=True)
+            if self._has_edge(actor, film):
+                continue
+            self._extra_edges.setdefault(actor, []).append(film)
+            self._extra_edges.setdefault(film, []).append(actor)
+            added += 1
+        if added:
+            self._extra_keys = np.fromiter(
+                self._extra_edges, dtype=np.int64, count=len(self._extra_edges)
+            )
+            self.pending_roles += added
+        return added
+
+    # -----------------------------
+    # Correspondances
+    # -----------------------------
+    def _node(self, kind: str, id_: int, create: bool = False) -> int | None:
+        ids, offset = (
+            (self.actor_ids, 0) if kind == "actor" else (self.film_ids, self.n_actors)
+        )
+        pos = np.searchsorted(ids, id_)
+        if pos < ids.size and ids[pos] == id_:
+            return offset + int(pos)
+        node = self._extra_index.get((kind, id_))
+        if node is None and create:
+            node = self.n_nodes
+            self._extra_index[(kind, id_)] = node
+            self._extra_nodes.append((kind, id_))
+        return node
+
+    def _actor_node(self, actor_id: int) -> int | None:
+        return self._node("actor", actor_id)
+
+    def _node_id(self, node: int) -> tuple[str, int]:
+        if node >= self._n_base:
+            return self._extra_nodes[node - self._n_base]
+        if node < self.n_actors:
+            return "actor", int(self.actor_ids[node])
+        return "film", int(self.film_ids[node - self.n_actors])
+
+    def _ids(self, nodes: np.ndarray) -> np.ndarray:
+        """id (id_actor ou id_film) de chaque nœud."""
+        ids = np.empty(nodes.size, dtype=np.int64)
+        actor = nodes < self.n_actors
+        extra = nodes >= self._n_base
+        film = ~actor & ~extra
+        ids[actor] = self.actor_ids[nodes[actor]]
+        ids[film] = self.film_ids[nodes[film] - self.n_actors]
+        ids[extra] = [self._extra_nodes[n - self._n_base][1] for n in nodes[extra]]
+        return ids
+
+    def _has_edge(self, actor: int, film: int) -> bool:
+        if actor < self._n_base and film < self._n_base:
+            row = self.indices[self.indptr[actor] : self.indptr[actor + 1]]
+            i = np.searchsorted(row, film)
+            if i < row.size and row[i] == film:
+                return True
+        return film in self._extra_edges.get(actor, ())
+
+    def _extra_hits(self, nodes: np.ndarray) -> list[int]:
+        """Nœuds de `nodes` ayant des arcs ajoutés depuis fit."""
+        if self._extra_keys.size == 0:
+            return []
+        return nodes[np.isin(nodes, self._extra_keys)].tolist()
+
+    def _neighbours(self, nodes: np.ndarray):
+        """Comme _gather(), arcs du CSR et arcs ajoutés depuis fit."""
+        base = nodes[nodes < self._n_base]
+        found, origins = _gather(self.indptr, self.indices, base)
+        extra = [(o, n) for n in self._extra_hits(nodes) for o in self._extra_edges[n]]
+        if not extra:
+            return found, origins
+        return (
+            np.concatenate(
+                [found, np.asarray([o for o, _ in extra], dtype=found.dtype)]
+            ),
+            np.concatenate(
+                [origins, np.asarray([n for _, n in extra], dtype=origins.dtype)]
+            ),
+        )
+
+    def _degree(self, nodes: np.ndarray) -> int:
+        """Nombre total d'arcs sortants des nœuds."""
+        base = nodes[nodes < self._n_base]
+        degree = int((self.indptr[base + 1] - self.indptr[base]).sum())
+        return degree + sum(len(self._extra_edges[n]) for n in self._extra_hits(nodes))
+
+    # -----------------------------
+    # Requêtes
+    # -----------------------------
+    def films(self, actor_id: int) -> list[int]:
+        """id_film des films d'un acteur."""
+        node = self._actor_node(actor_id)
+        if node is None:
+            return []
+        films, _ = self._neighbours(np.array([node]))
+        return np.sort(self._ids(films)).tolist()
+
+    def co_stars(self, actor_id: int, n: int | None = None) -> list[tuple[int, int]]:
+        """
+        Partenaires d'un acteur : [(id_actor, nombre de films en commun)],
+        du plus fréquent au moins fréquent (n premiers si n est donné).
+        """
+        node = self._actor_node(actor_id)
+        if node is None:
+            return []
+        films, _ = self._neighbours(np.array([node]))
+        partners, _ = self._neighbours(films)
+        partners = partners[partners != node]
+        if partners.size == 0:
+            return []
+        found, counts = np.unique(partners, return_counts=True)
+        order = np.argsort(-counts, kind="stable")[:n]
+        return list(
+            zip(
+                self._ids(found[order]).tolist(),
+                counts[order].tolist(),
+                strict=True,
+            )
+        )
+
+    def shortest_path(
+        self, source_id: int, target_id: int, max_degrees: int = 6
+    ) -> list[tuple[str, int]] | None:
+        """
+        Plus court chemin entre deux acteurs, par parcours en largeur
+        bidirectionnel : chaque étape étend le côté dont la frontière a le
+        moins d'arcs sortants.
+
+        Retour
+        ------
+        list[tuple[str, int]] | None
+            Nœuds du chemin, alternativement ("actor", id_actor) et
+            ("film", id_film), ou None si les acteurs sont inconnus ou à
+            plus de max_degrees degrés.
+        """
+        source, target = self._actor_node(source_id), self._actor_node(target_id)
+        if source is None or target is None:
+            return None
+        if source == target:
+            return [self._node_id(source)]
+
+        # parent[côté][nœud] : nœud précédent dans le parcours, -1 si non visité
+        parents = np.full((2, self.n_nodes), -1, dtype=np.int32)
+        depths = np.full((2, self.n_nodes), -1, dtype=np.int32)
+        frontiers = [np.array([source]), np.array([target])]
+        for side, node in ((0, source), (1, target)):
+            parents[side, node], depths[side, node] = node, 0
+
+        levels = [0, 0]
+        while frontiers[0].size and frontiers[1].size:
+            if levels[0] + levels[1] >= 2 * max_degrees:
+                return None
+            degrees = [self._degree(f) for f in frontiers]
+            side = 0 if degrees[0] <= degrees[1] else 1
+            frontier = frontiers[side]
+
+            nodes, origins = self._neighbours(frontier)
+            new = parents[side, nodes] == -1
+            nodes, first = np.unique(nodes[new], return_index=True)
+            levels[side] += 1
+            parents[side, nodes] = origins[new][first]
+            depths[side, nodes] = levels[side]
+            frontiers[side] = nodes
+
+            met = nodes[depths[1 - side, nodes] >= 0]
+            if met.size:
+                meet = int(met[np.argmin(depths[1 - side, met])])
+                return self._path(parents, meet)
+        return None
+
+    def _path(self, parents: np.ndarray, meet: int) -> list[tuple[str, int]]:
+        halves = []
+        for side in (0, 1):
+            nodes, node = [], meet
+            while parents[side, node] != node:
+                node = int(parents[side, node])
+                nodes.append(node)
+            halves.append(nodes)
+        path = halves[0][::-1] + [meet] + halves[1]
+        return [self._node_id(node) for node in path]
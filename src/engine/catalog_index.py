@@ -0,0 +1,397 @@
+import numpy as np
+
+
+FIELDS = ("genre", "director", "actor")
+
+
+def normalize(value) -> str:
+    """Clé de recherche d'un texte : minuscules, espaces simplifiés."""
+    return " ".join(str(value).split()).lower()
+
+
+def genre_labels(genre) -> dict[str, str]:
+    """
+    Genres d'un film (la colonne genre contient des genres séparés par des
+    virgules) : {clé normalisée: libellé}.
+    """
+    labels = {}
+    for label in str(genre or "").split(","):
+        label = " ".join(label.split())
+        if label:
+            labels.setdefault(label.lower(), label)
+    return labels
+
+
+def genre_keys(genre) -> list[str]:
+    """Clés normalisées des genres d'un film, triées."""
+    return sorted(genre_labels(genre))
+
+
+def year_of(annee) -> int:
+    """Année d'un film en entier (0 si elle est inconnue)."""
+    digits = str(annee or "")[:4]
+    return int(digits) if digits.isdigit() else 0
+
+
+def _intersect(small: np.ndarray, big: np.ndarray) -> np.ndarray:
+    """
+    Intersection de deux listes triées sans doublons : chaque élément de la
+    plus courte est cherché par dichotomie dans la plus longue, en
+    O(|small| log |big|) au lieu de parcourir les deux listes.
+    """
+    if small.size == 0 or big.size == 0:
+        return small[:0]
+    pos = np.minimum(np.searchsorted(big, small), big.size - 1)
+    return small[big[pos] == small]
+
+
+def _bitmap(rows: np.ndarray, n: int) -> np.ndarray:
+    """Bitmap des lignes données : un bit par ligne, en mots de 64 bits."""
+    bits = np.zeros(-(-n // 64) * 64, dtype=bool)
+    bits[rows] = True
+    return np.packbits(bits, bitorder="little").view(np.uint64)
+
+
+def _lists(keys: np.ndarray, films: np.ndarray) -> tuple:
+    """
+    Listes triées et sans doublons des films de chaque clé, à partir de
+    couples (clé, id_film), en CSR : (clés triées, indptr, id_film).
+    """
+    if keys.size == 0:
+        return np.empty(0, dtype=np.int64), np.zeros(1, np.int64), films[:0]
+    order = np.lexsort((films, keys))
+    keys, films = keys[order], films[order]
+    keep = np.ones(keys.size, dtype=bool)
+    keep[1:] = (keys[1:] != keys[:-1]) | (films[1:] != films[:-1])
+    keys, films = keys[keep], films[keep]
+    values, starts = np.unique(keys, return_index=True)
+    return values, np.append(starts, keys.size), films
+
+
+class CatalogIndex:
+    """
+    Index du catalogue pour la recherche à filtres et facettes.
+
+    Deux représentations des mêmes données, en tableaux d'entiers :
+
+    - des listes inversées : pour chaque genre, réalisateur et acteur, la
+      liste triée des id_film correspondants (en CSR, une paire de tableaux
+      par champ). Une recherche intersecte les listes de ses filtres en
+      partant de la plus courte : son coût dépend de la plus petite liste,
+      pas du nombre de films ;
+    - des colonnes, une ligne par film triée par id_film : année et code du
+      réalisateur, et pour chaque genre un bitmap des lignes des films de ce
+      genre. Le filtre d'années et les comptes par facette sont des
+      opérations vectorisées sur ces colonnes (bincount, ET binaire et
+      comptage de bits), sans requête GROUP BY. Les facettes du catalogue
+      entier sont gardées jusqu'au prochain ajout.
+
+    Genres et réalisateurs sont comparés sans tenir compte de la casse,
+    chaque genre de la colonne genre (« Drame, Crime ») étant compté à part.
+    Les ajouts (add_film, add_casting) sont mis en attente et intégrés à la
+    lecture suivante : un ajout ne recopie ni liste ni colonne.
+
+    Attributs
+    ---------
+    film_ids : np.ndarray
+        id_film de tous les films indexés, triés (une ligne par film).
+    years : np.ndarray
+        Année de chaque film (0 si inconnue).
+    directors : np.ndarray
+        Code du réalisateur de chaque film (-1 si inconnu).
+    genre_bits : np.ndarray
+        Bitmap des lignes de chaque genre (une ligne de mots de 64 bits par
+        code de genre).
+    labels : dict[str, list[str]]
+        Libellé de chaque code de genre et de réalisateur.
+    """
+
+    def __init__(self):
+        self.film_ids = np.empty(0, dtype=np.int64)
+        self.years = np.empty(0, dtype=np.int16)
+        self.directors = np.empty(0, dtype=np.int32)
+        self.genre_bits = np.zeros((0, 0), dtype=np.uint64)
+        self.labels: dict[str, list[str]] = {"genre": [], "director": []}
+        self._codes: dict[str, dict[str, int]] = {"genre": {}, "director": {}}
+        empty = np.empty(0, dtype=np.int64)
+        self._lists = {field: _lists(empty, empty) for field in FIELDS}
+        # listes complétées par des ajouts, à la place de celles du CSR
+        self._merged: dict[str, dict] = {field: {} for field in FIELDS}
+        self._pending: dict[str, dict] = {field: {} for field in FIELDS}
+        # films ajoutés, pas encore dans les colonnes :
+        # (id_film, année, réalisateur, genres)
+        self._new: list[tuple[int, int, int, list[int]]] = []
+        self._new_ids: set[int] = set()
+        self._all_facets: dict[int, dict] = {}
+
+    def _code(self, field: str, key: str, label: str) -> int:
+        """Code d'un genre ou d'un réalisateur, attribué à sa première apparition."""
+        code = self._codes[field].get(key)
+        if code is None:
+            code = self._codes[field][key] = len(self.labels[field])
+            self.labels[field].append(label)
+        return code
+
+    def fit(
+        self,
+        films,
+        directors,
+        genres,
+        casting_films=(),
+        casting_actors=(),
+        years=None,
+    ) -> "CatalogIndex":
+        """
+        Construit listes et colonnes à partir du catalogue (sur un index vide).
+
+        Paramètres
+        ----------
+        films : array-like d'entiers
+            id_film de chaque film (sans doublons)
+        directors, genres : list[str]
+            Réalisateur et genre(s) de chaque film
+        casting_films, casting_actors : array-like d'entiers
+            Couples (id_film, id_actor) de CASTING
+        years : list, optionnel
+            Année de chaque film
+        """
+        films = np.asarray(films, dtype=np.int64)
+        order = np.argsort(films, kind="stable").tolist()
+        self.film_ids = films[order]
+        self.years = np.zeros(films.size, dtype=np.int16)
+        if years is not None:
+            self.years[:] = [year_of(years[i]) for i in order]
+
+        self.directors = np.asarray(
+            [
+                self._code("director", normalize(d), " ".join(d.split())) if d else -1
+                for d in (directors[i] for i in order)
+            ],
+            dtype=np.int32,
+        )
+        codes, lengths = [], []
+        for i in order:
+            labels = genre_labels(genres[i])
+            codes += [self._code("genre", k, label) for k, label in labels.items()]
+            lengths.append(len(labels))
+
+        known = self.directors >= 0
+        self._lists["director"] = _lists(
+            self.directors[known].astype(np.int64), self.film_ids[known]
+        )
+        self._lists["genre"] = _lists(
+            np.asarray(codes, dtype=np.int64), np.repeat(self.film_ids, lengths)
+        )
+        self._build_genre_bits()
+        self._lists["actor"] = _lists(
+            np.asarray(casting_actors, dtype=np.int64),
+            np.asarray(casting_films, dtype=np.int64),
+        )
+        return self
+
+    # -----------------------------
+    # Mises à jour
+    # -----------------------------
+    def __contains__(self, id_film: int) -> bool:
+        pos = np.searchsorted(self.film_ids, id_film)
+        return id_film in self._new_ids or (
+            pos < self.film_ids.size and self.film_ids[pos] == id_film
+        )
+
+    def _add(self, field: str, key: int, id_film: int):
+        self._pending[field].setdefault(key, []).append(id_film)
+
+    def add_film(self, id_film: int, realisateur: str, genre: str, annee=None):
+        """Indexe un nouveau film (sans effet s'il est déjà indexé)."""
+        if id_film in self:
+            return
+        director = -1
+        if realisateur:
+            label = " ".join(realisateur.split())
+            director = self._code("director", normalize(label), label)
+            self._add("director", director, id_film)
+        codes = [
+            self._code("genre", key, label)
+            for key, label in genre_labels(genre).items()
+        ]
+        for code in codes:
+            self._add("genre", code, id_film)
+        self._new.append((id_film, year_of(annee), director, codes))
+        self._new_ids.add(id_film)
+
+    def add_casting(self, id_film: int, actors):
+        """Indexe les acteurs (id_actor) d'un film."""
+        for id_actor in actors:
+            self._add("actor", int(id_actor), id_film)
+
+    def _build_genre_bits(self):
+        """Bitmaps des genres, à partir de leurs listes de films."""
+        n = self.film_ids.size
+        self.genre_bits = np.zeros(
+            (len(self.labels["genre"]), -(-n // 64)), dtype=np.uint64
+        )
+        for code in range(len(self.labels["genre"])):
+            films = self._postings("genre", code)
+            self.genre_bits[code] = _bitmap(np.searchsorted(self.film_ids, films), n)
+
+    def _merge(self):
+        """Intègre les films ajoutés aux colonnes, en gardant l'ordre des id_film."""
+        if not self._new:
+            return
+        n = self.film_ids.size
+        ids, years, directors, codes = zip(*self._new, strict=True)
+        self.film_ids = np.append(self.film_ids, ids)
+        self.years = np.append(self.years, np.asarray(years, dtype=np.int16))
+        self.directors = np.append(
+            self.directors, np.asarray(directors, dtype=np.int32)
+        )
+        self._new, self._new_ids, self._all_facets = [], set(), {}
+
+        tail = self.film_ids[max(n - 1, 0) :]
+        if np.any(tail[1:] < tail[:-1]):
+            # id_film ajoutés hors d'ordre : lignes renumérotées
+            order = np.argsort(self.film_ids, kind="stable")
+            self.film_ids = self.film_ids[order]
+            self.years = self.years[order]
+            self.directors = self.directors[order]
+            self._build_genre_bits()
+            return
+
+        # nouvelles lignes en fin de tableau : bits ajoutés aux bitmaps
+        shape = len(self.labels["genre"]), -(-self.film_ids.size // 64)
+        grow = [(0, shape[i] - self.genre_bits.shape[i]) for i in range(2)]
+        if any(after for _, after in grow):
+            self.genre_bits = np.pad(self.genre_bits, grow)
+        lengths = [len(cs) for cs in codes]
+        rows = np.repeat(np.arange(n, n + len(ids), dtype=np.uint64), lengths)
+        np.bitwise_or.at(
+            self.genre_bits,
+            (np.asarray([c for cs in codes for c in cs], dtype=np.intp), rows >> 6),
+            np.uint64(1) << (rows & np.uint64(63)),
+        )
+
+    # -----------------------------
+    # Lectures
+    # -----------------------------
+    def all_films(self) -> np.ndarray:
+        """id_film de tous les films indexés, triés."""
+        self._merge()
+        return self.film_ids
+
+    def postings(self, field: str, key) -> np.ndarray:
+        """Liste triée des id_film d'une clé (vide si elle est inconnue)."""
+        if field != "actor":
+            key = self._codes[field].get(normalize(key))
+            if key is None:
+                return np.empty(0, dtype=np.int64)
+        return self._postings(field, key)
+
+    def _postings(self, field: str, key: int) -> np.ndarray:
+        """Liste d'un code de genre ou de réalisateur, ou d'un id_actor."""
+        films = self._merged[field].get(key)
+        if films is None:
+            keys, indptr, values = self._lists[field]
+            pos = np.searchsorted(keys, key)
+            if pos < keys.size and keys[pos] == key:
+                films = values[indptr[pos] : indptr[pos + 1]]
+        pending = self._pending[field].pop(key, None)
+        if pending:
+            merged = np.asarray(pending, dtype=np.int64)
+            films = merged if films is None else films
+            films = self._merged[field][key] = np.union1d(films, merged)
+        return films if films is not None else np.empty(0, dtype=np.int64)
+
+    def select(
+        self,
+        genres=(),
+        director: str | None = None,
+        actors=(),
+        years: tuple[int | None, int | None] = (None, None),
+    ) -> np.ndarray:
+        """
+        Lignes (croissantes) des films ayant tous les genres, le réalisateur
+        et tous les acteurs demandés, sortis entre years[0] et years[1]
+        inclus (bornes facultatives). Sans filtre, toutes les lignes.
+        """
+        self._merge()
+        lists = [self.postings("genre", genre) for genre in genres]
+        if director:
+            lists.append(self.postings("director", director))
+        lists += [self.postings("actor", actor) for actor in actors]
+
+        if lists:
+            lists.sort(key=len)
+            result = lists[0]
+            for films in lists[1:]:
+                if result.size == 0:
+                    break
+                result = _intersect(result, films)
+            rows = np.searchsorted(self.film_ids, result)
+            # films du casting absents des colonnes écartés
+            rows = rows[rows < self.film_ids.size]
+            rows = rows[self.film_ids[rows] == result[: rows.size]]
+        else:
+            rows = np.arange(self.film_ids.size)
+
+        low, high = years
+        if low is not None or high is not None:
+            year = self.years[rows]
+            keep = year > 0
+            if low is not None:
+                keep &= year >= low
+            if high is not None:
+                keep &= year <= high
+            rows = rows[keep]
+        return rows
+
+    def search(self, genres=(), director=None, actors=(), years=(None, None)):
+        """id_film (triés) des films trouvés par select()."""
+        rows = self.select(genres, director, actors, years)
+        return self.film_ids[rows]
+
+    def facets(self, rows: np.ndarray, top: int = 10) -> dict[str, list[tuple]]:
+        """
+        Nombre de films de `rows` par genre, par décennie et par réalisateur
+        (les `top` premiers), du plus au moins fréquent (décennies dans
+        l'ordre chronologique).
+
+        Retour
+        ------
+        dict[str, list[tuple]]
+            {"genre": [(libellé, n)], "decade": [(1990, n)],
+            "director": [(libellé, n)]}
+        """
+        everything = rows.size == self.film_ids.size
+        if everything and top in self._all_facets:
+            return self._all_facets[top]
+
+        selected = _bitmap(rows, self.film_ids.size)
+        genres = np.bitwise_count(self.genre_bits & selected).sum(
+            axis=1, dtype=np.int64
+        )
+
+        years = self.years[rows]
+        decades = np.bincount(years[years > 0] // 10)
+
+        directors = self.directors[rows]
+        directors = np.bincount(
+            directors[directors >= 0], minlength=len(self.labels["director"])
+        )
+        found = {
+            "genre": self._ranked("genre", genres, genres.size),
+            "decade": [(int(d) * 10, int(decades[d])) for d in np.flatnonzero(decades)],
+            "director": self._ranked("director", directors, top),
+        }
+        if everything:
+            self._all_facets[top] = found
+        return found
+
+    def _ranked(self, field: str, counts: np.ndarray, top: int) -> list[tuple]:
+        """Les `top` codes les plus comptés (comptes non nuls), avec leur libellé."""
+        top = min(top, int(np.count_nonzero(counts)))
+        if top == 0:
+            return []
+        best = np.argpartition(-counts, top - 1)[:top]
+        best = best[np.lexsort((best, -counts[best]))]
+        labels = self.labels[field]
+        return [(labels[i], int(counts[i])) for i in best.tolist()]
@@ -0,0 +1,327 @@
+from array import array
+from collections.abc import Iterable
+import zlib
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import svds
+
+
+def film_features(
+    genre: str | None,
+    realisateur: str | None,
+    annee: int | None,
+    actor_ids: Iterable[int] = (),
+) -> list[str]:
+    """
+    Caractéristiques textuelles d'un film : chaque genre de la colonne
+    `genre` (séparés par des virgules), le réalisateur, la décennie et les
+    acteurs (par id_actor).
+    """
+    features = [f"g:{g.strip().lower()}" for g in (genre or "").split(",") if g.strip()]
+    if realisateur and realisateur != "None":
+        features.append(f"d:{realisateur.strip().lower()}")
+    if annee:
+        features.append(f"y:{int(annee) // 10 * 10}")
+    features += [f"a:{a}" for a in actor_ids]
+    return features
+
+
+class ContentSimilarity:
+    """
+    Similarité de contenu entre films (genres, réalisateur, décennie, casting).
+
+    Chaque caractéristique est hachée (crc32) dans un espace de `n_features`
+    colonnes : aucun vocabulaire à garder en mémoire. Un film est une ligne
+    creuse TF-IDF normalisée d'une matrice CSR float32 ; la similarité de
+    deux films est le produit scalaire de leurs lignes (cosinus), et les
+    films proches d'un film s'obtiennent par un seul produit matrice-vecteur.
+
+    Les films ajoutés ou modifiés après la construction sont gardés à part
+    (IDF figée) jusqu'à la prochaine compaction, qui reconstruit la matrice
+    et recalcule l'IDF.
+
+    Attributs
+    ---------
+    n_features : int
+        Taille de l'espace de hachage.
+    compact_every : int
+        Nombre de mises à jour en attente déclenchant une compaction.
+    """
+
+    def __init__(self, n_features: int = 2**18, compact_every: int = 10_000):
+        self.n_features = n_features
+        self.compact_every = compact_every
+        self.film_ids = np.empty(0, dtype=np.int64)
+        self.matrix = sp.csr_matrix((0, n_features), dtype=np.float32)
+        self.alive = np.empty(0, dtype=bool)
+        self.df = np.zeros(n_features, dtype=np.int32)
+        self.idf = np.ones(n_features, dtype=np.float32)
+        # film_id -> (colonnes, poids normalisés), hors matrice principale
+        self.pending: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        # (colonnes utilisées, composantes (dim, n_colonnes)) du dernier embed
+        self._components: tuple[np.ndarray, np.ndarray] | None = None
+
+    # -----------------------------
+    # Encodage
+    # -----------------------------
+    def hash_features(self, features: Iterable[str]) -> np.ndarray:
+        """Colonnes (triées, sans doublon) des caractéristiques d'un film."""
+        cols = [zlib.crc32(f.encode("utf-8")) % self.n_features for f in features]
+        return np.unique(np.asarray(cols, dtype=np.int32))
+
+    def _weights(self, cols: np.ndarray) -> np.ndarray:
+        weights = self.idf[cols]
+        norm = np.sqrt(np.dot(weights, weights))
+        return weights / norm if norm else weights
+
+    def _compute_idf(self, n_docs: int):
+        self.idf = (np.log((1 + n_docs) / (1 + self.df)) + 1).astype(np.float32)
+
+    # -----------------------------
+    # Construction
+    # -----------------------------
+    def fit(self, rows: Iterable[tuple[int, Iterable[str]]]) -> "ContentSimilarity":
+        """
+        Construit la matrice à partir de couples (id_film, caractéristiques).
+        Les lignes sont lues au fil de l'eau dans des tableaux compacts : la
+        mémoire ne dépend que du nombre total de caractéristiques.
+        """
+        ids = array("q")
+        indptr = array("q", [0])
+        indices = array("i")
+        for film_id, features in rows:
+            ids.append(film_id)
+            indices.extend(
+                [zlib.crc32(f.encode("utf-8")) % self.n_features for f in features]
+            )
+            indptr.append(len(indices))
+
+        self._build(
+            np.frombuffer(ids, dtype=np.int64),
+            np.frombuffer(indptr, dtype=np.int64),
+            np.frombuffer(indices, dtype=np.int32),
+        )
+        return self
+
+    def _build(self, ids: np.ndarray, indptr: np.ndarray, indices: np.ndarray):
+        """
+        Construit la matrice normalisée (IDF recalculée) triée par id_film.
+        Les poids sont calculés directement sur le tableau `data`, sans
+        matrice intermédiaire, pour limiter le pic mémoire.
+        """
+        if indices.size < np.iinfo(np.int32).max:
+            indptr = indptr.astype(np.int32)  # index int32 : moitié moins de mémoire
+        matrix = sp.csr_matrix(
+            (np.ones(indices.size, dtype=np.float32), indices, indptr),
+            shape=(ids.size, self.n_features),
+        )
+        matrix.sum_duplicates()  # colonnes triées, doublons fusionnés
+        if ids.size and np.any(np.diff(ids) <= 0):
+            # non trié ou id en double : la dernière ligne l'emporte
+            last = ids.size - 1 - np.unique(ids[::-1], return_index=True)[1]
+            matrix = matrix[last]
+            ids = ids[last]
+
+        self.df = np.bincount(matrix.indices, minlength=self.n_features).astype(
+            np.int32
+        )
+        self._compute_idf(ids.size)
+        # poids IDF puis normalisation L2 de chaque ligne, en place
+        matrix.data = self.idf[matrix.indices]
+        np.multiply(matrix.data, matrix.data, out=matrix.data)
+        norms = np.sqrt(np.asarray(matrix.sum(axis=1), dtype=np.float32).ravel())
+        norms[norms == 0] = 1.0
+        np.sqrt(matrix.data, out=matrix.data)
+        matrix.data /= np.repeat(norms, np.diff(matrix.indptr))
+
+        self.matrix = matrix
+        self.film_ids = np.ascontiguousarray(ids)
+        self.alive = np.ones(ids.size, dtype=bool)
+        self.pending = {}
+
+    # -----------------------------
+    # Mises à jour incrémentales
+    # -----------------------------
+    def _main_row(self, film_id: int) -> int | None:
+        pos = np.searchsorted(self.film_ids, film_id)
+        if (
+            pos < self.film_ids.size
+            and self.film_ids[pos] == film_id
+            and self.alive[pos]
+        ):
+            return int(pos)
+        return None
+
+    def _row(self, film_id: int) -> tuple[np.ndarray, np.ndarray] | None:
+        """(colonnes, poids) d'un film, en attente ou dans la matrice."""
+        if film_id in self.pending:
+            return self.pending[film_id]
+        pos = self._main_row(film_id)
+        if pos is None:
+            return None
+        start, end = self.matrix.indptr[pos], self.matrix.indptr[pos + 1]
+        return self.matrix.indices[start:end], self.matrix.data[start:end]
+
+    def update(self, film_id: int, features: Iterable[str]):
+        """Ajoute un film ou remplace ses caractéristiques, en temps constant."""
+        self.remove(film_id)
+        cols = self.hash_features(features)
+        self.df[cols] += 1
+        self.pending[film_id] = (cols, self._weights(cols))
+        if len(self.pending) >= self.compact_every:
+            self.compact()
+
+    def remove(self, film_id: int):
+        """Retire un film du modèle."""
+        row = self.pending.pop(film_id, None)
+        if row is not None:
+            self.df[row[0]] -= 1
+            return
+        pos = self._main_row(film_id)
+        if pos is not None:
+            self.alive[pos] = False
+            start, end = self.matrix.indptr[pos], self.matrix.indptr[pos + 1]
+            self.df[self.matrix.indices[start:end]] -= 1
+
+    def compact(self):
+        """Réintègre les films en attente et recalcule l'IDF."""
+        keep = np.flatnonzero(self.alive)
+        main = self.matrix[keep]
+        pending_ids = np.fromiter(self.pending, dtype=np.int64, count=len(self.pending))
+        pending_cols = [cols for cols, _ in self.pending.values()]
+        lengths = np.fromiter((c.size for c in pending_cols), dtype=np.int64)
+
+        ids = np.concatenate([self.film_ids[keep], pending_ids])
+        indptr = np.concatenate([main.indptr, main.indptr[-1] + np.cumsum(lengths)])
+        indices = np.concatenate([main.indices, *pending_cols]).astype(np.int32)
+        self._build(ids, indptr, indices)
+
+    # -----------------------------
+    # Vecteurs denses
+    # -----------------------------
+    def embed(self, dim: int = 64, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vecteurs denses des films pour un index approché : SVD tronquée de la
+        matrice TF-IDF (analyse sémantique latente), restreinte aux colonnes
+        utilisées. Les composantes sont gardées pour projeter les films
+        ajoutés ensuite (vector).
+
+        Retour
+        ------
+        tuple[np.ndarray, np.ndarray]
+            id_film (n,) et vecteurs (n, dim) float32
+        """
+        keep = np.flatnonzero(self.alive)
+        main = self.matrix[keep]
+        used = np.unique(main.indices)
+        main = main[:, used]
+        rank = min(dim, min(main.shape) - 1)
+        components = np.zeros((dim, used.size), dtype=np.float32)
+        if rank > 0:
+            _, _, vt = svds(main, k=rank, random_state=seed)
+            components[:rank] = vt
+        self._components = (used, components)
+
+        ids = np.concatenate(
+            [
+                self.film_ids[keep],
+                np.fromiter(self.pending, dtype=np.int64, count=len(self.pending)),
+            ]
+        )
+        vectors = np.empty((ids.size, dim), dtype=np.float32)
+        vectors[: keep.size] = main @ components.T
+        for i, film_id in enumerate(ids[keep.size :].tolist(), start=keep.size):
+            vectors[i] = self.vector(film_id)
+        return ids, vectors
+
+    def vector(self, film_id: int) -> np.ndarray | None:
+        """
+        Vecteur dense d'un film, projeté sur les composantes du dernier
+        embed (None si le film est inconnu ou si embed n'a pas été appelé).
+        """
+        row = self._row(film_id)
+        if row is None or self._components is None:
+            return None
+        used, components = self._components
+        cols, weights = row
+        pos = np.searchsorted(used, cols).clip(0, max(used.size - 1, 0))
+        known = used[pos] == cols if used.size else np.zeros(cols.size, dtype=bool)
+        return components[:, pos[known]] @ weights[known]
+
+    # -----------------------------
+    # Requêtes
+    # -----------------------------
+    def __len__(self) -> int:
+        return int(self.alive.sum()) + len(self.pending)
+
+    def _scores(self, queries: list[tuple[np.ndarray, np.ndarray]]):
+        """
+        Cosinus de quelques lignes (colonnes, poids) avec tous les films.
+
+        Retour
+        ------
+        tuple[np.ndarray, np.ndarray]
+            id_film (n_films,) et scores (n_films, len(queries))
+        """
+        dense = np.zeros((self.n_features, len(queries)), dtype=np.float32)
+        for j, (cols, weights) in enumerate(queries):
+            dense[cols, j] = weights
+        scores = np.asarray(self.matrix @ dense)
+        scores[~self.alive] = -np.inf
+        ids = self.film_ids
+        if self.pending:
+            extra_ids = np.fromiter(
+                self.pending, dtype=np.int64, count=len(self.pending)
+            )
+            extra = np.stack([w @ dense[c] for c, w in self.pending.values()])
+            ids = np.concatenate([ids, extra_ids])
+            scores = np.concatenate([scores, extra])
+        return ids, scores
+
+    @staticmethod
+    def _top(ids, scores, n, exclude=()) -> list[tuple[int, float]]:
+        """Les n meilleurs scores strictement positifs, hors `exclude`."""
+        scores = scores.copy()
+        scores[np.isin(ids, np.fromiter(exclude, dtype=np.int64))] = -np.inf
+        n = min(n, scores.size)
+        if n <= 0:
+            return []
+        best = np.argpartition(-scores, n - 1)[:n]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        best = best[scores[best] > 0]
+        return list(zip(ids[best].tolist(), scores[best].tolist(), strict=True))
+
+    def similar_to_features(
+        self, features: Iterable[str], n: int = 10, exclude: Iterable[int] = ()
+    ) -> list[tuple[int, float]]:
+        """Les n films les plus proches d'une liste de caractéristiques."""
+        cols = self.hash_features(features)
+        ids, scores = self._scores([(cols, self._weights(cols))])
+        return self._top(ids, scores[:, 0], n, exclude)
+
+    def similar(self, film_id: int, n: int = 10) -> list[tuple[int, float]]:
+        """Les n films les plus proches d'un film : [(id_film, score)]."""
+        return self.similar_batch([film_id], n)[film_id]
+
+    def similar_batch(
+        self, film_ids: list[int], n: int = 10, block_size: int = 8
+    ) -> dict[int, list[tuple[int, float]]]:
+        """
+        Films proches de plusieurs films, par blocs : un produit matrice ×
+        matrice par bloc, mémoire bornée à n_films × block_size flottants.
+        """
+        result = {}
+        known = []
+        for film_id in film_ids:
+            row = self._row(film_id)
+            if row is None:
+                result[film_id] = []
+            else:
+                known.append((film_id, row))
+        for start in range(0, len(known), block_size):
+            block = known[start : start + block_size]
+            ids, scores = self._scores([row for _, row in block])
+            for j, (film_id, _) in enumerate(block):
+                result[film_id] = self._top(ids, scores[:, j], n, exclude=(film_id,))
+        return result
@@ -0,0 +1,460 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+def top_k_rows(matrix: sp.csr_matrix, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Garde les k plus grandes valeurs de chaque ligne d'une matrice creuse.
+
+    Retour
+    ------
+    tuple[np.ndarray, np.ndarray]
+        (colonnes, valeurs) de forme (n_lignes, k), triées par valeur
+        décroissante ; -1 / 0 pour compléter les lignes trop courtes.
+    """
+    n_rows = matrix.shape[0]
+    cols = np.full((n_rows, k), -1, dtype=np.int32)
+    vals = np.zeros((n_rows, k), dtype=np.float32)
+    indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+    for row in range(n_rows):
+        start, end = indptr[row], indptr[row + 1]
+        if start == end:
+            continue
+        row_data = data[start:end]
+        if end - start > k:
+            best = np.argpartition(-row_data, k - 1)[:k]
+        else:
+            best = np.arange(end - start)
+        best = best[np.argsort(-row_data[best], kind="stable")]
+        cols[row, : len(best)] = indices[start:end][best]
+        vals[row, : len(best)] = row_data[best]
+    return cols, vals
+
+
+def aggregate_top_n(
+    neighbours: np.ndarray,
+    scores: np.ndarray,
+    n: int,
+    exclude: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Somme les scores de plusieurs listes de voisins (une par ligne) et
+    retourne les n meilleurs indices, hors `exclude`.
+    """
+    idx = neighbours.ravel()
+    sc = scores.ravel()
+    keep = idx >= 0
+    idx, sc = idx[keep], sc[keep]
+    if idx.size == 0:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+    candidates, inverse = np.unique(idx, return_inverse=True)
+    totals = np.bincount(inverse, weights=sc).astype(np.float32)
+    if exclude is not None and exclude.size:
+        mask = ~np.isin(candidates, exclude)
+        candidates, totals = candidates[mask], totals[mask]
+
+    if candidates.size > n:
+        best = np.argpartition(-totals, n - 1)[:n]
+    else:
+        best = np.arange(candidates.size)
+    best = best[np.argsort(-totals[best], kind="stable")]
+    return candidates[best], totals[best]
+
+
+class ItemSimilarity:
+    """
+    Filtrage collaboratif item-item sur la matrice binaire utilisateurs × films.
+
+    La similarité de deux films est le cosinus de leurs colonnes : nombre
+    d'utilisateurs ayant les deux en favori, divisé par la racine du produit
+    de leurs popularités. Seuls les k plus proches voisins de chaque film sont
+    gardés, dans des tableaux NumPy : une recommandation est une agrégation
+    de quelques lignes de ces tableaux, sans requête SQL.
+
+    Les favoris ajoutés ou retirés après la construction (add / remove) sont
+    appliqués un par un : seules les similarités entre le film concerné et
+    les autres favoris de l'utilisateur sont recalculées, en
+    O(nb favoris de l'utilisateur × popularité du film), et les listes qui
+    citent le film sont remises à l'échelle de sa nouvelle popularité (un
+    parcours vectorisé de neighbours, O(nb films × k)). Les listes de
+    voisins ainsi corrigées restent approchées (un film sorti d'une liste ne
+    peut pas être remplacé par un voisin inconnu) jusqu'à la prochaine
+    compaction, qui reconstruit le modèle.
+
+    Attributs
+    ---------
+    k : int
+        Nombre de voisins gardés par film.
+    film_ids : np.ndarray
+        Identifiants (id_film) des films connus, triés.
+    user_ids : np.ndarray
+        Identifiants des utilisateurs connus, triés.
+    neighbours : np.ndarray
+        (n_films, k) : indice (dans film_ids) des voisins de chaque film, -1 si absent.
+    scores : np.ndarray
+        (n_films, k) : similarité correspondante (float32).
+    popularity : np.ndarray
+        Nombre d'utilisateurs ayant chaque film en favori.
+    pending_events : int
+        Nombre de favoris ajoutés ou retirés depuis la construction.
+    """
+
+    def __init__(self, k: int = 50, block_size: int = 2048):
+        self.k = k
+        self.block_size = block_size
+        self.film_ids = np.empty(0, dtype=np.int64)
+        self.user_ids = np.empty(0, dtype=np.int64)
+        self.user_films = sp.csr_matrix((0, 0), dtype=np.float32)
+        self.film_users = sp.csr_matrix((0, 0), dtype=np.float32)
+        self.neighbours = np.empty((0, k), dtype=np.int32)
+        self.scores = np.empty((0, k), dtype=np.float32)
+        self.popularity = np.empty(0, dtype=np.float32)
+        self._reset_pending()
+
+    def _reset_pending(self):
+        self._n_base = self.film_ids.size
+        self._n_base_users = self.user_ids.size
+        # id inconnus à la construction -> indice (après ceux de base)
+        self._extra_films: dict[int, int] = {}
+        self._extra_users: dict[int, int] = {}
+        self._extra_user_ids: list[int] = []
+        # écarts avec user_films, par indices :
+        # {utilisateur: {film: présent ?}} et {film: {utilisateur: présent ?}}
+        self._user_delta: dict[int, dict[int, bool]] = {}
+        self._film_delta: dict[int, dict[int, bool]] = {}
+        self.pending_events = 0
+
+    # -----------------------------
+    # Construction
+    # -----------------------------
+    def fit(self, users, films) -> "ItemSimilarity":
+        """
+        Construit le modèle à partir des couples (utilisateur, film) de FAVORIS.
+
+        Paramètres
+        ----------
+        users : array-like d'entiers
+            id_user de chaque favori
+        films : array-like d'entiers
+            id_film de chaque favori
+        """
+        users = np.asarray(users, dtype=np.int64)
+        films = np.asarray(films, dtype=np.int64)
+        self.user_ids, user_idx = np.unique(users, return_inverse=True)
+        self.film_ids, film_idx = np.unique(films, return_inverse=True)
+
+        matrix = sp.csr_matrix(
+            (np.ones(users.size, dtype=np.float32), (user_idx, film_idx)),
+            shape=(self.user_ids.size, self.film_ids.size),
+        )
+        matrix.sum_duplicates()
+        matrix.data[:] = 1.0  # favori = présence, les doublons ne comptent pas
+        self.user_films = matrix
+        self.film_users = matrix.T.tocsr()  # films × utilisateurs
+        self.film_users.sort_indices()
+        self.popularity = np.diff(self.film_users.indptr).astype(np.float32)
+
+        self.neighbours, self.scores = self._top_k_similarities(matrix)
+        self._reset_pending()
+        return self
+
+    def _top_k_similarities(self, matrix: sp.csr_matrix):
+        """Cosinus film × film par blocs de lignes, pour borner la mémoire."""
+        n_films = matrix.shape[1]
+        by_film = self.film_users
+        norms = np.sqrt(self.popularity)
+        norms[norms == 0] = 1.0
+        inv_norms = sp.diags(1.0 / norms)
+
+        neighbours = np.full((n_films, self.k), -1, dtype=np.int32)
+        scores = np.zeros((n_films, self.k), dtype=np.float32)
+        for start in range(0, n_films, self.block_size):
+            end = min(start + self.block_size, n_films)
+            block = (by_film[start:end] @ matrix).tocsr()  # co-occurrences
+            block = sp.diags(1.0 / norms[start:end]) @ block @ inv_norms
+            block = block.tocsr()
+            # un film n'est pas son propre voisin : diagonale globale à zéro
+            rows = np.repeat(np.arange(start, end), np.diff(block.indptr))
+            block.data[block.indices == rows] = 0.0
+            block.eliminate_zeros()
+            neighbours[start:end], scores[start:end] = top_k_rows(block, self.k)
+        return neighbours, scores
+
+    # -----------------------------
+    # Mises à jour incrémentales
+    # -----------------------------
+    def _user_index(self, user_id: int, create: bool = False) -> int | None:
+        pos = np.searchsorted(self.user_ids, user_id)
+        if pos < self.user_ids.size and self.user_ids[pos] == user_id:
+            return int(pos)
+        idx = self._extra_users.get(user_id)
+        if idx is None and create:
+            idx = self._n_base_users + len(self._extra_user_ids)
+            self._extra_users[user_id] = idx
+            self._extra_user_ids.append(user_id)
+        return idx
+
+    def _base_likes(self, user: int, film: int) -> bool:
+        """Le favori (indice utilisateur, indice film) est-il dans user_films ?"""
+        if user >= self._n_base_users or film >= self._n_base:
+            return False
+        start, end = self.user_films.indptr[user], self.user_films.indptr[user + 1]
+        row = self.user_films.indices[start:end]
+        i = np.searchsorted(row, film)
+        return bool(i < row.size and row[i] == film)
+
+    def _likes(self, user: int, film: int) -> bool:
+        delta = self._user_delta.get(user)
+        if delta is not None and film in delta:
+            return delta[film]
+        return self._base_likes(user, film)
+
+    def _liked_index(self, user: int) -> np.ndarray:
+        """Indices (triés) des films favoris d'un utilisateur."""
+        base = np.empty(0, dtype=np.int32)
+        if user < self._n_base_users:
+            start, end = self.user_films.indptr[user], self.user_films.indptr[user + 1]
+            base = self.user_films.indices[start:end]
+        delta = self._user_delta.get(user)
+        if not delta:
+            return base
+        added = [film for film, present in delta.items() if present]
+        removed = [film for film, present in delta.items() if not present]
+        return np.union1d(
+            np.setdiff1d(base, removed), np.asarray(added, dtype=np.int32)
+        )
+
+    def _base_users(self, film: int) -> np.ndarray:
+        if film >= self._n_base:
+            return np.empty(0, dtype=np.int32)
+        start, end = self.film_users.indptr[film], self.film_users.indptr[film + 1]
+        return self.film_users.indices[start:end]
+
+    def _co_occurrences(self, film: int, others: np.ndarray) -> np.ndarray:
+        """
+        Nombre d'utilisateurs ayant `film` et chacun des films `others` en
+        favori : un masque des utilisateurs de `film`, puis une lecture du
+        masque par utilisateur des autres films.
+        """
+        n_users = self._n_base_users + len(self._extra_user_ids)
+        mask = np.zeros(n_users, dtype=bool)
+        mask[self._base_users(film)] = True
+        for user, present in self._film_delta.get(film, {}).items():
+            mask[user] = present
+
+        counts = np.zeros(others.size, dtype=np.int64)
+        for i, other in enumerate(others.tolist()):
+            counts[i] = np.count_nonzero(mask[self._base_users(other)])
+            delta = self._film_delta.get(other)
+            if delta:
+                users = np.fromiter(delta, dtype=np.intp, count=len(delta))
+                sign = np.where(
+                    np.fromiter(delta.values(), dtype=bool, count=len(delta)), 1, -1
+                )
+                counts[i] += int(np.dot(mask[users], sign))
+        return counts
+
+    def _new_film(self, film_id: int) -> int:
+        """Ajoute un film inconnu ; les tableaux grandissent par doublement."""
+        idx = self.film_ids.size
+        self.film_ids = np.append(self.film_ids, np.int64(film_id))
+        self._extra_films[film_id] = idx
+        if idx >= self.neighbours.shape[0]:
+            capacity = max(2 * self.neighbours.shape[0], 16)
+            neighbours = np.full((capacity, self.k), -1, dtype=np.int32)
+            scores = np.zeros((capacity, self.k), dtype=np.float32)
+            popularity = np.zeros(capacity, dtype=np.float32)
+            neighbours[:idx], scores[:idx] = self.neighbours[:idx], self.scores[:idx]
+            popularity[:idx] = self.popularity[:idx]
+            self.neighbours, self.scores = neighbours, scores
+            self.popularity = popularity
+        return idx
+
+    def _set_delta(self, user: int, film: int, present: bool):
+        at_base = present == self._base_likes(user, film)
+        for table, key, value in (
+            (self._user_delta, user, film),
+            (self._film_delta, film, user),
+        ):
+            entries = table.setdefault(key, {})
+            if at_base:
+                entries.pop(value, None)  # retour à l'état de user_films
+            else:
+                entries[value] = present
+            if not entries:
+                del table[key]
+
+    def _set_neighbour(self, film: int, other: int, score: float):
+        """Remplace le score de `other` dans la liste de voisins de `film`."""
+        cols, vals = self.neighbours[film], self.scores[film]
+        hit = np.flatnonzero(cols == other)
+        if hit.size:
+            cols[hit[0]], vals[hit[0]] = (other, score) if score > 0 else (-1, 0.0)
+        elif score > 0:
+            slot = np.argmin(np.where(cols >= 0, vals, -1.0))
+            if cols[slot] >= 0 and vals[slot] >= score:
+                return
+            cols[slot], vals[slot] = other, score
+        else:
+            return
+        order = np.argsort(-np.where(cols >= 0, vals, -1.0), kind="stable")
+        self.neighbours[film], self.scores[film] = cols[order], vals[order]
+
+    def _sort_rows(self, rows: np.ndarray):
+        """Retrie par score décroissant les listes de voisins données."""
+        if rows.size == 0:
+            return
+        cols, vals = self.neighbours[rows], self.scores[rows]
+        order = np.argsort(-np.where(cols >= 0, vals, -1.0), axis=1, kind="stable")
+        self.neighbours[rows] = np.take_along_axis(cols, order, axis=1)
+        self.scores[rows] = np.take_along_axis(vals, order, axis=1)
+
+    def _apply(self, user: int, film: int, present: bool):
+        old_pop = float(self.popularity[film])
+        new_pop = old_pop + (1.0 if present else -1.0)
+        self._set_delta(user, film, present)
+        self.popularity[film] = new_pop
+        self.pending_events += 1
+
+        # Tous les cosinus du film sont divisés par sqrt(popularité) : ceux
+        # dont la co-occurrence ne change pas sont remis à l'échelle, dans sa
+        # ligne et dans toutes celles qui le citent (pas seulement celles de
+        # ses propres voisins : la relation des k plus proches n'est pas
+        # symétrique).
+        rows, slots = np.nonzero(self.neighbours[: self.film_ids.size] == film)
+        if new_pop > 0:
+            factor = np.float32(np.sqrt(old_pop / new_pop))
+            self.scores[film] *= factor
+            self.scores[rows, slots] *= factor
+        else:
+            self.neighbours[film], self.scores[film] = -1, 0.0
+            self.neighbours[rows, slots], self.scores[rows, slots] = -1, 0.0
+        self._sort_rows(np.unique(rows))
+
+        # Co-occurrences modifiées : le film et les autres favoris de l'utilisateur
+        others = self._liked_index(user)
+        others = others[others != film]
+        if others.size == 0:
+            return
+        common = self._co_occurrences(film, others)
+        pops = self.popularity[others]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sims = np.where(common > 0, common / np.sqrt(new_pop * pops), 0.0)
+        for other, score in zip(others.tolist(), sims.tolist(), strict=True):
+            self._set_neighbour(film, other, score)
+            self._set_neighbour(other, film, score)
+
+    def add(self, user_id: int, film_id: int) -> bool:
+        """
+        Ajoute un favori au modèle. Retourne False s'il y était déjà (une
+        même mise à jour peut donc être rejouée sans effet).
+        """
+        idx = self._film_index([film_id])
+        film = int(idx[0]) if idx.size else self._new_film(film_id)
+        user = self._user_index(user_id, create=True)
+        if self._likes(user, film):
+            return False
+        self._apply(user, film, True)
+        return True
+
+    def remove(self, user_id: int, film_id: int) -> bool:
+        """Retire un favori du modèle. Retourne False s'il n'y était pas."""
+        idx = self._film_index([film_id])
+        user = self._user_index(user_id)
+        if idx.size == 0 or user is None or not self._likes(user, int(idx[0])):
+            return False
+        self._apply(user, int(idx[0]), False)
+        return True
+
+    def compact(self) -> "ItemSimilarity":
+        """Reconstruit le modèle avec les favoris ajoutés et retirés depuis fit."""
+        coo = self.user_films.tocoo()
+        users, films = coo.row.astype(np.int64), coo.col.astype(np.int64)
+        removed = {
+            (user, film)
+            for user, delta in self._user_delta.items()
+            for film, present in delta.items()
+            if not present
+        }
+        if removed:
+            keep = np.fromiter(
+                (
+                    (u, f) not in removed
+                    for u, f in zip(users.tolist(), films.tolist(), strict=True)
+                ),
+                dtype=bool,
+                count=users.size,
+            )
+            users, films = users[keep], films[keep]
+        added = [
+            (user, film)
+            for user, delta in self._user_delta.items()
+            for film, present in delta.items()
+            if present
+        ]
+        if added:
+            users = np.concatenate([users, [u for u, _ in added]])
+            films = np.concatenate([films, [f for _, f in added]])
+        all_users = np.concatenate(
+            [self.user_ids, np.asarray(self._extra_user_ids, dtype=np.int64)]
+        )
+        return self.fit(all_users[users], self.film_ids[films])
+
+    # -----------------------------
+    # Requêtes
+    # -----------------------------
+    def _film_index(self, film_ids) -> np.ndarray:
+        """Indices internes des id_film connus (les inconnus sont ignorés)."""
+        film_ids = np.atleast_1d(np.asarray(film_ids, dtype=np.int64))
+        base = self.film_ids[: self._n_base]
+        if base.size:
+            pos = np.clip(np.searchsorted(base, film_ids), 0, base.size - 1)
+            found = base[pos] == film_ids
+        else:
+            pos = np.zeros(film_ids.size, dtype=np.intp)
+            found = np.zeros(film_ids.size, dtype=bool)
+        if self._extra_films:
+            extra = np.fromiter(
+                (self._extra_films.get(f, -1) for f in film_ids.tolist()),
+                dtype=np.intp,
+                count=film_ids.size,
+            )
+            pos = np.where(found, pos, extra)
+            found |= extra >= 0
+        return pos[found]
+
+    def similar(self, film_id: int, n: int = 10) -> list[tuple[int, float]]:
+        """Les n films les plus proches d'un film : [(id_film, score)]."""
+        idx = self._film_index([film_id])
+        if idx.size == 0:
+            return []
+        row, sc = self.neighbours[idx[0], :n], self.scores[idx[0], :n]
+        keep = row >= 0
+        return list(
+            zip(self.film_ids[row[keep]].tolist(), sc[keep].tolist(), strict=True)
+        )
+
+    def recommend(self, liked_ids, n: int = 10) -> list[tuple[int, float]]:
+        """
+        Recommande n films à partir d'une liste de films aimés : somme des
+        similarités de leurs voisins, films déjà aimés exclus.
+        """
+        liked = self._film_index(liked_ids)
+        if liked.size == 0:
+            return []
+        films, totals = aggregate_top_n(
+            self.neighbours[liked], self.scores[liked], n, exclude=liked
+        )
+        return list(zip(self.film_ids[films].tolist(), totals.tolist(), strict=True))
+
+    def liked(self, user_id: int) -> np.ndarray:
+        """id_film des favoris d'un utilisateur connu du modèle."""
+        user = self._user_index(user_id)
+        if user is None:
+            return np.empty(0, dtype=np.int64)
+        return self.film_ids[self._liked_index(user)]
+
+    def recommend_user(self, user_id: int, n: int = 10) -> list[tuple[int, float]]:
+        """Recommande n films à un utilisateur à partir de ses favoris."""
+        return self.recommend(self.liked(user_id), n)
@@ -0,0 +1,107 @@
+import math
+
+import numpy as np
+
+
+class DecayedPopularity:
+    """
+    Popularité des films avec oubli exponentiel : chaque ajout en favori
+    compte 2^(-âge / half_life), chaque retrait est soustrait de la même
+    façon (score plancher 0).
+
+    Les scores sont stockés relativement à un instant de référence t0,
+    s = Σ ± exp(λ (t - t0)) avec λ = ln 2 / half_life : le vieillissement
+    multiplie tous les scores par une même constante sans changer leur
+    ordre. Un événement ne modifie donc qu'un score, et le classement
+    (`ranked`) n'est recalculé qu'après des événements, pas à chaque lecture.
+
+    Attributs
+    ---------
+    half_life : float
+        Demi-vie d'un ajout, en secondes.
+    size : int
+        Nombre de films gardés dans le classement.
+    ranked : np.ndarray
+        id_film des `size` films les plus populaires, du premier au dernier.
+    ranked_scores : np.ndarray
+        Leurs scores relatifs à t0.
+    """
+
+    # au-delà, les scores sont ramenés à un t0 plus récent (évite l'overflow)
+    _MAX_EXPONENT = 30.0
+
+    def __init__(self, half_life: float, size: int = 100):
+        self.half_life = half_life
+        self.size = size
+        self.rate = math.log(2) / half_life
+        self.t0 = 0.0
+        self.film_ids = np.empty(0, dtype=np.int64)
+        self.scores = np.empty(0, dtype=np.float64)
+        self._positions: dict[int, int] = {}
+        self.ranked = np.empty(0, dtype=np.int64)
+        self.ranked_scores = np.empty(0, dtype=np.float64)
+
+    def fit(self, films, times, counts=None, now: float | None = None):
+        """
+        Calcule les scores à partir d'événements datés.
+
+        Paramètres
+        ----------
+        films : array-like d'entiers
+            id_film de chaque événement
+        times : array-like de réels
+            Date de chaque événement (secondes depuis l'epoch)
+        counts : array-like de réels, optionnel
+            Nombre d'ajouts (négatif pour des retraits) de chaque événement,
+            1 par défaut.
+        now : float, optionnel
+            Instant de référence t0 (dernier événement par défaut).
+        """
+        films = np.asarray(films, dtype=np.int64)
+        times = np.asarray(times, dtype=np.float64)
+        counts = (
+            np.ones(films.size) if counts is None else np.asarray(counts, np.float64)
+        )
+        if now is not None:
+            self.t0 = now
+        elif times.size:
+            self.t0 = float(times.max())
+        self.film_ids, inverse = np.unique(films, return_inverse=True)
+        weights = counts * np.exp(self.rate * (times - self.t0))
+        self.scores = np.maximum(
+            np.bincount(inverse, weights=weights, minlength=self.film_ids.size), 0.0
+        )
+        self._positions = {film: i for i, film in enumerate(self.film_ids.tolist())}
+        self.rank()
+        return self
+
+    def add(self, film_id: int, time: float, count: float = 1.0):
+        """Applique un ajout (count > 0) ou un retrait (count < 0) daté."""
+        if self.rate * (time - self.t0) > self._MAX_EXPONENT:
+            self.scores *= math.exp(-self.rate * (time - self.t0))
+            self.t0 = time
+        pos = self._positions.get(film_id)
+        if pos is None:
+            pos = self._positions[film_id] = self.film_ids.size
+            self.film_ids = np.append(self.film_ids, film_id)
+            self.scores = np.append(self.scores, 0.0)
+        weight = count * math.exp(self.rate * (time - self.t0))
+        self.scores[pos] = max(self.scores[pos] + weight, 0.0)
+
+    def rank(self) -> np.ndarray:
+        """Recalcule le classement des `size` films les plus populaires."""
+        size = min(self.size, int(np.count_nonzero(self.scores)))
+        top = np.empty(0, dtype=np.intp)
+        if size:
+            top = np.argpartition(-self.scores, size - 1)[:size]
+            top = top[np.argsort(-self.scores[top], kind="stable")]
+        self.ranked = self.film_ids[top]
+        self.ranked_scores = self.scores[top]
+        return self.ranked
+
+    def score(self, film_id: int, now: float) -> float:
+        """Score d'un film à l'instant `now` (0 s'il est inconnu)."""
+        pos = self._positions.get(film_id)
+        if pos is None:
+            return 0.0
+        return float(self.scores[pos] * math.exp(-self.rate * (now - self.t0)))
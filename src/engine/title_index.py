@@ -0,0 +1,255 @@
+import bisect
+import re
+import unicodedata
+
+import numpy as np
+
+
+_ACCENTS = re.compile(r"[\u0300-\u036f]+")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize_title(titre) -> str:
+    """
+    Forme de recherche d'un titre : minuscules, sans accents, la ponctuation
+    remplacée par des espaces (« L'Été meurtrier » -> « l ete meurtrier »).
+    """
+    text = _ACCENTS.sub("", unicodedata.normalize("NFKD", str(titre or "")))
+    return _SEPARATORS.sub(" ", text.casefold()).strip()
+
+
+def _blob(values: list[bytes]) -> tuple[bytes, np.ndarray]:
+    """Chaînes concaténées et positions de début (plus la fin de la dernière)."""
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum([len(v) for v in values], out=offsets[1:])
+    return b"".join(values), offsets
+
+
+def _splice(blob: bytes, offsets: np.ndarray, positions: list[int], values) -> tuple:
+    """Insère des chaînes aux positions données (croissantes) d'un bloc."""
+    pieces, previous = [], 0
+    for cut, value in zip(offsets[positions].tolist(), values, strict=True):
+        pieces += [blob[previous:cut], value]
+        previous = cut
+    pieces.append(blob[previous:])
+    lengths = np.insert(np.diff(offsets), positions, [len(v) for v in values])
+    offsets = np.zeros(lengths.size + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return b"".join(pieces), offsets
+
+
+class TitlePrefixIndex:
+    """
+    Autocomplétion des titres : les films dont le titre normalisé commence
+    par un préfixe, les plus populaires d'abord.
+
+    Les titres normalisés sont triés et concaténés en UTF-8 dans un seul
+    bloc d'octets, avec un tableau de positions : pas d'objet Python par
+    titre. Les titres commençant par un préfixe forment un intervalle du
+    tableau trié, trouvé par deux recherches dichotomiques. Les intervalles
+    courts (au plus `scan_limit` titres) sont classés à la volée ; le
+    classement des plus longs (préfixes d'une ou deux lettres) est calculé
+    à la première demande puis gardé.
+
+    Les films ajoutés sont gardés dans une petite liste triée, consultée à
+    chaque requête, et fusionnés au tableau tous les `merge_every` ajouts.
+
+    Attributs
+    ---------
+    film_ids : np.ndarray
+        id_film de chaque titre, dans l'ordre des titres normalisés.
+    popularity : np.ndarray
+        Popularité de chaque titre (nombre de favoris par exemple).
+    scan_limit : int
+        Taille d'intervalle au-delà de laquelle le classement est gardé.
+    max_results : int
+        Nombre de titres gardés par classement (n maximal des requêtes
+        servies par les classements gardés).
+    merge_every : int
+        Nombre d'ajouts en attente avant fusion.
+    """
+
+    def __init__(
+        self, scan_limit: int = 256, max_results: int = 20, merge_every: int = 1000
+    ):
+        self.scan_limit = scan_limit
+        self.max_results = max_results
+        self.merge_every = merge_every
+        self.film_ids = np.empty(0, dtype=np.int64)
+        self.popularity = np.empty(0, dtype=np.float32)
+        self._keys, self._key_offsets = _blob([])
+        self._titles, self._title_offsets = _blob([])
+        self._sorted_ids = np.empty(0, dtype=np.int64)
+        # films ajoutés : clés triées et (clé, titre, id_film, popularité)
+        self._pending_keys: list[bytes] = []
+        self._pending: list[tuple[bytes, str, int, float]] = []
+        self._pending_ids: set[int] = set()
+        self._top: dict[bytes, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.film_ids.size + len(self._pending)
+
+    def fit(self, films, titles, popularity=None) -> "TitlePrefixIndex":
+        """
+        Construit l'index.
+
+        Paramètres
+        ----------
+        films : array-like d'entiers
+            id_film de chaque film (sans doublons)
+        titles : list[str]
+            Titre de chaque film
+        popularity : array-like de réels, optionnel
+            Popularité de chaque film (0 par défaut)
+        """
+        films = np.asarray(films, dtype=np.int64)
+        if popularity is None:
+            popularity = np.zeros(films.size)
+        self._build(
+            [normalize_title(t).encode() for t in titles],
+            [str(t).encode() for t in titles],
+            films,
+            np.asarray(popularity, dtype=np.float32),
+        )
+        return self
+
+    def _build(self, keys, titles, films, popularity):
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys, self._key_offsets = _blob([keys[i] for i in order])
+        self._titles, self._title_offsets = _blob([titles[i] for i in order])
+        self.film_ids = films[order]
+        self.popularity = popularity[order]
+        self._sorted_ids = np.sort(self.film_ids)
+        self._pending_keys, self._pending, self._top = [], [], {}
+        self._pending_ids = set()
+
+    # -----------------------------
+    # Mises à jour
+    # -----------------------------
+    def __contains__(self, id_film: int) -> bool:
+        pos = np.searchsorted(self._sorted_ids, id_film)
+        if pos < self._sorted_ids.size and self._sorted_ids[pos] == id_film:
+            return True
+        return id_film in self._pending_ids
+
+    def add(self, id_film: int, titre: str, popularity: float = 0.0):
+        """Ajoute un film (sans effet s'il est déjà indexé)."""
+        if id_film in self:
+            return
+        key = normalize_title(titre).encode()
+        pos = bisect.bisect_right(self._pending_keys, key)
+        self._pending_keys.insert(pos, key)
+        self._pending.insert(pos, (key, titre, id_film, float(popularity)))
+        self._pending_ids.add(id_film)
+        if len(self._pending) >= self.merge_every:
+            self._merge()
+
+    def _merge(self):
+        """
+        Insère les ajouts en attente dans le tableau trié : les blocs d'octets
+        sont recopiés par tranches entre deux points d'insertion.
+        """
+        positions = [
+            bisect.bisect_right(range(self.film_ids.size), key, key=self._key)
+            for key in self._pending_keys
+        ]
+        keys, titles, films, popularity = zip(
+            *[(k, t.encode(), i, p) for k, t, i, p in self._pending], strict=True
+        )
+        self._keys, self._key_offsets = _splice(
+            self._keys, self._key_offsets, positions, keys
+        )
+        self._titles, self._title_offsets = _splice(
+            self._titles, self._title_offsets, positions, titles
+        )
+        self.film_ids = np.insert(self.film_ids, positions, films)
+        self.popularity = np.insert(self.popularity, positions, popularity)
+        self._sorted_ids = np.sort(self.film_ids)
+        self._pending_keys, self._pending, self._top = [], [], {}
+        self._pending_ids = set()
+
+    # -----------------------------
+    # Lectures
+    # -----------------------------
+    def _key(self, i: int) -> bytes:
+        return self._keys[self._key_offsets[i] : self._key_offsets[i + 1]]
+
+    def _title(self, i: int) -> str:
+        offsets = self._title_offsets
+        return self._titles[offsets[i] : offsets[i + 1]].decode()
+
+    def _range(self, prefix: bytes) -> tuple[int, int]:
+        """Intervalle [lo, hi) des titres commençant par `prefix`."""
+        keys, offsets = self._keys, memoryview(self._key_offsets)
+
+        def key(i):
+            return keys[offsets[i] : offsets[i + 1]]
+
+        positions = range(self.film_ids.size)
+        lo = bisect.bisect_left(positions, prefix, key=key)
+        # 0xff n'apparaît jamais en UTF-8 : borne supérieure des clés du préfixe
+        hi = bisect.bisect_left(positions, prefix + b"\xff", lo, key=key)
+        return lo, hi
+
+    def _best(self, lo: int, hi: int, n: int) -> np.ndarray:
+        """Positions des n titres les plus populaires de [lo, hi)."""
+        # tri stable : à popularité égale, ordre alphabétique
+        return lo + np.argsort(-self.popularity[lo:hi], kind="stable")[:n]
+
+    def complete(self, prefix: str, n: int = 10) -> list[tuple[int, str, float]]:
+        """
+        Les n films les plus populaires dont le titre commence par `prefix`
+        (comparaison sur les titres normalisés) : [(id_film, titre,
+        popularité)].
+        """
+        key = normalize_title(prefix).encode()
+        if not key or n <= 0:
+            return []
+        lo, hi = self._range(key)
+        if hi - lo > self.scan_limit and n <= self.max_results:
+            best = self._top.get(key)
+            if best is None:
+                best = self._top[key] = self._best(lo, hi, self.max_results)
+            best = best[:n]
+        else:
+            best = self._best(lo, hi, n)
+        positions = best.tolist()
+        found = list(
+            zip(
+                self.film_ids[best].tolist(),
+                [self._title(i) for i in positions],
+                self.popularity[best].tolist(),
+                strict=True,
+            )
+        )
+
+        start = bisect.bisect_left(self._pending_keys, key)
+        stop = bisect.bisect_left(self._pending_keys, key + b"\xff", start)
+        if start == stop:
+            return found
+        # ajouts en attente : classés avec les autres (popularité, puis titre)
+        ranked = [
+            (-score, self._key(i), entry)
+            for i, entry, score in zip(
+                positions, found, (f[2] for f in found), strict=True
+            )
+        ]
+        ranked += [
+            (-popularity, pending_key, (id_film, titre, popularity))
+            for pending_key, titre, id_film, popularity in self._pending[start:stop]
+        ]
+        ranked.sort(key=lambda entry: entry[:2])
+        return [entry for _, _, entry in ranked[:n]]
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire occupée par les tableaux de l'index, en octets."""
+        arrays = [
+            self.film_ids,
+            self.popularity,
+            self._key_offsets,
+            self._title_offsets,
+            self._sorted_ids,
+            *self._top.values(),
+        ]
+        return len(self._keys) + len(self._titles) + sum(a.nbytes for a in arrays)
@@ -0,0 +1,344 @@
+import re
+
+import numpy as np
+
+from src.engine.cast_graph import _gather
+from src.engine.title_index import _blob, normalize_title
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Trigrammes d'un titre normalisé, comme pg_trgm : chaque mot est
+    complété de deux espaces devant et d'un derrière (« up » -> « __u »,
+    « _up », « up_ »).
+    """
+    found = set()
+    for word in text.split():
+        padded = f"  {word} "
+        found.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return found
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int | None:
+    """
+    Distance de Levenshtein entre a et b si elle vaut au plus max_distance,
+    None sinon. Seule une bande de 2 * max_distance + 1 cases autour de la
+    diagonale est calculée, et le calcul s'arrête dès que toute la bande
+    dépasse la borne.
+    """
+    k = max_distance
+    if abs(len(a) - len(b)) > k:
+        return None
+    far = k + 1
+    previous = [j if j <= k else far for j in range(len(b) + 1)]
+    for i, char in enumerate(a, start=1):
+        current = [far] * (len(b) + 1)
+        current[0] = i if i <= k else far
+        low, high = max(1, i - k), min(len(b), i + k)
+        for j in range(low, high + 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char != b[j - 1]),
+            )
+        if min(current[low - 1 : high + 1]) > k:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= k else None
+
+
+_NUMERAL = re.compile(r"\d|^[ivxlc]+$")
+
+
+def is_typo(query: str, titre: str, min_length: int = 5) -> bool:
+    """
+    Vrai si deux titres normalisés différents peuvent être le même titre mal
+    saisi plutôt que deux titres distincts. Il faut le même nombre de mots,
+    et chaque mot qui diffère doit :
+
+    - ne contenir ni chiffre ni nombre romain (« Toy Story 2 » / « 3 ») ;
+    - compter au moins `min_length` lettres des deux côtés (« Cars » /
+      « Cats ») ;
+    - commencer par la même lettre (« Titanik » pour « Titanic », mais pas
+      « Bambi » pour « Rambo »).
+    """
+    words, others = query.split(), titre.split()
+    if len(words) != len(others):
+        return False
+    for word, other in zip(words, others, strict=True):
+        if word == other:
+            continue
+        if _NUMERAL.search(word) or _NUMERAL.search(other):
+            return False
+        if min(len(word), len(other)) < min_length:
+            return False
+        if word[0] != other[0]:
+            return False
+    return True
+
+
+class TrigramIndex:
+    """
+    Recherche approchée de titres (fautes de frappe, accents, ponctuation)
+    par trigrammes.
+
+    Chaque titre normalisé est découpé en trigrammes (voir trigrams()) ;
+    l'index inversé trigramme -> titres est stocké en CSR. Les candidats
+    d'une requête sont les titres partageant des trigrammes avec elle, lus
+    dans les listes les plus courtes d'abord dans la limite de
+    `max_postings` entrées ; les `max_candidates` titres à la similarité
+    possible la plus haute sont ensuite comparés exactement :
+
+    - similarité de Jaccard des ensembles de trigrammes (comme la fonction
+      similarity() de pg_trgm), au moins `threshold` ;
+    - puis distance d'édition bornée entre les titres normalisés, au plus
+      `max_edits`.
+
+    Les titres ajoutés reçoivent de nouvelles lignes ; leurs trigrammes sont
+    mis en attente et insérés dans le CSR tous les `merge_every` ajouts.
+
+    Attributs
+    ---------
+    film_ids : np.ndarray
+        id_film de chaque ligne.
+    sizes : np.ndarray
+        Nombre de trigrammes distincts de chaque ligne.
+    """
+
+    def __init__(
+        self,
+        max_postings: int = 50_000,
+        max_candidates: int = 100,
+        merge_every: int = 1000,
+    ):
+        self.max_postings = max_postings
+        self.max_candidates = max_candidates
+        self.merge_every = merge_every
+        self.film_ids = np.empty(0, dtype=np.int64)
+        self.sizes = np.empty(0, dtype=np.int32)
+        self._codes: dict[str, int] = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.rows = np.empty(0, dtype=np.int32)
+        self._keys, self._key_offsets = _blob([])
+        self._sorted_ids = np.empty(0, dtype=np.int64)
+        # titres ajoutés, pas encore dans le CSR : clés, id_film, nombres de
+        # trigrammes, et lignes par code de trigramme
+        self._new_keys: list[bytes] = []
+        self._new_ids: list[int] = []
+        self._new_sizes: list[int] = []
+        self._new_rows: dict[int, list[int]] = {}
+
+    def __len__(self) -> int:
+        return self.film_ids.size + len(self._new_ids)
+
+    def _code(self, trigram: str) -> int:
+        code = self._codes.get(trigram)
+        if code is None:
+            code = self._codes[trigram] = len(self._codes)
+        return code
+
+    def fit(self, films, titles) -> "TrigramIndex":
+        """
+        Construit l'index.
+
+        Paramètres
+        ----------
+        films : array-like d'entiers
+            id_film de chaque film (sans doublons)
+        titles : list[str]
+            Titre de chaque film
+        """
+        keys = [normalize_title(t) for t in titles]
+        codes, sizes = [], []
+        # les mots reviennent d'un titre à l'autre : trigrammes calculés une fois
+        words: dict[str, set[int]] = {}
+        for key in keys:
+            grams = set()
+            for word in key.split():
+                found = words.get(word)
+                if found is None:
+                    found = words[word] = {self._code(g) for g in trigrams(word)}
+                grams |= found
+            codes += grams
+            sizes.append(len(grams))
+        self.film_ids = np.asarray(films, dtype=np.int64)
+        self.sizes = np.asarray(sizes, dtype=np.int32)
+        self._keys, self._key_offsets = _blob([k.encode() for k in keys])
+        self._sorted_ids = np.sort(self.film_ids)
+
+        codes = np.asarray(codes, dtype=np.int64)
+        rows = np.repeat(np.arange(len(keys), dtype=np.int32), sizes)
+        order = np.argsort(codes, kind="stable")
+        self.rows = rows[order]
+        self.indptr = np.zeros(len(self._codes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(self._codes)), out=self.indptr[1:])
+        return self
+
+    # -----------------------------
+    # Mises à jour
+    # -----------------------------
+    def __contains__(self, id_film: int) -> bool:
+        pos = np.searchsorted(self._sorted_ids, id_film)
+        if pos < self._sorted_ids.size and self._sorted_ids[pos] == id_film:
+            return True
+        return id_film in self._new_ids
+
+    def add(self, id_film: int, titre: str):
+        """Ajoute un titre (sans effet si le film est déjà indexé)."""
+        if id_film in self:
+            return
+        key = normalize_title(titre)
+        row = len(self)
+        grams = trigrams(key)
+        for gram in grams:
+            self._new_rows.setdefault(self._code(gram), []).append(row)
+        self._new_keys.append(key.encode())
+        self._new_ids.append(id_film)
+        self._new_sizes.append(len(grams))
+        if len(self._new_ids) >= self.merge_every:
+            self._merge()
+
+    def _merge(self):
+        """
+        Insère les trigrammes des titres ajoutés dans le CSR : leurs lignes
+        étant les plus grandes, elles vont en fin de liste de chaque
+        trigramme, et une seule copie des tableaux suffit.
+        """
+        pairs = np.asarray(
+            [
+                (code, row)
+                for code in sorted(self._new_rows)
+                for row in self._new_rows[code]
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        n_codes = len(self._codes)
+        indptr = np.append(
+            self.indptr, np.full(n_codes + 1 - self.indptr.size, self.indptr[-1])
+        )
+        self.rows = np.insert(
+            self.rows, indptr[pairs[:, 0] + 1], pairs[:, 1].astype(np.int32)
+        )
+        counts = np.bincount(pairs[:, 0], minlength=n_codes)
+        self.indptr = indptr + np.concatenate(([0], np.cumsum(counts)))
+
+        self._keys += b"".join(self._new_keys)
+        lengths = np.cumsum([len(k) for k in self._new_keys])
+        self._key_offsets = np.append(
+            self._key_offsets, self._key_offsets[-1] + lengths
+        )
+        self.film_ids = np.append(self.film_ids, self._new_ids)
+        self.sizes = np.append(self.sizes, np.asarray(self._new_sizes, dtype=np.int32))
+        self._sorted_ids = np.sort(self.film_ids)
+        self._new_keys, self._new_ids, self._new_rows = [], [], {}
+        self._new_sizes = []
+
+    # -----------------------------
+    # Lectures
+    # -----------------------------
+    def _key(self, row: int) -> str:
+        merged = self._key_offsets.size - 1
+        if row >= merged:
+            return self._new_keys[row - merged].decode()
+        return self._keys[self._key_offsets[row] : self._key_offsets[row + 1]].decode()
+
+    def _film_id(self, row: int) -> int:
+        merged = self.film_ids.size
+        return self._new_ids[row - merged] if row >= merged else int(self.film_ids[row])
+
+    def _sizes(self, rows: np.ndarray) -> np.ndarray:
+        merged = rows < self.sizes.size
+        sizes = np.empty(rows.size, dtype=np.int64)
+        sizes[merged] = self.sizes[rows[merged]]
+        sizes[~merged] = [self._new_sizes[r - self.sizes.size] for r in rows[~merged]]
+        return sizes
+
+    def _candidates(self, codes: list[int], size: int) -> np.ndarray:
+        """
+        Lignes les plus similaires d'après les trigrammes lus (listes courtes
+        d'abord), pour une requête de `size` trigrammes : classées par la
+        similarité maximale compatible avec les trigrammes lus.
+        """
+        pending = [row for code in codes for row in self._new_rows.get(code, [])]
+        # les trigrammes apparus depuis la dernière fusion n'ont pas de liste
+        codes = np.asarray(codes, dtype=np.int64)
+        codes = codes[codes < self.indptr.size - 1]
+        lengths = self.indptr[codes + 1] - self.indptr[codes]
+        order = np.argsort(lengths, kind="stable")
+        within = np.cumsum(lengths[order]) <= self.max_postings
+        if within.size:
+            # au moins le trigramme le plus rare, même si sa liste dépasse la limite
+            within[0] = True
+        rows, _ = _gather(self.indptr, self.rows, codes[order[within]])
+        rows = np.concatenate((rows, np.asarray(pending, dtype=np.int32)))
+        if rows.size == 0:
+            return rows
+        found, counts = np.unique(rows, return_counts=True)
+        if found.size > self.max_candidates:
+            # similarité maximale possible si les trigrammes non lus sont communs
+            sizes = self._sizes(found)
+            common = np.minimum(counts + np.count_nonzero(~within), sizes)
+            scores = common / (size + sizes - common)
+            best = np.argpartition(-scores, self.max_candidates - 1)
+            found = found[best[: self.max_candidates]]
+        return found
+
+    def search(self, titre: str, n: int = 5) -> list[tuple[int, str, float]]:
+        """
+        Les n titres les plus proches, du plus au moins similaire :
+        [(id_film, titre normalisé, similarité de Jaccard des trigrammes)].
+        """
+        key = normalize_title(titre)
+        grams = trigrams(key)
+        codes = [self._codes[g] for g in grams if g in self._codes]
+        if not codes:
+            return []
+        scored = []
+        candidates = self._candidates(codes, len(grams))
+        for row, size in zip(
+            candidates.tolist(), self._sizes(candidates).tolist(), strict=True
+        ):
+            other = self._key(row)
+            common = len(grams & trigrams(other))
+            similarity = common / (len(grams) + size - common)
+            scored.append((-similarity, other, self._film_id(row)))
+        scored.sort()
+        return [(film, other, -score) for score, other, film in scored[:n]]
+
+    def match(
+        self, titre: str, threshold: float = 0.5, max_edits: int = 2
+    ) -> tuple[int, float, int] | None:
+        """
+        Le titre égal au titre normalisé demandé, ou à défaut le plus proche
+        dont la similarité atteint `threshold`, la distance d'édition (entre
+        titres normalisés) ne dépasse pas `max_edits` et dont l'écart ressemble
+        à une faute de frappe (voir is_typo()) : (id_film, similarité,
+        distance), ou None.
+        """
+        key = normalize_title(titre)
+        verified = []
+        for id_film, other, similarity in self.search(titre, n=self.max_candidates):
+            if similarity < threshold:
+                break
+            if other == key:
+                return id_film, similarity, 0
+            distance = edit_distance(key, other, max_edits)
+            if distance is not None and is_typo(key, other):
+                verified.append((-similarity, distance, id_film))
+        if not verified:
+            return None
+        similarity, distance, id_film = min(verified)
+        return id_film, -similarity, distance
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire occupée par les tableaux de l'index, en octets."""
+        arrays = [
+            self.film_ids,
+            self.sizes,
+            self.indptr,
+            self.rows,
+            self._key_offsets,
+            self._sorted_ids,
+        ]
+        return len(self._keys) + sum(a.nbytes for a in arrays)
@@ -0,0 +1,170 @@
+import numpy as np
+
+from src.engine.cast_graph import _gather
+
+
+class UserSimilarity:
+    """
+    Similarité des goûts entre utilisateurs (« les gens comme vous »), à
+    partir des ensembles de favoris.
+
+    Les favoris de chaque utilisateur sont un tableau trié de numéros de
+    films (CSR `indptr` / `indices`), et l'index inversé film -> utilisateurs
+    a la même forme. Les candidats d'une requête sont les utilisateurs ayant
+    au moins un favori en commun : ils sont pris dans les listes des films
+    les plus rares d'abord, dans la limite de `max_postings` entrées, pour
+    ne pas parcourir les listes des films que tout le monde a aimés. Les
+    intersections exactes sont ensuite comptées en une opération vectorisée
+    sur les favoris des meilleurs candidats.
+
+    Attributs
+    ---------
+    metric : str
+        "jaccard" (|A ∩ B| / |A ∪ B|) ou "cosine" (|A ∩ B| / √(|A| |B|)).
+    max_postings : int
+        Nombre maximal d'entrées de l'index inversé lues par requête.
+    max_candidates : int
+        Nombre maximal de candidats dont l'intersection exacte est calculée.
+    """
+
+    def __init__(
+        self,
+        metric: str = "jaccard",
+        max_postings: int = 200_000,
+        max_candidates: int = 5_000,
+    ):
+        if metric not in ("jaccard", "cosine"):
+            raise ValueError("metric doit valoir 'jaccard' ou 'cosine'")
+        self.metric = metric
+        self.max_postings = max_postings
+        self.max_candidates = max_candidates
+        self.user_ids = np.empty(0, dtype=np.int64)
+        self.film_ids = np.empty(0, dtype=np.int64)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.empty(0, dtype=np.int32)
+        self.film_indptr = np.zeros(1, dtype=np.int64)
+        self.film_users = np.empty(0, dtype=np.int32)
+
+    def fit(self, users, films) -> "UserSimilarity":
+        """
+        Construit les ensembles de favoris et l'index inversé.
+
+        Paramètres
+        ----------
+        users : array-like d'entiers
+            id_user de chaque favori
+        films : array-like d'entiers
+            id_film de chaque favori
+        """
+        users = np.asarray(users, dtype=np.int64)
+        films = np.asarray(films, dtype=np.int64)
+        self.user_ids, user_rows = np.unique(users, return_inverse=True)
+        self.film_ids, film_cols = np.unique(films, return_inverse=True)
+        n_users, n_films = self.user_ids.size, self.film_ids.size
+
+        pairs = np.unique(user_rows * n_films + film_cols)
+        user_rows, film_cols = pairs // n_films, pairs % n_films
+        # couples triés par utilisateur puis film : favoris triés par ligne
+        self.indices = film_cols.astype(np.int32)
+        self.indptr = np.zeros(n_users + 1, dtype=np.int64)
+        np.cumsum(np.bincount(user_rows, minlength=n_users), out=self.indptr[1:])
+
+        order = np.argsort(film_cols, kind="stable")
+        self.film_users = user_rows[order].astype(np.int32)
+        self.film_indptr = np.zeros(n_films + 1, dtype=np.int64)
+        np.cumsum(np.bincount(film_cols, minlength=n_films), out=self.film_indptr[1:])
+        return self
+
+    # -----------------------------
+    # Correspondances
+    # -----------------------------
+    def _user_row(self, user_id: int) -> int | None:
+        pos = np.searchsorted(self.user_ids, user_id)
+        if pos < self.user_ids.size and self.user_ids[pos] == user_id:
+            return int(pos)
+        return None
+
+    def liked(self, user_id: int) -> np.ndarray:
+        """id_film des favoris d'un utilisateur (triés)."""
+        row = self._user_row(user_id)
+        if row is None:
+            return np.empty(0, dtype=np.int64)
+        return self.film_ids[self.indices[self.indptr[row] : self.indptr[row + 1]]]
+
+    # -----------------------------
+    # Requêtes
+    # -----------------------------
+    def _candidates(self, row: int, films: np.ndarray) -> np.ndarray:
+        """Utilisateurs partageant un favori, pris dans les films rares d'abord."""
+        lengths = self.film_indptr[films + 1] - self.film_indptr[films]
+        order = np.argsort(lengths, kind="stable")
+        within = np.cumsum(lengths[order]) <= self.max_postings
+        # au moins le film le plus rare, même si sa liste dépasse la limite
+        within[0] = True
+        users, _ = _gather(self.film_indptr, self.film_users, films[order[within]])
+        found, counts = np.unique(users, return_counts=True)
+        keep = found != row
+        found, counts = found[keep], counts[keep]
+        if found.size > self.max_candidates:
+            best = np.argpartition(-counts, self.max_candidates - 1)
+            found = np.sort(found[best[: self.max_candidates]])
+        return found
+
+    def _neighbours(self, user_id: int, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """(lignes, similarités) des k utilisateurs les plus proches."""
+        row = self._user_row(user_id)
+        empty = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        if row is None:
+            return empty
+        films = self.indices[self.indptr[row] : self.indptr[row + 1]]
+        candidates = self._candidates(row, films)
+        if candidates.size == 0:
+            return empty
+
+        # intersections exactes : favoris des candidats marqués s'ils sont communs
+        mine = np.zeros(self.film_ids.size, dtype=bool)
+        mine[films] = True
+        sizes = self.indptr[candidates + 1] - self.indptr[candidates]
+        theirs, _ = _gather(self.indptr, self.indices, candidates)
+        common = np.add.reduceat(
+            mine[theirs].astype(np.float64), np.cumsum(sizes) - sizes
+        )
+        if self.metric == "jaccard":
+            scores = common / (films.size + sizes - common)
+        else:
+            scores = common / np.sqrt(films.size * sizes)
+
+        k = min(k, candidates.size)
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        keep = scores[best] > 0
+        return candidates[best[keep]], scores[best[keep]]
+
+    def similar_users(self, user_id: int, k: int = 10) -> list[tuple[int, float]]:
+        """Les k utilisateurs aux favoris les plus proches : [(id_user, similarité)]."""
+        rows, scores = self._neighbours(user_id, k)
+        return list(zip(self.user_ids[rows].tolist(), scores.tolist(), strict=True))
+
+    def recommend(
+        self, user_id: int, n: int = 10, k: int = 50
+    ) -> list[tuple[int, float]]:
+        """
+        Films aimés par les k voisins d'un utilisateur et pas par lui :
+        [(id_film, somme des similarités des voisins qui l'aiment)].
+        """
+        rows, scores = self._neighbours(user_id, k)
+        if rows.size == 0:
+            return []
+        films, _ = _gather(self.indptr, self.indices, rows)
+        weights = np.repeat(scores, self.indptr[rows + 1] - self.indptr[rows])
+        totals = np.bincount(films, weights=weights, minlength=self.film_ids.size)
+        row = self._user_row(user_id)
+        totals[self.indices[self.indptr[row] : self.indptr[row + 1]]] = 0
+        n = min(n, int(np.count_nonzero(totals)))
+        if n == 0:
+            return []
+        best = np.argpartition(-totals, n - 1)[:n]
+        best = best[np.argsort(-totals[best], kind="stable")]
+        return list(
+            zip(self.film_ids[best].tolist(), totals[best].tolist(), strict=True)
+        )
@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+
+import dotenv
+
+from src.business_object.film import Film
+from src.dao.film_dao import FilmDAO
+from src.dao.user_dao import UserDao
+from src.engine.title_index import TitlePrefixIndex
+from src.utils.env import getenv
+
+
+class AutocompleteService:
+    """
+    Autocomplétion des titres du catalogue local, les films les plus mis en
+    favori d'abord, sans requête en base ni appel à TMDB.
+
+    L'index des titres (voir src/engine/title_index.py) est construit à
+    partir de FILM et du nombre de favoris de chaque film, puis complété à
+    chaque film ajouté par ce processus (le service partagé est inscrit
+    auprès de FilmDAO). Il est reconstruit au plus toutes les
+    AUTOCOMPLETE_REFRESH_INTERVAL secondes (10 min par défaut), ce qui met
+    aussi à jour la popularité des films.
+
+    Attributs
+    ---------
+    refresh_interval : float
+        Âge maximal de l'index, en secondes.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        film_dao: FilmDAO = None,
+        user_dao: UserDao = None,
+        refresh_interval: float | None = None,
+    ):
+        dotenv.load_dotenv()
+        self.film_dao: FilmDAO = film_dao if film_dao else FilmDAO()
+        self.user_dao: UserDao = user_dao if user_dao else UserDao()
+        self.refresh_interval = (
+            refresh_interval
+            if refresh_interval is not None
+            else float(getenv("AUTOCOMPLETE_REFRESH_INTERVAL", "600"))
+        )
+        self._index: TitlePrefixIndex | None = None
+        self._built_at: float | None = None
+        self._lock = threading.Lock()
+        # l'index garde des classements et des ajouts en attente : accès exclusif
+        self._index_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "AutocompleteService":
+        """Retourne le service partagé par tous les clients du processus."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                FilmDAO.subscribe(cls._shared)
+            return cls._shared
+
+    def refresh(self):
+        """Reconstruit l'index à partir de FILM et FAVORIS et le met en service."""
+        start = time.monotonic()
+        films = self.film_dao.get_films_by_id()
+        counts = dict(self.user_dao.get_favorites_counts())
+        index = TitlePrefixIndex().fit(
+            list(films),
+            [film.titre for film in films.values()],
+            [counts.get(id_film, 0) for id_film in films],
+        )
+        with self._index_lock:
+            self._index = index
+        self._built_at = time.monotonic()
+        logging.info(
+            f"Index des titres construit : {len(films)} films "
+            f"({index.nbytes / 1e6:.1f} Mo) en {self._built_at - start:.2f}s"
+        )
+
+    def _get_index(self) -> TitlePrefixIndex:
+        """Index courant, reconstruit s'il est absent ou périmé."""
+        stale = (
+            self._built_at is None
+            or time.monotonic() - self._built_at > self.refresh_interval
+        )
+        if stale and self._lock.acquire(blocking=self._index is None):
+            try:
+                if self._built_at is None or (
+                    time.monotonic() - self._built_at > self.refresh_interval
+                ):
+                    self.refresh()
+            finally:
+                self._lock.release()
+        return self._index
+
+    def film_added(self, id_film: int | None, film: Film):
+        """Indexe un film ajouté en base (ignoré tant que l'index n'est pas construit)."""
+        if id_film is None or self._index is None:
+            return
+        with self._index_lock:
+            self._index.add(id_film, film.titre)
+
+    def complete(self, prefix: str, n: int = 10) -> list[tuple[str, int]]:
+        """
+        Les n titres commençant par `prefix` (sans tenir compte de la casse,
+        des accents ni de la ponctuation), avec leur nombre de favoris.
+        """
+        index = self._get_index()
+        with self._index_lock:
+            found = index.complete(prefix, n)
+        return [(titre, int(count)) for _, titre, count in found]
@@ -0,0 +1,136 @@
+import logging
+import threading
+import time
+
+import dotenv
+
+from src.business_object.actor import Actor
+from src.business_object.film import Film
+from src.dao.actor_dao import ActorDAO
+from src.dao.film_dao import FilmDAO
+from src.engine.cast_graph import CastGraph
+from src.utils.env import getenv
+
+
+class CastGraphService:
+    """
+    Requêtes sur le graphe acteurs – films (partenaires, degrés de
+    séparation).
+
+    Le graphe (voir src/engine/cast_graph.py) est construit en mémoire à
+    partir de CASTING, puis reconstruit au plus toutes les
+    CAST_GRAPH_REFRESH_INTERVAL secondes (1h par défaut). Les castings
+    ajoutés par ce processus y sont ajoutés sans reconstruction (le service
+    partagé est inscrit auprès de FilmDAO). Les requêtes ne lisent en base
+    que les noms des acteurs et titres des films retournés.
+
+    Attributs
+    ---------
+    refresh_interval : float
+        Âge maximal du graphe, en secondes.
+    max_degrees : int
+        Degré de séparation maximal recherché (CAST_GRAPH_MAX_DEGREES, 6).
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        actor_dao: ActorDAO = None,
+        film_dao: FilmDAO = None,
+        refresh_interval: float | None = None,
+    ):
+        dotenv.load_dotenv()
+        self.actor_dao: ActorDAO = actor_dao if actor_dao else ActorDAO()
+        self.film_dao: FilmDAO = film_dao if film_dao else FilmDAO()
+        self.refresh_interval = (
+            refresh_interval
+            if refresh_interval is not None
+            else float(getenv("CAST_GRAPH_REFRESH_INTERVAL", "3600"))
+        )
+        self.max_degrees = int(getenv("CAST_GRAPH_MAX_DEGREES", "6"))
+        self._graph: CastGraph | None = None
+        self._built_at: float | None = None
+        self._lock = threading.Lock()
+        # le graphe garde des ajouts à part et les lit avec le CSR : accès exclusif
+        self._graph_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "CastGraphService":
+        """Retourne le service partagé par tous les clients du processus."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                FilmDAO.subscribe(cls._shared)
+            return cls._shared
+
+    def refresh(self):
+        """Reconstruit le graphe à partir de CASTING et le met en service."""
+        start = time.monotonic()
+        pairs = self.film_dao.get_casting_pairs()
+        graph = CastGraph().fit([p[0] for p in pairs], [p[1] for p in pairs])
+        with self._graph_lock:
+            self._graph = graph
+        self._built_at = time.monotonic()
+        logging.info(
+            f"Graphe des acteurs construit : {len(pairs)} rôles "
+            f"en {self._built_at - start:.2f}s"
+        )
+
+    def casting_added(self, id_film: int | None, actors: list[int]):
+        """Ajoute un casting au graphe (ignoré tant qu'il n'est pas construit)."""
+        if id_film is None or self._graph is None:
+            return
+        with self._graph_lock:
+            self._graph.add(id_film, actors)
+
+    def _get_graph(self) -> CastGraph:
+        """Graphe courant, reconstruit s'il est absent ou périmé."""
+        stale = (
+            self._built_at is None
+            or time.monotonic() - self._built_at > self.refresh_interval
+        )
+        if stale and self._lock.acquire(blocking=self._graph is None):
+            try:
+                if self._built_at is None or (
+                    time.monotonic() - self._built_at > self.refresh_interval
+                ):
+                    self.refresh()
+            finally:
+                self._lock.release()
+        return self._graph
+
+    def co_stars(self, actor: Actor, n: int = 20) -> list[tuple[Actor, int]] | None:
+        """
+        Les n acteurs ayant le plus souvent joué avec `actor`, avec le nombre
+        de films en commun. None si l'acteur est inconnu.
+        """
+        id_actor = self.actor_dao.find_id(actor)
+        if id_actor is None:
+            return None
+        graph = self._get_graph()
+        with self._graph_lock:
+            partners = graph.co_stars(id_actor, n)
+        actors = self.actor_dao.get_actors_by_id([p for p, _ in partners])
+        return [(actors[p], count) for p, count in partners if p in actors]
+
+    def separation(self, actor: Actor, other: Actor) -> list[Actor | Film] | None:
+        """
+        Plus court chemin entre deux acteurs : acteurs et films alternés,
+        de `actor` à `other`. Liste vide s'ils ne sont pas reliés en moins de
+        max_degrees films, None si l'un d'eux est inconnu.
+        """
+        ids = self.actor_dao.find_id(actor), self.actor_dao.find_id(other)
+        if None in ids:
+            return None
+        graph = self._get_graph()
+        with self._graph_lock:
+            path = graph.shortest_path(*ids, max_degrees=self.max_degrees)
+        if path is None:
+            return []
+        actors = self.actor_dao.get_actors_by_id(
+            [i for kind, i in path if kind == "actor"]
+        )
+        films = self.film_dao.get_films_by_id([i for kind, i in path if kind == "film"])
+        return [actors.get(i) if kind == "actor" else films.get(i) for kind, i in path]
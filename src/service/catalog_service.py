@@ -0,0 +1,190 @@
+import logging
+import threading
+import time
+
+import dotenv
+
+from src.business_object.actor import Actor
+from src.business_object.film import Film
+from src.dao.actor_dao import ActorDAO
+from src.dao.film_dao import FilmDAO
+from src.engine.catalog_index import CatalogIndex
+from src.utils.env import getenv
+
+
+class CatalogService:
+    """
+    Recherche dans le catalogue local par genre, réalisateur, années et
+    acteurs, avec le nombre de films trouvés par genre, décennie et
+    réalisateur (facettes), sans requête de filtrage ni GROUP BY en base.
+
+    L'index (listes inversées et colonnes, voir src/engine/catalog_index.py)
+    est construit à partir de FILM et CASTING, puis tenu à jour à chaque film
+    ou casting ajouté par ce processus (le service partagé est inscrit auprès
+    de FilmDAO). Il est aussi reconstruit au plus toutes les
+    CATALOG_REFRESH_INTERVAL secondes (10 min par défaut), pour les ajouts
+    faits par les autres processus. Une recherche ne lit en base que
+    l'identifiant des acteurs demandés et les films de la page retournée.
+
+    Attributs
+    ---------
+    refresh_interval : float
+        Âge maximal de l'index, en secondes.
+    facet_size : int
+        Nombre de réalisateurs retournés dans les facettes
+        (CATALOG_FACET_SIZE, 10 par défaut).
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        film_dao: FilmDAO = None,
+        actor_dao: ActorDAO = None,
+        refresh_interval: float | None = None,
+    ):
+        dotenv.load_dotenv()
+        self.film_dao: FilmDAO = film_dao if film_dao else FilmDAO()
+        self.actor_dao: ActorDAO = actor_dao if actor_dao else ActorDAO()
+        self.refresh_interval = (
+            refresh_interval
+            if refresh_interval is not None
+            else float(getenv("CATALOG_REFRESH_INTERVAL", "600"))
+        )
+        self.facet_size = int(getenv("CATALOG_FACET_SIZE", "10"))
+        self._index: CatalogIndex | None = None
+        self._built_at: float | None = None
+        self._lock = threading.Lock()
+        # l'index fusionne ses ajouts en attente à la lecture : accès exclusif
+        self._index_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "CatalogService":
+        """Retourne le service partagé par tous les clients du processus."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                FilmDAO.subscribe(cls._shared)
+            return cls._shared
+
+    def refresh(self):
+        """Reconstruit l'index à partir de FILM et CASTING et le met en service."""
+        start = time.monotonic()
+        films = self.film_dao.get_films_by_id()
+        pairs = self.film_dao.get_casting_pairs()
+        index = CatalogIndex().fit(
+            list(films),
+            [film.realisateur for film in films.values()],
+            [film.genre for film in films.values()],
+            [p[0] for p in pairs],
+            [p[1] for p in pairs],
+            years=[film.annee for film in films.values()],
+        )
+        with self._index_lock:
+            self._index = index
+        self._built_at = time.monotonic()
+        logging.info(
+            f"Index du catalogue construit : {len(films)} films, {len(pairs)} rôles "
+            f"en {self._built_at - start:.2f}s"
+        )
+
+    def _get_index(self) -> CatalogIndex:
+        """Index courant, reconstruit s'il est absent ou périmé."""
+        stale = (
+            self._built_at is None
+            or time.monotonic() - self._built_at > self.refresh_interval
+        )
+        if stale and self._lock.acquire(blocking=self._index is None):
+            try:
+                if self._built_at is None or (
+                    time.monotonic() - self._built_at > self.refresh_interval
+                ):
+                    self.refresh()
+            finally:
+                self._lock.release()
+        return self._index
+
+    # -----------------------------
+    # Mises à jour (FilmDAO)
+    # -----------------------------
+    def film_added(self, id_film: int | None, film: Film):
+        """Indexe un film ajouté en base (ignoré tant que l'index n'est pas construit)."""
+        if id_film is None or self._index is None:
+            return
+        with self._index_lock:
+            self._index.add_film(id_film, film.realisateur, film.genre, film.annee)
+
+    def casting_added(self, id_film: int | None, actors: list[int]):
+        """Indexe les acteurs ajoutés au casting d'un film."""
+        if id_film is None or self._index is None:
+            return
+        with self._index_lock:
+            self._index.add_casting(id_film, actors)
+
+    # -----------------------------
+    # Recherche
+    # -----------------------------
+    def search_ids(
+        self,
+        genres: list[str] | None = None,
+        realisateur: str | None = None,
+        acteurs: list[Actor] | None = None,
+        annees: tuple[int | None, int | None] = (None, None),
+    ) -> list[int]:
+        """
+        id_film (croissants) des films ayant tous les genres, le réalisateur
+        et tous les acteurs demandés, sortis entre annees[0] et annees[1].
+        Liste vide si un acteur est inconnu.
+        """
+        return self.search(genres, realisateur, acteurs, annees, limit=None)[1]
+
+    def search(
+        self,
+        genres: list[str] | None = None,
+        realisateur: str | None = None,
+        acteurs: list[Actor] | None = None,
+        annees: tuple[int | None, int | None] = (None, None),
+        limit: int | None = 20,
+        offset: int = 0,
+        facets: bool = False,
+    ) -> tuple[int, list[int], dict]:
+        """
+        Recherche paginée dans l'index.
+
+        Retour
+        ------
+        tuple[int, list[int], dict]
+            Nombre total de films trouvés, id_film de la page (croissants),
+            et facettes des films trouvés si `facets` (voir
+            CatalogIndex.facets), {} sinon.
+        """
+        actor_ids = [self.actor_dao.find_id(actor) for actor in acteurs or []]
+        if None in actor_ids:
+            return 0, [], {}
+        index = self._get_index()
+        with self._index_lock:
+            rows = index.select(genres or [], realisateur, actor_ids, annees)
+            stop = None if limit is None else offset + limit
+            page = index.film_ids[rows[offset:stop]].tolist()
+            found = index.facets(rows, self.facet_size) if facets else {}
+        return rows.size, page, found
+
+    def search_films(
+        self,
+        genres: list[str] | None = None,
+        realisateur: str | None = None,
+        acteurs: list[Actor] | None = None,
+        annees: tuple[int | None, int | None] = (None, None),
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[int, list[Film], dict]:
+        """
+        Recherche paginée avec facettes : (nombre total de films trouvés,
+        films de la page, facettes).
+        """
+        total, page, found = self.search(
+            genres, realisateur, acteurs, annees, limit, offset, facets=True
+        )
+        films = self.film_dao.get_films_by_id(page)
+        return total, [films[i] for i in page if i in films], found
@@ -0,0 +1,145 @@
+from collections import OrderedDict
+import threading
+import time
+
+import dotenv
+
+from src.business_object.film import Film
+from src.utils.env import getenv
+
+
+class FavoritesCache:
+    """
+    Cache borné (LRU) des listes de favoris, par pseudo.
+
+    Chaque pseudo a un numéro de version, incrémenté à chaque écriture
+    (invalidate). Un lecteur relève la version avant de lire la base et ne
+    remplit le cache que si elle n'a pas changé entre-temps : un remplissage
+    tardif ne peut donc pas écraser une donnée plus récente.
+
+    Les versions ne voient que les écritures du processus : une entrée peut
+    aussi porter le dernier changement FAVORIS_LOG relevé avant la lecture,
+    et n'est alors servie qu'à un lecteur qui relève le même (une écriture
+    faite par un autre worker la périme aussitôt).
+
+    Attributs
+    ---------
+    max_entries : int
+        Nombre maximal de listes gardées (FAVORITES_CACHE_MAX).
+    ttl : float
+        Durée de vie d'une entrée en secondes (FAVORITES_CACHE_TTL). Borne le
+        retard vis-à-vis des écritures faites par un autre processus.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_entries: int | None = None, ttl: float | None = None):
+        dotenv.load_dotenv()
+        if max_entries is None:
+            max_entries = int(getenv("FAVORITES_CACHE_MAX", "10000"))
+        if ttl is None:
+            ttl = float(getenv("FAVORITES_CACHE_TTL", "60"))
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[int, float, list[Film], int | None]] = (
+            OrderedDict()
+        )
+        # Versions gardées pour 4x plus de pseudos que d'entrées ; une version
+        # oubliée vaut `_floor`, toujours >= à toute version déjà distribuée.
+        self._versions: OrderedDict[str, int] = OrderedDict()
+        self._counter = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "fills": 0,
+            "stale_fills": 0,
+            "invalidations": 0,
+            "evictions": 0,
+        }
+
+    @classmethod
+    def shared(cls) -> "FavoritesCache":
+        """Retourne le cache partagé par tous les services du processus."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _version(self, pseudo: str) -> int:
+        return self._versions.get(pseudo, self._floor)
+
+    def version(self, pseudo: str) -> int:
+        """Version courante des favoris d'un utilisateur."""
+        with self._lock:
+            return self._version(pseudo)
+
+    def get(self, pseudo: str, change: int | None = None) -> list[Film] | None:
+        """
+        Retourne une copie de la liste en cache, ou None (absente/périmée, ou
+        remplie pour un autre dernier changement que `change` s'il est donné).
+        """
+        with self._lock:
+            entry = self._entries.get(pseudo)
+            if entry is not None:
+                version, filled_at, films, filled_change = entry
+                if (
+                    version == self._version(pseudo)
+                    and time.monotonic() - filled_at <= self.ttl
+                    and (change is None or change == filled_change)
+                ):
+                    self._entries.move_to_end(pseudo)
+                    self._stats["hits"] += 1
+                    return list(films)
+                del self._entries[pseudo]
+            self._stats["misses"] += 1
+            return None
+
+    def fill(
+        self, pseudo: str, films: list[Film], version: int, change: int | None = None
+    ) -> bool:
+        """
+        Met en cache la liste lue pour `version` (et le dernier changement
+        `change` relevé avant la lecture). Refusé (False) si les favoris ont
+        été modifiés depuis que cette version a été relevée.
+        """
+        with self._lock:
+            if version != self._version(pseudo):
+                self._stats["stale_fills"] += 1
+                return False
+            self._entries[pseudo] = (version, time.monotonic(), list(films), change)
+            self._entries.move_to_end(pseudo)
+            self._stats["fills"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+            return True
+
+    def invalidate(self, pseudo: str) -> int:
+        """
+        Signale une écriture sur les favoris d'un utilisateur : l'entrée est
+        supprimée et la version incrémentée. Retourne la nouvelle version.
+        """
+        with self._lock:
+            self._counter = max(self._counter, self._floor) + 1
+            self._versions[pseudo] = self._counter
+            self._versions.move_to_end(pseudo)
+            while len(self._versions) > 4 * self.max_entries:
+                _, dropped = self._versions.popitem(last=False)
+                self._floor = max(self._floor, dropped)
+            self._entries.pop(pseudo, None)
+            self._stats["invalidations"] += 1
+            return self._counter
+
+    def metrics(self) -> dict:
+        """Compteurs du cache et taux de succès des lectures."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        return stats
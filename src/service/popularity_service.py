@@ -0,0 +1,171 @@
+from datetime import datetime, timezone
+import logging
+import threading
+import time
+
+import dotenv
+
+from src.business_object.film import Film
+from src.dao.film_dao import FilmDAO
+from src.dao.user_dao import UserDao
+from src.engine.popularity import DecayedPopularity
+from src.utils.env import getenv
+
+
+def _timestamp(day: str) -> float:
+    """Milieu (UTC) du jour 'AAAA-MM-JJ', en secondes depuis l'epoch."""
+    start = datetime.fromisoformat(day[:10]).replace(tzinfo=timezone.utc)
+    return start.timestamp() + 12 * 3600
+
+
+class PopularityService:
+    """
+    Films tendance : les films les plus ajoutés en favori récemment, chaque
+    ajout comptant de moins en moins avec le temps (demi-vie
+    TRENDING_HALF_LIFE_DAYS, 7 jours par défaut).
+
+    Le modèle (voir src/engine/popularity.py) est construit une fois à partir
+    des comptes journaliers de FAVORIS_LOG, puis mis à jour avec les
+    nouveaux changements du journal au plus toutes les
+    TRENDING_SYNC_INTERVAL secondes. Le classement des TRENDING_SIZE premiers
+    films et les films correspondants sont gardés en mémoire : une requête
+    ne lit pas la base.
+
+    Attributs
+    ---------
+    half_life : float
+        Demi-vie d'un ajout, en secondes.
+    size : int
+        Nombre de films du classement (TRENDING_SIZE, 100 par défaut).
+    sync_interval : float
+        Délai maximal avant de lire les nouveaux changements (10s par défaut).
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        user_dao: UserDao = None,
+        film_dao: FilmDAO = None,
+        half_life_days: float | None = None,
+        size: int | None = None,
+        sync_interval: float | None = None,
+    ):
+        dotenv.load_dotenv()
+        self.user_dao: UserDao = user_dao if user_dao else UserDao()
+        self.film_dao: FilmDAO = film_dao if film_dao else FilmDAO()
+        if half_life_days is None:
+            half_life_days = float(getenv("TRENDING_HALF_LIFE_DAYS", "7"))
+        self.half_life = half_life_days * 86400
+        self.size = size if size is not None else int(getenv("TRENDING_SIZE", "100"))
+        self.sync_interval = (
+            sync_interval
+            if sync_interval is not None
+            else float(getenv("TRENDING_SYNC_INTERVAL", "10"))
+        )
+        self._model: DecayedPopularity | None = None
+        self._token = 0
+        # classement en service : (t0, [(id_film, Film, score relatif à t0)])
+        self._ranking: tuple[float, list[tuple[int, Film, float]]] = (0.0, [])
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "PopularityService":
+        """Retourne le service partagé par tous les clients du processus."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def refresh(self):
+        """Reconstruit le modèle à partir des comptes journaliers de FAVORIS_LOG."""
+        start = time.monotonic()
+        now = time.time()
+        # au-delà de 10 demi-vies, un ajout compte pour moins de 0,1 %
+        since = datetime.fromtimestamp(now - 10 * self.half_life, timezone.utc)
+        token = self.user_dao.last_favorites_change()
+        rows = self.user_dao.get_favorites_daily_counts(
+            since.strftime("%Y-%m-%d %H:%M:%S"), token
+        )
+        self._model = DecayedPopularity(self.half_life, self.size).fit(
+            [row[0] for row in rows],
+            [_timestamp(row[2]) for row in rows],
+            [row[3] if row[1] == "add" else -row[3] for row in rows],
+            now=now,
+        )
+        self._token = token
+        self._publish()
+        self._synced_at = time.monotonic()
+        logging.info(
+            f"Popularité des films construite : {len(rows)} comptes journaliers "
+            f"en {time.monotonic() - start:.2f}s"
+        )
+
+    def _publish(self):
+        """Met en service le classement du modèle, avec les films correspondants."""
+        films = {id_film: film for id_film, film, _ in self._ranking[1]}
+        ranked = self._model.ranked.tolist()
+        films.update(
+            self.film_dao.get_films_by_id([i for i in ranked if i not in films])
+        )
+        self._ranking = (
+            self._model.t0,
+            [
+                (id_film, films[id_film], score)
+                for id_film, score in zip(
+                    ranked, self._model.ranked_scores.tolist(), strict=True
+                )
+                if id_film in films
+            ],
+        )
+
+    def sync(self) -> int:
+        """
+        Applique au modèle les changements de FAVORIS_LOG postérieurs au
+        dernier lu, datés de leur lecture, puis recalcule le classement.
+
+        Retour
+        ------
+        int
+            Nombre de changements appliqués
+        """
+        changes = self.user_dao.get_favorites_log(self._token) or []
+        self._synced_at = time.monotonic()
+        if not changes:
+            return 0
+        now = time.time()
+        for id_change, _, id_film, op in changes:
+            self._model.add(id_film, now, 1.0 if op == "add" else -1.0)
+            self._token = id_change
+        self._model.rank()
+        self._publish()
+        return len(changes)
+
+    def _get_ranking(self) -> tuple[float, list[tuple[int, Film, float]]]:
+        """Classement courant, construit au premier appel puis mis à jour."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self.refresh()
+        elif (
+            time.monotonic() - self._synced_at > self.sync_interval
+            and self._lock.acquire(blocking=False)
+        ):
+            try:
+                self.sync()
+            except Exception as e:
+                logging.error(f"Erreur lors de la mise à jour des tendances : {e}")
+            finally:
+                self._lock.release()
+        return self._ranking
+
+    def trending(self, n: int = 10) -> list[tuple[Film, float]]:
+        """
+        Les n films les plus populaires en ce moment, avec leur score : nombre
+        d'ajouts en favori pondérés par leur ancienneté.
+        """
+        t0, ranking = self._get_ranking()
+        decay = 2 ** (-(time.time() - t0) / self.half_life)
+        return [(film, score * decay) for _, film, score in ranking[:n]]
@@ -0,0 +1,217 @@
+"""
+Précalcul des recommandations de tous les utilisateurs.
+
+Tâche planifiée (voir kubernetes/cronjob.yaml), exécutée hors des workers de
+l'API :
+
+    uv run python -m src.service.recommendation_batch --workers 4
+"""
+
+import argparse
+from functools import partial
+import logging
+import multiprocessing
+import os
+import time
+
+import dotenv
+import numpy as np
+
+from src.dao.recommendation_dao import RecommendationDAO
+from src.engine.als import ImplicitALS
+from src.service.recommendation_service import ModelSnapshot, RecommendationService
+from src.utils.env import getenv
+
+
+# Modèles partagés avec les processus de calcul : construits avant la création
+# du pool, ils sont hérités par fork sans être copiés ni sérialisés.
+_service: RecommendationService | None = None
+_snapshot: ModelSnapshot | None = None
+
+
+def _columns(users: list[int], scored: list[list[tuple[int, float]]]) -> tuple:
+    """
+    Recommandations d'un lot d'utilisateurs, en colonnes (id_user, rang,
+    id_film, score) : quatre tableaux se transmettent au processus parent
+    bien plus vite qu'autant de tuples.
+    """
+    lengths = np.asarray([len(films) for films in scored], dtype=np.int64)
+    pairs = [pair for films in scored for pair in films]
+    first = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return len(users), (
+        np.repeat(np.asarray(users, dtype=np.int64), lengths),
+        np.arange(len(pairs), dtype=np.int64) - first + 1,
+        np.asarray([film for film, _ in pairs], dtype=np.int64),
+        np.asarray([score for _, score in pairs], dtype=np.float64),
+    )
+
+
+def _recommend_chunk(users: list[int], n: int) -> tuple:
+    """Recommandations item-item d'un lot d'utilisateurs (voir _columns)."""
+    return _columns(
+        users, [_service.recommend_ids(_snapshot, id_user, n) for id_user in users]
+    )
+
+
+class RecommendationBatch:
+    """
+    Calcule les n meilleures recommandations de chaque utilisateur en
+    parallèle et les écrit dans la table RECOMMENDATIONS, remplacée d'un bloc
+    (voir RecommendationDAO.replace_all). GET /recommendations n'est alors
+    plus qu'une lecture indexée.
+
+    Attributs
+    ---------
+    n : int
+        Recommandations gardées par utilisateur (RECO_PRECOMPUTE_N, 100 par
+        défaut, le maximum servi par l'API).
+    workers : int
+        Nombre de processus de calcul (RECO_BATCH_WORKERS, nombre de CPU par
+        défaut). 0 = calcul dans le processus courant.
+    chunk_size : int
+        Utilisateurs par lot de calcul et d'insertion (RECO_BATCH_CHUNK, 500
+        par défaut).
+    model : str
+        "item" (filtrage item-item complété par le contenu, par défaut) ou
+        "als" (factorisation implicite, voir src/engine/als.py)
+        (RECO_BATCH_MODEL).
+    als_factors, als_iterations : int
+        Dimension des facteurs et nombre d'itérations de l'ALS
+        (RECO_ALS_FACTORS, 64 ; RECO_ALS_ITERATIONS, 10).
+    als_path : str | None
+        Dossier où sauvegarder les facteurs appris (RECO_ALS_PATH, aucun par
+        défaut).
+    """
+
+    def __init__(
+        self,
+        recommendation_service: RecommendationService = None,
+        recommendation_dao: RecommendationDAO = None,
+        n: int | None = None,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        model: str | None = None,
+    ):
+        dotenv.load_dotenv()
+        self.recommendation_service = (
+            recommendation_service
+            if recommendation_service
+            else RecommendationService(refresh_interval=float("inf"))
+        )
+        self.recommendation_dao = (
+            recommendation_dao if recommendation_dao else RecommendationDAO()
+        )
+        self.n = n if n is not None else int(getenv("RECO_PRECOMPUTE_N", "100"))
+        self.workers = (
+            workers
+            if workers is not None
+            else int(getenv("RECO_BATCH_WORKERS", os.cpu_count() or 1))
+        )
+        self.chunk_size = (
+            chunk_size
+            if chunk_size is not None
+            else int(getenv("RECO_BATCH_CHUNK", "500"))
+        )
+        self.model = model if model else getenv("RECO_BATCH_MODEL", "item")
+        self.als_factors = int(getenv("RECO_ALS_FACTORS", "64"))
+        self.als_iterations = int(getenv("RECO_ALS_ITERATIONS", "10"))
+        self.als_path = getenv("RECO_ALS_PATH") or None
+
+    def _chunks(self, users: list[int]) -> list[list[int]]:
+        return [
+            users[i : i + self.chunk_size]
+            for i in range(0, len(users), self.chunk_size)
+        ]
+
+    def train_als(self) -> ImplicitALS:
+        """Apprend la factorisation sur FAVORIS, et la sauvegarde si als_path est donné."""
+        pairs = self.recommendation_service.user_dao.get_favorites_pairs()
+        model = ImplicitALS(
+            factors=self.als_factors,
+            iterations=self.als_iterations,
+            workers=self.workers,
+        ).fit([p[0] for p in pairs], [p[1] for p in pairs])
+        for i, seconds in enumerate(model.iteration_times, start=1):
+            logging.info(f"ALS : itération {i} en {seconds:.2f}s")
+        if self.als_path:
+            model.save(self.als_path)
+        return model
+
+    def run(self) -> dict:
+        """
+        Construit les modèles, calcule et écrit les recommandations.
+
+        Retour
+        ------
+        dict
+            users, rows, seconds, users_per_second et written (la nouvelle
+            table est en service).
+        """
+        global _service, _snapshot
+        start = time.monotonic()
+        stats = {"users": 0, "rows": 0}
+
+        def batches(results):
+            for count, columns in results:
+                rows = list(zip(*(c.tolist() for c in columns), strict=True))
+                stats["users"] += count
+                stats["rows"] += len(rows)
+                yield rows
+
+        if self.model == "als":
+            # une fois les facteurs appris, un produit matriciel par lot
+            als = self.train_als()
+            results = (
+                _columns(users, als.recommend(users, self.n))
+                for users in self._chunks(als.user_ids.tolist())
+            )
+            written = self.recommendation_dao.replace_all(batches(results))
+        else:
+            _service = self.recommendation_service
+            _snapshot = _service._get_snapshot()
+            chunks = self._chunks(sorted(set(_snapshot.user_ids.values())))
+            task = partial(_recommend_chunk, n=self.n)
+            if self.workers > 0:
+                context = multiprocessing.get_context("fork")
+                with context.Pool(self.workers) as pool:
+                    # imap garde l'ordre des id_user : insertions dans l'ordre de la clé
+                    written = self.recommendation_dao.replace_all(
+                        batches(pool.imap(task, chunks))
+                    )
+            else:
+                written = self.recommendation_dao.replace_all(
+                    batches(map(task, chunks))
+                )
+
+        stats["seconds"] = time.monotonic() - start
+        stats["users_per_second"] = stats["users"] / max(stats["seconds"], 1e-9)
+        stats["written"] = written
+        logging.info(
+            f"Recommandations précalculées : {stats['users']} utilisateurs, "
+            f"{stats['rows']} lignes en {stats['seconds']:.1f}s "
+            f"({stats['users_per_second']:.0f} utilisateurs/s)"
+        )
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--model", choices=["item", "als"], default=None)
+    args = parser.parse_args()
+
+    stats = RecommendationBatch(
+        n=args.n, workers=args.workers, chunk_size=args.chunk_size, model=args.model
+    ).run()
+    print(
+        f"{stats['users']} utilisateurs, {stats['rows']} recommandations en "
+        f"{stats['seconds']:.1f}s : {stats['users_per_second']:.0f} utilisateurs/s"
+    )
+    if not stats["written"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+from collections import defaultdict
+import logging
+import threading
+import time
+
+import dotenv
+import numpy as np
+
+from src.business_object.film import Film
+from src.dao.film_dao import FilmDAO
+from src.dao.recommendation_dao import RecommendationDAO
+from src.dao.user_dao import UserDao
+from src.engine.ann_index import LSHIndex
+from src.engine.content_similarity import ContentSimilarity, film_features
+from src.engine.item_similarity import ItemSimilarity, aggregate_top_n
+from src.engine.user_similarity import UserSimilarity
+from src.service.popularity_service import PopularityService
+from src.utils.env import getenv
+
+
+class ModelSnapshot:
+    """
+    Modèles et tables de correspondance construits ensemble à partir de la
+    base, et remplacés d'un bloc à chaque reconstruction.
+
+    Attributs
+    ---------
+    items : ItemSimilarity
+        Filtrage collaboratif item-item (FAVORIS).
+    content : ContentSimilarity
+        Similarité de contenu (FILM, CASTING).
+    user_ids : dict[str, int]
+        pseudo -> id_user
+    pseudos : dict[int, str]
+        id_user -> pseudo
+    films : dict[int, Film]
+        id_film -> Film
+    titles : dict[str, int]
+        titre en minuscules -> id_film
+    token : int
+        Dernier changement de FAVORIS_LOG pris en compte.
+    ann : LSHIndex | None
+        Index approché des vecteurs de contenu des films.
+    users : UserSimilarity | None
+        Similarité des favoris entre utilisateurs. Elle n'est pas mise à jour
+        par sync : seulement à la reconstruction.
+    """
+
+    def __init__(self, items, content, user_ids, films, token=0, ann=None, users=None):
+        self.items: ItemSimilarity = items
+        self.content: ContentSimilarity = content
+        self.ann: LSHIndex | None = ann
+        self.users: UserSimilarity | None = users
+        self.user_ids: dict[str, int] = {}
+        self.pseudos: dict[int, str] = {}
+        self.films: dict[int, Film] = films
+        self.titles: dict[str, int] = {}
+        self.token: int = token
+        self.add_users(user_ids)
+        self.add_films(films)
+
+    def add_users(self, user_ids: dict[str, int]):
+        self.user_ids.update(user_ids)
+        self.pseudos.update({id_user: pseudo for pseudo, id_user in user_ids.items()})
+
+    def add_films(self, films: dict[int, Film]):
+        self.films.update(films)
+        self.titles.update(
+            {
+                film.titre.lower(): id_film
+                for id_film, film in films.items()
+                if film.titre
+            }
+        )
+
+
+class RecommendationService:
+    """
+    Service de recommandation de films à partir des favoris et du contenu
+    des films.
+
+    Les modèles (voir src/engine) sont construits en mémoire à partir de la
+    base, puis reconstruits au plus toutes les RECO_REFRESH_INTERVAL secondes
+    (1h par défaut). Une requête ne fait qu'agréger quelques lignes de
+    tableaux précalculés.
+
+    Entre deux reconstructions, les favoris ajoutés ou retirés sont lus dans
+    FAVORIS_LOG et appliqués un par un aux modèles (sync) : immédiatement
+    après une écriture de ce processus, et au plus toutes les
+    RECO_SYNC_INTERVAL secondes pour celles des autres processus.
+
+    Attributs
+    ---------
+    k : int
+        Nombre de voisins gardés par film (RECO_NEIGHBOURS, 50 par défaut).
+    refresh_interval : float
+        Âge maximal des modèles, en secondes.
+    sync_interval : float
+        Délai maximal avant de lire les nouveaux changements (1s par défaut).
+    compact_every : int
+        Nombre de changements appliqués déclenchant une reconstruction
+        (RECO_COMPACT_EVERY, 10000 par défaut).
+    ann_dim : int
+        Dimension des vecteurs de films de l'index approché (RECO_ANN_DIM,
+        64 par défaut).
+    ann_probes : int
+        Seaux voisins visités par table lors d'une recherche approchée
+        (RECO_ANN_PROBES, 4 par défaut) : plus de seaux, meilleur rappel.
+    user_metric : str
+        Similarité entre utilisateurs, "jaccard" ou "cosine"
+        (RECO_USER_METRIC, "jaccard" par défaut).
+    user_neighbours : int
+        Voisins dont les favoris sont proposés par neighbour_films
+        (RECO_USER_NEIGHBOURS, 50 par défaut).
+    live_fallback : bool
+        Calcule à la demande les recommandations des utilisateurs absents de
+        la table précalculée (RECO_LIVE_FALLBACK, False par défaut).
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        user_dao: UserDao = None,
+        film_dao: FilmDAO = None,
+        k: int | None = None,
+        refresh_interval: float | None = None,
+        sync_interval: float | None = None,
+        compact_every: int | None = None,
+        recommendation_dao: RecommendationDAO = None,
+        popularity_service: PopularityService = None,
+    ):
+        dotenv.load_dotenv()
+        self.user_dao: UserDao = user_dao if user_dao else UserDao()
+        self.film_dao: FilmDAO = film_dao if film_dao else FilmDAO()
+        self.recommendation_dao: RecommendationDAO = (
+            recommendation_dao if recommendation_dao else RecommendationDAO()
+        )
+        self.popularity_service: PopularityService = (
+            popularity_service if popularity_service else PopularityService.shared()
+        )
+        self.k = k if k is not None else int(getenv("RECO_NEIGHBOURS", "50"))
+        self.refresh_interval = (
+            refresh_interval
+            if refresh_interval is not None
+            else float(getenv("RECO_REFRESH_INTERVAL", "3600"))
+        )
+        self.sync_interval = (
+            sync_interval
+            if sync_interval is not None
+            else float(getenv("RECO_SYNC_INTERVAL", "1"))
+        )
+        self.compact_every = (
+            compact_every
+            if compact_every is not None
+            else int(getenv("RECO_COMPACT_EVERY", "10000"))
+        )
+        self.ann_dim = int(getenv("RECO_ANN_DIM", "64"))
+        self.ann_probes = int(getenv("RECO_ANN_PROBES", "4"))
+        self.user_metric = getenv("RECO_USER_METRIC", "jaccard")
+        self.user_neighbours = int(getenv("RECO_USER_NEIGHBOURS", "50"))
+        self.live_fallback = getenv("RECO_LIVE_FALLBACK", "False") == "True"
+        self._snapshot: ModelSnapshot | None = None
+        self._built_at: float | None = None
+        self._synced_at: float = 0.0
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "RecommendationService":
+        """Retourne le service partagé par tous les clients du processus."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    # -----------------------------
+    # Construction des modèles
+    # -----------------------------
+    def _castings(self, ids: list[int] | None = None) -> dict[int, list[int]]:
+        """id_actor du casting de chaque film (de tous, ou de ceux de `ids`)."""
+        casting = defaultdict(list)
+        for id_film, id_actor in self.film_dao.get_casting_pairs(ids):
+            casting[id_film].append(id_actor)
+        return casting
+
+    def _build_content(self, films: dict[int, Film]) -> ContentSimilarity:
+        casting = self._castings()
+        return ContentSimilarity().fit(
+            (
+                id_film,
+                film_features(
+                    film.genre, film.realisateur, film.annee, casting.get(id_film, ())
+                ),
+            )
+            for id_film, film in films.items()
+        )
+
+    def refresh(self):
+        """Reconstruit les modèles à partir de la base et les met en service."""
+        start = time.monotonic()
+        # jeton relevé avant la lecture : les changements concurrents sont
+        # rejoués ensuite par sync (add / remove sont idempotents)
+        token = self.user_dao.last_favorites_change()
+        pairs = self.user_dao.get_favorites_pairs()
+        users, films = [p[0] for p in pairs], [p[1] for p in pairs]
+        items = ItemSimilarity(k=self.k).fit(users, films)
+        neighbours = UserSimilarity(self.user_metric).fit(users, films)
+        films = self.film_dao.get_films_by_id()
+        content = self._build_content(films)
+        ann = LSHIndex(self.ann_dim).build(*content.embed(self.ann_dim))
+        self._snapshot = ModelSnapshot(
+            items,
+            content,
+            self.user_dao.get_user_ids(),
+            films,
+            token,
+            ann,
+            neighbours,
+        )
+        self._built_at = time.monotonic()
+        logging.info(
+            f"Modèles de recommandation construits : {len(pairs)} favoris, "
+            f"{len(films)} films en {self._built_at - start:.2f}s"
+        )
+        self.sync()
+
+    def _register(self, snapshot: ModelSnapshot, user_ids: set, film_ids: set):
+        """Ajoute aux tables du snapshot les utilisateurs et films apparus."""
+        new_users = user_ids - set(snapshot.user_ids.values())
+        if new_users:
+            snapshot.add_users(self.user_dao.get_user_ids(sorted(new_users)))
+        new_films = self.film_dao.get_films_by_id(
+            sorted(film_ids - snapshot.films.keys())
+        )
+        # mêmes caractéristiques qu'à la construction (refresh), casting compris
+        casting = self._castings(sorted(new_films)) if new_films else {}
+        for id_film, film in new_films.items():
+            snapshot.content.update(
+                id_film,
+                film_features(
+                    film.genre, film.realisateur, film.annee, casting.get(id_film, ())
+                ),
+            )
+            vector = snapshot.content.vector(id_film)
+            if snapshot.ann is not None and vector is not None:
+                snapshot.ann.insert(id_film, vector)
+        snapshot.add_films(new_films)
+
+    def sync(self, blocking: bool = True) -> int:
+        """
+        Applique aux modèles en service les changements de favoris journalisés
+        depuis leur construction. Au-delà de `compact_every` changements, les
+        modèles sont reconstruits à la requête suivante.
+
+        Retour
+        ------
+        int
+            Nombre de changements appliqués
+        """
+        snapshot = self._snapshot
+        if snapshot is None or not self._sync_lock.acquire(blocking=blocking):
+            return 0
+        try:
+            changes = self.user_dao.get_favorites_log(
+                snapshot.token, self.compact_every
+            )
+            self._synced_at = time.monotonic()
+            if not changes:
+                return 0
+            self._register(snapshot, {c[1] for c in changes}, {c[2] for c in changes})
+            for id_change, id_user, id_film, op in changes:
+                if op == "add":
+                    snapshot.items.add(id_user, id_film)
+                else:
+                    snapshot.items.remove(id_user, id_film)
+                snapshot.token = id_change
+            if snapshot.items.pending_events >= self.compact_every:
+                self._built_at = None
+            return len(changes)
+        except Exception as e:
+            logging.error(f"Erreur lors de la mise à jour des recommandations : {e}")
+            return 0
+        finally:
+            self._sync_lock.release()
+
+    def _get_snapshot(self) -> ModelSnapshot:
+        """
+        Retourne les modèles courants, reconstruits s'ils sont absents ou
+        périmés. Pendant une reconstruction, les autres requêtes servent les
+        anciens modèles.
+        """
+        stale = (
+            self._built_at is None
+            or time.monotonic() - self._built_at > self.refresh_interval
+        )
+        if stale and self._lock.acquire(blocking=self._snapshot is None):
+            try:
+                if self._built_at is None or (
+                    time.monotonic() - self._built_at > self.refresh_interval
+                ):
+                    self.refresh()
+            finally:
+                self._lock.release()
+        elif time.monotonic() - self._synced_at > self.sync_interval:
+            self.sync(blocking=False)
+        return self._snapshot
+
+    # -----------------------------
+    # Requêtes
+    # -----------------------------
+    def recommend(self, pseudo: str, n: int = 10) -> list[tuple[Film, float]]:
+        """
+        Recommande n films à un utilisateur : voisins de ses favoris, pondérés
+        par leur similarité, films déjà en favori exclus. Si les favoris sont
+        trop peu partagés pour en trouver n, la liste est complétée par des
+        films de contenu proche.
+        """
+        snapshot = self._get_snapshot()
+        id_user = snapshot.user_ids.get(pseudo)
+        if id_user is None:
+            return []
+        return [
+            (snapshot.films[id_film], score)
+            for id_film, score in self.recommend_ids(snapshot, id_user, n)
+            if id_film in snapshot.films
+        ]
+
+    def recommend_ids(
+        self, snapshot: ModelSnapshot, id_user: int, n: int = 10
+    ) -> list[tuple[int, float]]:
+        """Recommandations de `recommend`, en (id_film, score), sur un snapshot donné."""
+        liked = snapshot.items.liked(id_user)
+        scored = snapshot.items.recommend(liked, n)
+        if len(scored) < n and liked.size:
+            scored += self._content_fill(snapshot, liked, n, scored)
+        return scored
+
+    def precomputed(self, pseudo: str, n: int = 10) -> list[tuple[Film, float]]:
+        """
+        Recommandations lues dans la table précalculée par
+        src/service/recommendation_batch.py, sans construire de modèle.
+
+        Les favoris de l'utilisateur (une lecture) en sont retirés : un film
+        ajouté depuis le dernier calcul n'est plus proposé. Un utilisateur
+        absent de la table (pas encore de calcul) reçoit les films tendance,
+        ou un calcul à la demande si live_fallback est activé.
+        """
+        liked = {
+            (film.titre, film.realisateur)
+            for film in self.user_dao.get_favorites_by_pseudo(pseudo) or []
+        }
+        # plus de films que demandé : les favoris de l'utilisateur en sont retirés
+        wanted = n + len(liked)
+        recommandations = self.recommendation_dao.get_for_user(pseudo, wanted)
+        if not recommandations and self.live_fallback:
+            recommandations = self.recommend(pseudo, wanted)
+        if not recommandations:
+            recommandations = self.popularity_service.trending(wanted)
+        return [
+            (film, score)
+            for film, score in recommandations
+            if (film.titre, film.realisateur) not in liked
+        ][:n]
+
+    @staticmethod
+    def _content_fill(snapshot, liked, n, scored) -> list[tuple[int, float]]:
+        """Films de contenu proche des favoris, hors favoris et déjà proposés."""
+        per_film = snapshot.content.similar_batch(liked[:8].tolist(), n)
+        ids = [film for voisins in per_film.values() for film, _ in voisins]
+        scores = [score for voisins in per_film.values() for _, score in voisins]
+        if not ids:
+            return []
+        exclude = np.concatenate([liked, [film for film, _ in scored]])
+        films, totals = aggregate_top_n(
+            np.asarray([ids]),
+            np.asarray([scores], dtype=np.float32),
+            n - len(scored),
+            exclude=exclude,
+        )
+        return list(zip(films.tolist(), totals.tolist(), strict=True))
+
+    def similar_films(
+        self, titre: str, n: int = 10, approx: bool = False
+    ) -> list[tuple[Film, float]] | None:
+        """
+        Films au contenu le plus proche d'un film de la base (genres,
+        réalisateur, décennie, casting). None si le titre est inconnu.
+        Avec approx=True, la recherche passe par l'index approché des
+        vecteurs de films (LSHIndex) au lieu de parcourir tout le catalogue.
+        """
+        snapshot = self._get_snapshot()
+        id_film = snapshot.titles.get(titre.strip().lower())
+        if id_film is None:
+            return None
+        if approx and snapshot.ann is not None:
+            similaires = snapshot.ann.similar(id_film, n, self.ann_probes)
+        else:
+            similaires = snapshot.content.similar(id_film, n)
+        return [
+            (snapshot.films[other], score)
+            for other, score in similaires
+            if other in snapshot.films
+        ]
+
+    def similar_users(self, pseudo: str, n: int = 10) -> list[tuple[str, float]]:
+        """Les n utilisateurs aux favoris les plus proches : [(pseudo, similarité)]."""
+        snapshot = self._get_snapshot()
+        id_user = snapshot.user_ids.get(pseudo)
+        if id_user is None or snapshot.users is None:
+            return []
+        return [
+            (snapshot.pseudos[other], score)
+            for other, score in snapshot.users.similar_users(id_user, n)
+            if other in snapshot.pseudos
+        ]
+
+    def neighbour_films(self, pseudo: str, n: int = 10) -> list[tuple[Film, float]]:
+        """
+        Films aimés par les utilisateurs aux goûts proches et pas encore en
+        favori, pondérés par la similarité de ces utilisateurs.
+        """
+        snapshot = self._get_snapshot()
+        id_user = snapshot.user_ids.get(pseudo)
+        if id_user is None or snapshot.users is None:
+            return []
+        return [
+            (snapshot.films[id_film], score)
+            for id_film, score in snapshot.users.recommend(
+                id_user, n, self.user_neighbours
+            )
+            if id_film in snapshot.films
+        ]
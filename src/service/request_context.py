@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from src.business_object.user import User
+from src.service.session import Session
+
+
+class RequestContext:
+    """
+    État propre à une requête : utilisateur authentifié, session et caches.
+
+    Les services longue durée (UserService, UserClient...) n'ont ainsi plus
+    d'état modifiable partagé et peuvent être utilisés par plusieurs threads.
+
+    Attributs
+    ---------
+    user : User | None
+        Utilisateur authentifié pour la requête.
+    session : Session | None
+        Session ouverte ou validée pendant la requête.
+    cache : dict
+        Cache local à la requête (ex: utilisateurs déjà lus en base).
+    scoped : bool
+        True si le contexte a été ouvert par request_scope(). Hors requête
+        (scripts, tests), le cache est désactivé.
+    """
+
+    def __init__(self, scoped: bool = False):
+        self.user: User | None = None
+        self.session: Session | None = None
+        self.cache: dict = {}
+        self.scoped = scoped
+
+    def cached(self, key, factory):
+        """
+        Retourne la valeur en cache pour `key`, ou la calcule avec factory().
+        Les valeurs None ne sont pas mises en cache.
+        """
+        if not self.scoped:
+            return factory()
+        if key not in self.cache:
+            value = factory()
+            if value is None:
+                return None
+            self.cache[key] = value
+        return self.cache[key]
+
+
+_context: ContextVar[RequestContext | None] = ContextVar(
+    "request_context", default=None
+)
+
+
+def get_context() -> RequestContext:
+    """
+    Retourne le contexte de la requête courante.
+    Hors requête, un contexte non limité est créé pour le contexte d'exécution
+    courant (comportement d'un script mono-utilisateur).
+    """
+    context = _context.get()
+    if context is None:
+        context = RequestContext()
+        _context.set(context)
+    return context
+
+
+@contextmanager
+def request_scope():
+    """
+    Ouvre un contexte neuf pour la durée d'une requête et le referme ensuite.
+    """
+    context = RequestContext(scoped=True)
+    token = _context.set(context)
+    try:
+        yield context
+    finally:
+        _context.reset(token)
@@ -1,12 +1,19 @@
+import time
 import uuid
 
 import dotenv
 
+from src.business_object.admin import Admin
+from src.business_object.client import Client
 from src.business_object.user import User
+from src.utils.env import getenv
 
 
 dotenv.load_dotenv()
 
+# Mot de passe des utilisateurs restaurés : aucun hash bcrypt ne lui correspond
+_NO_HASH = "!"
+
 
 class Session:
     """
@@ -18,11 +25,51 @@ class Session:
         Identifiant unique de la session.
     user : User
         L'utilisateur associé à la session.
+    expires_at : float
+        Date d'expiration (timestamp) de la session.
     """
 
     def __init__(
         self,
         user: User,
+        ttl: int | None = None,
     ):
+        if ttl is None:
+            ttl = int(getenv("SESSION_TTL", "3600"))
         self.session_id: str = str(uuid.uuid4())  # ID unique pour chaque session
         self.user: User = user
+        self.expires_at: float = time.time() + ttl
+
+    def is_expired(self) -> bool:
+        """Indique si la session a dépassé sa date d'expiration."""
+        return time.time() > self.expires_at
+
+    def to_dict(self) -> dict:
+        """
+        Représentation sérialisable de la session (pour un stockage partagé),
+        sans le hash du mot de passe : il est relu en base quand il sert.
+        """
+        return {
+            "session_id": self.session_id,
+            "expires_at": self.expires_at,
+            "user": {
+                "pseudo": self.user.pseudo,
+                "email": self.user.email,
+                "role": getattr(self.user, "role", "client"),
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Session":
+        """
+        Reconstruit une session à partir de to_dict(). L'utilisateur n'a pas
+        de hash de mot de passe (_NO_HASH à la place).
+        """
+        user_data = dict(data["user"])
+        # sessions enregistrées avant le retrait du hash
+        user_data.pop("psswd", None)
+        user_class = Admin if user_data.get("role") == "admin" else Client
+        session = cls(user_class(psswd=_NO_HASH, **user_data))
+        session.session_id = data["session_id"]
+        session.expires_at = data["expires_at"]
+        return session
@@ -1,34 +1,54 @@
 from src.business_object.user import User
+from src.service.request_context import get_context
 from src.service.session import Session
+from src.service.session_store import SessionStore, get_session_store
 
 
 class SessionManager:
     """
-    Gère toutes les sessions utilisateurs en mémoire.
+    Gère toutes les sessions utilisateurs.
     Permet de récupérer la session active courante pour simplifier l'utilisation
     dans UserService.
+    Les sessions sont conservées dans un SessionStore (mémoire ou fichier
+    SQLite, voir SESSION_STORE), partagé par tous les services du processus,
+    voire par plusieurs workers. La session active est propre à la requête
+    (voir request_context).
     """
 
-    def __init__(self):
-        self.sessions = {}  # clé = pseudo, valeur = Session
-        self.current_session: Session | None = None  # session active courante
+    def __init__(self, store: SessionStore | None = None):
+        self.store: SessionStore = store if store else get_session_store()
 
-    def create_session(self, user: User) -> Session:
+    @property
+    def current_session(self) -> Session | None:
+        """Session active de la requête courante."""
+        return get_context().session
+
+    @current_session.setter
+    def current_session(self, session: Session | None):
+        get_context().session = session
+
+    def create_session(self, user: User, ttl: int | None = None) -> Session:
         """
         Crée et stocke une nouvelle session pour un utilisateur
         et la définit comme active.
         """
-        session = Session(user)
-        self.sessions[user.pseudo] = session
+        session = Session(user, ttl)
+        self.store.save(session)
         self.current_session = session  # définit la session comme active
         return session
 
     def get_session(self, pseudo: str) -> Session | None:
         """
-        Récupère la session active d'un utilisateur par pseudo.
+        Récupère la session active la plus récente d'un utilisateur par pseudo.
         """
-        session = self.sessions.get(pseudo)
-        return session
+        sessions = self.store.find_by_pseudo(pseudo)
+        return max(sessions, key=lambda s: s.expires_at, default=None)
+
+    def get_session_by_id(self, session_id: str) -> Session | None:
+        """
+        Récupère une session non expirée par son identifiant.
+        """
+        return self.store.get(session_id)
 
     def get_active_session(self) -> Session | None:
         """
@@ -36,12 +56,19 @@ class SessionManager:
         """
         return self.current_session
 
+    def revoke(self, session_id: str):
+        """
+        Supprime une session : les jetons qui s'y rapportent deviennent invalides.
+        """
+        self.store.delete(session_id)
+        if self.current_session and self.current_session.session_id == session_id:
+            self.current_session = None
+
     def logout(self, pseudo: str):
         """
-        Supprime la session de l'utilisateur et réinitialise
+        Supprime toutes les sessions de l'utilisateur et réinitialise
         la session active si nécessaire.
         """
-        if pseudo in self.sessions:
-            if self.current_session and self.current_session.user.pseudo == pseudo:
-                self.current_session = None
-            del self.sessions[pseudo]
+        self.store.delete_by_pseudo(pseudo)
+        if self.current_session and self.current_session.user.pseudo == pseudo:
+            self.current_session = None
@@ -0,0 +1,251 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+import dotenv
+
+from src.service.session import Session
+from src.utils.env import getenv
+
+
+class SessionStore(ABC):
+    """
+    Interface de stockage des sessions utilisateurs.
+
+    Toutes les implémentations respectent l'expiration des sessions
+    (Session.expires_at) : une session expirée n'est jamais retournée.
+    Un thread de fond optionnel supprime régulièrement les sessions expirées.
+    """
+
+    _sweeper: threading.Thread | None = None
+
+    @abstractmethod
+    def save(self, session: Session):
+        """Enregistre (ou remplace) une session."""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Session | None:
+        """Retourne la session si elle existe et n'a pas expiré."""
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        """Supprime une session."""
+
+    @abstractmethod
+    def find_by_pseudo(self, pseudo: str) -> list[Session]:
+        """Retourne les sessions non expirées d'un utilisateur."""
+
+    @abstractmethod
+    def sweep(self) -> int:
+        """Supprime les sessions expirées et retourne leur nombre."""
+
+    def delete_by_pseudo(self, pseudo: str):
+        """Supprime toutes les sessions d'un utilisateur."""
+        for session in self.find_by_pseudo(pseudo):
+            self.delete(session.session_id)
+
+    def start_sweeper(self, interval: float = 60.0):
+        """
+        Lance (une seule fois) un thread démon qui appelle sweep() toutes les
+        `interval` secondes.
+        """
+        if self._sweeper is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sweep()
+                except Exception as e:
+                    logging.error(f"Erreur lors du nettoyage des sessions : {e}")
+
+        self._sweeper = threading.Thread(
+            target=run, name="session-sweeper", daemon=True
+        )
+        self._sweeper.start()
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Stockage en mémoire, sûr entre threads.
+
+    Les sessions sont réparties en `shards` sous-dictionnaires protégés chacun
+    par leur propre verrou, pour limiter la contention. Chaque sous-dictionnaire
+    est un LRU : au-delà de `max_sessions / shards` entrées, la session la
+    moins récemment utilisée est évincée.
+    """
+
+    def __init__(self, max_sessions: int = 100_000, shards: int = 16):
+        self.shards = [OrderedDict() for _ in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+        self.max_per_shard = max(1, max_sessions // shards)
+
+    def _shard(self, session_id: str) -> int:
+        return hash(session_id) % len(self.shards)
+
+    def save(self, session: Session):
+        i = self._shard(session.session_id)
+        with self.locks[i]:
+            shard = self.shards[i]
+            shard[session.session_id] = session
+            shard.move_to_end(session.session_id)
+            while len(shard) > self.max_per_shard:
+                shard.popitem(last=False)
+
+    def get(self, session_id: str) -> Session | None:
+        if not isinstance(session_id, str):
+            return None
+        i = self._shard(session_id)
+        with self.locks[i]:
+            shard = self.shards[i]
+            session = shard.get(session_id)
+            if session is None:
+                return None
+            if session.is_expired():
+                del shard[session_id]
+                return None
+            shard.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str):
+        i = self._shard(session_id)
+        with self.locks[i]:
+            self.shards[i].pop(session_id, None)
+
+    def find_by_pseudo(self, pseudo: str) -> list[Session]:
+        sessions = []
+        for shard, lock in zip(self.shards, self.locks, strict=True):
+            with lock:
+                sessions += [
+                    s
+                    for s in shard.values()
+                    if s.user.pseudo == pseudo and not s.is_expired()
+                ]
+        return sessions
+
+    def sweep(self) -> int:
+        removed = 0
+        for shard, lock in zip(self.shards, self.locks, strict=True):
+            with lock:
+                expired = [sid for sid, s in shard.items() if s.is_expired()]
+                for sid in expired:
+                    del shard[sid]
+                removed += len(expired)
+        return removed
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Stockage dans un fichier SQLite (mode WAL), partageable entre plusieurs
+    workers uvicorn d'un même pod sans routage collant.
+    """
+
+    def __init__(self, path: str = "data/sessions.db"):
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS SESSIONS (
+                  session_id TEXT PRIMARY KEY,
+                  pseudo TEXT NOT NULL,
+                  data TEXT NOT NULL,
+                  expires_at REAL NOT NULL
+                  );
+                CREATE INDEX IF NOT EXISTS idx_sessions_pseudo ON SESSIONS (pseudo);
+                CREATE INDEX IF NOT EXISTS idx_sessions_expires ON SESSIONS (expires_at);
+                """
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _execute(self, query: str, params: tuple = ()) -> tuple[list, int]:
+        """Exécute une requête dans sa propre transaction : (lignes, nb modifiées)."""
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute(query, params)
+                return cursor.fetchall(), cursor.rowcount
+        finally:
+            conn.close()
+
+    def save(self, session: Session):
+        self._execute(
+            "INSERT OR REPLACE INTO SESSIONS (session_id, pseudo, data, expires_at) "
+            "VALUES (?, ?, ?, ?);",
+            (
+                session.session_id,
+                session.user.pseudo,
+                json.dumps(session.to_dict()),
+                session.expires_at,
+            ),
+        )
+
+    def get(self, session_id: str) -> Session | None:
+        rows, _ = self._execute(
+            "SELECT data FROM SESSIONS WHERE session_id = ? AND expires_at > ?;",
+            (session_id, time.time()),
+        )
+        return Session.from_dict(json.loads(rows[0][0])) if rows else None
+
+    def delete(self, session_id: str):
+        self._execute("DELETE FROM SESSIONS WHERE session_id = ?;", (session_id,))
+
+    def find_by_pseudo(self, pseudo: str) -> list[Session]:
+        rows, _ = self._execute(
+            "SELECT data FROM SESSIONS WHERE pseudo = ? AND expires_at > ?;",
+            (pseudo, time.time()),
+        )
+        return [Session.from_dict(json.loads(row[0])) for row in rows]
+
+    def delete_by_pseudo(self, pseudo: str):
+        self._execute("DELETE FROM SESSIONS WHERE pseudo = ?;", (pseudo,))
+
+    def sweep(self) -> int:
+        _, removed = self._execute(
+            "DELETE FROM SESSIONS WHERE expires_at <= ?;", (time.time(),)
+        )
+        return removed
+
+
+_stores: dict[str, SessionStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """
+    Retourne le stockage de sessions partagé du processus, choisi par la
+    variable SESSION_STORE ("memory" par défaut, ou "sqlite").
+    """
+    dotenv.load_dotenv()
+    kind = getenv("SESSION_STORE", "memory").lower()
+    with _stores_lock:
+        if kind not in _stores:
+            if kind == "sqlite":
+                store = SQLiteSessionStore(
+                    getenv("SESSION_DB_PATH", "data/sessions.db")
+                )
+            elif kind == "memory":
+                store = MemorySessionStore(
+                    max_sessions=int(getenv("SESSION_MAX", "100000"))
+                )
+            else:
+                raise ValueError(
+                    "La variable d'environnement SESSION_STORE n'accepte que "
+                    "deux valeurs : memory et sqlite"
+                )
+            store.start_sweeper(float(getenv("SESSION_SWEEP_INTERVAL", "60")))
+            _stores[kind] = store
+        return _stores[kind]
@@ -0,0 +1,123 @@
+import logging
+import threading
+import time
+
+import dotenv
+
+from src.business_object.film import Film
+from src.dao.film_dao import FilmDAO
+from src.engine.trigram_index import TrigramIndex
+from src.utils.env import getenv
+
+
+class TitleMatchService:
+    """
+    Retrouve dans le catalogue local le film correspondant à un titre saisi,
+    même mal orthographié (« Incepton », « l'ete meurtier »), avant tout
+    appel à TMDB.
+
+    L'index des trigrammes des titres (voir src/engine/trigram_index.py) est
+    construit à partir de FILM, puis complété à chaque film ajouté par ce
+    processus (le service partagé est inscrit auprès de FilmDAO). Il est
+    reconstruit au plus toutes les TITLE_MATCH_REFRESH_INTERVAL secondes
+    (10 min par défaut), pour les ajouts faits par les autres processus.
+
+    Un titre n'est retenu que si la correspondance est sûre : titre normalisé
+    identique, ou similarité des trigrammes d'au moins TITLE_MATCH_THRESHOLD
+    (0.5 par défaut), au plus TITLE_MATCH_MAX_EDITS modifications de
+    caractères (2 par défaut) et un écart de faute de frappe, pas de suite
+    ni d'autre titre (voir trigram_index.is_typo()).
+
+    Attributs
+    ---------
+    refresh_interval : float
+        Âge maximal de l'index, en secondes.
+    threshold : float
+        Similarité de Jaccard minimale des trigrammes.
+    max_edits : int
+        Distance d'édition maximale entre titres normalisés.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        film_dao: FilmDAO = None,
+        refresh_interval: float | None = None,
+    ):
+        dotenv.load_dotenv()
+        self.film_dao: FilmDAO = film_dao if film_dao else FilmDAO()
+        self.refresh_interval = (
+            refresh_interval
+            if refresh_interval is not None
+            else float(getenv("TITLE_MATCH_REFRESH_INTERVAL", "600"))
+        )
+        self.threshold = float(getenv("TITLE_MATCH_THRESHOLD", "0.5"))
+        self.max_edits = int(getenv("TITLE_MATCH_MAX_EDITS", "2"))
+        self._index: TrigramIndex | None = None
+        self._built_at: float | None = None
+        self._lock = threading.Lock()
+        # l'index garde des ajouts en attente et les fusionne : accès exclusif
+        self._index_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "TitleMatchService":
+        """Retourne le service partagé par tous les clients du processus."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                FilmDAO.subscribe(cls._shared)
+            return cls._shared
+
+    def refresh(self):
+        """Reconstruit l'index à partir de FILM et le met en service."""
+        start = time.monotonic()
+        films = self.film_dao.get_films_by_id()
+        index = TrigramIndex().fit(list(films), [film.titre for film in films.values()])
+        with self._index_lock:
+            self._index = index
+        self._built_at = time.monotonic()
+        logging.info(
+            f"Index des trigrammes construit : {len(films)} films "
+            f"({index.nbytes / 1e6:.1f} Mo) en {self._built_at - start:.2f}s"
+        )
+
+    def _get_index(self) -> TrigramIndex:
+        """Index courant, reconstruit s'il est absent ou périmé."""
+        stale = (
+            self._built_at is None
+            or time.monotonic() - self._built_at > self.refresh_interval
+        )
+        if stale and self._lock.acquire(blocking=self._index is None):
+            try:
+                if self._built_at is None or (
+                    time.monotonic() - self._built_at > self.refresh_interval
+                ):
+                    self.refresh()
+            finally:
+                self._lock.release()
+        return self._index
+
+    def film_added(self, id_film: int | None, film: Film):
+        """Indexe un film ajouté en base (ignoré tant que l'index n'est pas construit)."""
+        if id_film is None or self._index is None:
+            return
+        with self._index_lock:
+            self._index.add(id_film, film.titre)
+
+    def match(self, titre: str) -> tuple[int, float, int] | None:
+        """
+        Film local correspondant au titre : (id_film, similarité, distance
+        d'édition), ou None si aucune correspondance n'est assez sûre.
+        """
+        index = self._get_index()
+        with self._index_lock:
+            return index.match(titre, self.threshold, self.max_edits)
+
+    def find(self, titre: str) -> Film | None:
+        """Film local correspondant au titre, lu en base, ou None."""
+        found = self.match(titre)
+        if found is None:
+            return None
+        return self.film_dao.get_films_by_id([found[0]]).get(found[0])
@@ -1,26 +1,53 @@
-import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 
 from dotenv import load_dotenv
 import requests
 
 from src.business_object.film import Film
+from src.utils.env import getenv
+from src.utils.etag import content_etag
 
 
 class TmdbService:
     """
     Service d'accès à l'API TMDB
+
+    La table des genres (id -> nom) est partagée entre toutes les instances et
+    rafraîchie au plus toutes les TMDB_GENRES_TTL secondes (24h par défaut).
+    Les recherches par lot sont parallélisées sur au plus TMDB_MAX_CONCURRENCY
+    requêtes simultanées (8 par défaut).
+    Les films recherchés par titre sont gardés TMDB_CACHE_TTL secondes
+    (10 min par défaut), dans la limite de TMDB_CACHE_MAX titres.
     """
 
+    _genres: dict[int, str] = {}
+    _genres_loaded_at: float | None = None
+    # ids absents de la table rechargée : plus de rechargement pour eux
+    # jusqu'au prochain (à expiration du TTL)
+    _unknown_genres: set[int] = set()
+    _genres_lock = threading.Lock()
+
+    _movies: OrderedDict[str, tuple[float, Film, str]] = OrderedDict()
+    _movies_lock = threading.Lock()
+
     def __init__(self):
         load_dotenv()
         load_dotenv(".env.local", override=True)
 
-        self.api_key = os.getenv("TMDB_API_KEY")
-        self.base_url = os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
+        self.api_key = getenv("TMDB_API_KEY")
+        self.base_url = getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
 
         if not self.api_key:
             raise RuntimeError("Clé TMDB_API_KEY manquante")
 
+        self.genres_ttl = int(getenv("TMDB_GENRES_TTL", "86400"))
+        self.max_concurrency = int(getenv("TMDB_MAX_CONCURRENCY", "8"))
+        self.movies_ttl = int(getenv("TMDB_CACHE_TTL", "600"))
+        self.movies_max = int(getenv("TMDB_CACHE_MAX", "1000"))
+
     # -----------------------------
     # factorisation des requestes
     # -----------------------------
@@ -44,44 +71,141 @@ class TmdbService:
     def movie_credits(self, movie_id: int) -> dict:
         return self._get(f"/movie/{movie_id}/credits", {"language": None})
 
+    def genre_list(self) -> dict:
+        return self._get("/genre/movie/list")
+
+    # -----------------------------
+    # Cache des genres : id -> nom
+    # -----------------------------
+    def get_genres(self, refresh: bool = False) -> dict[int, str]:
+        """
+        Retourne la table id -> nom des genres TMDB.
+        Elle n'est rechargée que si elle est absente, périmée ou si refresh=True.
+        """
+        cls = TmdbService
+        with cls._genres_lock:
+            perime = (
+                cls._genres_loaded_at is None
+                or time.monotonic() - cls._genres_loaded_at > self.genres_ttl
+            )
+            if refresh or perime:
+                genres = self.genre_list().get("genres", [])
+                cls._genres = {g["id"]: g.get("name") for g in genres if g.get("name")}
+                cls._genres_loaded_at = time.monotonic()
+                cls._unknown_genres = set()
+            return cls._genres
+
+    def genre_names(self, genre_ids: list[int]) -> list[str]:
+        """
+        Traduit une liste d'id de genres en noms.
+        Un id inconnu (nouveau genre côté TMDB) force un unique rechargement ;
+        s'il manque encore à la table rechargée, il est ignoré jusqu'à
+        l'expiration du TTL.
+        """
+        cls = TmdbService
+        genres = self.get_genres()
+        if any(g not in genres and g not in cls._unknown_genres for g in genre_ids):
+            genres = self.get_genres(refresh=True)
+            with cls._genres_lock:
+                cls._unknown_genres |= {g for g in genre_ids if g not in genres}
+        return [genres[g] for g in genre_ids if g in genres]
+
     # -----------------------------
     # Film filtré : id, titre, realisateur, annee, genres, casting
     # -----------------------------
     def get_movie_filtered(self, query: str, nb_acteurs: int = 5) -> Film:
+        """
+        Construit le film à partir du premier résultat de recherche.
+        Titre, date de sortie et genres sont déjà dans le résultat de recherche :
+        seuls les crédits demandent un second appel, et uniquement si nb_acteurs > 0.
+        """
         search = self.search_movie(query=query, page=1)
         results = search.get("results", [])
         if not results:
             raise ValueError(f"Aucun film trouvé pour '{query}'")
 
-        movie_id = results[0]["id"]
+        hit = results[0]
 
-        details = self.movie_details(movie_id=movie_id)
-        credits = self.movie_credits(movie_id=movie_id)
+        realisateur = None
+        casting = []
+        if nb_acteurs > 0:
+            credits = self.movie_credits(movie_id=hit["id"])
 
-        realisateur = next(
-            (
-                c.get("name")
-                for c in credits.get("crew", [])
-                if c.get("job") == "Director"
-            ),
-            None,
-        )
+            realisateur = next(
+                (
+                    c.get("name")
+                    for c in credits.get("crew", [])
+                    if c.get("job") == "Director"
+                ),
+                None,
+            )
 
-        casting = [
-            a.get("name") for a in credits.get("cast", [])[:nb_acteurs] if a.get("name")
-        ]
+            casting = [
+                a.get("name")
+                for a in credits.get("cast", [])[:nb_acteurs]
+                if a.get("name")
+            ]
 
-        genre = [g.get("name") for g in details.get("genres", []) if g.get("name")]
-        genre = ", ".join(genre)
+        genre = ", ".join(self.genre_names(hit.get("genre_ids", [])))
 
         # 📅 Année du film (API TMDB)
-        release_date = details.get("release_date")  # ex: "2010-07-16"
+        release_date = hit.get("release_date")  # ex: "2010-07-16"
         annee = int(release_date[:4]) if release_date else None
 
         return Film(
-            titre=details.get("title"),
+            titre=hit.get("title"),
             realisateur=realisateur,
             annee=annee,
             genre=genre,
             casting=casting,
         )
+
+    def get_movies_filtered(
+        self, queries: list[str], nb_acteurs: int = 5
+    ) -> dict[str, Film | Exception]:
+        """
+        Résout plusieurs titres en parallèle (au plus max_concurrency à la fois).
+        Retourne pour chaque titre le Film trouvé, ou l'exception rencontrée.
+        """
+        queries = list(dict.fromkeys(queries))
+        if not queries:
+            return {}
+
+        def resolve(query: str) -> Film | Exception:
+            try:
+                return self.get_movie_filtered(query, nb_acteurs)
+            except Exception as e:
+                return e
+
+        # Table des genres chargée une fois avant de lancer les threads
+        self.get_genres()
+        workers = max(1, min(self.max_concurrency, len(queries)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(queries, executor.map(resolve, queries), strict=True))
+
+    # -----------------------------
+    # Cache des recherches par titre
+    # -----------------------------
+    def get_movie_cached(self, query: str) -> tuple[Film, str]:
+        """
+        Comme get_movie_filtered(), avec un cache à durée de vie limitée.
+        Retourne le film et l'ETag de l'entrée (empreinte de son contenu).
+        """
+        cls = TmdbService
+        key = query.strip().lower()
+        with cls._movies_lock:
+            entry = cls._movies.get(key)
+            if entry and time.monotonic() - entry[0] <= self.movies_ttl:
+                cls._movies.move_to_end(key)
+                return entry[1], entry[2]
+
+        film = self.get_movie_filtered(query)
+        etag = content_etag(
+            [film.titre, film.realisateur, film.annee, film.genre, film.casting]
+        )
+        with cls._movies_lock:
+            cls._movies[key] = (time.monotonic(), film, etag)
+            cls._movies.move_to_end(key)
+            while len(cls._movies) > self.movies_max:
+                cls._movies.popitem(last=False)
+        return film, etag
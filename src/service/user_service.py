@@ -7,34 +7,81 @@ from src.app_errors.app_errors import (
     IncorrectPasswordError,
     InvalidInputError,
     InvalidPassWordError,
+    InvalidTokenError,
     SomeThingWentWrongError,
     UserAlreadyExistsError,
     UserNotFoundError,
     UserPermissionError,
+    UserSessionExpiredError,
 )
 from src.business_object.admin import Admin
 from src.business_object.client import Client
 from src.business_object.film import Film
 from src.business_object.user import User
 from src.dao.user_dao import UserDao
+from src.service.favorites_cache import FavoritesCache
+from src.service.recommendation_service import RecommendationService
+from src.service.request_context import get_context
 from src.service.session_manager import SessionManager
 from src.utils.log_decorator import log
+from src.utils.psswd_pool import PasswordPool
 from src.utils.psswd_proc import PasswordProcessing
+from src.utils.token_proc import TokenProcessing
 
 
 class UserService:
     """
     Service métier pour gérer les utilisateurs et les données liées aux stations.
     Utilise la session pour identifier l'utilisateur courant sans avoir à passer son pseudo.
+    La session courante est portée par le contexte de la requête : une même
+    instance peut donc servir des requêtes concurrentes.
     """
 
     def __init__(
         self,
         user_dao: UserDao = None,
+        password_pool: PasswordPool = None,
+        favorites_cache: FavoritesCache = None,
+        recommendation_service: RecommendationService = None,
     ):
         self.user_dao: UserDao = user_dao if user_dao else UserDao()
+        self.password_pool: PasswordPool = (
+            password_pool if password_pool else PasswordPool.shared()
+        )
+        self.favorites_cache: FavoritesCache = (
+            favorites_cache if favorites_cache else FavoritesCache.shared()
+        )
+        self.recommendation_service: RecommendationService = (
+            recommendation_service
+            if recommendation_service
+            else RecommendationService.shared()
+        )
         self.session_manager: SessionManager = SessionManager()
-        self.current_session = None
+        self.token_processor: TokenProcessing = TokenProcessing()
+
+    @property
+    def current_session(self):
+        """Session de la requête courante."""
+        return get_context().session
+
+    @current_session.setter
+    def current_session(self, session):
+        context = get_context()
+        context.session = session
+        context.user = session.user if session else None
+
+    @property
+    def current_user(self) -> Client | Admin | None:
+        """Utilisateur authentifié de la requête courante."""
+        return get_context().user
+
+    def get_user(self, pseudo: str) -> Client | Admin | None:
+        """
+        Lit un utilisateur par pseudo, une seule fois par requête.
+        """
+        return get_context().cached(
+            ("user", pseudo), lambda: self.user_dao.get_by_pseudo(pseudo)
+        )
 
     @staticmethod
     def validate_email(email: str):
@@ -44,11 +91,10 @@ class UserService:
         pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
         return re.match(pattern, email)
 
-    def signup(self, user: User, role: str = "client") -> User:
+    def _check_signup(self, user: User):
         """
-        Cette méthode peut être utilliser par un nouvel utilisateur
-        souhaitant créer un compte ou par l'administrateur dans le but
-        de créer un compte pour une tierse personne.
+        Vérifications préalables à la création d'un compte (type, email,
+        unicité du pseudo et de l'email, robustesse du mot de passe).
         """
         if not isinstance(user, User):
             raise TypeError("L'utilisateur doit être de type User")
@@ -56,14 +102,13 @@ class UserService:
         if not self.validate_email(user.email):
             raise InvalidInputError("L'email n'est pas valide")
 
-        verif_user_existed = self.user_dao.get_by_pseudo(user.pseudo)
-        if verif_user_existed:
+        # Lectures sur index unique ; une inscription concurrente est de toute
+        # façon rejetée par la contrainte lors de l'insertion.
+        if self.user_dao.pseudo_exists(user.pseudo):
             message = f"Le pseudo '{user.pseudo}' est déjà utilisé."
             raise UserAlreadyExistsError(message)
 
-        all_users = self.user_dao.get_all_users()
-        # for user_ in all_users:
-        if any(user_.email == user.email for user_ in all_users):
+        if self.user_dao.email_exists(user.email):
             message = f"Le mail '{user.email}' est déjà utilisé."
             raise UserAlreadyExistsError(message)
 
@@ -76,8 +121,12 @@ class UserService:
             )
             raise InvalidPassWordError(message)
 
+    def _create_user(self, user: User, hashed_password: bytes, role: str) -> User:
+        """
+        Enregistre l'utilisateur avec son mot de passe hashé.
+        """
         #  on change le password du user en le remplaçant par celui hashé
-        user._psswd = password_processor._hash_password().decode("utf-8")
+        user._psswd = hashed_password.decode("utf-8")
 
         #  on essaie de créer l'utilisateur avec la méthode create du DAO
         user_created = self.user_dao.create(user=user, role=role)
@@ -87,19 +136,35 @@ class UserService:
             message = "Échec de la création de l'utilisateur."
             raise CreationError(message)
 
-    def login(self, pseudo: str, psswd: str) -> Client | Admin:
+    def signup(self, user: User, role: str = "client") -> User:
         """
-        Connecte un utilisateur et crée sa session.
-        Stocke la session dans self.current_session.
+        Cette méthode peut être utilliser par un nouvel utilisateur
+        souhaitant créer un compte ou par l'administrateur dans le but
+        de créer un compte pour une tierse personne.
+        Le hachage bcrypt est délégué au pool de processus.
+        """
+        self._check_signup(user)
+        hashed_password = self.password_pool.hash(user._psswd).result()
+        return self._create_user(user, hashed_password, role)
+
+    async def signup_async(self, user: User, role: str = "client") -> User:
+        """
+        Version awaitable de signup : la boucle d'événements reste libre
+        pendant le hachage.
         """
-        user = self.user_dao.get_by_pseudo(pseudo)
+        self._check_signup(user)
+        hashed_password = await self.password_pool.hash_async(user._psswd)
+        return self._create_user(user, hashed_password, role)
+
+    def _get_login_user(self, pseudo: str) -> Client | Admin:
+        user = self.get_user(pseudo)
         if not user:
             message = "Utilisateur non trouvé."
             raise UserNotFoundError(message)
+        return user
 
-        if not PasswordProcessing._verify_password(
-            None, psswd, user._psswd.encode("utf-8")
-        ):
+    def _open_session(self, user: Client | Admin, verified: bool) -> Client | Admin:
+        if not verified:
             message = "Mot de passe incorrect."
             raise IncorrectPasswordError(message)
 
@@ -107,6 +172,87 @@ class UserService:
 
         return user
 
+    def _store_rehash(self, user: Client | Admin, hashed_password: bytes):
+        user._psswd = hashed_password.decode("utf-8")
+        self.user_dao.change_mdp(pseudo=user.pseudo, new_psswd=user._psswd)
+
+    def login(self, pseudo: str, psswd: str) -> Client | Admin:
+        """
+        Connecte un utilisateur et crée sa session.
+        Stocke la session dans self.current_session.
+        La vérification bcrypt est déléguée au pool de processus.
+        Si le hash stocké n'utilise pas le coût bcrypt courant, il est recalculé
+        au passage (le mot de passe en clair n'est disponible qu'ici).
+        """
+        user = self._get_login_user(pseudo)
+        hashed_password = user._psswd.encode("utf-8")
+        verified = self.password_pool.verify(psswd, hashed_password).result()
+        self._open_session(user, verified)
+
+        if PasswordProcessing.needs_rehash(hashed_password):
+            try:
+                self._store_rehash(user, self.password_pool.hash(psswd).result())
+            except Exception as e:
+                logging.warning(f"Rehash du mot de passe de {pseudo} ignoré : {e}")
+
+        return user
+
+    async def login_async(self, pseudo: str, psswd: str) -> Client | Admin:
+        """
+        Version awaitable de login.
+        """
+        user = self._get_login_user(pseudo)
+        hashed_password = user._psswd.encode("utf-8")
+        verified = await self.password_pool.verify_async(psswd, hashed_password)
+        self._open_session(user, verified)
+
+        if PasswordProcessing.needs_rehash(hashed_password):
+            try:
+                self._store_rehash(user, await self.password_pool.hash_async(psswd))
+            except Exception as e:
+                logging.warning(f"Rehash du mot de passe de {pseudo} ignoré : {e}")
+
+        return user
+
+    def login_token(self, pseudo: str, psswd: str) -> str:
+        """
+        Connecte un utilisateur et retourne un jeton signé pour sa session.
+        Le jeton permet ensuite de s'authentifier sans revérifier le mot de passe.
+        """
+        self.login(pseudo, psswd)
+        session = self.current_session
+        return self.token_processor.sign(
+            session.user.pseudo, session.session_id, session.expires_at
+        )
+
+    def authenticate(self, token: str) -> Client | Admin:
+        """
+        Retourne l'utilisateur associé à un jeton.
+        Vérifie la signature HMAC puis la session en mémoire : aucun accès à
+        la base de données ni calcul bcrypt.
+        """
+        payload = self.token_processor.verify(token)
+
+        session = self.session_manager.get_session_by_id(payload.get("sid"))
+        if session is None or session.user.pseudo != payload.get("sub"):
+            message = "Session expirée ou révoquée."
+            raise UserSessionExpiredError(message)
+
+        self.current_session = session
+        return session.user
+
+    def revoke_token(self, token: str) -> bool:
+        """
+        Révoque la session associée à un jeton.
+        """
+        try:
+            payload = self.token_processor.verify(token)
+        except InvalidTokenError:
+            return False
+
+        self.session_manager.revoke(payload.get("sid"))
+        return True
+
     def logout(self) -> bool:
         """
         Déconnecte l'utilisateur courant et termine sa session.
@@ -204,7 +350,6 @@ class UserService:
         if not isinstance(new_psswd, str):
             raise TypeError("Le mot de passe doit être une chaîne de caractères")
 
-        password_processor = PasswordProcessing(new_psswd)
         if not PasswordProcessing.validate_password(new_psswd):
             message = (
                 "Mot de passe invalide ! Il doit contenir majuscule, chiffre et caractère spécial"
@@ -213,7 +358,7 @@ class UserService:
             raise InvalidPassWordError(message)
 
         actor = self.current_session.user
-        new_psswd = password_processor._hash_password().decode("utf-8")
+        new_psswd = self.password_pool.hash(new_psswd).result().decode("utf-8")
         if actor.pseudo == pseudo:
             changed = self.user_dao.change_mdp(pseudo=pseudo, new_psswd=new_psswd)
             return changed
@@ -251,6 +396,7 @@ class UserService:
 
         elif actor.role == "admin" and target_user.role != "admin":
             success = self.user_dao.delete_user(pseudo)
+            self.favorites_cache.invalidate(pseudo)
         else:
             raise UserPermissionError(
                 "Vous n'avez pas les droits pour supprimer ce compte."
@@ -293,28 +439,140 @@ class UserService:
         return users_list
 
 
+    def _favorites_changed(self, pseudo: str):
+        """
+        Après une écriture sur les favoris : invalide le cache et met à jour
+        les modèles de recommandation.
+        """
+        self.favorites_cache.invalidate(pseudo)
+        self.recommendation_service.sync()
+
     @log
     def add_favorite(self, pseudo: str, film: Film):
+        """
+        Ajoute un film aux favoris d'un utilisateur (une seule ligne insérée,
+        sans relire la liste existante).
+        """
         try:
-            user = self.user_dao.get_by_pseudo(pseudo)
-            favorites = self.user_dao.get_favorites(user)
-            if favorites:
-                favorites.append(film)
-            else:
-                favorites = [film]
-            user.listfilms = favorites
-            self.user_dao.add_favorites(user)
-            return True
+            user = self.get_user(pseudo)
+            id_user = self.user_dao.get_id(user)
+            return self.user_dao.add_favorite(id_user, film)
         except Exception as e:
             logging.error(f"Erreur lors de l'ajout des favoris : {e}")
             return False
+        finally:
+            self._favorites_changed(pseudo)
+
+    def add_favorites_batch(self, pseudo: str, films: list[Film]) -> bool:
+        """
+        Ajoute plusieurs films aux favoris d'un utilisateur en une transaction.
+        """
+        try:
+            user = self.get_user(pseudo)
+            id_user = self.user_dao.get_id(user)
+            return self.user_dao.add_favorites_batch(id_user, films)
+        except Exception as e:
+            logging.error(f"Erreur lors de l'ajout des favoris : {e}")
+            return False
+        finally:
+            self._favorites_changed(pseudo)
 
 
     @log
-    def get_favorites(self, pseudo: str):
+    def remove_favorite(self, pseudo: str, titre: str) -> bool:
+        """
+        Retire un film (par son titre) des favoris d'un utilisateur.
+        """
+        try:
+            user = self.get_user(pseudo)
+            id_user = self.user_dao.get_id(user)
+            return self.user_dao.remove_favorite(id_user, titre)
+        except Exception as e:
+            logging.error(f"Erreur lors de la suppression du favori : {e}")
+            return False
+        finally:
+            self._favorites_changed(pseudo)
+
+    def sync_favorites(self, pseudo: str, since: int | None = None) -> dict | None:
+        """
+        Retourne les favoris ajoutés ou retirés depuis le jeton `since`, et le
+        nouveau jeton. Sans jeton, ou si le jeton est inconnu de la base, la
+        liste complète est renvoyée (full=True).
+
+        Retour
+        ------
+        dict | None
+            {"full": bool, "token": int, "added": list[Film], "removed": list[Film]}
+        """
+        try:
+            user = self.get_user(pseudo)
+            id_user = self.user_dao.get_id(user)
+
+            if since is not None and 0 <= since <= self.user_dao.last_favorites_change():
+                changes = self.user_dao.get_favorites_changes(id_user, since)
+                if changes is not None:
+                    token = since
+                    latest = {}  # dernier changement de chaque film
+                    for id_change, op, film in changes:
+                        latest[(film.titre, film.realisateur)] = (op, film)
+                        token = id_change
+                    return {
+                        "full": False,
+                        "token": token,
+                        "added": [f for op, f in latest.values() if op == "add"],
+                        "removed": [f for op, f in latest.values() if op == "remove"],
+                    }
+
+            # Resynchronisation complète : jeton relevé avant la lecture, un
+            # changement concurrent sera renvoyé à la synchronisation suivante.
+            token = self.user_dao.last_favorites_change(id_user)
+            films = self.user_dao.get_favorites_by_pseudo(pseudo)
+            if films is None:
+                return None
+            return {"full": True, "token": token, "added": films, "removed": []}
+
+        except Exception as e:
+            logging.error(f"Erreur lors de la synchronisation des favoris : {e}")
+            return None
+
+    def favorites_change(self, pseudo: str) -> int | None:
+        """
+        Dernier changement des favoris d'un utilisateur (identifiant
+        FAVORIS_LOG), lu en base une fois par requête : la même valeur sur
+        tous les workers. None si l'utilisateur est inconnu.
+        """
+
+        def read():
+            id_user = self.user_dao.get_id(self.get_user(pseudo))
+            if id_user is None:
+                return None
+            return self.user_dao.last_favorites_change(id_user)
+
+        try:
+            return get_context().cached(("favorites_change", pseudo), read)
+        except Exception as e:
+            logging.error(f"Erreur lors de la lecture du journal des favoris : {e}")
+            return None
+
+    def get_favorites(
+        self, pseudo: str, change: int | None = None
+    ) -> list[Film] | None:
+        """
+        Retourne les favoris d'un utilisateur, depuis le cache si possible.
+        Une lecture en base ne remplit le cache que si aucune écriture n'a eu
+        lieu entre-temps (voir FavoritesCache). Avec `change` (voir
+        favorites_change), une liste mise en cache avant un changement fait
+        par un autre worker est relue.
+        """
+        films = self.favorites_cache.get(pseudo, change)
+        if films is not None:
+            return films
         try:
-            user = self.user_dao.get_by_pseudo(pseudo)
-            return self.user_dao.get_favorites(user)
+            version = self.favorites_cache.version(pseudo)
+            films = self.user_dao.get_favorites_by_pseudo(pseudo)
+            if films is not None:
+                self.favorites_cache.fill(pseudo, films, version, change)
+            return films
         except Exception as e:
             logging.error(f"Erreur lors de la récupération des favoris : {e}")
             return None
@@ -172,3 +172,32 @@ def test_get_films_returns_none_on_exception(actor_dao, sample_actor):
 
     actor_dao.dao.select_query.side_effect = Exception("Select error")
     assert actor_dao.get_films(sample_actor) is None
+
+
+# =====================================================
+# find_id() / get_actors_by_id()
+# =====================================================
+def test_find_id_uses_parameters(actor_dao):
+    actor_dao.dao.placeholder.return_value = "?"
+    cursor = actor_dao.dao.transaction.return_value.__enter__.return_value
+    cursor.fetchone.return_value = (7,)
+
+    assert actor_dao.find_id(Actor(nom="O'Brien", prenom="Conan")) == 7
+    assert cursor.execute.call_args.args[1] == ("O'Brien", "Conan")
+
+
+def test_find_id_returns_none_when_missing(actor_dao, sample_actor):
+    cursor = actor_dao.dao.transaction.return_value.__enter__.return_value
+    cursor.fetchone.return_value = None
+
+    assert actor_dao.find_id(sample_actor) is None
+
+
+def test_get_actors_by_id(actor_dao):
+    actor_dao.dao.select_query.return_value = [(3, "Hanks", "Tom")]
+
+    actors = actor_dao.get_actors_by_id([3])
+
+    assert actors[3].description() == "Tom Hanks"
+    assert "id_actor IN (3)" in actor_dao.dao.select_query.call_args.kwargs["where"]
+    assert actor_dao.get_actors_by_id([]) == {}
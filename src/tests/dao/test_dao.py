@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.dao.dao import DAO
+from src.dao.db_connection import DBConnection
+
+
+@pytest.fixture
+def postgres_dao(monkeypatch):
+    """DAO PostgreSQL dont les connexions sont des MagicMock"""
+    for name in ("HOST", "PORT", "DATABASE", "USER", "PASSWORD"):
+        monkeypatch.setenv(f"POSTGRES_{name}", "test")
+    with (
+        patch(
+            "src.dao.db_connection.psycopg2.connect",
+            side_effect=lambda **_: MagicMock(closed=False),
+        ) as connect,
+        patch.object(DAO, "postgres", return_value=True),
+        patch.object(DAO, "__init__", return_value=None),
+    ):
+        DBConnection._instances.pop(DBConnection, None)
+        try:
+            yield DAO(), connect
+        finally:
+            DBConnection._instances.pop(DBConnection, None)
+
+
+def test_transaction_has_its_own_connection(postgres_dao):
+    """Test - le rollback d'une transaction ne touche pas la connexion partagée"""
+    dao, _ = postgres_dao
+    shared = DBConnection().connection
+
+    with pytest.raises(ValueError), dao.transaction():
+        raise ValueError("échec")
+
+    shared.rollback.assert_not_called()
+    shared.commit.assert_not_called()
+
+
+def test_concurrent_transactions_use_distinct_connections(postgres_dao):
+    """Test - deux transactions ouvertes en même temps, deux connexions"""
+    dao, _ = postgres_dao
+
+    with dao.transaction() as first, dao.transaction() as second:
+        assert first is not second
+
+
+def test_transaction_connection_is_reused(postgres_dao):
+    """Test - la connexion d'une transaction terminée est reprise"""
+    dao, connect = postgres_dao
+    DBConnection()  # connexion partagée
+
+    with dao.transaction():
+        pass
+    with dao.transaction():
+        pass
+
+    assert connect.call_count == 2
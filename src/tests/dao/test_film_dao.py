@@ -1,9 +1,11 @@
-from unittest.mock import MagicMock
+import sqlite3
+from unittest.mock import MagicMock, call
 
 import pytest
 
 from src.business_object.actor import Actor
 from src.business_object.film import Film
+from src.dao.dao import DAO
 from src.dao.film_dao import FilmDAO
 
 
@@ -94,6 +96,94 @@ def test_add_film_returns_false_on_exception(film_dao, sample_film):
     assert film_dao.add_film(sample_film) is False
 
 
+# =====================================================
+# upsert_film()
+# =====================================================
+def test_upsert_film_inserts_with_conflict_guard(film_dao, sample_film):
+    film_dao.dao.select_query.return_value = (7,)
+
+    assert film_dao.upsert_film(sample_film) == 7
+    _, kwargs = film_dao.dao.insert_query.call_args
+    assert kwargs["other"] == "ON CONFLICT (titre, realisateur) DO NOTHING"
+    film_dao.dao.select_query.assert_called_once()
+
+
+def test_upsert_film_returns_none_on_exception(film_dao, sample_film):
+    film_dao.dao.insert_query.side_effect = Exception("Insert error")
+
+    assert film_dao.upsert_film(sample_film) is None
+
+
+def test_upsert_films_batches_in_one_cursor(film_dao, sample_film):
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE FILM (id_film INTEGER PRIMARY KEY, titre TEXT, "
+        "realisateur TEXT, annee INT, genre TEXT, UNIQUE(titre, realisateur))"
+    )
+    cursor = conn.cursor()
+    film_dao.dao.placeholder.return_value = "?"
+    film_dao.dao.insert_many.side_effect = lambda *args, **kwargs: DAO.insert_many(
+        film_dao.dao, *args, **kwargs
+    )
+    other = Film(titre="Tenet", realisateur="Nolan", annee=2020, genre="Action")
+
+    ids = film_dao.upsert_films([sample_film, other, sample_film], cursor)
+
+    assert ids == [1, 2, 1]
+    assert conn.execute("SELECT COUNT(*) FROM FILM").fetchone() == (2,)
+    film_dao.dao.insert_query.assert_not_called()
+
+
+def test_upsert_casting_stores_tmdb_names_once(film_dao):
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE ACTOR (id_actor INTEGER PRIMARY KEY, nom TEXT, prenom TEXT, "
+        "UNIQUE(nom, prenom))"
+    )
+    conn.execute(
+        "CREATE TABLE CASTING (id_film INT, id_actor INT, PRIMARY KEY(id_film, id_actor))"
+    )
+    cursor = conn.cursor()
+    film_dao.dao.placeholder.return_value = "?"
+    film_dao.dao.insert_many.side_effect = lambda *args, **kwargs: DAO.insert_many(
+        film_dao.dao, *args, **kwargs
+    )
+    listener = MagicMock()
+    FilmDAO.subscribe(listener)
+    try:
+        inception = Film(
+            titre="Inception",
+            realisateur="Nolan",
+            annee=2010,
+            genre="Sci-Fi",
+            casting=["Leonardo DiCaprio", "Elliot Page", "Leonardo DiCaprio"],
+        )
+        tenet = Film(
+            titre="Tenet",
+            realisateur="Nolan",
+            annee=2020,
+            genre="Action",
+            casting=["Elliot Page", "Zendaya"],
+        )
+        film_dao.upsert_casting([1, 2], [inception, tenet], cursor)
+        film_dao.upsert_casting([1], [inception], cursor)
+    finally:
+        FilmDAO.unsubscribe(listener)
+
+    assert conn.execute(
+        "SELECT nom, prenom FROM ACTOR ORDER BY id_actor"
+    ).fetchall() == [
+        ("DiCaprio", "Leonardo"),
+        ("Page", "Elliot"),
+        ("", "Zendaya"),
+    ]
+    assert conn.execute(
+        "SELECT id_film, id_actor FROM CASTING ORDER BY id_film, id_actor"
+    ).fetchall() == [(1, 1), (1, 2), (2, 2), (2, 3)]
+    listener.casting_added.assert_has_calls([call(1, [1, 2]), call(2, [2, 3])])
+    assert listener.casting_added.call_count == 2
+
+
 # =====================================================
 # get_id()
 # =====================================================
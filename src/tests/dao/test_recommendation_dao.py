@@ -0,0 +1,95 @@
+from contextlib import contextmanager
+import sqlite3
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.dao.dao import DAO
+from src.dao.recommendation_dao import RecommendationDAO
+
+
+# =====================================================
+# FIXTURE : RecommendationDAO sur une base SQLite en mémoire
+# =====================================================
+@pytest.fixture
+def recommendation_dao(monkeypatch):
+    dao_mock = MagicMock()
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
+        """
+        CREATE TABLE USERS (id_user INTEGER PRIMARY KEY, pseudo TEXT);
+        CREATE TABLE FILM (id_film INTEGER PRIMARY KEY, titre TEXT,
+          realisateur TEXT, annee INT, genre TEXT);
+        CREATE TABLE RECOMMENDATIONS (id_user INT, rang INT, id_film INT,
+          score REAL, PRIMARY KEY (id_user, rang));
+        INSERT INTO USERS VALUES (1, 'alice'), (2, 'bob');
+        INSERT INTO FILM VALUES (10, 'Inception', 'Nolan', 2010, 'SF'),
+          (20, 'Tenet', 'Nolan', 2020, 'SF');
+        INSERT INTO RECOMMENDATIONS VALUES (1, 1, 10, 0.5);
+        """
+    )
+
+    @contextmanager
+    def transaction():
+        yield conn.cursor()
+        conn.commit()
+
+    dao_mock.placeholder.return_value = "?"
+    dao_mock.postgres.return_value = False
+    dao_mock.transaction.side_effect = transaction
+    dao_mock.insert_many.side_effect = lambda *args, **kwargs: DAO.insert_many(
+        dao_mock, *args, **kwargs
+    )
+
+    import src.dao.recommendation_dao as recommendation_dao_module
+
+    monkeypatch.setattr(recommendation_dao_module, "DAO", lambda: dao_mock)
+    return RecommendationDAO(), conn
+
+
+# =====================================================
+# get_for_user()
+# =====================================================
+def test_get_for_user(recommendation_dao):
+    dao, _ = recommendation_dao
+
+    [(film, score)] = dao.get_for_user("alice")
+
+    assert film.titre == "Inception"
+    assert score == 0.5
+    assert dao.get_for_user("bob") == []
+
+
+def test_get_for_user_database_error(recommendation_dao):
+    dao, _ = recommendation_dao
+    dao.dao.transaction.side_effect = Exception("boom")
+
+    assert dao.get_for_user("alice") == []
+
+
+# =====================================================
+# replace_all()
+# =====================================================
+def test_replace_all_swaps_tables(recommendation_dao):
+    dao, conn = recommendation_dao
+
+    assert dao.replace_all([[(1, 1, 20, 0.9), (1, 2, 10, 0.1)], [(2, 1, 10, 0.3)]])
+
+    assert [film.titre for film, _ in dao.get_for_user("alice")] == [
+        "Tenet",
+        "Inception",
+    ]
+    assert [film.titre for film, _ in dao.get_for_user("bob", 1)] == ["Inception"]
+    tables = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    assert "RECOMMENDATIONS_NEW" not in {row[0] for row in tables}
+
+
+def test_replace_all_keeps_old_table_on_error(recommendation_dao):
+    dao, _ = recommendation_dao
+
+    def batches():
+        yield [(1, 1, 20, 0.9)]
+        raise RuntimeError("calcul interrompu")
+
+    assert dao.replace_all(batches()) is False
+    assert [film.titre for film, _ in dao.get_for_user("alice")] == ["Inception"]
@@ -1,9 +1,12 @@
+import sqlite3
 from typing import Literal
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.app_errors.app_errors import UserAlreadyExistsError
 from src.business_object.user import User
+from src.dao.dao import DAO
 from src.dao.user_dao import UserDao
 
 
@@ -154,6 +157,353 @@ class TestCreate:
         # Le premier argument doit être la table USERS
         assert call_args[0] == "USERS"
 
+    def test_create_unique_violation_raises(
+        self,
+        user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock],
+        user_examples: tuple[User, User, User],
+    ):
+        """Test violation d'index unique - lève UserAlreadyExistsError"""
+        # Arrange
+        dao, mock_dao, _ = user_dao_with_mocks
+        user, _, _ = user_examples
+        mock_dao.insert_query.side_effect = sqlite3.IntegrityError(
+            "UNIQUE constraint failed: USERS.email"
+        )
+
+        # Act / Assert
+        with pytest.raises(UserAlreadyExistsError):
+            dao.create(user, role="client")
+
+
+# ---------------------- TESTS pseudo_exists / email_exists ---------------------- #
+
+
+class TestExists:
+    """Tests pour les méthodes pseudo_exists() et email_exists() du UserDao"""
+
+    @pytest.mark.parametrize("row, expected", [((1,), True), (None, False)])
+    def test_pseudo_exists(
+        self,
+        user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock],
+        row,
+        expected: bool,
+    ):
+        """Test - une seule lecture indexée sur le pseudo"""
+        dao, mock_dao, _ = user_dao_with_mocks
+        mock_dao.select_query.return_value = row
+
+        assert dao.pseudo_exists("Viki2025") is expected
+        mock_dao.select_query.assert_called_once_with(
+            "USERS", "1", where="pseudo = 'Viki2025'", other="LIMIT 1"
+        )
+
+    @pytest.mark.parametrize("row, expected", [((1,), True), (None, False)])
+    def test_email_exists(
+        self,
+        user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock],
+        row,
+        expected: bool,
+    ):
+        """Test - une seule lecture indexée sur l'email (normalisé)"""
+        dao, mock_dao, _ = user_dao_with_mocks
+        mock_dao.select_query.return_value = row
+
+        assert dao.email_exists("Viki@Example.com") is expected
+        mock_dao.select_query.assert_called_once_with(
+            "USERS", "1", where="email = 'viki@example.com'", other="LIMIT 1"
+        )
+
+    def test_exists_database_error(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - erreur de base de données"""
+        dao, mock_dao, _ = user_dao_with_mocks
+        mock_dao.select_query.side_effect = Exception("DB crash")
+
+        assert dao.pseudo_exists("Viki2025") is False
+        assert dao.email_exists("viki@example.com") is False
+
+
+# ---------------------- TESTS add_favorite ---------------------- #
+
+
+class TestAddFavorite:
+    """Tests pour la méthode add_favorite() du UserDao"""
+
+    def test_add_favorite_inserts_single_row(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - upsert du film puis une seule insertion dans FAVORIS"""
+        dao, mock_dao, mock_film_dao = user_dao_with_mocks
+        mock_film_dao.upsert_film.return_value = 12
+        film = MagicMock()
+
+        result = dao.add_favorite(3, film)
+
+        assert result is True
+        mock_film_dao.upsert_film.assert_called_once_with(film)
+        cursor = mock_dao.transaction.return_value.__enter__.return_value
+        mock_film_dao.upsert_casting.assert_called_once_with([12], [film], cursor)
+        cursor.executemany.assert_called_once()  # journal FAVORIS_LOG
+        mock_dao.insert_many.assert_called_once_with(
+            cursor,
+            "FAVORIS",
+            "id_user, id_film",
+            [(3, 12)],
+            other="ON CONFLICT (id_user, id_film) DO NOTHING",
+        )
+        mock_dao.select_query.assert_not_called()
+
+    def test_add_favorite_locks_log_on_postgres(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - FAVORIS_LOG verrouillé avant l'écriture du journal"""
+        dao, mock_dao, mock_film_dao = user_dao_with_mocks
+        mock_dao.postgres.return_value = True
+        mock_film_dao.upsert_film.return_value = 12
+
+        assert dao.add_favorite(3, MagicMock()) is True
+
+        cursor = mock_dao.transaction.return_value.__enter__.return_value
+        assert [c[0] for c in cursor.method_calls[:2]] == ["execute", "executemany"]
+        assert "LOCK TABLE FAVORIS_LOG" in cursor.execute.call_args[0][0]
+
+    def test_add_favorite_film_not_saved(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - le film n'a pas pu être enregistré"""
+        dao, mock_dao, mock_film_dao = user_dao_with_mocks
+        mock_film_dao.upsert_film.return_value = None
+
+        assert dao.add_favorite(3, MagicMock()) is False
+        mock_dao.transaction.assert_not_called()
+
+    def test_add_favorite_database_error(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - erreur de base de données"""
+        dao, mock_dao, mock_film_dao = user_dao_with_mocks
+        mock_film_dao.upsert_film.return_value = 12
+        mock_dao.insert_many.side_effect = Exception("DB crash")
+
+        assert dao.add_favorite(3, MagicMock()) is False
+
+
+# ---------------------- TESTS add_favorites_batch ---------------------- #
+
+
+class TestAddFavoritesBatch:
+    """Tests pour la méthode add_favorites_batch() du UserDao"""
+
+    def test_add_favorites_batch_single_transaction(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - films et favoris insérés par lots dans la même transaction"""
+        dao, mock_dao, mock_film_dao = user_dao_with_mocks
+        cursor = mock_dao.transaction.return_value.__enter__.return_value
+        mock_film_dao.upsert_films.return_value = [4, 5]
+        films = [MagicMock(), MagicMock()]
+
+        assert dao.add_favorites_batch(3, films) is True
+        mock_dao.transaction.assert_called_once()
+        mock_film_dao.upsert_films.assert_called_once_with(films, cursor)
+        mock_film_dao.upsert_casting.assert_called_once_with([4, 5], films, cursor)
+        mock_dao.insert_many.assert_called_once_with(
+            cursor,
+            "FAVORIS",
+            "id_user, id_film",
+            [(3, 4), (3, 5)],
+            other="ON CONFLICT (id_user, id_film) DO NOTHING",
+        )
+        mock_dao.insert_query.assert_not_called()
+
+    def test_add_favorites_batch_film_not_saved(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - un film non enregistré annule tout le lot"""
+        dao, mock_dao, mock_film_dao = user_dao_with_mocks
+        mock_film_dao.upsert_films.return_value = [4, None]
+
+        assert dao.add_favorites_batch(3, [MagicMock(), MagicMock()]) is False
+        mock_dao.insert_many.assert_not_called()
+
+    def test_add_favorites_batch_empty(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - lot vide : aucune transaction"""
+        dao, mock_dao, _ = user_dao_with_mocks
+
+        assert dao.add_favorites_batch(3, []) is True
+        mock_dao.transaction.assert_not_called()
+
+
+# ---------------------- TESTS journal FAVORIS_LOG ---------------------- #
+
+
+@pytest.fixture
+def user_dao_sqlite(user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]):
+    """UserDao dont les transactions s'exécutent sur une base SQLite en mémoire"""
+    dao, mock_dao, mock_film_dao = user_dao_with_mocks
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
+        """
+        CREATE TABLE FILM (id_film INTEGER PRIMARY KEY, titre TEXT);
+        CREATE TABLE FAVORIS (id_user INT, id_film INT, PRIMARY KEY (id_user, id_film));
+        CREATE TABLE FAVORIS_LOG (id_change INTEGER PRIMARY KEY, id_user INT,
+          id_film INT, op TEXT, changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        INSERT INTO FILM VALUES (1, 'Inception'), (2, 'Tenet');
+        """
+    )
+    mock_dao.postgres.return_value = False
+    mock_dao.placeholder.return_value = "?"
+    mock_dao.transaction.return_value.__enter__.return_value = conn.cursor()
+    mock_dao.insert_many.side_effect = lambda *args, **kwargs: DAO.insert_many(
+        mock_dao, *args, **kwargs
+    )
+    return dao, mock_film_dao, conn
+
+
+class TestFavoritesLog:
+    """Tests du journal des favoris (add_favorite, remove_favorite)"""
+
+    def test_only_new_favorites_are_logged(self, user_dao_sqlite):
+        """Test - un favori déjà présent n'est pas journalisé deux fois"""
+        dao, mock_film_dao, conn = user_dao_sqlite
+        mock_film_dao.upsert_film.return_value = 1
+
+        dao.add_favorite(3, MagicMock())
+        dao.add_favorite(3, MagicMock())
+
+        assert conn.execute(
+            "SELECT id_user, id_film, op FROM FAVORIS_LOG"
+        ).fetchall() == [(3, 1, "add")]
+
+    def test_remove_favorite_logs_removal(self, user_dao_sqlite):
+        """Test - suppression journalisée, seconde suppression sans effet"""
+        dao, mock_film_dao, conn = user_dao_sqlite
+        mock_film_dao.upsert_film.return_value = 1
+        dao.add_favorite(3, MagicMock())
+
+        assert dao.remove_favorite(3, "Inception") is True
+        assert dao.remove_favorite(3, "Inception") is False
+        assert conn.execute("SELECT COUNT(*) FROM FAVORIS").fetchone() == (0,)
+        assert conn.execute("SELECT op FROM FAVORIS_LOG").fetchall() == [
+            ("add",),
+            ("remove",),
+        ]
+
+    def test_get_favorites_log(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - journal de tous les utilisateurs, postérieur au jeton"""
+        dao, mock_dao, _ = user_dao_with_mocks
+        mock_dao.select_query.return_value = [(8, 3, 1, "add"), (9, 4, 1, "remove")]
+
+        changes = dao.get_favorites_log(7, 100)
+
+        assert changes == [(8, 3, 1, "add"), (9, 4, 1, "remove")]
+        kwargs = mock_dao.select_query.call_args.kwargs
+        assert kwargs["where"] == "id_change > 7"
+        assert kwargs["other"] == "ORDER BY id_change ASC LIMIT 100"
+
+    def test_get_favorites_daily_counts(self, user_dao_sqlite):
+        """Test - comptes par film, opération et jour, jusqu'au jeton donné"""
+        dao, mock_film_dao, conn = user_dao_sqlite
+        conn.executemany(
+            "INSERT INTO FAVORIS_LOG (id_user, id_film, op, changed_at) VALUES (?, ?, ?, ?)",
+            [
+                (1, 1, "add", "2026-10-17 08:00:00"),
+                (2, 1, "add", "2026-10-17 20:00:00"),
+                (2, 1, "remove", "2026-10-18 09:00:00"),
+                (3, 2, "add", "2026-10-10 09:00:00"),
+                (4, 2, "add", "2026-10-18 10:00:00"),
+            ],
+        )
+        dao.dao.select_query.side_effect = lambda *args, **kwargs: DAO.select_query(
+            dao.dao, *args, **kwargs
+        )
+        dao.dao.postgres.return_value = False
+
+        with patch("src.dao.dao.LocalDBConnection") as connection:
+            connection.return_value.get_connection.return_value.__enter__.return_value = conn
+            counts = dao.get_favorites_daily_counts("2026-10-15 00:00:00", 4)
+
+        assert sorted(counts) == [
+            (1, "add", "2026-10-17", 2),
+            (1, "remove", "2026-10-18", 1),
+        ]
+
+    def test_get_favorites_changes(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - lecture des changements postérieurs au jeton"""
+        dao, mock_dao, _ = user_dao_with_mocks
+        mock_dao.select_query.return_value = [(8, "remove", "A", "R", 2000, "g")]
+
+        changes = dao.get_favorites_changes(3, 7)
+
+        assert [(c[0], c[1], c[2].titre) for c in changes] == [(8, "remove", "A")]
+        assert (
+            "l.id_user = 3 AND l.id_change > 7" in mock_dao.select_query.call_args.args
+        )
+
+    def test_last_favorites_change_empty_log(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - journal vide"""
+        dao, mock_dao, _ = user_dao_with_mocks
+        mock_dao.select_query.return_value = (None,)
+
+        assert dao.last_favorites_change() == 0
+
+    def test_get_favorites_counts(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - nombre de favoris par film, en une requête groupée"""
+        dao, mock_dao, _ = user_dao_with_mocks
+        mock_dao.select_query.return_value = [(1, 3), (2, 1)]
+
+        assert dao.get_favorites_counts() == [(1, 3), (2, 1)]
+        assert mock_dao.select_query.call_args.kwargs["other"] == "GROUP BY id_film"
+
+
+# ---------------------- TESTS get_favorites_by_pseudo ---------------------- #
+
+
+class TestGetFavoritesByPseudo:
+    """Tests pour la méthode get_favorites_by_pseudo() du UserDao"""
+
+    def test_single_join_query(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - une seule requête, sans relecture de l'utilisateur"""
+        dao, mock_dao, _ = user_dao_with_mocks
+        mock_dao.select_query.return_value = [(1, "Inception", "Nolan", 2010, "SF")]
+
+        films = dao.get_favorites_by_pseudo("louis")
+
+        assert [f.titre for f in films] == ["Inception"]
+        mock_dao.select_query.assert_called_once()
+        assert "u.pseudo = 'louis'" in mock_dao.select_query.call_args.args
+
+    def test_no_favorites_returns_empty_list(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - aucun favori"""
+        dao, mock_dao, _ = user_dao_with_mocks
+        mock_dao.select_query.return_value = []
+
+        assert dao.get_favorites_by_pseudo("louis") == []
+
+    def test_database_error_returns_none(
+        self, user_dao_with_mocks: tuple[UserDao, MagicMock, MagicMock]
+    ):
+        """Test - erreur de base de données"""
+        dao, mock_dao, _ = user_dao_with_mocks
+        mock_dao.select_query.side_effect = Exception("DB crash")
+
+        assert dao.get_favorites_by_pseudo("louis") is None
+
 
 # ---------------------- TESTS change_user_email ---------------------- #
 
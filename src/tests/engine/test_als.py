@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from src.engine.als import ImplicitALS, conjugate_gradient
+
+
+# =====================================================
+# Fixtures
+# =====================================================
+@pytest.fixture
+def favorites():
+    """Deux groupes d'utilisateurs, chacun aimant une moitié des films."""
+    rng = np.random.default_rng(0)
+    users, films = [], []
+    for user in range(200):
+        group = user % 2
+        liked = rng.choice(np.arange(group * 20, group * 20 + 20), 8, replace=False)
+        users += [user] * liked.size
+        films += (liked + 100).tolist()
+    return np.asarray(users), np.asarray(films)
+
+
+@pytest.fixture
+def model(favorites):
+    return ImplicitALS(factors=4, iterations=10, block_nnz=200).fit(*favorites)
+
+
+# =====================================================
+# conjugate_gradient
+# =====================================================
+def test_conjugate_gradient_solves_normal_equations():
+    rng = np.random.default_rng(0)
+    others = rng.standard_normal((30, 6))
+    weights = sp.random(5, 30, density=0.3, random_state=0, format="csr") * 10
+    gram = others.T @ others + 0.1 * np.eye(6)
+    x = np.zeros((5, 6))
+
+    conjugate_gradient(weights, x, others, gram, steps=20)
+
+    for row in range(5):
+        c = weights[row].toarray().ravel()
+        a = gram + others.T @ (c[:, None] * others)
+        b = others.T @ (c + (c > 0))
+        assert x[row] == pytest.approx(np.linalg.solve(a, b), abs=1e-6)
+
+
+# =====================================================
+# ImplicitALS
+# =====================================================
+def test_factors_are_float32(model):
+    assert model.user_factors.dtype == np.float32
+    assert model.item_factors.shape == (40, 4)
+    assert len(model.iteration_times) == 10
+
+
+def test_recommend_same_group_without_liked(model, favorites):
+    users, films = favorites
+    for user, recommended in enumerate(model.recommend(np.arange(200), 3)):
+        liked = set(films[users == user].tolist())
+        group = range(100 + (user % 2) * 20, 120 + (user % 2) * 20)
+        assert [film for film, _ in recommended] != []
+        assert all(film in group and film not in liked for film, _ in recommended)
+
+
+def test_recommend_unknown_user(model):
+    assert model.recommend([999, 0], 3)[0] == []
+    assert model.recommend_user(999) == []
+
+
+def test_workers_match_single_process(model, favorites):
+    parallel = ImplicitALS(factors=4, iterations=10, block_nnz=200, workers=2).fit(
+        *favorites
+    )
+
+    assert parallel.user_factors == pytest.approx(model.user_factors, abs=1e-5)
+
+
+def test_save_and_load_mmap(model, tmp_path):
+    model.save(tmp_path)
+
+    loaded = ImplicitALS.load(tmp_path)
+
+    assert isinstance(loaded.item_factors, np.memmap)
+    assert loaded.recommend(np.arange(5), 3) == model.recommend(np.arange(5), 3)
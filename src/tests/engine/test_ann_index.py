@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from src.engine.ann_index import LSHIndex
+
+
+# =====================================================
+# Fixtures
+# =====================================================
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((20, 16))
+    labels = rng.integers(0, 20, 2000)
+    return (centers[labels] + 0.3 * rng.standard_normal((2000, 16))).astype(np.float32)
+
+
+@pytest.fixture
+def index(vectors):
+    return LSHIndex(16, n_tables=8, n_bits=8).build(np.arange(2000) * 10, vectors)
+
+
+def _recall(index, queries, n_probes, k=10):
+    found = 0
+    for film_id in queries:
+        exact = index.exact(index.vector(film_id), k, exclude=(film_id,))
+        approx = index.similar(film_id, k, n_probes)
+        found += len({f for f, _ in exact} & {f for f, _ in approx})
+    return found / (k * len(queries))
+
+
+# =====================================================
+# LSHIndex
+# =====================================================
+def test_similar_finds_itself_first(index, vectors):
+    result = index.query(vectors[3], k=1)
+
+    assert result[0][0] == 30
+    assert result[0][1] == pytest.approx(1.0)
+
+
+def test_recall_grows_with_probes(index):
+    queries = list(range(0, 20000, 400))
+
+    low, high = _recall(index, queries, 0), _recall(index, queries, 8)
+
+    assert high >= low
+    assert high > 0.8
+
+
+def test_insert_and_remove(index, vectors):
+    index.insert(99999, vectors[3])
+
+    assert 99999 in {f for f, _ in index.similar(30, 5)}
+    assert len(index) == 2001
+
+    index.remove(99999)
+    index.remove(30)
+    assert index.vector(30) is None
+    assert 30 not in {f for f, _ in index.query(vectors[3], 5)}
+    assert len(index) == 1999
+
+
+def test_compact_keeps_results(index, vectors):
+    index.insert(99999, vectors[3])
+    before = index.similar(30, 5)
+
+    index.compact()
+
+    assert index.similar(30, 5) == pytest.approx(before)
+    assert index.vector(99999) is not None
+
+
+def test_save_and_load_mmap(index, vectors, tmp_path):
+    index.insert(99999, vectors[5])
+    index.save(tmp_path)
+
+    loaded = LSHIndex.load(tmp_path)
+
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.similar(50, 5) == pytest.approx(index.similar(50, 5))
+    loaded.insert(123456, vectors[5])
+    loaded.remove(50)
+    assert 123456 in {f for f, _ in loaded.query(vectors[5], 3)}
+
+
+def test_unknown_and_bad_dimension(index):
+    assert index.similar(-1) == []
+    with pytest.raises(ValueError):
+        index.insert(1, np.ones(3))
@@ -0,0 +1,114 @@
+from collections import deque
+
+import numpy as np
+
+from src.engine.cast_graph import CastGraph
+
+
+# =====================================================
+# Fixtures
+# =====================================================
+def _graph():
+    # film 1 : 10, 20 / film 2 : 20, 30 / film 3 : 30, 40 / film 4 : 50
+    # film 5 : 10, 20 (10 et 20 ont deux films en commun)
+    films = [1, 1, 2, 2, 3, 3, 4, 5, 5, 1]
+    actors = [10, 20, 20, 30, 30, 40, 50, 10, 20, 10]
+    return CastGraph().fit(films, actors)
+
+
+def _bfs_length(graph, source, target):
+    source, target = graph._actor_node(source), graph._actor_node(target)
+    dist, queue = {source: 0}, deque([source])
+    while queue:
+        node = queue.popleft()
+        if node == target:
+            return dist[node]
+        for other in graph.indices[graph.indptr[node] : graph.indptr[node + 1]]:
+            if int(other) not in dist:
+                dist[int(other)] = dist[node] + 1
+                queue.append(int(other))
+    return None
+
+
+# =====================================================
+# CastGraph
+# =====================================================
+def test_films_and_co_stars():
+    graph = _graph()
+
+    assert graph.films(20) == [1, 2, 5]
+    assert graph.co_stars(20) == [(10, 2), (30, 1)]
+    assert graph.co_stars(20, n=1) == [(10, 2)]
+    assert graph.co_stars(50) == []
+    assert graph.co_stars(999) == []
+
+
+def test_shortest_path_alternates_actors_and_films():
+    path = _graph().shortest_path(10, 40)
+
+    assert [kind for kind, _ in path] == ["actor", "film"] * 3 + ["actor"]
+    assert path[0] == ("actor", 10)
+    assert path[2:] == [
+        ("actor", 20),
+        ("film", 2),
+        ("actor", 30),
+        ("film", 3),
+        ("actor", 40),
+    ]
+
+
+def test_shortest_path_limits():
+    graph = _graph()
+
+    assert graph.shortest_path(10, 10) == [("actor", 10)]
+    assert graph.shortest_path(10, 50) is None
+    assert graph.shortest_path(10, 999) is None
+    assert graph.shortest_path(10, 40, max_degrees=2) is None
+
+
+def test_shortest_path_matches_bfs():
+    rng = np.random.default_rng(0)
+    graph = CastGraph().fit(rng.integers(0, 300, 1500), rng.zipf(1.8, 1500) % 800)
+
+    for _ in range(30):
+        source, target = rng.choice(graph.actor_ids, 2).tolist()
+        path = graph.shortest_path(source, target, max_degrees=50)
+        expected = _bfs_length(graph, source, target)
+        assert (path is None and expected is None) or len(path) - 1 == expected
+
+
+def test_add_roles_without_rebuild():
+    graph = _graph()
+
+    assert graph.add(6, [40, 60, 10]) == 3
+    assert graph.add(1, [10, 20]) == 0  # déjà dans le CSR
+
+    assert graph.films(10) == [1, 5, 6]
+    assert graph.co_stars(60) == [(10, 1), (40, 1)]
+    assert graph.shortest_path(60, 50) is None
+    assert graph.shortest_path(20, 60) == [
+        ("actor", 20),
+        ("film", 1),
+        ("actor", 10),
+        ("film", 6),
+        ("actor", 60),
+    ]
+    assert graph.pending_roles == 3
+
+
+def test_added_roles_match_refit():
+    rng = np.random.default_rng(1)
+    films, actors = rng.integers(0, 300, 1500), rng.zipf(1.8, 1500) % 800
+    graph = CastGraph().fit(films[:1000], actors[:1000])
+    for film in np.unique(films[1000:]).tolist():
+        graph.add(film, actors[1000:][films[1000:] == film].tolist())
+    refit = CastGraph().fit(films, actors)
+
+    for _ in range(30):
+        source, target = rng.choice(refit.actor_ids, 2).tolist()
+        assert sorted(graph.co_stars(source)) == sorted(refit.co_stars(source))
+        assert graph.films(source) == refit.films(source)
+        path = graph.shortest_path(source, target, max_degrees=50)
+        expected = refit.shortest_path(source, target, max_degrees=50)
+        assert (path is None) == (expected is None)
+        assert path is None or len(path) == len(expected)
@@ -0,0 +1,152 @@
+import numpy as np
+
+from src.engine.catalog_index import CatalogIndex, genre_keys
+
+
+# =====================================================
+# Fixtures
+# =====================================================
+def _index():
+    return CatalogIndex().fit(
+        [4, 2, 3, 1],
+        ["Nolan", "nolan ", "Villeneuve", "Nolan"],
+        ["Drame", "Crime", "science-fiction", "Drame, Science-Fiction"],
+        [1, 1, 2, 3, 4, 1],
+        [10, 20, 10, 20, 10, 10],
+        years=[2014, 2000, 2021, "2010"],
+    )
+
+
+def _brute_force(films, genres, director, actors, years):
+    return sorted(
+        f
+        for f, (g, d, a, y) in films.items()
+        if set(genres) <= g
+        and (director is None or d == director)
+        and set(actors) <= a
+        and years[0] <= y <= years[1]
+    )
+
+
+# =====================================================
+# Tests
+# =====================================================
+def test_genre_keys_split_and_normalize():
+    assert genre_keys(" Drame,  Science-Fiction ,drame") == ["drame", "science-fiction"]
+    assert genre_keys(None) == []
+
+
+def test_postings_are_sorted_and_unique():
+    index = _index()
+
+    assert index.postings("genre", "SCIENCE-FICTION").tolist() == [1, 3]
+    assert index.postings("director", "Nolan").tolist() == [1, 2, 4]
+    assert index.postings("actor", 10).tolist() == [1, 2, 4]
+    assert index.postings("genre", "western").size == 0
+
+
+def test_search_intersects_filters():
+    index = _index()
+
+    assert index.search(genres=["drame"], director="NOLAN").tolist() == [1, 4]
+    assert index.search(director="nolan", actors=[10, 20]).tolist() == [1]
+    assert index.search(genres=["drame", "crime"]).size == 0
+    assert index.search().tolist() == [1, 2, 3, 4]
+
+
+def test_search_by_years():
+    index = _index()
+
+    assert index.search(years=(2005, None)).tolist() == [1, 3, 4]
+    assert index.search(genres=["drame"], years=(None, 2012)).tolist() == [1]
+
+
+def test_facets():
+    index = _index()
+
+    assert index.facets(index.select(director="nolan")) == {
+        "genre": [("Drame", 2), ("Science-Fiction", 1), ("Crime", 1)],
+        "decade": [(2000, 1), (2010, 2)],
+        "director": [("Nolan", 3)],
+    }
+    assert index.facets(index.select(), top=1)["director"] == [("Nolan", 3)]
+    assert index.facets(index.select(genres=["western"])) == {
+        "genre": [],
+        "decade": [],
+        "director": [],
+    }
+
+
+def test_incremental_additions():
+    index = _index()
+    index.facets(index.select())
+
+    index.add_film(5, "Nolan", "Drame, Western", 1995)
+    index.add_casting(5, [20])
+    index.add_film(1, "Autre", "Western")  # déjà indexé : ignoré
+
+    assert index.search(genres=["drame"], actors=[20]).tolist() == [1, 5]
+    assert index.search(director="nolan").tolist() == [1, 2, 4, 5]
+    assert index.search(genres=["western"]).tolist() == [5]
+    assert 5 in index and 6 not in index
+    assert index.all_films().tolist() == [1, 2, 3, 4, 5]
+    facets = index.facets(index.select())
+    assert ("Western", 1) in facets["genre"]
+    assert facets["decade"][0] == (1990, 1)
+
+
+def test_out_of_order_addition_renumbers_rows():
+    index = _index()
+
+    index.add_film(0, "Villeneuve", "Western", 1980)
+
+    assert index.search(genres=["western"]).tolist() == [0]
+    assert index.search(director="villeneuve", years=(None, 1990)).tolist() == [0]
+    facets = index.facets(index.select(genres=["drame"]))
+    assert facets["genre"] == [("Drame", 2), ("Science-Fiction", 1)]
+
+
+def test_out_of_order_additions_to_empty_index():
+    index = CatalogIndex().fit([], [], [])
+
+    index.add_film(30, "Nolan", "Thriller", 2010)
+    index.add_film(10, "Scott", "Drame", 1990)
+    index.add_film(20, "Nolan", "Thriller", 2002)
+
+    assert index.search(genres=["thriller"]).tolist() == [20, 30]
+    assert index.film_ids.tolist() == [10, 20, 30]
+
+
+def test_search_matches_brute_force():
+    rng = np.random.default_rng(0)
+    genres, directors = ["a", "b", "c", "d"], ["x", "y", "z"]
+    films = {}
+    for f in range(1, 300):
+        films[f] = (
+            set(rng.choice(genres, size=rng.integers(1, 3), replace=False).tolist()),
+            str(rng.choice(directors)),
+            set(rng.choice(20, size=3).tolist()),
+            int(rng.integers(1950, 2020)),
+        )
+    index = CatalogIndex().fit(
+        list(films),
+        [d for _, d, _, _ in films.values()],
+        [", ".join(g) for g, _, _, _ in films.values()],
+        [f for f, (_, _, a, _) in films.items() for _ in a],
+        [actor for _, _, a, _ in films.values() for actor in a],
+        years=[y for _, _, _, y in films.values()],
+    )
+
+    for query in [
+        (["a"], None, [], (0, 3000)),
+        (["a", "b"], "x", [], (1980, 2000)),
+        ([], "y", [3, 4], (0, 3000)),
+        (["c"], None, [1], (1960, 1970)),
+    ]:
+        rows = index.select(*query)
+        expected = _brute_force(films, *query)
+        assert index.film_ids[rows].tolist() == expected
+        counts = dict(index.facets(rows)["genre"])
+        for genre in genres:
+            expected_count = sum(genre in films[f][0] for f in expected)
+            assert counts.get(genre, 0) == expected_count
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from src.engine.content_similarity import ContentSimilarity, film_features
+
+
+# =====================================================
+# Fixtures
+# =====================================================
+@pytest.fixture
+def model():
+    return ContentSimilarity(n_features=4096).fit(
+        [
+            (1, film_features("Action, Science-Fiction", "Nolan", 2010, [1, 2])),
+            (2, film_features("Science-Fiction", "Nolan", 2014, [2, 3])),
+            (3, film_features("Comédie", "Veber", 1998, [4])),
+        ]
+    )
+
+
+# =====================================================
+# film_features()
+# =====================================================
+def test_film_features_splits_genres():
+    features = film_features("Action, Science-Fiction", "Nolan", 2014, [7])
+
+    assert features == ["g:action", "g:science-fiction", "d:nolan", "y:2010", "a:7"]
+
+
+def test_film_features_ignores_missing_values():
+    assert film_features(None, "None", None) == []
+
+
+# =====================================================
+# ContentSimilarity
+# =====================================================
+def test_similar_ranks_shared_features(model):
+    similaires = model.similar(1)
+
+    assert [film for film, _ in similaires] == [2]
+    assert 0 < similaires[0][1] <= 1
+    assert model.similar(3) == []
+    assert model.similar(99) == []
+
+
+def test_rows_are_normalized(model):
+    row = model.matrix[0].toarray()
+
+    assert (row**2).sum() == pytest.approx(1.0, rel=1e-5)
+
+
+def test_update_adds_film_without_rebuild(model):
+    model.update(4, film_features("Comédie", "Veber", 2001, [4]))
+
+    assert model.similar(3)[0][0] == 4
+    assert model.similar(4)[0][0] == 3
+    assert len(model) == 4
+
+
+def test_update_replaces_and_remove_hides(model):
+    model.update(2, film_features("Comédie", "Veber", 1998, [4]))
+    assert model.similar(1) == []
+
+    model.remove(3)
+    assert [film for film, _ in model.similar(2)] == []
+    assert len(model) == 2
+
+
+def test_compact_keeps_results(model):
+    model.update(4, film_features("Comédie", "Veber", 2001, [4]))
+    model.remove(2)
+    before = [film for film, _ in model.similar(3)]
+
+    model.compact()
+
+    assert model.pending == {}
+    assert model.film_ids.tolist() == [1, 3, 4]
+    assert [film for film, _ in model.similar(3)] == before
+
+
+def test_similar_batch_matches_similar(model):
+    model.update(4, film_features("Action", "Nolan", 2020, [1]))
+
+    batch = model.similar_batch([1, 2, 4, 99], n=3, block_size=2)
+
+    for film_id in (1, 2, 4):
+        assert batch[film_id] == model.similar(film_id, n=3)
+    assert batch[99] == []
+
+
+def test_similar_to_features_excludes(model):
+    similaires = model.similar_to_features(["d:nolan"], exclude=[1])
+
+    assert [film for film, _ in similaires] == [2]
+
+
+def test_embed_and_fold_in(model):
+    ids, vectors = model.embed(dim=4)
+
+    assert ids.tolist() == [1, 2, 3]
+    assert vectors.shape == (3, 4)
+    model.update(4, film_features("Comédie", "Veber", 1998, [4]))
+    np.testing.assert_allclose(model.vector(4), vectors[2], atol=1e-5)
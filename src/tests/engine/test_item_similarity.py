@@ -0,0 +1,176 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from src.engine.item_similarity import ItemSimilarity, aggregate_top_n, top_k_rows
+
+
+# =====================================================
+# Fixtures
+# =====================================================
+@pytest.fixture
+def model():
+    # user 1 : 10, 20 / user 2 : 10, 20 / user 3 : 10, 20, 30
+    users = [1, 1, 2, 2, 3, 3, 3]
+    films = [10, 20, 10, 20, 10, 20, 30]
+    return ItemSimilarity(k=2).fit(users, films)
+
+
+# =====================================================
+# Fonctions utilitaires
+# =====================================================
+def test_top_k_rows_sorted_and_padded():
+    matrix = sp.csr_matrix(np.array([[0.0, 0.5, 0.9, 0.1], [0.0, 0.0, 0.0, 0.3]]))
+
+    cols, vals = top_k_rows(matrix, 2)
+
+    assert cols.tolist() == [[2, 1], [3, -1]]
+    assert vals[0].tolist() == pytest.approx([0.9, 0.5])
+
+
+def test_aggregate_top_n_sums_and_excludes():
+    neighbours = np.array([[1, 2], [2, -1]])
+    scores = np.array([[0.5, 0.4], [0.3, 0.0]], dtype=np.float32)
+
+    films, totals = aggregate_top_n(neighbours, scores, 5, exclude=np.array([1]))
+
+    assert films.tolist() == [2]
+    assert totals.tolist() == pytest.approx([0.7])
+
+
+# =====================================================
+# ItemSimilarity
+# =====================================================
+def test_fit_cosine_similarity(model):
+    similar = dict(model.similar(10))
+
+    assert similar[20] == pytest.approx(1.0)
+    assert similar[30] == pytest.approx(1 / np.sqrt(3))
+
+
+def test_fit_ignores_duplicate_favorites():
+    model = ItemSimilarity(k=2).fit([1, 1, 1], [10, 10, 20])
+
+    assert dict(model.similar(10))[20] == pytest.approx(1.0)
+
+
+def test_recommend_excludes_liked(model):
+    recommended = [film for film, _ in model.recommend([10])]
+
+    assert 10 not in recommended
+    assert recommended[0] == 20
+
+
+def test_recommend_user_uses_favorites(model):
+    assert model.liked(1).tolist() == [10, 20]
+    assert [film for film, _ in model.recommend_user(1)] == [30]
+
+
+def test_unknown_ids_return_empty(model):
+    assert model.similar(999) == []
+    assert model.recommend_user(999) == []
+    assert ItemSimilarity().fit([], []).recommend([10]) == []
+
+
+def test_blocks_give_same_result():
+    rng = np.random.default_rng(0)
+    users, films = rng.integers(0, 50, 400), rng.integers(0, 30, 400)
+
+    full = ItemSimilarity(k=5, block_size=1000).fit(users, films)
+    blocks = ItemSimilarity(k=5, block_size=7).fit(users, films)
+
+    np.testing.assert_allclose(full.scores, blocks.scores, rtol=1e-6)
+
+
+# =====================================================
+# Mises à jour incrémentales
+# =====================================================
+def _random_events(model, rng, n_events, n_users, n_films):
+    pairs = set()
+    for user, film in zip(
+        model.user_ids[model.user_films.tocoo().row],
+        model.film_ids[model.user_films.tocoo().col],
+        strict=True,
+    ):
+        pairs.add((int(user), int(film)))
+    for _ in range(n_events):
+        user, film = int(rng.integers(0, n_users)), int(rng.integers(0, n_films))
+        if rng.random() < 0.6:
+            model.add(user, film)
+            pairs.add((user, film))
+        else:
+            model.remove(user, film)
+            pairs.discard((user, film))
+    return pairs
+
+
+def test_add_updates_similarities(model):
+    assert model.add(1, 30) is True
+    assert model.add(1, 30) is False  # déjà présent : rejouable
+
+    # 30 : users 1, 3 / 10 et 20 : users 1, 2, 3
+    assert dict(model.similar(10))[30] == pytest.approx(2 / np.sqrt(6))
+    assert model.liked(1).tolist() == [10, 20, 30]
+    assert model.pending_events == 1
+
+
+def test_add_new_user_and_film(model):
+    model.add(4, 40)
+    model.add(4, 10)
+
+    assert dict(model.similar(40))[10] == pytest.approx(1 / 2)
+    assert model.recommend_user(4)[0][0] == 20
+
+
+def test_remove_updates_similarities(model):
+    assert model.remove(3, 30) is True
+    assert model.remove(3, 30) is False
+
+    assert model.similar(30) == []
+    assert 30 not in dict(model.similar(10))
+
+
+def test_incremental_matches_refit():
+    rng = np.random.default_rng(0)
+    model = ItemSimilarity(k=40).fit(rng.integers(0, 40, 300), rng.integers(0, 25, 300))
+
+    pairs = _random_events(model, rng, 300, n_users=45, n_films=30)
+    refit = ItemSimilarity(k=40).fit([p[0] for p in pairs], [p[1] for p in pairs])
+
+    for film_id in refit.film_ids.tolist():
+        expected = dict(refit.similar(film_id, 40))
+        got = dict(model.similar(film_id, 40))
+        assert got.keys() == expected.keys()
+        assert list(got.values()) == pytest.approx([expected[f] for f in got])
+
+
+def test_incremental_scores_exact_with_few_neighbours():
+    # k bien inférieur au nombre de films : un film est cité par des listes
+    # dont il n'a pas lui-même l'auteur pour voisin
+    rng = np.random.default_rng(0)
+    model = ItemSimilarity(k=5).fit(rng.integers(0, 40, 300), rng.integers(0, 25, 300))
+
+    pairs = _random_events(model, rng, 300, n_users=45, n_films=30)
+    exact = ItemSimilarity(k=40).fit([p[0] for p in pairs], [p[1] for p in pairs])
+
+    for film_id in model.film_ids.tolist():
+        expected = dict(exact.similar(film_id, 40))
+        got = model.similar(film_id, 5)
+        assert [score for _, score in got] == sorted(
+            (score for _, score in got), reverse=True
+        )
+        for other, score in got:
+            assert score == pytest.approx(expected[other], rel=1e-5)
+
+
+def test_compact_rebuilds_snapshot():
+    rng = np.random.default_rng(1)
+    model = ItemSimilarity(k=5).fit(rng.integers(0, 40, 300), rng.integers(0, 25, 300))
+
+    pairs = _random_events(model, rng, 200, n_users=45, n_films=30)
+    model.compact()
+    refit = ItemSimilarity(k=5).fit([p[0] for p in pairs], [p[1] for p in pairs])
+
+    assert model.pending_events == 0
+    assert model.film_ids.tolist() == refit.film_ids.tolist()
+    np.testing.assert_allclose(model.scores, refit.scores, rtol=1e-6)
@@ -0,0 +1,44 @@
+import pytest
+
+from src.engine.popularity import DecayedPopularity
+
+
+DAY = 86400.0
+
+
+@pytest.fixture
+def model():
+    # film 1 : 4 ajouts il y a 7 jours ; film 2 : 3 ajouts aujourd'hui
+    return DecayedPopularity(half_life=7 * DAY).fit(
+        [1, 2, 3], [0.0, 7 * DAY, 7 * DAY], [4, 3, 1], now=7 * DAY
+    )
+
+
+def test_recent_additions_rank_first(model):
+    assert model.ranked.tolist() == [2, 1, 3]
+    assert model.score(1, 7 * DAY) == pytest.approx(2.0)
+    assert model.score(2, 14 * DAY) == pytest.approx(1.5)
+    assert model.score(99, 7 * DAY) == 0.0
+
+
+def test_add_and_remove(model):
+    model.add(3, 8 * DAY, 5)
+    model.add(4, 8 * DAY)
+    model.add(2, 8 * DAY, -10)
+
+    assert model.rank().tolist() == [3, 1, 4]
+    assert model.score(2, 8 * DAY) == 0.0
+
+
+def test_rebase_keeps_scores(model):
+    model.add(5, 7 * DAY + 400 * DAY)
+
+    assert model.t0 == 7 * DAY + 400 * DAY
+    assert model.score(5, model.t0) == pytest.approx(1.0)
+    assert model.score(2, model.t0) == pytest.approx(3 * 2 ** (-400 / 7))
+
+
+def test_rank_size_and_empty():
+    assert DecayedPopularity(DAY).fit([], []).ranked.tolist() == []
+    model = DecayedPopularity(DAY, size=2).fit([1, 2, 3], [0, 0, 0], [1, 3, 2])
+    assert model.ranked.tolist() == [2, 3]
@@ -0,0 +1,93 @@
+import numpy as np
+
+from src.engine.title_index import TitlePrefixIndex, normalize_title
+
+
+# =====================================================
+# Fixtures
+# =====================================================
+TITLES = {
+    1: ("Star Wars", 10),
+    2: ("Stargate", 3),
+    3: ("Starship Troopers", 5),
+    4: ("Alien", 8),
+    5: ("star trek", 7),
+    6: ("L'Été meurtrier", 2),
+}
+
+
+def _index(**kwargs):
+    return TitlePrefixIndex(**kwargs).fit(
+        list(TITLES),
+        [titre for titre, _ in TITLES.values()],
+        [count for _, count in TITLES.values()],
+    )
+
+
+# =====================================================
+# Tests
+# =====================================================
+def test_normalize_title():
+    assert normalize_title("L'Été  meurtrier !") == "l ete meurtrier"
+    assert normalize_title("Star Wars: Épisode IV") == "star wars episode iv"
+
+
+def test_complete_ranks_by_popularity():
+    index = _index()
+
+    assert index.complete("sta", 3) == [
+        (1, "Star Wars", 10.0),
+        (5, "star trek", 7.0),
+        (3, "Starship Troopers", 5.0),
+    ]
+    assert index.complete("STAR W") == [(1, "Star Wars", 10.0)]
+    assert index.complete("l'ete") == [(6, "L'Été meurtrier", 2.0)]
+    assert index.complete("x") == []
+    assert index.complete("  ") == []
+
+
+def test_long_ranges_are_cached():
+    index = _index(scan_limit=2)
+
+    first = index.complete("star", 2)
+
+    assert first == [(1, "Star Wars", 10.0), (5, "star trek", 7.0)]
+    assert b"star" in index._top
+    assert index.complete("star", 2) == first
+
+
+def test_additions_pending_then_merged():
+    index = _index(scan_limit=2, merge_every=3)
+    index.complete("star")
+
+    index.add(7, "Stardust", 20)
+    index.add(1, "Doublon")  # déjà indexé : ignoré
+    assert index.complete("star", 2) == [(7, "Stardust", 20.0), (1, "Star Wars", 10.0)]
+    assert len(index) == 7
+
+    index.add(8, "Aliens", 9)
+    index.add(9, "Zorro")
+    assert index._pending == []
+    assert index.complete("ali") == [(8, "Aliens", 9.0), (4, "Alien", 8.0)]
+    assert index.complete("z") == [(9, "Zorro", 0.0)]
+    assert index.complete("star", 1) == [(7, "Stardust", 20.0)]
+
+
+def test_matches_brute_force():
+    rng = np.random.default_rng(0)
+    titles = ["".join(rng.choice(list("abc"), rng.integers(1, 6))) for _ in range(500)]
+    popularity = rng.integers(0, 5, 500)
+    index = TitlePrefixIndex(scan_limit=20, merge_every=50).fit(
+        np.arange(400), titles[:400], popularity[:400]
+    )
+    for i in range(400, 500):
+        index.add(i, titles[i], popularity[i])
+
+    for prefix in ["a", "ab", "cab", "bbb", "c"]:
+        expected = sorted(
+            (i for i in range(500) if titles[i].startswith(prefix)),
+            key=lambda i: (-popularity[i], titles[i]),
+        )[:10]
+        found = index.complete(prefix, 10)
+        assert [popularity[i] for i, _, _ in found] == [popularity[i] for i in expected]
+        assert [titles[i] for i, _, _ in found] == [titles[i] for i in expected]
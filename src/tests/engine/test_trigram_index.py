@@ -0,0 +1,150 @@
+import random
+
+from src.engine.trigram_index import TrigramIndex, edit_distance, is_typo, trigrams
+
+
+# =====================================================
+# Fixtures
+# =====================================================
+TITLES = {
+    1: "Inception",
+    2: "Star Wars",
+    3: "Star Trek",
+    4: "L'Été meurtrier",
+    5: "The Lord of the Rings: The Fellowship of the Ring",
+    6: "Insomnia",
+}
+
+
+def _index(**kwargs):
+    return TrigramIndex(**kwargs).fit(list(TITLES), list(TITLES.values()))
+
+
+def _levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, start=1):
+        current = [i]
+        for j, other in enumerate(b, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char != other),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+# =====================================================
+# Tests
+# =====================================================
+def test_trigrams_pad_each_word():
+    assert trigrams("up") == {"  u", " up", "up "}
+    assert trigrams("a b") == {"  a", " a ", "  b", " b "}
+
+
+def test_edit_distance_is_bounded():
+    assert edit_distance("kitten", "sitting", 3) == 3
+    assert edit_distance("kitten", "sitting", 2) is None
+    assert edit_distance("inception", "inception", 0) == 0
+    assert edit_distance("", "ab", 2) == 2
+    assert edit_distance("abcdef", "ab", 3) is None
+
+
+def test_edit_distance_matches_full_computation():
+    rng = random.Random(0)
+    for _ in range(300):
+        a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+        exact = _levenshtein(a, b)
+        for k in range(4):
+            assert edit_distance(a, b, k) == (exact if exact <= k else None)
+
+
+def test_search_ranks_by_similarity():
+    found = _index().search("Star Wars", 2)
+
+    assert [(film, key) for film, key, _ in found] == [
+        (2, "star wars"),
+        (3, "star trek"),
+    ]
+    assert found[0][2] == 1.0
+    assert 0 < found[1][2] < 1
+
+
+def test_match_tolerates_typos_accents_and_punctuation():
+    index = _index()
+
+    film, _, distance = index.match("Incepton")
+    assert (film, distance) == (1, 1)
+    assert index.match("l'ete meurtier")[0] == 4
+    assert index.match("STAR WARS!") == (2, 1.0, 0)
+
+
+def test_is_typo():
+    assert is_typo("incepton", "inception")
+    assert is_typo("l ete meurtier", "l ete meurtrier")
+    assert is_typo("titanik", "titanic")  # dernière lettre
+    # suites, mots courts, première lettre et mots ajoutés : d'autres titres
+    assert not is_typo("toy story 3", "toy story 2")
+    assert not is_typo("rocky iv", "rocky iii")
+    assert not is_typo("cats", "cars")
+    assert not is_typo("sinister", "minister")
+    assert not is_typo("the alien", "alien")
+
+
+def test_match_rejects_sequels_and_other_titles():
+    index = TrigramIndex().fit(
+        [1, 2, 3, 4], ["Toy Story 2", "The Aliens", "Scream 3", "Cars"]
+    )
+
+    assert index.match("Toy Story 3") is None
+    assert index.match("Toy Story 4") is None
+    assert index.match("Scream 2") is None
+    assert index.match("Aliens") is None
+    assert index.match("Cats") is None
+    assert index.match("toy story 2") == (1, 1.0, 0)
+    assert index.match("SCREAM: 3")[0] == 3
+
+
+def test_match_rejects_uncertain_titles():
+    index = _index()
+
+    # trop peu de trigrammes communs
+    assert index.match("Lord of the Rings") is None
+    # assez similaire, mais trop de modifications
+    assert index.match("Inceptionnn", threshold=0.5, max_edits=1) is None
+    assert index.match("zzz") is None
+    assert index.match("") is None
+
+
+def test_added_titles_before_and_after_merge():
+    index = _index(merge_every=2)
+    index.add(7, "Interstellar")
+    index.add(7, "Interstellar")  # déjà indexé
+
+    assert len(index) == 7
+    assert index.match("Interstelar")[0] == 7
+
+    index.add(8, "Zodiac")  # fusion
+    assert index.match("Zoddiac")[0] == 8
+    assert index.match("Interstelar")[0] == 7
+    assert index.match("Incepton")[0] == 1
+    assert index.match("Insomia")[0] == 6
+
+
+def test_match_accepts_last_letter_typos():
+    index = TrigramIndex().fit([1, 2], ["Titanic", "Inception"])
+
+    assert index.match("Titanik")[0] == 1
+    assert index.match("Inceptiom")[0] == 2
+
+
+def test_candidates_limited_to_rarest_postings():
+    films = list(range(1, 201))
+    titles = [f"star {i}" for i in films] + ["star wars"]
+    index = TrigramIndex(max_postings=5).fit(films + [201], titles)
+
+    # les listes de « star » dépassent la limite : seules les plus rares sont lues
+    assert index.match("star wars")[0] == 201
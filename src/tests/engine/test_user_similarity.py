@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from src.engine.user_similarity import UserSimilarity
+
+
+@pytest.fixture
+def favorites():
+    # alice et bob partagent 3 films sur 4, carol n'a que le film 10 en commun
+    pairs = [
+        (1, 10), (1, 20), (1, 30), (1, 40),
+        (2, 10), (2, 20), (2, 30), (2, 50),
+        (3, 10), (3, 60), (3, 70),
+        (4, 80),
+    ]  # fmt: skip
+    return [p[0] for p in pairs], [p[1] for p in pairs]
+
+
+def _brute_force(users, films, user_id, metric):
+    sets = {}
+    for user, film in zip(users, films, strict=True):
+        sets.setdefault(user, set()).add(film)
+    mine, scores = sets[user_id], {}
+    for other, theirs in sets.items():
+        common = len(mine & theirs)
+        if other == user_id or common == 0:
+            continue
+        if metric == "jaccard":
+            scores[other] = common / len(mine | theirs)
+        else:
+            scores[other] = common / np.sqrt(len(mine) * len(theirs))
+    return scores
+
+
+def test_similar_users_jaccard(favorites):
+    model = UserSimilarity().fit(*favorites)
+
+    assert model.similar_users(1, 5) == [
+        (2, pytest.approx(0.6)),
+        (3, pytest.approx(1 / 6)),
+    ]
+    assert model.similar_users(4) == []
+    assert model.similar_users(99) == []
+
+
+def test_recommend_neighbours_films(favorites):
+    model = UserSimilarity().fit(*favorites)
+
+    films = model.recommend(1, 5)
+
+    assert films[0] == (50, pytest.approx(0.6))
+    assert {film for film, _ in films} == {50, 60, 70}
+    assert model.recommend(4) == []
+
+
+@pytest.mark.parametrize("metric", ["jaccard", "cosine"])
+def test_matches_brute_force(metric):
+    rng = np.random.default_rng(0)
+    users = rng.integers(0, 300, 4000)
+    films = (rng.zipf(1.5, 4000) - 1) % 200
+    model = UserSimilarity(metric, max_postings=10**9).fit(users, films)
+
+    for user_id in (0, 7, 42):
+        expected = _brute_force(users.tolist(), films.tolist(), user_id, metric)
+        best = sorted(expected.values(), reverse=True)[:10]
+        found = [score for _, score in model.similar_users(user_id, 10)]
+        assert found == pytest.approx(best)
+
+
+def test_candidate_pruning_reads_rare_films_first(favorites):
+    model = UserSimilarity(max_postings=1).fit(*favorites)
+
+    # seule la liste du film le plus rare de bob (50, lui seul) est lue
+    assert model.similar_users(2) == []
+    assert model.liked(2).tolist() == [10, 20, 30, 50]
@@ -0,0 +1,49 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.business_object.film import Film
+from src.dao.film_dao import FilmDAO
+from src.service.autocomplete_service import AutocompleteService
+
+
+@pytest.fixture
+def service():
+    film_dao = MagicMock()
+    user_dao = MagicMock()
+    film_dao.get_films_by_id.return_value = {
+        1: Film("Inception", "Nolan", 2010, "Action"),
+        2: Film("Insomnia", "Nolan", 2002, "Thriller"),
+        3: Film("Interstellar", "Nolan", 2014, "Science-Fiction"),
+    }
+    user_dao.get_favorites_counts.return_value = [(1, 4), (3, 9)]
+    return AutocompleteService(film_dao, user_dao, refresh_interval=3600)
+
+
+def test_complete_by_favorites(service):
+    assert service.complete("in") == [
+        ("Interstellar", 9),
+        ("Inception", 4),
+        ("Insomnia", 0),
+    ]
+    assert service.complete("INS", 1) == [("Insomnia", 0)]
+
+
+def test_index_built_once(service):
+    service.complete("in")
+    service.complete("inc")
+
+    service.film_dao.get_films_by_id.assert_called_once()
+
+
+def test_films_added_through_film_dao(service):
+    service.complete("in")
+    FilmDAO.subscribe(service)
+    try:
+        dao = FilmDAO.__new__(FilmDAO)
+        dao._notify("film_added", 4, Film("Infiltrés", "Scorsese", 2006, "Crime"))
+        dao._notify("casting_added", 4, [1])  # sans effet sur ce service
+    finally:
+        FilmDAO.unsubscribe(service)
+
+    assert service.complete("infil") == [("Infiltrés", 0)]
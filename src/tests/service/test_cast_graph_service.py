@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.business_object.actor import Actor
+from src.business_object.film import Film
+from src.service.cast_graph_service import CastGraphService
+
+
+@pytest.fixture
+def service():
+    actor_dao = MagicMock()
+    film_dao = MagicMock()
+    film_dao.get_casting_pairs.return_value = [(1, 10), (1, 20), (2, 20), (2, 30)]
+    names = {
+        10: Actor("Hanks", "Tom"),
+        20: Actor("Bacon", "Kevin"),
+        30: Actor("Ryan", "Meg"),
+    }
+    actor_dao.find_id.side_effect = lambda actor: {
+        (a.nom, a.prenom): i for i, a in names.items()
+    }.get((actor.nom, actor.prenom))
+    actor_dao.get_actors_by_id.side_effect = lambda ids: {i: names[i] for i in ids}
+    film_dao.get_films_by_id.side_effect = lambda ids: {
+        i: Film(titre=f"F{i}", realisateur="R", annee=2000, genre="g") for i in ids
+    }
+    return CastGraphService(actor_dao, film_dao, refresh_interval=3600)
+
+
+def test_co_stars(service):
+    partners = service.co_stars(Actor("Bacon", "Kevin"))
+
+    assert sorted(actor.nom for actor, _ in partners) == ["Hanks", "Ryan"]
+    assert service.co_stars(Actor("Inconnu", "X")) is None
+
+
+def test_separation(service):
+    path = service.separation(Actor("Hanks", "Tom"), Actor("Ryan", "Meg"))
+
+    assert [getattr(step, "nom", None) or step.titre for step in path] == [
+        "Hanks",
+        "F1",
+        "Bacon",
+        "F2",
+        "Ryan",
+    ]
+
+
+def test_graph_built_once(service):
+    service.co_stars(Actor("Bacon", "Kevin"))
+    service.separation(Actor("Hanks", "Tom"), Actor("Ryan", "Meg"))
+
+    service.film_dao.get_casting_pairs.assert_called_once()
+
+
+def test_casting_added_without_rebuild(service):
+    assert service.co_stars(Actor("Hanks", "Tom"))[0][0].nom == "Bacon"
+
+    service.casting_added(3, [10, 30])
+
+    partners = service.co_stars(Actor("Hanks", "Tom"))
+    assert sorted(actor.nom for actor, _ in partners) == ["Bacon", "Ryan"]
+    service.film_dao.get_casting_pairs.assert_called_once()
@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.business_object.actor import Actor
+from src.business_object.film import Film
+from src.dao.film_dao import FilmDAO
+from src.service.catalog_service import CatalogService
+
+
+@pytest.fixture
+def service():
+    film_dao = MagicMock()
+    actor_dao = MagicMock()
+    films = {
+        1: Film("Inception", "Nolan", 2010, "Action, Science-Fiction"),
+        2: Film("Memento", "Nolan", 2000, "Thriller"),
+        3: Film("Dune", "Villeneuve", 2021, "Science-Fiction"),
+    }
+    film_dao.get_films_by_id.side_effect = lambda ids=None: {
+        i: f for i, f in films.items() if ids is None or i in ids
+    }
+    film_dao.get_casting_pairs.return_value = [(1, 10), (2, 20), (3, 10)]
+    actor_dao.find_id.side_effect = lambda actor: {"DiCaprio": 10, "Pearce": 20}.get(
+        actor.nom
+    )
+    return CatalogService(film_dao, actor_dao, refresh_interval=3600)
+
+
+def test_search_filters_and_paginates(service):
+    total, films, _ = service.search_films(
+        genres=["science-fiction"], limit=1, offset=1
+    )
+
+    assert total == 2
+    assert [f.titre for f in films] == ["Dune"]
+    service.film_dao.get_films_by_id.assert_called_with([3])
+
+
+def test_search_by_director_actor_and_years(service):
+    total, page, _ = service.search(
+        realisateur="nolan", acteurs=[Actor("DiCaprio", "Leonardo")]
+    )
+    assert (total, page) == (1, [1])
+
+    assert service.search_ids(realisateur="nolan", annees=(None, 2005)) == [2]
+    assert service.search_ids(annees=(2005, 2015)) == [1]
+
+
+def test_search_facets(service):
+    _, _, facets = service.search_films(realisateur="Nolan")
+
+    assert facets == {
+        "genre": [("Action", 1), ("Science-Fiction", 1), ("Thriller", 1)],
+        "decade": [(2000, 1), (2010, 1)],
+        "director": [("Nolan", 2)],
+    }
+
+
+def test_unknown_actor_gives_no_result(service):
+    assert service.search(acteurs=[Actor("Inconnu", "X")]) == (0, [], {})
+    service.film_dao.get_casting_pairs.assert_not_called()
+
+
+def test_index_built_once(service):
+    service.search(genres=["thriller"])
+    service.search(realisateur="villeneuve")
+
+    service.film_dao.get_casting_pairs.assert_called_once()
+
+
+def test_additions_from_film_dao_are_indexed(service):
+    service.search()
+    FilmDAO.subscribe(service)
+    try:
+        dao = FilmDAO.__new__(FilmDAO)
+        dao._notify("film_added", 4, Film("Tenet", "Nolan", 2020, "Action"))
+        dao._notify("casting_added", 4, [20])
+    finally:
+        FilmDAO.unsubscribe(service)
+
+    assert service.search_ids(genres=["action"], acteurs=[Actor("Pearce", "Guy")]) == [
+        4
+    ]
+    assert service.film_dao.get_casting_pairs.call_count == 1
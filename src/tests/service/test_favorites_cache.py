@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+from src.service.favorites_cache import FavoritesCache
+
+
+def test_fill_then_get():
+    cache = FavoritesCache(max_entries=10, ttl=60)
+    cache.fill("u", ["A"], cache.version("u"))
+
+    assert cache.get("u") == ["A"]
+    assert cache.metrics()["hit_rate"] == 1.0
+
+
+def test_get_returns_copy():
+    cache = FavoritesCache(max_entries=10, ttl=60)
+    cache.fill("u", ["A"], cache.version("u"))
+
+    cache.get("u").append("B")
+
+    assert cache.get("u") == ["A"]
+
+
+def test_stale_fill_rejected():
+    cache = FavoritesCache(max_entries=10, ttl=60)
+    version = cache.version("u")
+    cache.invalidate("u")  # écriture pendant la lecture en base
+
+    assert cache.fill("u", ["ancien"], version) is False
+    assert cache.get("u") is None
+    assert cache.metrics()["stale_fills"] == 1
+
+
+def test_entry_tied_to_last_change():
+    cache = FavoritesCache(max_entries=10, ttl=60)
+    cache.fill("u", ["A"], cache.version("u"), change=5)
+
+    assert cache.get("u", 5) == ["A"]
+    assert cache.get("u", 6) is None  # écriture faite par un autre worker
+
+
+def test_invalidate_drops_entry():
+    cache = FavoritesCache(max_entries=10, ttl=60)
+    cache.fill("u", ["A"], cache.version("u"))
+
+    cache.invalidate("u")
+
+    assert cache.get("u") is None
+
+
+def test_lru_eviction():
+    cache = FavoritesCache(max_entries=2, ttl=60)
+    for pseudo in ("a", "b"):
+        cache.fill(pseudo, [pseudo], cache.version(pseudo))
+    cache.get("a")
+    cache.fill("c", ["c"], cache.version("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ["a"]
+    assert cache.metrics()["evictions"] == 1
+
+
+def test_expired_entry_is_a_miss():
+    cache = FavoritesCache(max_entries=10, ttl=60)
+    with patch("src.service.favorites_cache.time.monotonic", return_value=0):
+        cache.fill("u", ["A"], cache.version("u"))
+    with patch("src.service.favorites_cache.time.monotonic", return_value=61):
+        assert cache.get("u") is None
+
+
+def test_forgotten_versions_never_go_back():
+    cache = FavoritesCache(max_entries=1, ttl=60)
+    version = cache.version("u")
+    cache.invalidate("u")
+    for pseudo in ("a", "b", "c", "d"):  # évince la version de "u"
+        cache.invalidate(pseudo)
+
+    assert cache.version("u") > version
+    assert cache.fill("u", ["ancien"], version) is False
@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.business_object.film import Film
+from src.service.popularity_service import PopularityService
+
+
+@pytest.fixture
+def service():
+    user_dao = MagicMock()
+    film_dao = MagicMock()
+    user_dao.last_favorites_change.return_value = 7
+    user_dao.get_favorites_daily_counts.return_value = [
+        (10, "add", "2026-10-18", 3),
+        (20, "add", "2026-10-18", 5),
+        (20, "remove", "2026-10-18", 4),
+    ]
+    user_dao.get_favorites_log.return_value = []
+    film_dao.get_films_by_id.side_effect = lambda ids: {
+        i: Film(titre=f"F{i}", realisateur="R", annee=2000, genre="g") for i in ids
+    }
+    return PopularityService(user_dao, film_dao, half_life_days=7, sync_interval=0)
+
+
+def test_trending_from_daily_counts(service):
+    trending = service.trending(5)
+
+    assert [film.titre for film, _ in trending] == ["F10", "F20"]
+    assert trending[0][1] > trending[1][1] > 0
+    until = service.user_dao.get_favorites_daily_counts.call_args.args[1]
+    assert until == 7
+
+
+def test_sync_applies_new_changes(service):
+    service.trending()
+    service.user_dao.get_favorites_log.return_value = [
+        (8, 1, 30, "add"),
+        (9, 2, 30, "add"),
+        (10, 3, 30, "add"),
+        (11, 4, 30, "add"),
+    ]
+
+    trending = service.trending(1)
+
+    assert [film.titre for film, _ in trending] == ["F30"]
+    assert service._token == 11
+    service.user_dao.get_favorites_log.assert_called_with(7)
+    service.user_dao.get_favorites_daily_counts.assert_called_once()
+
+
+def test_films_read_once(service):
+    service.trending()
+    service.trending()
+
+    assert service.film_dao.get_films_by_id.call_count == 1
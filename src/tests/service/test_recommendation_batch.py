@@ -0,0 +1,76 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.business_object.film import Film
+from src.service.recommendation_batch import RecommendationBatch
+from src.service.recommendation_service import RecommendationService
+
+
+@pytest.fixture
+def batch():
+    user_dao = MagicMock()
+    film_dao = MagicMock()
+    user_dao.get_favorites_pairs.return_value = [(1, 10), (1, 20), (2, 10), (2, 30)]
+    user_dao.get_user_ids.return_value = {"alice": 1, "bob": 2, "nouveau": 3}
+    user_dao.last_favorites_change.return_value = 0
+    user_dao.get_favorites_log.return_value = []
+    film_dao.get_films_by_id.return_value = {
+        i: Film(titre=f"F{i}", realisateur="R", annee=2000, genre="g")
+        for i in (10, 20, 30)
+    }
+    film_dao.get_casting_pairs.return_value = []
+    service = RecommendationService(
+        user_dao,
+        film_dao,
+        k=5,
+        refresh_interval=3600,
+        recommendation_dao=MagicMock(),
+        popularity_service=MagicMock(),
+    )
+
+    written = []
+    recommendation_dao = MagicMock()
+    recommendation_dao.replace_all.side_effect = lambda batches: bool(
+        [written.extend(rows) for rows in batches]
+    )
+    batch = RecommendationBatch(service, recommendation_dao, n=5, chunk_size=2)
+    return batch, written
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_run_writes_every_user(batch, workers):
+    batch, written = batch
+    batch.workers = workers
+
+    stats = batch.run()
+
+    assert [row[:3] for row in written] == [(1, 1, 30), (2, 1, 20)]
+    assert stats["users"] == 3
+    assert stats["rows"] == 2
+    assert stats["written"] is True
+    assert stats["users_per_second"] > 0
+
+
+def test_run_reports_failed_write(batch):
+    batch, _ = batch
+    batch.workers = 0
+    batch.recommendation_dao.replace_all.side_effect = None
+    batch.recommendation_dao.replace_all.return_value = False
+
+    assert batch.run()["written"] is False
+
+
+def test_run_with_als(batch, tmp_path):
+    batch, written = batch
+    batch.model = "als"
+    batch.workers = 0
+    batch.als_factors = 2
+    batch.als_path = str(tmp_path)
+
+    stats = batch.run()
+
+    assert stats["users"] == 2
+    assert {row[0] for row in written} == {1, 2}
+    assert {(row[0], row[2]) for row in written} == {(1, 30), (2, 20)}
+    assert (tmp_path / "item_factors.npy").exists()
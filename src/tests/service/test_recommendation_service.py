@@ -0,0 +1,240 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.business_object.film import Film
+from src.engine.content_similarity import film_features
+from src.service.recommendation_service import RecommendationService
+
+
+@pytest.fixture
+def service():
+    user_dao = MagicMock()
+    film_dao = MagicMock()
+    user_dao.get_favorites_pairs.return_value = [(1, 10), (1, 20), (2, 10), (2, 30)]
+    user_dao.get_user_ids.return_value = {"alice": 1, "bob": 2, "nouveau": 3}
+    user_dao.last_favorites_change.return_value = 0
+    user_dao.get_favorites_log.return_value = []
+    user_dao.get_favorites_by_pseudo.return_value = []
+    film_dao.get_films_by_id.return_value = {
+        i: Film(titre=f"F{i}", realisateur="R", annee=2000, genre="g")
+        for i in (10, 20, 30)
+    }
+    film_dao.get_casting_pairs.return_value = []
+    return RecommendationService(
+        user_dao,
+        film_dao,
+        k=5,
+        refresh_interval=3600,
+        sync_interval=3600,
+        recommendation_dao=MagicMock(),
+        popularity_service=MagicMock(),
+    )
+
+
+def test_recommend_returns_films(service):
+    recommandations = service.recommend("alice")
+
+    assert [film.titre for film, _ in recommandations] == ["F30"]
+
+
+def test_precomputed_reads_table_only(service):
+    film = Film(titre="F30", realisateur="R", annee=2000, genre="g")
+    service.recommendation_dao.get_for_user.return_value = [(film, 0.5)]
+
+    assert service.precomputed("alice", 5) == [(film, 0.5)]
+    service.recommendation_dao.get_for_user.assert_called_once_with("alice", 5)
+    service.user_dao.get_favorites_pairs.assert_not_called()
+
+
+def test_precomputed_excludes_new_favorites(service):
+    # F30 ajouté en favori après le dernier calcul de la table
+    service.user_dao.get_favorites_by_pseudo.return_value = [
+        Film(titre="F30", realisateur="R", annee=2000, genre="g")
+    ]
+    service.recommendation_dao.get_for_user.return_value = [
+        (Film(titre=f"F{i}", realisateur="R", annee=2000, genre="g"), 1.0 - i / 100)
+        for i in (30, 40, 50)
+    ]
+
+    found = service.precomputed("alice", 2)
+
+    assert [film.titre for film, _ in found] == ["F40", "F50"]
+    service.recommendation_dao.get_for_user.assert_called_once_with("alice", 3)
+    service.user_dao.get_favorites_pairs.assert_not_called()
+
+
+def test_precomputed_live_fallback(service):
+    service.recommendation_dao.get_for_user.return_value = []
+    service.live_fallback = True
+
+    assert [film.titre for film, _ in service.precomputed("alice")] == ["F30"]
+    service.popularity_service.trending.assert_not_called()
+
+
+def test_precomputed_falls_back_to_trending(service):
+    film = Film(titre="Tendance", realisateur="R", annee=2024, genre="g")
+    service.recommendation_dao.get_for_user.return_value = []
+    service.popularity_service.trending.return_value = [(film, 3.0)]
+
+    assert service.precomputed("nouveau", 5) == [(film, 3.0)]
+    service.popularity_service.trending.assert_called_once_with(5)
+    service.user_dao.get_favorites_pairs.assert_not_called()
+
+
+def test_precomputed_no_model_without_live_fallback(service):
+    # favoris mais pas encore de ligne dans la table : pas de modèle dans l'API
+    service.recommendation_dao.get_for_user.return_value = []
+    service.user_dao.get_favorites_by_pseudo.return_value = [
+        Film(titre="F10", realisateur="R", annee=2000, genre="g"),
+        Film(titre="F20", realisateur="R", annee=2000, genre="g"),
+    ]
+    service.popularity_service.trending.return_value = []
+
+    assert service.precomputed("alice") == []
+    service.user_dao.get_favorites_pairs.assert_not_called()
+
+
+def test_precomputed_trending_excludes_favorites(service):
+    service.recommendation_dao.get_for_user.return_value = []
+    service.user_dao.get_favorites_by_pseudo.return_value = [
+        Film(titre="F10", realisateur="R", annee=2000, genre="g")
+    ]
+    service.user_dao.get_user_ids.return_value = {}  # pas encore dans le modèle
+    service.popularity_service.trending.return_value = [
+        (Film(titre=f"F{i}", realisateur="R", annee=2000, genre="g"), 10.0 - i / 10)
+        for i in (10, 20, 30)
+    ]
+
+    found = service.precomputed("alice", 2)
+
+    assert [film.titre for film, _ in found] == ["F20", "F30"]
+    service.popularity_service.trending.assert_called_once_with(3)
+
+
+def test_model_built_once(service):
+    service.recommend("alice")
+    service.recommend("bob")
+
+    service.user_dao.get_favorites_pairs.assert_called_once()
+
+
+def test_model_rebuilt_when_stale(service):
+    service.refresh_interval = 0
+    service.recommend("alice")
+    service._built_at -= 1
+    service.recommend("alice")
+
+    assert service.user_dao.get_favorites_pairs.call_count == 2
+
+
+def test_user_without_favorites(service):
+    assert service.recommend("nouveau") == []
+    assert service.recommend("inconnu") == []
+
+
+def test_similar_films_by_content(service):
+    service.film_dao.get_films_by_id.return_value = {
+        10: Film(titre="Inception", realisateur="Nolan", annee=2010, genre="SF"),
+        20: Film(titre="Tenet", realisateur="Nolan", annee=2020, genre="SF"),
+        30: Film(
+            titre="Le Dîner de cons", realisateur="Veber", annee=1998, genre="Comédie"
+        ),
+    }
+    service.film_dao.get_casting_pairs.return_value = [(10, 1), (20, 1)]
+
+    similaires = service.similar_films(" inception ")
+
+    assert [film.titre for film, _ in similaires] == ["Tenet"]
+    assert service.similar_films("Inconnu") is None
+
+
+def test_recommend_completed_by_content(service):
+    # "alice" n'a qu'un favori partagé par personne : voisins de contenu
+    service.user_dao.get_favorites_pairs.return_value = [(1, 10)]
+    service.film_dao.get_films_by_id.return_value = {
+        10: Film(titre="Inception", realisateur="Nolan", annee=2010, genre="SF"),
+        20: Film(titre="Tenet", realisateur="Nolan", annee=2020, genre="SF"),
+    }
+    service.film_dao.get_casting_pairs.return_value = []
+
+    assert [film.titre for film, _ in service.recommend("alice")] == ["Tenet"]
+
+
+def test_sync_applies_logged_favorites(service):
+    service.recommend("alice")
+    service.user_dao.get_favorites_log.return_value = [(5, 3, 20, "add")]
+
+    assert service.sync() == 1
+    assert service.recommend("nouveau")[0][0].titre == "F10"
+    assert service._snapshot.token == 5
+
+    service.user_dao.get_favorites_log.return_value = []
+    service.sync()
+    service.user_dao.get_favorites_log.assert_called_with(5, service.compact_every)
+
+
+def test_sync_registers_new_films(service):
+    service.recommend("alice")
+    service.user_dao.get_favorites_log.return_value = [(6, 1, 40, "add")]
+    service.film_dao.get_films_by_id.return_value = {
+        40: Film(titre="F40", realisateur="R", annee=2000, genre="g")
+    }
+
+    service.sync()
+
+    service.film_dao.get_films_by_id.assert_called_with([40])
+    assert "F40" in [film.titre for film, _ in service.recommend("bob")]
+
+
+def test_sync_registers_new_films_with_casting(service):
+    service.recommend("alice")
+    film = Film(titre="F40", realisateur="R", annee=2000, genre="g")
+    service.user_dao.get_favorites_log.return_value = [(6, 1, 40, "add")]
+    service.film_dao.get_films_by_id.return_value = {40: film}
+    service.film_dao.get_casting_pairs.return_value = [(40, 7), (40, 8)]
+
+    service.sync()
+
+    service.film_dao.get_casting_pairs.assert_called_with([40])
+    content = service._snapshot.content
+    expected = content.hash_features(film_features("g", "R", 2000, [7, 8]))
+    assert sorted(content._row(40)[0].tolist()) == sorted(expected.tolist())
+
+
+def test_sync_without_model_reads_nothing(service):
+    assert service.sync() == 0
+    service.user_dao.get_favorites_log.assert_not_called()
+
+
+def test_compaction_rebuilds_model(service):
+    service.compact_every = 1
+    service.recommend("alice")
+    service.user_dao.get_favorites_log.return_value = [(5, 3, 20, "add")]
+    service.sync()
+    service.user_dao.get_favorites_log.return_value = []
+
+    service.recommend("alice")
+
+    assert service.user_dao.get_favorites_pairs.call_count == 2
+
+
+def test_similar_films_approx(service):
+    service.film_dao.get_films_by_id.return_value = {
+        10: Film(titre="Inception", realisateur="Nolan", annee=2010, genre="SF"),
+        20: Film(titre="Tenet", realisateur="Nolan", annee=2020, genre="SF"),
+        30: Film(
+            titre="Le Dîner de cons", realisateur="Veber", annee=1998, genre="Comédie"
+        ),
+    }
+
+    similaires = service.similar_films("Inception", n=1, approx=True)
+
+    assert [film.titre for film, _ in similaires] == ["Tenet"]
+
+
+def test_similar_users_and_neighbour_films(service):
+    assert service.similar_users("alice") == [("bob", pytest.approx(1 / 3))]
+    assert [film.titre for film, _ in service.neighbour_films("alice")] == ["F30"]
+    assert service.similar_users("nouveau") == []
+    assert service.neighbour_films("inconnu") == []
@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.service.request_context import get_context, request_scope
+from src.service.user_service import UserService
+from src.utils.psswd_pool import PasswordPool
+
+
+# =====================================================
+# request_scope / get_context
+# =====================================================
+def test_scope_gives_fresh_context():
+    outer = get_context()
+    with request_scope() as context:
+        assert get_context() is context
+        assert context is not outer
+        assert context.user is None
+    assert get_context() is outer
+
+
+def test_cache_only_inside_scope():
+    factory = MagicMock(return_value="valeur")
+
+    get_context().cached("cle", factory)
+    get_context().cached("cle", factory)
+    assert factory.call_count == 2
+
+    with request_scope() as context:
+        context.cached("cle", factory)
+        context.cached("cle", factory)
+    assert factory.call_count == 3
+
+
+def test_none_is_not_cached():
+    factory = MagicMock(return_value=None)
+    with request_scope() as context:
+        context.cached("cle", factory)
+        context.cached("cle", factory)
+    assert factory.call_count == 2
+
+
+# =====================================================
+# UserService partagé entre requêtes concurrentes
+# =====================================================
+def test_user_service_session_is_request_scoped():
+    """Deux requêtes concurrentes ne voient pas la session de l'autre."""
+    service = UserService(
+        user_dao=MagicMock(),
+        password_pool=PasswordPool(workers=0),
+        recommendation_service=MagicMock(),
+    )
+
+    def request(pseudo):
+        with request_scope():
+            service.current_session = SimpleNamespace(
+                user=SimpleNamespace(pseudo=pseudo)
+            )
+            return service.current_user.pseudo
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, request, f"user{i}")
+            for i in range(20)
+        ]
+        results = [f.result() for f in futures]
+
+    assert results == [f"user{i}" for i in range(20)]
+
+
+def test_get_user_reads_database_once_per_request():
+    dao = MagicMock()
+    service = UserService(
+        user_dao=dao,
+        password_pool=PasswordPool(workers=0),
+        recommendation_service=MagicMock(),
+    )
+
+    with request_scope():
+        service.get_user("louis")
+        service.get_user("louis")
+    with request_scope():
+        service.get_user("louis")
+
+    assert dao.get_by_pseudo.call_count == 2
@@ -0,0 +1,132 @@
+import time
+
+import pytest
+
+from src.business_object.client import Client
+from src.service.session import Session
+from src.service.session_manager import SessionManager
+from src.service.session_store import MemorySessionStore, SQLiteSessionStore
+
+
+# =====================================================
+# Fixtures
+# =====================================================
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Chaque test est joué sur les deux implémentations."""
+    if request.param == "memory":
+        return MemorySessionStore(max_sessions=100, shards=4)
+    return SQLiteSessionStore(str(tmp_path / "sessions.db"))
+
+
+@pytest.fixture
+def user():
+    return Client(pseudo="louis", email="louis@ex.com", psswd="hash")
+
+
+# =====================================================
+# Opérations de base
+# =====================================================
+def test_save_and_get(store, user):
+    session = Session(user, ttl=60)
+    store.save(session)
+
+    found = store.get(session.session_id)
+
+    assert found.session_id == session.session_id
+    assert found.user.pseudo == "louis"
+    assert found.user.role == "client"
+
+
+def test_serialized_session_has_no_password_hash(user):
+    session = Session(user, ttl=60)
+
+    data = session.to_dict()
+    restored = Session.from_dict(data)
+
+    assert "psswd" not in data["user"]
+    assert "hash" not in str(data)
+    assert restored.user.pseudo == "louis"
+    assert restored.user.psswd == "!"
+
+
+def test_get_unknown_returns_none(store):
+    assert store.get("inconnu") is None
+
+
+def test_expired_session_is_not_returned(store, user):
+    session = Session(user, ttl=-1)
+    store.save(session)
+
+    assert store.get(session.session_id) is None
+
+
+def test_delete(store, user):
+    session = Session(user, ttl=60)
+    store.save(session)
+    store.delete(session.session_id)
+
+    assert store.get(session.session_id) is None
+
+
+def test_find_and_delete_by_pseudo(store, user):
+    other = Client(pseudo="olivier", email="o@ex.com", psswd="hash")
+    store.save(Session(user, ttl=60))
+    store.save(Session(user, ttl=60))
+    kept = Session(other, ttl=60)
+    store.save(kept)
+
+    assert len(store.find_by_pseudo("louis")) == 2
+    store.delete_by_pseudo("louis")
+
+    assert store.find_by_pseudo("louis") == []
+    assert store.get(kept.session_id) is not None
+
+
+def test_sweep_removes_expired(store, user):
+    store.save(Session(user, ttl=-1))
+    alive = Session(user, ttl=60)
+    store.save(alive)
+
+    assert store.sweep() == 1
+    assert store.get(alive.session_id) is not None
+
+
+# =====================================================
+# Spécifique au stockage mémoire
+# =====================================================
+def test_memory_store_evicts_least_recently_used(user):
+    store = MemorySessionStore(max_sessions=2, shards=1)
+    first, second, third = (Session(user, ttl=60) for _ in range(3))
+    store.save(first)
+    store.save(second)
+    store.get(first.session_id)  # first devient la plus récente
+    store.save(third)
+
+    assert store.get(second.session_id) is None
+    assert store.get(first.session_id) is not None
+    assert len(store) == 2
+
+
+def test_background_sweeper(user):
+    store = MemorySessionStore(shards=1)
+    store.save(Session(user, ttl=0))
+    store.start_sweeper(interval=0.01)
+    time.sleep(0.1)
+
+    assert len(store) == 0
+
+
+# =====================================================
+# SessionManager
+# =====================================================
+def test_sessions_shared_between_managers(tmp_path, user):
+    """Deux gestionnaires (ex: deux workers) partagent le même fichier."""
+    first = SessionManager(SQLiteSessionStore(str(tmp_path / "s.db")))
+    second = SessionManager(SQLiteSessionStore(str(tmp_path / "s.db")))
+
+    session = first.create_session(user)
+    assert second.get_session_by_id(session.session_id) is not None
+
+    second.revoke(session.session_id)
+    assert first.get_session_by_id(session.session_id) is None
@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.business_object.film import Film
+from src.dao.film_dao import FilmDAO
+from src.service.title_match_service import TitleMatchService
+
+
+FILMS = {
+    1: Film("Inception", "Nolan", 2010, "Action"),
+    2: Film("Insomnia", "Nolan", 2002, "Thriller"),
+    3: Film("Interstellar", "Nolan", 2014, "Science-Fiction"),
+}
+
+
+@pytest.fixture
+def service():
+    film_dao = MagicMock()
+    film_dao.get_films_by_id.side_effect = lambda ids=None: (
+        FILMS if ids is None else {i: FILMS[i] for i in ids if i in FILMS}
+    )
+    return TitleMatchService(film_dao, refresh_interval=3600)
+
+
+def test_find_misspelled_title(service):
+    assert service.find("Interstelar") is FILMS[3]
+    assert service.match("inception")[:2] == (1, 1.0)
+
+
+def test_find_unknown_title(service):
+    assert service.find("Oppenheimer") is None
+    service.film_dao.get_films_by_id.assert_called_once_with()
+
+
+def test_thresholds_from_environment(monkeypatch):
+    monkeypatch.setenv("TITLE_MATCH_THRESHOLD", "0.9")
+    monkeypatch.setenv("TITLE_MATCH_MAX_EDITS", "0")
+    film_dao = MagicMock()
+    film_dao.get_films_by_id.return_value = FILMS
+    strict = TitleMatchService(film_dao, refresh_interval=3600)
+
+    assert strict.match("Interstelar") is None
+    assert strict.match("INCEPTION")[0] == 1
+
+
+def test_index_built_once(service):
+    service.match("inception")
+    service.match("insomnia")
+
+    service.film_dao.get_films_by_id.assert_called_once()
+
+
+def test_films_added_through_film_dao(service):
+    service.match("inception")
+    FilmDAO.subscribe(service)
+    try:
+        dao = FilmDAO.__new__(FilmDAO)
+        dao._notify("film_added", 4, Film("Les Infiltrés", "Scorsese", 2006, "Crime"))
+    finally:
+        FilmDAO.unsubscribe(service)
+
+    assert service.match("les infiltres")[0] == 4
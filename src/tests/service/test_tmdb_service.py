@@ -1,4 +1,5 @@
-from unittest.mock import MagicMock
+from collections import OrderedDict
+from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
@@ -16,9 +17,22 @@ def tmdb_service(monkeypatch):
     monkeypatch.setenv("TMDB_API_KEY", "fake_key")
     # Base URL stable (évite surprises)
     monkeypatch.setenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
+    # Cache des genres vide pour chaque test
+    monkeypatch.setattr(TmdbService, "_genres", {})
+    monkeypatch.setattr(TmdbService, "_genres_loaded_at", None)
+    monkeypatch.setattr(TmdbService, "_unknown_genres", set())
+    monkeypatch.setattr(TmdbService, "_movies", OrderedDict())
     return TmdbService()
 
 
+GENRES = {
+    "genres": [
+        {"id": 878, "name": "Science Fiction"},
+        {"id": 28, "name": "Action"},
+    ]
+}
+
+
 @pytest.fixture
 def mock_requests_get(monkeypatch):
     """
@@ -123,18 +137,84 @@ def test_movie_credits_calls__get(tmdb_service):
     )
 
 
+# =====================================================
+# genre_list() / get_genres() / genre_names()
+# =====================================================
+def test_genre_list_calls__get(tmdb_service):
+    tmdb_service._get = MagicMock(return_value=GENRES)
+
+    res = tmdb_service.genre_list()
+
+    assert res == GENRES
+    tmdb_service._get.assert_called_once_with("/genre/movie/list")
+
+
+def test_get_genres_is_cached(tmdb_service):
+    tmdb_service.genre_list = MagicMock(return_value=GENRES)
+
+    first = tmdb_service.get_genres()
+    second = tmdb_service.get_genres()
+
+    assert first == {878: "Science Fiction", 28: "Action"}
+    assert second == first
+    tmdb_service.genre_list.assert_called_once()
+
+
+def test_get_genres_refreshes_when_expired(tmdb_service):
+    tmdb_service.genre_list = MagicMock(return_value=GENRES)
+    tmdb_service.genres_ttl = -1
+
+    tmdb_service.get_genres()
+    tmdb_service.get_genres()
+
+    assert tmdb_service.genre_list.call_count == 2
+
+
+def test_genre_names_refreshes_on_unknown_id(tmdb_service):
+    tmdb_service.genre_list = MagicMock(
+        side_effect=[
+            {"genres": [{"id": 28, "name": "Action"}]},
+            {"genres": [{"id": 28, "name": "Action"}, {"id": 99, "name": "Docu"}]},
+        ]
+    )
+
+    assert tmdb_service.genre_names([28]) == ["Action"]
+    assert tmdb_service.genre_names([28, 99]) == ["Action", "Docu"]
+    assert tmdb_service.genre_list.call_count == 2
+
+
+def test_genre_names_remembers_ids_missing_after_refresh(tmdb_service):
+    tmdb_service.genre_list = MagicMock(
+        return_value={"genres": [{"id": 28, "name": "Action"}]}
+    )
+
+    assert tmdb_service.genre_names([28, 1234]) == ["Action"]
+    assert tmdb_service.genre_names([1234]) == []
+    assert tmdb_service.genre_list.call_count == 2  # chargement + un rechargement
+
+    tmdb_service.genres_ttl = -1  # TTL expiré : l'id est de nouveau cherché
+    tmdb_service.genre_names([1234])
+    assert tmdb_service.genre_list.call_count == 4
+
+
 # =====================================================
 # get_movie_filtered()
 # =====================================================
 def test_get_movie_filtered_returns_film(tmdb_service):
-    tmdb_service.search_movie = MagicMock(return_value={"results": [{"id": 42}]})
-    tmdb_service.movie_details = MagicMock(
+    tmdb_service.search_movie = MagicMock(
         return_value={
-            "title": "Inception",
-            "release_date": "2010-07-16",
-            "genres": [{"name": "Science Fiction"}, {"name": "Action"}],
+            "results": [
+                {
+                    "id": 42,
+                    "title": "Inception",
+                    "release_date": "2010-07-16",
+                    "genre_ids": [878, 28],
+                }
+            ]
         }
     )
+    tmdb_service.genre_list = MagicMock(return_value=GENRES)
+    tmdb_service.movie_details = MagicMock()
     tmdb_service.movie_credits = MagicMock(
         return_value={
             "crew": [{"job": "Director", "name": "Christopher Nolan"}],
@@ -154,6 +234,26 @@ def test_get_movie_filtered_returns_film(tmdb_service):
     assert film.annee == 2010
     assert film.genre == "Science Fiction, Action"
     assert film.casting == ["Actor 1", "Actor 2"]
+    tmdb_service.movie_details.assert_not_called()
+    tmdb_service.movie_credits.assert_called_once_with(movie_id=42)
+
+
+def test_get_movie_filtered_without_actors_skips_credits(tmdb_service):
+    tmdb_service.search_movie = MagicMock(
+        return_value={
+            "results": [{"id": 42, "title": "Inception", "release_date": "2010-07-16"}]
+        }
+    )
+    tmdb_service.genre_list = MagicMock(return_value=GENRES)
+    tmdb_service.movie_credits = MagicMock()
+
+    film = tmdb_service.get_movie_filtered(query="Inception", nb_acteurs=0)
+
+    assert film.titre == "Inception"
+    assert film.annee == 2010
+    assert film.realisateur is None
+    assert film.casting == []
+    tmdb_service.movie_credits.assert_not_called()
 
 
 def test_get_movie_filtered_raises_when_no_results(tmdb_service):
@@ -164,14 +264,14 @@ def test_get_movie_filtered_raises_when_no_results(tmdb_service):
 
 
 def test_get_movie_filtered_handles_missing_release_date(tmdb_service):
-    tmdb_service.search_movie = MagicMock(return_value={"results": [{"id": 1}]})
-    tmdb_service.movie_details = MagicMock(
+    tmdb_service.search_movie = MagicMock(
         return_value={
-            "title": "Test",
-            "release_date": None,
-            "genres": [],
+            "results": [
+                {"id": 1, "title": "Test", "release_date": None, "genre_ids": []}
+            ]
         }
     )
+    tmdb_service.genre_list = MagicMock(return_value=GENRES)
     tmdb_service.movie_credits = MagicMock(return_value={"crew": [], "cast": []})
 
     film = tmdb_service.get_movie_filtered(query="Test", nb_acteurs=5)
@@ -181,3 +281,86 @@ def test_get_movie_filtered_handles_missing_release_date(tmdb_service):
     assert film.annee is None
     assert film.genre == ""
     assert film.casting == []
+
+
+# =====================================================
+# get_movies_filtered()
+# =====================================================
+def test_get_movies_filtered_resolves_each_title_once(tmdb_service):
+    tmdb_service.genre_list = MagicMock(return_value=GENRES)
+    tmdb_service.get_movie_filtered = MagicMock(
+        side_effect=lambda query, _nb: Film(
+            titre=query, realisateur="X", annee=None, genre=""
+        )
+    )
+
+    res = tmdb_service.get_movies_filtered(["A", "B", "A"])
+
+    assert list(res) == ["A", "B"]
+    assert res["B"].titre == "B"
+    assert tmdb_service.get_movie_filtered.call_count == 2
+
+
+def test_get_movies_filtered_returns_errors_per_title(tmdb_service):
+    tmdb_service.genre_list = MagicMock(return_value=GENRES)
+
+    def fake(query, _nb):
+        if query == "Nope":
+            raise ValueError("Aucun film trouvé pour 'Nope'")
+        return Film(titre=query, realisateur="X", annee=None, genre="")
+
+    tmdb_service.get_movie_filtered = MagicMock(side_effect=fake)
+
+    res = tmdb_service.get_movies_filtered(["Inception", "Nope"])
+
+    assert isinstance(res["Inception"], Film)
+    assert isinstance(res["Nope"], ValueError)
+
+
+def test_get_movies_filtered_empty(tmdb_service):
+    assert tmdb_service.get_movies_filtered([]) == {}
+
+
+# =====================================================
+# get_movie_cached()
+# =====================================================
+def test_get_movie_cached_hits_tmdb_once(tmdb_service):
+    film = Film(titre="Inception", realisateur="Nolan", annee=2010, genre="SF")
+    tmdb_service.get_movie_filtered = MagicMock(return_value=film)
+
+    first, etag = tmdb_service.get_movie_cached("Inception")
+    second, etag2 = tmdb_service.get_movie_cached(" inception")
+
+    assert first is second
+    assert etag == etag2
+    tmdb_service.get_movie_filtered.assert_called_once()
+
+
+def test_get_movie_cached_expires(tmdb_service):
+    tmdb_service.movies_ttl = 60
+    tmdb_service.get_movie_filtered = MagicMock(
+        return_value=Film(titre="A", realisateur="B", annee=None, genre="")
+    )
+
+    with patch("src.service.tmdb_service.time.monotonic", return_value=0):
+        tmdb_service.get_movie_cached("A")
+    with patch("src.service.tmdb_service.time.monotonic", return_value=61):
+        tmdb_service.get_movie_cached("A")
+
+    assert tmdb_service.get_movie_filtered.call_count == 2
+
+
+def test_get_movie_cached_etag_follows_content(tmdb_service):
+    tmdb_service.movies_ttl = 0
+    tmdb_service.get_movie_filtered = MagicMock(
+        side_effect=[
+            Film(titre="A", realisateur="B", annee=None, genre=""),
+            Film(titre="A", realisateur="C", annee=None, genre=""),
+        ]
+    )
+
+    with patch("src.service.tmdb_service.time.monotonic", side_effect=[0, 1, 1]):
+        _, etag = tmdb_service.get_movie_cached("A")
+        _, etag2 = tmdb_service.get_movie_cached("A")
+
+    assert etag != etag2
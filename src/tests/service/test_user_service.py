@@ -8,17 +8,29 @@ from src.app_errors.app_errors import (
     IncorrectPasswordError,
     InvalidInputError,
     InvalidPassWordError,
+    InvalidTokenError,
     UserAlreadyExistsError,
     UserNotFoundError,
+    UserSessionExpiredError,
 )
 from src.business_object import User
+from src.service.favorites_cache import FavoritesCache
+from src.service.session_manager import SessionManager
 from src.service.user_service import UserService
+from src.utils.psswd_pool import PasswordPool
+from src.utils.psswd_proc import PasswordProcessing
+from src.utils.token_proc import TokenProcessing
 
 
 @pytest.fixture
 def svc():
     """Fixture UserService avec DAO et utilitaires mockés."""
-    service = UserService(user_dao=MagicMock())
+    service = UserService(
+        user_dao=MagicMock(),
+        password_pool=PasswordPool(workers=0),
+        favorites_cache=FavoritesCache(),
+        recommendation_service=MagicMock(),
+    )
     service.session_manager = MagicMock()
     service.current_session = None
     return service
@@ -58,8 +70,8 @@ def test_signup_pseudo_exists(svc):
     user.email = "ok@ex.com"
     user.pseudo = "dupe"
     user._psswd = "Pwd!2345"
-    svc.user_dao.get_user_by_pseudo.return_value = True
-    with pytest.raises(UserAlreadyExistsError):
+    svc.user_dao.pseudo_exists.return_value = True
+    with pytest.raises(UserAlreadyExistsError, match="pseudo"):
         svc.signup(user)
 
 
@@ -69,10 +81,12 @@ def test_signup_email_exists(svc):
     user.email = "dup@ex.com"
     user.pseudo = "unique"
     user._psswd = "Pwd!2345"
-    svc.user_dao.get_user_by_pseudo.return_value = None
-    svc.user_dao.get_all_users.return_value = [SimpleNamespace(email="dup@ex.com")]
-    with pytest.raises(UserAlreadyExistsError):
+    svc.user_dao.pseudo_exists.return_value = False
+    svc.user_dao.email_exists.return_value = True
+    with pytest.raises(UserAlreadyExistsError, match="mail"):
         svc.signup(user)
+    svc.user_dao.email_exists.assert_called_once_with("dup@ex.com")
+    svc.user_dao.get_all_users.assert_not_called()
 
 
 def test_signup_bad_password(svc):
@@ -131,6 +145,18 @@ def test_signup_creation_fail_raises(svc):
         svc.signup(user)
 
 
+def test_signup_conflict_on_insert(svc, monkeypatch):
+    """Une inscription concurrente détectée à l'insertion remonte telle quelle."""
+    monkeypatch.setenv("BCRYPT_ROUNDS", "4")
+    user = User(pseudo="new3", email="ok@ex.com", psswd="Strong!234")
+    svc.user_dao.pseudo_exists.return_value = False
+    svc.user_dao.email_exists.return_value = False
+    svc.user_dao.create.side_effect = UserAlreadyExistsError("déjà utilisé")
+
+    with pytest.raises(UserAlreadyExistsError):
+        svc.signup(user)
+
+
 # ---------- login ------------------------------------------------------- #
 def test_login_not_found(svc):
     """Login utilisateur inexistant. Devrait lever UserNotFoundError."""
@@ -167,3 +193,212 @@ def test_login_success(svc):
         res = svc.login("u", "pwd")
         assert res == user_obj
         svc.session_manager.create_session.assert_called_once_with(user_obj)
+
+
+# ---------- jetons de session ------------------------------------------ #
+@pytest.fixture
+def svc_token():
+    """UserService avec un vrai SessionManager et une clé de signature fixe."""
+    service = UserService(
+        user_dao=MagicMock(),
+        password_pool=PasswordPool(workers=0),
+        recommendation_service=MagicMock(),
+    )
+    service.session_manager = SessionManager()
+    service.token_processor = TokenProcessing(secret="cle-de-test")
+    return service
+
+
+def _login_token(service):
+    hashed = PasswordProcessing("pwd", rounds=4)._hash_password().decode("utf-8")
+    user_obj = SimpleNamespace(pseudo="u", _psswd=hashed, role="client")
+    service.user_dao.get_by_pseudo.return_value = user_obj
+    with patch(
+        "src.service.user_service.PasswordProcessing._verify_password",
+        return_value=True,
+    ):
+        return user_obj, service.login_token("u", "pwd")
+
+
+def test_authenticate_with_token(svc_token):
+    """Un jeton émis au login authentifie l'utilisateur sans accès au DAO."""
+    user_obj, token = _login_token(svc_token)
+    svc_token.user_dao.reset_mock()
+
+    assert svc_token.authenticate(token) is user_obj
+    svc_token.user_dao.get_by_pseudo.assert_not_called()
+
+
+def test_authenticate_rejects_forged_token(svc_token):
+    """Un jeton falsifié lève InvalidTokenError."""
+    _, token = _login_token(svc_token)
+    with pytest.raises(InvalidTokenError):
+        svc_token.authenticate(token + "x")
+
+
+def test_revoked_token_is_rejected(svc_token):
+    """Après révocation, le jeton ne permet plus de s'authentifier."""
+    _, token = _login_token(svc_token)
+
+    assert svc_token.revoke_token(token) is True
+    with pytest.raises(UserSessionExpiredError):
+        svc_token.authenticate(token)
+
+
+# ---------- rehash au login -------------------------------------------- #
+def test_login_rehashes_when_cost_differs(svc, monkeypatch):
+    """Un hash calculé avec un ancien coût est recalculé et enregistré."""
+    monkeypatch.setenv("BCRYPT_ROUNDS", "5")
+    old_hash = PasswordProcessing("Pwd!2345", rounds=4)._hash_password()
+    user_obj = SimpleNamespace(pseudo="u", _psswd=old_hash.decode("utf-8"))
+    svc.user_dao.get_by_pseudo.return_value = user_obj
+
+    svc.login("u", "Pwd!2345")
+
+    svc.user_dao.change_mdp.assert_called_once()
+    assert PasswordProcessing.get_rounds(user_obj._psswd.encode("utf-8")) == 5
+
+
+def test_login_keeps_hash_with_current_cost(svc, monkeypatch):
+    """Aucun rehash si le coût du hash est déjà le coût cible."""
+    monkeypatch.setenv("BCRYPT_ROUNDS", "4")
+    current = PasswordProcessing("Pwd!2345", rounds=4)._hash_password()
+    user_obj = SimpleNamespace(pseudo="u", _psswd=current.decode("utf-8"))
+    svc.user_dao.get_by_pseudo.return_value = user_obj
+
+    svc.login("u", "Pwd!2345")
+
+    svc.user_dao.change_mdp.assert_not_called()
+
+
+# ---------- favoris ---------------------------------------------------- #
+def test_add_favorite_inserts_single_row(svc):
+    """L'ajout d'un favori ne relit pas la liste existante."""
+    film = MagicMock()
+    svc.user_dao.get_id.return_value = 3
+    svc.user_dao.add_favorite.return_value = True
+
+    assert svc.add_favorite("u", film) is True
+    svc.user_dao.add_favorite.assert_called_once_with(3, film)
+    svc.user_dao.get_favorites.assert_not_called()
+    svc.user_dao.add_favorites.assert_not_called()
+
+
+def test_add_favorites_batch_uses_one_dao_call(svc):
+    """Un lot de favoris est transmis en un seul appel au DAO."""
+    films = [MagicMock(), MagicMock()]
+    svc.user_dao.get_id.return_value = 3
+    svc.user_dao.add_favorites_batch.return_value = True
+
+    assert svc.add_favorites_batch("u", films) is True
+    svc.user_dao.add_favorites_batch.assert_called_once_with(3, films)
+
+
+def test_get_favorites_served_from_cache(svc):
+    """Deuxième lecture servie par le cache, sans requête."""
+    films = [MagicMock()]
+    svc.user_dao.get_favorites_by_pseudo.return_value = films
+
+    assert svc.get_favorites("u") == films
+    assert svc.get_favorites("u") == films
+    svc.user_dao.get_favorites_by_pseudo.assert_called_once_with("u")
+    svc.user_dao.get_by_pseudo.assert_not_called()
+    assert svc.favorites_cache.metrics()["hits"] == 1
+
+
+def test_get_favorites_rereads_after_change_elsewhere(svc):
+    """Un changement en base fait par un autre worker force la relecture."""
+    svc.user_dao.get_id.return_value = 3
+    svc.user_dao.last_favorites_change.return_value = 5
+    svc.user_dao.get_favorites_by_pseudo.return_value = []
+    svc.get_favorites("u", svc.favorites_change("u"))
+    svc.get_favorites("u", svc.favorites_change("u"))
+
+    svc.user_dao.last_favorites_change.return_value = 6
+    svc.get_favorites("u", svc.favorites_change("u"))
+
+    svc.user_dao.last_favorites_change.assert_called_with(3)
+    assert svc.user_dao.get_favorites_by_pseudo.call_count == 2
+
+
+def test_add_favorite_invalidates_cache(svc):
+    """Un ajout force la relecture des favoris."""
+    svc.user_dao.get_favorites_by_pseudo.return_value = []
+    svc.get_favorites("u")
+
+    svc.add_favorite("u", MagicMock())
+    svc.get_favorites("u")
+
+    assert svc.user_dao.get_favorites_by_pseudo.call_count == 2
+
+
+def test_add_favorite_updates_recommendations(svc):
+    """Chaque écriture sur les favoris est propagée aux recommandations."""
+    svc.add_favorite("u", MagicMock())
+    svc.remove_favorite("u", "Titre")
+
+    assert svc.recommendation_service.sync.call_count == 2
+
+
+def test_get_favorites_error_not_cached(svc):
+    """Une erreur DAO (None) n'est pas mise en cache."""
+    svc.user_dao.get_favorites_by_pseudo.return_value = None
+
+    assert svc.get_favorites("u") is None
+    assert svc.favorites_cache.metrics()["size"] == 0
+
+
+def _film(titre):
+    return SimpleNamespace(titre=titre, realisateur="R")
+
+
+def test_sync_favorites_returns_delta(svc):
+    """Seuls les changements postérieurs au jeton sont renvoyés."""
+    svc.user_dao.get_id.return_value = 3
+    svc.user_dao.last_favorites_change.return_value = 12
+    svc.user_dao.get_favorites_changes.return_value = [
+        (10, "add", _film("A")),
+        (11, "add", _film("B")),
+        (12, "remove", _film("A")),
+    ]
+
+    delta = svc.sync_favorites("u", since=9)
+
+    assert delta["full"] is False
+    assert delta["token"] == 12
+    assert [f.titre for f in delta["added"]] == ["B"]
+    assert [f.titre for f in delta["removed"]] == ["A"]
+    svc.user_dao.get_favorites_changes.assert_called_once_with(3, 9)
+    svc.user_dao.get_favorites_by_pseudo.assert_not_called()
+
+
+def test_sync_favorites_without_token_is_full(svc):
+    """Sans jeton, la liste complète est renvoyée avec le jeton courant."""
+    svc.user_dao.last_favorites_change.return_value = 5
+    svc.user_dao.get_favorites_by_pseudo.return_value = [_film("A")]
+
+    delta = svc.sync_favorites("u")
+
+    assert delta["full"] is True
+    assert delta["token"] == 5
+    assert [f.titre for f in delta["added"]] == ["A"]
+
+
+def test_sync_favorites_unknown_token_is_full(svc):
+    """Un jeton plus récent que le journal (base réinitialisée) force un full."""
+    svc.user_dao.last_favorites_change.return_value = 5
+    svc.user_dao.get_favorites_by_pseudo.return_value = []
+
+    assert svc.sync_favorites("u", since=99)["full"] is True
+    svc.user_dao.get_favorites_changes.assert_not_called()
+
+
+def test_remove_favorite_invalidates_cache(svc):
+    """La suppression d'un favori invalide le cache."""
+    svc.user_dao.get_id.return_value = 3
+    svc.user_dao.remove_favorite.return_value = True
+    version = svc.favorites_cache.version("u")
+
+    assert svc.remove_favorite("u", "Inception") is True
+    svc.user_dao.remove_favorite.assert_called_once_with(3, "Inception")
+    assert svc.favorites_cache.version("u") != version
@@ -0,0 +1,18 @@
+from src.utils.env import getenv
+
+
+def test_getenv_value(monkeypatch):
+    monkeypatch.setenv("TEST_ENV_VALUE", "12")
+
+    assert getenv("TEST_ENV_VALUE", "3") == "12"
+
+
+def test_getenv_missing_or_empty_uses_default(monkeypatch):
+    monkeypatch.delenv("TEST_ENV_VALUE", raising=False)
+    assert getenv("TEST_ENV_VALUE", "3") == "3"
+    assert getenv("TEST_ENV_VALUE") is None
+
+    for empty in ("", "  "):
+        monkeypatch.setenv("TEST_ENV_VALUE", empty)
+        assert getenv("TEST_ENV_VALUE", "3") == "3"
+        assert int(getenv("TEST_ENV_VALUE", 4)) == 4
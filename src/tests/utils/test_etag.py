@@ -0,0 +1,26 @@
+from src.utils.etag import content_etag, etag_matches, version_etag
+
+
+def test_version_etag_changes_with_version():
+    assert version_etag("favorites", "u", 1) == version_etag("favorites", "u", 1)
+    assert version_etag("favorites", "u", 1) != version_etag("favorites", "u", 2)
+    assert version_etag("favorites", "u", 1).startswith('W/"')
+
+
+def test_content_etag_depends_on_content_only():
+    assert content_etag({"a": 1, "b": 2}) == content_etag({"b": 2, "a": 1})
+    assert content_etag({"a": 1}) != content_etag({"a": 2})
+
+
+def test_etag_matches_weak_comparison_and_lists():
+    etag = version_etag("x")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"autre", {etag.removeprefix("W/")}', etag)
+    assert etag_matches("*", etag)
+
+
+def test_etag_matches_missing_or_different():
+    etag = content_etag("x")
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"autre"', etag)
+    assert not etag_matches(etag, None)
@@ -0,0 +1,88 @@
+import asyncio
+from concurrent.futures import Future
+
+import pytest
+
+from src.app_errors.app_errors import PasswordPoolSaturatedError
+from src.utils.psswd_pool import PasswordPool
+
+
+# -----------------------------
+# Fixture : pool exécuté dans le thread appelant
+# -----------------------------
+@pytest.fixture
+def inline_pool():
+    """Pool sans processus : les calculs sont faits dans le thread du test."""
+    return PasswordPool(workers=0, max_queue=2)
+
+
+# -----------------------------
+# Hachage et vérification
+# -----------------------------
+def test_hash_and_verify(inline_pool):
+    """Le hash produit par le pool est vérifiable par le pool."""
+    hashed = inline_pool.hash("Password1@").result()
+
+    assert isinstance(hashed, bytes)
+    assert inline_pool.verify("Password1@", hashed).result() is True
+    assert inline_pool.verify("WrongPass1@", hashed).result() is False
+
+
+def test_async_api(inline_pool):
+    """hash_async / verify_async sont awaitables."""
+
+    async def scenario():
+        hashed = await inline_pool.hash_async("Password1@")
+        return await inline_pool.verify_async("Password1@", hashed)
+
+    assert asyncio.run(scenario()) is True
+
+
+def test_process_pool():
+    """Les calculs sont exécutés dans des processus séparés."""
+    pool = PasswordPool(workers=1, max_queue=2)
+    hashed = pool.hash("Password1@").result(timeout=30)
+
+    assert pool.verify("Password1@", hashed).result(timeout=30) is True
+    pool._executor.shutdown()
+
+
+# -----------------------------
+# Contre-pression
+# -----------------------------
+def test_saturated_pool_rejects_immediately():
+    """Quand la file est pleine, la soumission échoue tout de suite."""
+    pool = PasswordPool(workers=1, max_queue=1)
+    inner = Future()
+
+    class BlockingExecutor:
+        """Exécuteur factice : le calcul reste en cours jusqu'à set_result."""
+
+        def submit(self, *_args):
+            return inner
+
+    pool._executor = BlockingExecutor()
+    pending = pool.hash("Password1@")
+
+    with pytest.raises(PasswordPoolSaturatedError):
+        pool.hash("Password1@")
+    assert pool.metrics()["rejected"] == 1
+
+    inner.set_result((b"hash", 0.0, 0.0))
+    assert pending.result() == b"hash"
+    assert pool.metrics()["in_flight"] == 0
+
+
+# -----------------------------
+# Métriques
+# -----------------------------
+def test_metrics(inline_pool):
+    """Les métriques distinguent attente dans la file et temps de calcul."""
+    inline_pool.hash("Password1@").result()
+    metrics = inline_pool.metrics()
+
+    assert metrics["submitted"] == 1
+    assert metrics["completed"] == 1
+    assert metrics["in_flight"] == 0
+    assert metrics["compute_avg"] > 0
+    assert metrics["queue_wait_avg"] >= 0
@@ -82,3 +82,40 @@ def test_password_is_bytes(password_processor):
     Vérifie que l'attribut password est bien encodé en bytes pour bcrypt.
     """
     assert isinstance(password_processor.password, bytes)
+
+
+# -----------------------------
+# Facteur de coût bcrypt
+# -----------------------------
+def test_hash_uses_configured_rounds(monkeypatch):
+    """Le hash utilise le coût défini par BCRYPT_ROUNDS."""
+    monkeypatch.setenv("BCRYPT_ROUNDS", "5")
+    hashed = PasswordProcessing("Password1@")._hash_password()
+
+    assert PasswordProcessing.get_rounds(hashed) == 5
+
+
+def test_hash_with_explicit_rounds():
+    """Un coût passé au constructeur prime sur la configuration."""
+    hashed = PasswordProcessing("Password1@", rounds=4)._hash_password()
+
+    assert PasswordProcessing.get_rounds(hashed) == 4
+
+
+def test_needs_rehash(monkeypatch):
+    """Un hash dont le coût diffère du coût cible doit être recalculé."""
+    monkeypatch.setenv("BCRYPT_ROUNDS", "5")
+    hashed = PasswordProcessing("Password1@", rounds=4)._hash_password()
+
+    assert PasswordProcessing.needs_rehash(hashed) is True
+    monkeypatch.setenv("BCRYPT_ROUNDS", "4")
+    assert PasswordProcessing.needs_rehash(hashed) is False
+
+
+def test_calibrate_rounds_respects_target():
+    """Le coût calibré reste dans les bornes et croît avec la latence cible."""
+    low = PasswordProcessing.calibrate_rounds(target_ms=0.001)
+    high = PasswordProcessing.calibrate_rounds(target_ms=20, max_rounds=10)
+
+    assert low == 4
+    assert 4 <= high <= 10
@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from src.app_errors.app_errors import InvalidTokenError
+from src.utils.token_proc import TokenProcessing
+
+
+# -----------------------------
+# Fixture : instance TokenProcessing
+# -----------------------------
+@pytest.fixture
+def token_processor():
+    """Crée une instance TokenProcessing avec une clé connue."""
+    return TokenProcessing(secret="cle-de-test")
+
+
+# -----------------------------
+# Signature et vérification
+# -----------------------------
+def test_sign_and_verify(token_processor):
+    """Un jeton signé est vérifié et restitue son contenu."""
+    token = token_processor.sign("louis", "sid-1", time.time() + 60)
+
+    payload = token_processor.verify(token)
+
+    assert payload["sub"] == "louis"
+    assert payload["sid"] == "sid-1"
+
+
+def test_verify_rejects_tampered_token(token_processor):
+    """Un jeton modifié est refusé."""
+    token = token_processor.sign("louis", "sid-1", time.time() + 60)
+    _, signature = token.split(".")
+    forged = TokenProcessing(secret="cle-de-test").sign(
+        "admin", "sid-1", time.time() + 60
+    )
+
+    with pytest.raises(InvalidTokenError, match="Signature"):
+        token_processor.verify(f"{forged.split('.')[0]}.{signature}")
+
+
+def test_verify_rejects_other_secret(token_processor):
+    """Un jeton signé avec une autre clé est refusé."""
+    token = TokenProcessing(secret="autre").sign("louis", "sid", time.time() + 60)
+
+    with pytest.raises(InvalidTokenError):
+        token_processor.verify(token)
+
+
+def test_verify_rejects_expired_token(token_processor):
+    """Un jeton expiré est refusé."""
+    token = token_processor.sign("louis", "sid-1", time.time() - 1)
+
+    with pytest.raises(InvalidTokenError, match="expiré"):
+        token_processor.verify(token)
+
+
+@pytest.mark.parametrize("token", ["", "abc", "a.b.c", None, "é.abc", "abc.déf"])
+def test_verify_rejects_malformed_token(token_processor, token):
+    """Un jeton mal formé est refusé."""
+    with pytest.raises(InvalidTokenError):
+        token_processor.verify(token)
@@ -0,0 +1,13 @@
+import os
+
+
+def getenv(name: str, default=None):
+    """
+    Comme os.getenv(), mais une variable vide ou faite d'espaces compte comme
+    absente : les clés laissées vides de .env.template (« RECO_NEIGHBOURS = »)
+    prennent leur valeur par défaut au lieu de faire échouer int("").
+    """
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value
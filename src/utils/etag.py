@@ -0,0 +1,44 @@
+import hashlib
+import json
+import secrets
+
+
+# Tiré au démarrage : les ETag fondés sur des compteurs en mémoire changent
+# à chaque redémarrage et diffèrent d'un worker à l'autre (jamais de faux 304).
+BOOT_NONCE = secrets.token_hex(8)
+
+
+def _digest(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:20]
+
+
+def version_etag(*parts) -> str:
+    """
+    ETag faible construit à partir d'un numéro de version en mémoire
+    (ex: version des favoris d'un utilisateur), propre au processus.
+    """
+    return f'W/"{_digest("|".join([BOOT_NONCE, *map(str, parts)]))}"'
+
+
+def content_etag(content) -> str:
+    """
+    ETag fort construit à partir d'un contenu sérialisable en JSON :
+    identique sur tous les workers pour un même contenu.
+    """
+    return f'"{_digest(json.dumps(content, sort_keys=True, default=str))}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    """
+    Compare l'en-tête If-None-Match à un ETag (comparaison faible, RFC 9110) :
+    True si le client a déjà la représentation courante.
+    """
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
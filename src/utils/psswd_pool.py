@@ -0,0 +1,175 @@
+import asyncio
+from concurrent.futures import Future, ProcessPoolExecutor
+import os
+import threading
+import time
+
+import dotenv
+
+from src.app_errors.app_errors import PasswordPoolSaturatedError
+from src.utils.env import getenv
+from src.utils.psswd_proc import PasswordProcessing
+
+
+def _timed(func, *args):
+    """Exécute func dans le processus de travail et mesure son temps de calcul."""
+    start = time.time()
+    result = func(*args)
+    return result, start, time.time()
+
+
+def _hash(password: str) -> bytes:
+    return PasswordProcessing(password)._hash_password()
+
+
+def _verify(password: str, hashed_password: bytes) -> bool:
+    return PasswordProcessing._verify_password(None, password, hashed_password)
+
+
+class PasswordPool:
+    """
+    Exécute les calculs bcrypt (hachage et vérification) dans un pool de
+    processus dédié, pour ne pas bloquer le thread qui traite la requête.
+
+    Le nombre de calculs en attente ou en cours est borné : au-delà,
+    PasswordPoolSaturatedError est levée immédiatement (l'API répond 503).
+
+    Attributs
+    ---------
+    workers : int
+        Nombre de processus (PASSWORD_POOL_WORKERS). 0 = exécution dans le
+        thread appelant, sans processus.
+    max_queue : int
+        Nombre maximal de calculs en attente ou en cours
+        (PASSWORD_POOL_MAX_QUEUE).
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, workers: int | None = None, max_queue: int | None = None):
+        dotenv.load_dotenv()
+        if workers is None:
+            workers = int(getenv("PASSWORD_POOL_WORKERS", os.cpu_count() or 1))
+        if max_queue is None:
+            max_queue = int(getenv("PASSWORD_POOL_MAX_QUEUE", 4 * max(workers, 1)))
+
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max_queue)
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "rejected": 0,
+            "in_flight": 0,
+            "queue_wait_total": 0.0,
+            "queue_wait_max": 0.0,
+            "compute_total": 0.0,
+            "compute_max": 0.0,
+        }
+
+    @classmethod
+    def shared(cls) -> "PasswordPool":
+        """Retourne le pool partagé par tous les services du processus."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    # -----------------------------
+    # Soumission des calculs
+    # -----------------------------
+    def submit(self, func, *args) -> Future:
+        """
+        Soumet un calcul au pool et retourne un Future de son résultat.
+        Lève PasswordPoolSaturatedError si la file est pleine.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise PasswordPoolSaturatedError(
+                "Trop de calculs de mot de passe en cours, réessayez plus tard."
+            )
+
+        with self._lock:
+            self._stats["submitted"] += 1
+            self._stats["in_flight"] += 1
+
+        submitted_at = time.time()
+        result = Future()
+
+        def done(inner: Future):
+            self._slots.release()
+            try:
+                value, start, end = inner.result()
+            except Exception as e:
+                with self._lock:
+                    self._stats["in_flight"] -= 1
+                result.set_exception(e)
+                return
+            self._record(start - submitted_at, end - start)
+            result.set_result(value)
+
+        if self.workers == 0:
+            inner = Future()
+            try:
+                inner.set_result(_timed(func, *args))
+            except Exception as e:
+                inner.set_exception(e)
+            done(inner)
+        else:
+            self._get_executor().submit(_timed, func, *args).add_done_callback(done)
+
+        return result
+
+    def hash(self, password: str) -> Future:
+        """Hache un mot de passe dans le pool. Le Future donne des bytes."""
+        return self.submit(_hash, password)
+
+    def verify(self, password: str, hashed_password: bytes) -> Future:
+        """Vérifie un mot de passe dans le pool. Le Future donne un booléen."""
+        return self.submit(_verify, password, hashed_password)
+
+    async def hash_async(self, password: str) -> bytes:
+        """Version awaitable de hash()."""
+        return await asyncio.wrap_future(self.hash(password))
+
+    async def verify_async(self, password: str, hashed_password: bytes) -> bool:
+        """Version awaitable de verify()."""
+        return await asyncio.wrap_future(self.verify(password, hashed_password))
+
+    # -----------------------------
+    # Métriques
+    # -----------------------------
+    def _record(self, queue_wait: float, compute: float):
+        with self._lock:
+            self._stats["completed"] += 1
+            self._stats["in_flight"] -= 1
+            self._stats["queue_wait_total"] += queue_wait
+            self._stats["queue_wait_max"] = max(
+                self._stats["queue_wait_max"], queue_wait
+            )
+            self._stats["compute_total"] += compute
+            self._stats["compute_max"] = max(self._stats["compute_max"], compute)
+
+    def metrics(self) -> dict:
+        """
+        Retourne les compteurs du pool et les temps moyens (en secondes)
+        d'attente dans la file et de calcul bcrypt.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        completed = stats["completed"] or 1
+        stats["queue_wait_avg"] = stats["queue_wait_total"] / completed
+        stats["compute_avg"] = stats["compute_total"] / completed
+        stats["workers"] = self.workers
+        stats["max_queue"] = self.max_queue
+        return stats
@@ -1,27 +1,90 @@
 import re
+import time
 
 import bcrypt
 import dotenv
 
+from src.utils.env import getenv
+
+
+# Bornes du facteur de coût acceptées par bcrypt
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+
 
 class PasswordProcessing:
     """
     Classe utilitaire pour gérer le hachage, la vérification et la validation
     de mots de passe de manière sécurisée avec bcrypt.
+
+    Le facteur de coût bcrypt est lu dans BCRYPT_ROUNDS (12 par défaut) ; la
+    valeur adaptée à une machine s'obtient avec `python -m src.utils.psswd_proc`.
     """
 
-    def __init__(self, password: str):
+    def __init__(self, password: str, rounds: int | None = None):
         """
         Initialise le gestionnaire avec un mot de passe.
         """
         dotenv.load_dotenv()
         self.password = password.encode("utf-8")  # bcrypt attend des bytes
+        self.rounds = rounds if rounds else self.target_rounds()
+
+    @staticmethod
+    def target_rounds() -> int:
+        """
+        Retourne le facteur de coût configuré (BCRYPT_ROUNDS).
+        """
+        dotenv.load_dotenv()
+        rounds = int(getenv("BCRYPT_ROUNDS", "12"))
+        return min(max(rounds, MIN_ROUNDS), MAX_ROUNDS)
+
+    @staticmethod
+    def get_rounds(hashed_password: bytes) -> int:
+        """
+        Extrait le facteur de coût d'un hash bcrypt (ex: b"$2b$12$..." -> 12).
+        """
+        return int(hashed_password.split(b"$")[2])
+
+    @staticmethod
+    def needs_rehash(hashed_password: bytes) -> bool:
+        """
+        Indique si un hash a été calculé avec un autre coût que le coût cible.
+        """
+        try:
+            rounds = PasswordProcessing.get_rounds(hashed_password)
+        except (IndexError, ValueError):
+            return True
+        return rounds != PasswordProcessing.target_rounds()
+
+    @staticmethod
+    def calibrate_rounds(target_ms: float | None = None, max_rounds: int = 16) -> int:
+        """
+        Mesure le temps de hachage sur la machine courante et retourne le plus
+        grand coût dont le temps reste sous la latence cible (BCRYPT_TARGET_MS,
+        250 ms par défaut). Chaque unité de coût double le temps de calcul.
+        """
+        dotenv.load_dotenv()
+        if target_ms is None:
+            target_ms = float(getenv("BCRYPT_TARGET_MS", "250"))
+
+        rounds = MIN_ROUNDS
+        while rounds < max_rounds:
+            start = time.perf_counter()
+            bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds=rounds))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            # Le coût suivant prendrait environ deux fois plus de temps
+            if 2 * elapsed_ms > target_ms:
+                break
+            rounds += 1
+
+        return rounds
 
     def _hash_password(self) -> bytes:
         """
         Génère un hash bcrypt du mot de passe avec un sel aléatoire.
         """
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self.rounds)
         return bcrypt.hashpw(self.password, salt=salt)
 
     def _verify_password(self, entered_password: str, hashed_password: bytes) -> bool:
@@ -50,3 +113,8 @@ class PasswordProcessing:
         if not re.search(r"[0-9]", password):
             return False
         return re.search(r"[@#$!%^&*]", password) is not None
+
+
+if __name__ == "__main__":
+    rounds = PasswordProcessing.calibrate_rounds()
+    print(f"BCRYPT_ROUNDS={rounds}")
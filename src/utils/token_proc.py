@@ -0,0 +1,92 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+
+import dotenv
+
+from src.app_errors.app_errors import InvalidTokenError
+from src.utils.env import getenv
+
+
+# Secret de secours si SESSION_SECRET n'est pas défini : propre au processus,
+# les jetons ne survivent donc pas à un redémarrage.
+_FALLBACK_SECRET = secrets.token_bytes(32)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class TokenProcessing:
+    """
+    Classe utilitaire pour signer et vérifier les jetons de session (bearer).
+
+    Un jeton a la forme `payload.signature` (base64 url-safe) où le payload
+    contient le pseudo (sub), l'identifiant de session (sid) et l'expiration
+    (exp). La signature est un HMAC-SHA256 : la vérification ne demande aucun
+    accès à la base de données.
+    """
+
+    def __init__(self, secret: str | None = None):
+        """
+        Initialise le gestionnaire avec la clé de signature.
+        """
+        dotenv.load_dotenv()
+        secret = secret or getenv("SESSION_SECRET")
+        if secret:
+            self.secret = secret.encode("utf-8")
+        else:
+            logging.warning(
+                "SESSION_SECRET absent : clé de signature générée pour ce processus."
+            )
+            self.secret = _FALLBACK_SECRET
+
+    def _signature(self, payload: str) -> str:
+        digest = hmac.new(self.secret, payload.encode("ascii"), hashlib.sha256)
+        return _b64encode(digest.digest())
+
+    def sign(self, pseudo: str, session_id: str, expires_at: float) -> str:
+        """
+        Génère un jeton signé pour une session.
+        """
+        payload = _b64encode(
+            json.dumps(
+                {"sub": pseudo, "sid": session_id, "exp": int(expires_at)},
+                separators=(",", ":"),
+            ).encode("utf-8")
+        )
+        return f"{payload}.{self._signature(payload)}"
+
+    def verify(self, token: str) -> dict:
+        """
+        Vérifie la signature et l'expiration d'un jeton et retourne son contenu.
+        Lève InvalidTokenError si le jeton est mal formé, falsifié ou expiré.
+        """
+        try:
+            payload, signature = token.split(".")
+        except (AttributeError, ValueError) as e:
+            raise InvalidTokenError("Jeton mal formé.") from e
+        # les en-têtes sont décodés en latin-1 : un jeton valide est en ASCII
+        if not token.isascii():
+            raise InvalidTokenError("Jeton mal formé.")
+
+        if not hmac.compare_digest(signature, self._signature(payload)):
+            raise InvalidTokenError("Signature du jeton invalide.")
+
+        try:
+            content = json.loads(_b64decode(payload))
+        except ValueError as e:
+            raise InvalidTokenError("Jeton mal formé.") from e
+
+        if content.get("exp", 0) < time.time():
+            raise InvalidTokenError("Jeton expiré.")
+
+        return content